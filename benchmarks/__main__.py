@@ -0,0 +1,125 @@
+"""Run the overhead benchmarks and write the results as JSON.
+
+python -m benchmarks -o results.json
+python -m benchmarks --compare baseline.json -k stream_once
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+from benchmarks.suite import Case, Result, run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-o", "--output", type=Path, help="write JSON here")
+    parser.add_argument(
+        "-k", "--select", action="append", default=[], help="name substring"
+    )
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="seconds per repeat"
+    )
+    parser.add_argument("--compare", type=Path, help="baseline JSON to diff against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.10,
+        help="median CPU ratio that counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    def select(case: Case) -> bool:
+        return not args.select or any(part in case.name for part in args.select)
+
+    results = run(repeat=args.repeat, min_time=args.min_time, select=select)
+    report = {"meta": _meta(), "results": [result.to_dict() for result in results]}
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.compare is None:
+        _print_table(results)
+        return 0
+    baseline = json.loads(args.compare.read_text())
+    return _print_comparison(report["results"], baseline["results"], args.threshold)
+
+
+def _meta() -> dict[str, Any]:
+    try:
+        llmify_version = version("py-llmify")
+    except PackageNotFoundError:
+        llmify_version = None
+    return {
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "llmify": llmify_version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _key(result: dict[str, Any]) -> str:
+    params = ",".join(f"{key}={value}" for key, value in result["params"].items())
+    return f"{result['name']}[{params}]" if params else result["name"]
+
+
+def _print_table(results: list[Result]) -> None:
+    for result in results:
+        summary = result.to_dict()
+        print(
+            f"{_key(summary):<60} {summary['cpu_us']['median']:>12.3f} us/{result.unit}",
+            file=sys.stderr,
+        )
+
+
+def _print_comparison(
+    current: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    threshold: float,
+) -> int:
+    """Print median CPU ratios; return 1 if any case regressed past ``threshold``."""
+    previous = {_key(result): result for result in baseline}
+    regressions = 0
+    for result in current:
+        key = _key(result)
+        before = previous.get(key)
+        now = result["cpu_us"]["median"]
+        if before is None:
+            print(f"{key:<60} {now:>12.3f} us  (new)", file=sys.stderr)
+            continue
+        ratio = now / max(before["cpu_us"]["median"], 1e-9)
+        flag = "  REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"{key:<60} {now:>12.3f} us  x{ratio:.2f}{flag}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
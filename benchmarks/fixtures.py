@@ -0,0 +1,513 @@
+"""Inputs and stub provider clients for the benchmark suite.
+
+Stub clients hand llmify fully parsed SDK objects that are built once up
+front, so the measured time is llmify's own work: no sockets, no JSON
+decoding and no SDK response parsing.
+"""
+
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any
+
+from llmify.messages import (
+    AssistantMessage,
+    ContentPartImageParam,
+    ContentPartTextParam,
+    Function,
+    ImageURL,
+    Message,
+    SystemMessage,
+    ToolCall,
+    ToolResultMessage,
+    UserMessage,
+)
+from llmify.tools import Tool, tool
+
+_IMAGE_URL = "data:image/png;base64," + "iVBORw0KGgo" * 64
+_TOOL_EVERY = 5
+_IMAGE_EVERY = 25
+
+
+def history(turns: int) -> list[Message]:
+    """A system prompt followed by ``turns`` user/assistant exchanges.
+
+    Every fifth exchange is answered through a tool call and its result, and
+    every 25th user message carries an image, so every converter branch runs.
+    """
+    messages: list[Message] = [
+        SystemMessage(content="You are a terse assistant for a logistics team.")
+    ]
+    for turn in range(turns):
+        if turn % _IMAGE_EVERY == 0:
+            messages.append(
+                UserMessage(
+                    content=[
+                        ContentPartTextParam(text=f"What is on pallet {turn}?"),
+                        ContentPartImageParam(image_url=ImageURL(url=_IMAGE_URL)),
+                    ]
+                )
+            )
+        else:
+            messages.append(UserMessage(content=f"Where is shipment {turn} now?"))
+
+        if turn % _TOOL_EVERY == 0:
+            call = ToolCall(
+                id=f"call_{turn}",
+                function=Function(
+                    name="track_shipment", arguments=f'{{"shipment_id": {turn}}}'
+                ),
+            )
+            messages.append(AssistantMessage(tool_calls=[call]))
+            messages.append(
+                ToolResultMessage(
+                    tool_call_id=call.id,
+                    content=f'{{"status": "in transit", "hub": "HUB-{turn}"}}',
+                )
+            )
+        messages.append(
+            AssistantMessage(content=f"Shipment {turn} left the hub this morning.")
+        )
+    return messages
+
+
+def tools(count: int) -> list[Tool]:
+    """``count`` distinct decorated function tools with typed parameters."""
+
+    def make(index: int) -> Tool:
+        def lookup(
+            query: str, limit: int = 10, include_archived: bool = False
+        ) -> list[str]:
+            return [query] * limit
+
+        lookup.__name__ = f"lookup_{index}"
+        lookup.__doc__ = f"Search index {index} for matching records."
+        return tool(lookup)
+
+    return [make(index) for index in range(count)]
+
+
+def text_deltas(count: int) -> list[str]:
+    return [f" token{index}" for index in range(count)]
+
+
+TOOL_CALL_ID = "call_bench"
+TOOL_NAME = "track_shipment"
+TOOL_ARGUMENTS = ['{"shipment', '_id": ', "42}"]
+
+
+async def _replay[T](items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+# OpenAI Chat Completions ------------------------------------------------------
+
+
+def openai_chat_chunks(deltas: int) -> list[Any]:
+    from openai.types.chat import ChatCompletionChunk
+
+    def chunk(choices: list[dict[str, Any]], usage: dict | None = None) -> Any:
+        return ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "bench",
+                "choices": choices,
+                "usage": usage,
+            }
+        )
+
+    def delta(payload: dict[str, Any], finish_reason: str | None = None) -> Any:
+        return chunk([{"index": 0, "delta": payload, "finish_reason": finish_reason}])
+
+    chunks = [delta({"role": "assistant", "content": ""})]
+    chunks += [delta({"content": text}) for text in text_deltas(deltas)]
+    for index, fragment in enumerate(TOOL_ARGUMENTS):
+        call: dict[str, Any] = {"index": 0, "function": {"arguments": fragment}}
+        if index == 0:
+            call["id"] = TOOL_CALL_ID
+            call["function"]["name"] = TOOL_NAME
+        chunks.append(delta({"tool_calls": [call]}))
+    chunks.append(delta({}, finish_reason="tool_calls"))
+    chunks.append(
+        chunk(
+            [],
+            usage={"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+        )
+    )
+    return chunks
+
+
+def openai_chat_completion() -> Any:
+    from openai.types.chat import ChatCompletion
+
+    return ChatCompletion.model_validate(
+        {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "bench",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "Done."},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 100,
+                "completion_tokens": 5,
+                "total_tokens": 105,
+            },
+        }
+    )
+
+
+def openai_chat_client(chunks: list[Any], completion: Any) -> Any:
+    async def create(**params: Any) -> Any:
+        if params.get("stream"):
+            return _replay(chunks)
+        return completion
+
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+
+# OpenAI Responses -------------------------------------------------------------
+
+
+def responses_events(deltas: int) -> list[Any]:
+    from openai.types.responses import (
+        ResponseCompletedEvent,
+        ResponseOutputItemAddedEvent,
+        ResponseOutputItemDoneEvent,
+        ResponseTextDeltaEvent,
+    )
+
+    message = {
+        "id": "msg_bench",
+        "type": "message",
+        "role": "assistant",
+        "status": "completed",
+        "content": [
+            {
+                "type": "output_text",
+                "text": "".join(text_deltas(deltas)),
+                "annotations": [],
+            }
+        ],
+    }
+    function_call = {
+        "id": "fc_bench",
+        "type": "function_call",
+        "call_id": TOOL_CALL_ID,
+        "name": TOOL_NAME,
+        "arguments": "".join(TOOL_ARGUMENTS),
+        "status": "completed",
+    }
+    sequence = iter(range(deltas + 16))
+
+    events: list[Any] = [
+        ResponseOutputItemAddedEvent.model_validate(
+            {
+                "type": "response.output_item.added",
+                "output_index": 0,
+                "sequence_number": next(sequence),
+                "item": {**message, "status": "in_progress", "content": []},
+            }
+        )
+    ]
+    events += [
+        ResponseTextDeltaEvent.model_validate(
+            {
+                "type": "response.output_text.delta",
+                "item_id": "msg_bench",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": text,
+                "logprobs": [],
+                "sequence_number": next(sequence),
+            }
+        )
+        for text in text_deltas(deltas)
+    ]
+    for index, item in enumerate((message, function_call)):
+        events.append(
+            ResponseOutputItemDoneEvent.model_validate(
+                {
+                    "type": "response.output_item.done",
+                    "output_index": index,
+                    "sequence_number": next(sequence),
+                    "item": item,
+                }
+            )
+        )
+    events.append(
+        ResponseCompletedEvent.model_validate(
+            {
+                "type": "response.completed",
+                "sequence_number": next(sequence),
+                "response": {
+                    "id": "resp_bench",
+                    "object": "response",
+                    "created_at": 0,
+                    "model": "bench",
+                    "status": "completed",
+                    "output": [message, function_call],
+                    "parallel_tool_calls": True,
+                    "tool_choice": "auto",
+                    "tools": [],
+                    "usage": {
+                        "input_tokens": 100,
+                        "input_tokens_details": {
+                            "cached_tokens": 0,
+                            "cache_write_tokens": 0,
+                        },
+                        "output_tokens": 50,
+                        "output_tokens_details": {"reasoning_tokens": 0},
+                        "total_tokens": 150,
+                    },
+                },
+            }
+        )
+    )
+    return events
+
+
+class StubResponsesSession:
+    def __init__(self, events: list[Any]) -> None:
+        self._events = events
+
+    def events(self, request: dict[str, Any]) -> AsyncIterator[Any]:
+        return _replay(self._events)
+
+    def can_continue_from(self, response_id: str) -> bool:
+        return False
+
+    def remember(self, response_id: str) -> None:
+        pass
+
+
+class StubResponsesTransport:
+    """``ResponsesTransport`` that replays the same events for every request."""
+
+    def __init__(self, events: list[Any]) -> None:
+        self.stub_session = StubResponsesSession(events)
+
+    @asynccontextmanager
+    async def session(self, client: Any) -> AsyncIterator[StubResponsesSession]:
+        yield self.stub_session
+
+
+# Anthropic Messages -----------------------------------------------------------
+
+
+def anthropic_events(deltas: int) -> list[Any]:
+    from anthropic.types import (
+        RawContentBlockDeltaEvent,
+        RawContentBlockStartEvent,
+        RawContentBlockStopEvent,
+        RawMessageDeltaEvent,
+        RawMessageStartEvent,
+    )
+
+    events: list[Any] = [
+        RawMessageStartEvent.model_validate(
+            {
+                "type": "message_start",
+                "message": {
+                    "id": "msg_bench",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": "bench",
+                    "content": [],
+                    "stop_reason": None,
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 100, "output_tokens": 1},
+                },
+            }
+        ),
+        RawContentBlockStartEvent.model_validate(
+            {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""},
+            }
+        ),
+    ]
+    events += [
+        RawContentBlockDeltaEvent.model_validate(
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": text},
+            }
+        )
+        for text in text_deltas(deltas)
+    ]
+    events.append(
+        RawContentBlockStopEvent.model_validate(
+            {"type": "content_block_stop", "index": 0}
+        )
+    )
+    events.append(
+        RawContentBlockStartEvent.model_validate(
+            {
+                "type": "content_block_start",
+                "index": 1,
+                "content_block": {
+                    "type": "tool_use",
+                    "id": TOOL_CALL_ID,
+                    "name": TOOL_NAME,
+                    "input": {},
+                },
+            }
+        )
+    )
+    events += [
+        RawContentBlockDeltaEvent.model_validate(
+            {
+                "type": "content_block_delta",
+                "index": 1,
+                "delta": {"type": "input_json_delta", "partial_json": fragment},
+            }
+        )
+        for fragment in TOOL_ARGUMENTS
+    ]
+    events.append(
+        RawContentBlockStopEvent.model_validate(
+            {"type": "content_block_stop", "index": 1}
+        )
+    )
+    events.append(
+        RawMessageDeltaEvent.model_validate(
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": "tool_use", "stop_sequence": None},
+                "usage": {"output_tokens": 50},
+            }
+        )
+    )
+    return events
+
+
+def anthropic_message() -> Any:
+    from anthropic.types import Message as AnthropicMessage
+
+    return AnthropicMessage.model_validate(
+        {
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "model": "bench",
+            "content": [{"type": "text", "text": "Done."}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 100, "output_tokens": 5},
+        }
+    )
+
+
+class _AnthropicStream:
+    def __init__(self, events: list[Any]) -> None:
+        self._events = events
+
+    async def __aenter__(self) -> AsyncIterator[Any]:
+        return _replay(self._events)
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        pass
+
+
+def anthropic_client(events: list[Any], message: Any) -> Any:
+    async def create(**params: Any) -> Any:
+        return message
+
+    return SimpleNamespace(
+        messages=SimpleNamespace(
+            create=create, stream=lambda **params: _AnthropicStream(events)
+        )
+    )
+
+
+# Google Gemini ----------------------------------------------------------------
+
+
+def google_chunks(deltas: int) -> list[Any]:
+    from google.genai.types import GenerateContentResponse
+
+    def chunk(parts: list[dict[str, Any]], **extra: Any) -> Any:
+        candidate: dict[str, Any] = {
+            "index": 0,
+            "content": {"role": "model", "parts": parts},
+        }
+        if "finish_reason" in extra:
+            candidate["finish_reason"] = extra.pop("finish_reason")
+        return GenerateContentResponse.model_validate(
+            {"candidates": [candidate], **extra}
+        )
+
+    chunks = [chunk([{"text": text}]) for text in text_deltas(deltas)]
+    chunks.append(
+        chunk(
+            [
+                {
+                    "function_call": {
+                        "id": TOOL_CALL_ID,
+                        "name": TOOL_NAME,
+                        "args": {"shipment_id": 42},
+                    }
+                }
+            ],
+            finish_reason="STOP",
+            usage_metadata={
+                "prompt_token_count": 100,
+                "candidates_token_count": 50,
+                "total_token_count": 150,
+            },
+        )
+    )
+    return chunks
+
+
+def google_response() -> Any:
+    from google.genai.types import GenerateContentResponse
+
+    return GenerateContentResponse.model_validate(
+        {
+            "candidates": [
+                {
+                    "index": 0,
+                    "finish_reason": "STOP",
+                    "content": {"role": "model", "parts": [{"text": "Done."}]},
+                }
+            ],
+            "usage_metadata": {
+                "prompt_token_count": 100,
+                "candidates_token_count": 5,
+                "total_token_count": 105,
+            },
+        }
+    )
+
+
+def google_client(chunks: list[Any], response: Any) -> Any:
+    """Stands in for ``genai.Client``; llmify only talks to ``client.aio``."""
+
+    async def generate_content(**params: Any) -> Any:
+        return response
+
+    async def generate_content_stream(**params: Any) -> AsyncIterator[Any]:
+        return _replay(chunks)
+
+    return SimpleNamespace(
+        aio=SimpleNamespace(
+            models=SimpleNamespace(
+                generate_content=generate_content,
+                generate_content_stream=generate_content_stream,
+            )
+        )
+    )
@@ -0,0 +1,350 @@
+"""Benchmark cases for llmify's per-request overhead.
+
+Each case times one operation llmify performs on every request: converting
+a history, merging parameters, building tool schemas, handling stream chunks
+and constructing completions. Providers whose SDK is not installed are
+skipped.
+"""
+
+import asyncio
+import importlib.util
+import inspect
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from benchmarks import fixtures
+from llmify.messages import Function, ToolCall, UserMessage
+from llmify.providers._openai_utils import tool_schemas
+from llmify.providers.fake import ChatFake
+from llmify.views import ChatInvokeCompletion, ChatInvokeUsage
+
+HISTORY_TURNS = (10, 100, 1000)
+STREAM_DELTAS = 500
+TOOL_COUNT = 20
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    """One timed operation.
+
+    ``run`` may return an awaitable. ``per`` is how many ``unit`` one call
+    processes, so stream cases can report the cost of a single chunk.
+    """
+
+    name: str
+    run: Callable[[], object]
+    params: dict[str, Any] = field(default_factory=dict)
+    per: int = 1
+    unit: str = "op"
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    name: str
+    params: dict[str, Any]
+    unit: str
+    loops: int
+    cpu_us: list[float]
+    wall_us: list[float]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "params": self.params,
+            "unit": self.unit,
+            "loops": self.loops,
+            "repeat": len(self.cpu_us),
+            "cpu_us": _summary(self.cpu_us),
+            "wall_us": _summary(self.wall_us),
+        }
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "min": round(min(samples), 4),
+        "median": round(statistics.median(samples), 4),
+        "mean": round(statistics.fmean(samples), 4),
+        "stdev": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+    }
+
+
+def has_sdk(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def cases() -> Iterator[Case]:
+    yield from _convert_cases()
+    yield from _merge_params_cases()
+    yield from _tool_schema_cases()
+    yield from _completion_cases()
+    yield from _stream_cases()
+    yield from _invoke_cases()
+
+
+def _converters() -> Iterator[tuple[str, Callable[[list], object]]]:
+    if has_sdk("openai"):
+        from llmify.providers import openai_compatible, openai_responses
+
+        yield "openai_chat", openai_compatible._convert_messages
+        yield "openai_responses", openai_responses._convert_messages
+    if has_sdk("anthropic"):
+        from llmify.providers import anthropic
+
+        yield "anthropic", anthropic._convert_messages
+    if has_sdk("google.genai"):
+        from llmify.providers import google
+
+        yield "google", google._convert_messages
+
+
+def _convert_cases() -> Iterator[Case]:
+    for turns in HISTORY_TURNS:
+        messages = fixtures.history(turns)
+        for provider, convert in _converters():
+            yield Case(
+                name=f"convert_messages.{provider}",
+                run=lambda convert=convert, messages=messages: convert(messages),
+                params={"turns": turns, "messages": len(messages)},
+            )
+
+
+def _merge_params_cases() -> Iterator[Case]:
+    model = ChatFake(temperature=0.2, max_tokens=1024, seed=7, user="bench")
+    yield Case(
+        name="merge_params",
+        run=lambda: model._merge_params({"top_p": 0.9, "temperature": None}),
+    )
+
+
+def _tool_schema_cases() -> Iterator[Case]:
+    tools = fixtures.tools(TOOL_COUNT)
+    params = {"tools": TOOL_COUNT}
+    yield Case(name="tool_schemas", run=lambda: tool_schemas(tools), params=params)
+    if has_sdk("openai"):
+        from llmify.providers import openai_responses
+
+        yield Case(
+            name="tool_schemas.openai_responses",
+            run=lambda: openai_responses._convert_tools(tools),
+            params=params,
+        )
+    if has_sdk("anthropic"):
+        from llmify.providers import anthropic
+
+        yield Case(
+            name="tool_schemas.anthropic",
+            run=lambda: anthropic._convert_tools(tools),
+            params=params,
+        )
+    if has_sdk("google.genai"):
+        from llmify.providers import google
+
+        yield Case(
+            name="tool_schemas.google",
+            run=lambda: [google._convert_tool(tool) for tool in tools],
+            params=params,
+        )
+
+
+def _completion_cases() -> Iterator[Case]:
+    usage = ChatInvokeUsage(prompt_tokens=100, completion_tokens=5, total_tokens=105)
+    calls = [
+        ToolCall(
+            id=f"call_{index}",
+            function=Function(name="lookup", arguments='{"query": "x"}'),
+        )
+        for index in range(3)
+    ]
+    yield Case(
+        name="completion.plain",
+        run=lambda: ChatInvokeCompletion(
+            completion="Done.", usage=usage, stop_reason="stop"
+        ),
+    )
+    yield Case(
+        name="completion.parametrized",
+        run=lambda: ChatInvokeCompletion[str](
+            completion="Done.", usage=usage, stop_reason="stop"
+        ),
+    )
+    yield Case(
+        name="completion.tool_calls",
+        run=lambda: ChatInvokeCompletion(
+            completion="",
+            usage=usage,
+            stop_reason="tool_calls",
+            tool_calls=calls,
+        ),
+        params={"tool_calls": len(calls)},
+    )
+
+
+async def _drain(stream: Any) -> None:
+    async for _ in stream:
+        pass
+
+
+def _stream_cases() -> Iterator[Case]:
+    """Time ``_stream_once`` per chunk against pre-parsed SDK events."""
+    messages = [UserMessage(content="Track shipment 42.")]
+    if has_sdk("openai"):
+        from llmify.providers.openai import ChatOpenAI
+        from llmify.providers.openai_responses import ChatOpenAIResponses
+
+        chunks = fixtures.openai_chat_chunks(STREAM_DELTAS)
+        chat = ChatOpenAI(model="bench", api_key="bench")
+        chat._client = fixtures.openai_chat_client(chunks, None)
+        request = {"model": "bench", "messages": [], "stream": True}
+        yield _stream_case(
+            "openai_chat", lambda: chat._stream_once(request), len(chunks)
+        )
+
+        events = fixtures.responses_events(STREAM_DELTAS)
+        transport = fixtures.StubResponsesTransport(events)
+        responses = ChatOpenAIResponses(
+            model="bench", api_key="bench", transport=transport
+        )
+        options = responses._responses_options
+        yield _stream_case(
+            "openai_responses",
+            lambda: responses._stream_once(
+                messages,
+                tools=None,
+                tool_choice="auto",
+                provider_state=None,
+                options=options,
+                params={},
+                session=transport.stub_session,
+            ),
+            len(events),
+        )
+
+    if has_sdk("anthropic"):
+        from llmify.providers.anthropic import ChatAnthropic
+
+        events = fixtures.anthropic_events(STREAM_DELTAS)
+        anthropic = ChatAnthropic(
+            model="bench",
+            client=fixtures.anthropic_client(events, None),
+        )
+        yield _stream_case("anthropic", lambda: anthropic._stream_once({}), len(events))
+
+    if has_sdk("google.genai"):
+        from llmify.providers.google import ChatGoogle
+
+        chunks = fixtures.google_chunks(STREAM_DELTAS)
+        google = ChatGoogle(model="bench", client=fixtures.google_client(chunks, None))
+        yield _stream_case("google", lambda: google._stream_once([], None), len(chunks))
+
+
+def _stream_case(provider: str, open_stream: Callable[[], Any], chunks: int) -> Case:
+    return Case(
+        name=f"stream_once.{provider}",
+        run=lambda: _drain(open_stream()),
+        params={"chunks": chunks},
+        per=chunks,
+        unit="chunk",
+    )
+
+
+def _invoke_cases() -> Iterator[Case]:
+    """Time a full ``invoke`` on a 10-turn history through stub clients."""
+    messages = fixtures.history(10)
+    if has_sdk("openai"):
+        from llmify.providers.openai import ChatOpenAI
+        from llmify.providers.openai_responses import ChatOpenAIResponses
+
+        chat = ChatOpenAI(model="bench", api_key="bench")
+        chat._client = fixtures.openai_chat_client(
+            [], fixtures.openai_chat_completion()
+        )
+        yield _invoke_case("openai_chat", chat, messages)
+
+        responses = ChatOpenAIResponses(
+            model="bench",
+            api_key="bench",
+            transport=fixtures.StubResponsesTransport(fixtures.responses_events(5)),
+        )
+        yield _invoke_case("openai_responses", responses, messages)
+
+    if has_sdk("anthropic"):
+        from llmify.providers.anthropic import ChatAnthropic
+
+        anthropic = ChatAnthropic(
+            model="bench",
+            client=fixtures.anthropic_client([], fixtures.anthropic_message()),
+        )
+        yield _invoke_case("anthropic", anthropic, messages)
+
+    if has_sdk("google.genai"):
+        from llmify.providers.google import ChatGoogle
+
+        google = ChatGoogle(
+            model="bench",
+            client=fixtures.google_client([], fixtures.google_response()),
+        )
+        yield _invoke_case("google", google, messages)
+
+
+def _invoke_case(provider: str, model: Any, messages: list) -> Case:
+    return Case(
+        name=f"invoke.{provider}",
+        run=lambda: model.invoke(messages),
+        params={"messages": len(messages)},
+    )
+
+
+async def measure(case: Case, *, repeat: int, min_time: float) -> Result:
+    """Time ``case`` ``repeat`` times, each over enough loops to last ``min_time``.
+
+    Operations returning an awaitable are awaited inside the timed loop.
+    """
+    warmup = case.run()
+    is_async = inspect.isawaitable(warmup)
+    if is_async:
+        await warmup
+
+    async def timed(loops: int) -> tuple[int, int]:
+        cpu_start, wall_start = time.process_time_ns(), time.perf_counter_ns()
+        for _ in range(loops):
+            result = case.run()
+            if is_async:
+                await result
+        return (
+            time.process_time_ns() - cpu_start,
+            time.perf_counter_ns() - wall_start,
+        )
+
+    budget = min_time * 1e9
+    loops = 1
+    while (wall := (await timed(loops))[1]) < budget / 10:
+        loops *= 10
+    loops = max(1, round(loops * budget / max(wall, 1)))
+
+    cpu_us: list[float] = []
+    wall_us: list[float] = []
+    for _ in range(repeat):
+        cpu, wall = await timed(loops)
+        units = loops * case.per
+        cpu_us.append(cpu / units / 1000)
+        wall_us.append(wall / units / 1000)
+    return Result(case.name, case.params, case.unit, loops, cpu_us, wall_us)
+
+
+def run(
+    *, repeat: int, min_time: float, select: Callable[[Case], bool]
+) -> list[Result]:
+    async def main() -> list[Result]:
+        return [
+            await measure(case, repeat=repeat, min_time=min_time)
+            for case in cases()
+            if select(case)
+        ]
+
+    return asyncio.run(main())
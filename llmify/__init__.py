@@ -18,7 +18,14 @@ from .messages import (
     Function,
     ContentPartTextParam,
     ContentPartImageParam,
+    ContentPartImageBytes,
     ImageURL,
+    FrozenMessage,
+    FrozenSystemMessage,
+    FrozenUserMessage,
+    FrozenAssistantMessage,
+    FrozenToolResultMessage,
+    freeze,
 )
 from .providers import (
     ChatModel,
@@ -28,10 +35,41 @@ from .providers import (
     StreamProviderEvent,
     StreamTextDelta,
     StreamToolCall,
+    StreamToolResult,
     StreamEnd,
     StreamEvent,
 )
-from .retries import RetryCallback, RetryEvent
+from .cache import InMemoryResponseCache, ResponseCache, SQLiteResponseCache
+from .connection_pool import ConnectionPoolOptions, close_connection_pools
+from .rate_limit import RateLimiter, RateLimitReservation
+from .prompt_cache import (
+    BreakpointKind,
+    CachePlan,
+    CacheStrategy,
+    PrefixStats,
+    PromptCachePlanner,
+)
+from .retries import AdaptiveConcurrencyLimiter, RetryCallback, RetryEvent
+from .tracing import Tracer, disable_tracing, enable_tracing
+from .context_overflow import (
+    ContextOverflowPolicy,
+    DropOldestTurns,
+    KeepLastTurns,
+    SummarizeMiddle,
+)
+from .tokens import (
+    HeuristicTokenEstimator,
+    TiktokenEstimator,
+    TokenEstimator,
+    default_token_estimator,
+)
+from .usage_meter import ModelPrice, PriceTable, UsageMeter, UsageTotals, UsageWindow
+from .instrumentation import (
+    RequestCallback,
+    RequestEndEvent,
+    RequestEvent,
+    RequestStartEvent,
+)
 from .tools import (
     Tool,
     FunctionTool,
@@ -49,6 +87,7 @@ if TYPE_CHECKING:
     from .providers.openai_responses import ChatOpenAIResponses, ReasoningEffort
     from .providers.openai_responses_transport import (
         HTTPResponsesTransport,
+        PooledWebSocketResponsesTransport,
         ResponsesSession,
         ResponsesTransport,
         WebSocketResponsesTransport,
@@ -61,6 +100,7 @@ if TYPE_CHECKING:
         OpenAIResponsesStreamEventType,
         OpenAIResponsesUsage,
         PromptCacheOptions,
+        CompactionPolicy,
         ResponsesOptions,
         StreamOutputItemAdded,
         StreamOutputItemDone,
@@ -73,11 +113,14 @@ if TYPE_CHECKING:
         AnthropicUsage,
     )
     from .providers.google import ChatGoogle, GoogleModel
+    from .providers.google_context_cache import GoogleContextCache
     from .providers.google_types import (
         GoogleCompletion,
         GoogleStreamEnd,
         GoogleUsage,
     )
+    from .providers.fake import ChatFake, FakeBehavior
+    from .mock_server import MockLLMServer
 
 
 def __getattr__(name: str):
@@ -149,6 +192,7 @@ def __getattr__(name: str):
         "OpenAIResponsesStreamEventType",
         "OpenAIResponsesUsage",
         "PromptCacheOptions",
+        "CompactionPolicy",
         "ResponsesOptions",
         "StreamOutputItemAdded",
         "StreamOutputItemDone",
@@ -160,6 +204,7 @@ def __getattr__(name: str):
 
     if name in {
         "HTTPResponsesTransport",
+        "PooledWebSocketResponsesTransport",
         "ResponsesSession",
         "ResponsesTransport",
         "WebSocketResponsesTransport",
@@ -202,6 +247,11 @@ def __getattr__(name: str):
 
         return GoogleModel
 
+    if name == "GoogleContextCache":
+        from .providers.google_context_cache import GoogleContextCache
+
+        return GoogleContextCache
+
     if name in {
         "GoogleCompletion",
         "GoogleStreamEnd",
@@ -211,6 +261,16 @@ def __getattr__(name: str):
 
         return getattr(google_types, name)
 
+    if name in {"ChatFake", "FakeBehavior"}:
+        from .providers import fake
+
+        return getattr(fake, name)
+
+    if name == "MockLLMServer":
+        from .mock_server import MockLLMServer
+
+        return MockLLMServer
+
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -230,7 +290,14 @@ __all__ = [
     "Function",
     "ContentPartTextParam",
     "ContentPartImageParam",
+    "ContentPartImageBytes",
     "ImageURL",
+    "FrozenMessage",
+    "FrozenSystemMessage",
+    "FrozenUserMessage",
+    "FrozenAssistantMessage",
+    "FrozenToolResultMessage",
+    "freeze",
     "ChatOpenAI",
     "OpenAIModel",
     "ChatAzureOpenAI",
@@ -250,6 +317,7 @@ __all__ = [
     "OpenAIResponsesStreamEventType",
     "OpenAIResponsesUsage",
     "PromptCacheOptions",
+    "CompactionPolicy",
     "ResponsesOptions",
     "StreamOutputItemAdded",
     "StreamOutputItemDone",
@@ -258,6 +326,7 @@ __all__ = [
     "ResponsesSession",
     "ResponsesTransport",
     "WebSocketResponsesTransport",
+    "PooledWebSocketResponsesTransport",
     "ChatAnthropic",
     "AnthropicModel",
     "AnthropicCompletion",
@@ -265,9 +334,13 @@ __all__ = [
     "AnthropicUsage",
     "ChatGoogle",
     "GoogleModel",
+    "GoogleContextCache",
     "GoogleCompletion",
     "GoogleStreamEnd",
     "GoogleUsage",
+    "ChatFake",
+    "FakeBehavior",
+    "MockLLMServer",
     "ChatModel",
     "OpenAICompatible",
     "ChatInvokeCompletion",
@@ -276,6 +349,7 @@ __all__ = [
     "StreamProviderEvent",
     "StreamTextDelta",
     "StreamToolCall",
+    "StreamToolResult",
     "StreamEnd",
     "StreamEvent",
     "Tool",
@@ -291,4 +365,37 @@ __all__ = [
     "CredentialsUnavailableError",
     "RetryCallback",
     "RetryEvent",
+    "RequestCallback",
+    "RequestEvent",
+    "RequestStartEvent",
+    "RequestEndEvent",
+    "Tracer",
+    "enable_tracing",
+    "disable_tracing",
+    "UsageMeter",
+    "ModelPrice",
+    "PriceTable",
+    "UsageTotals",
+    "UsageWindow",
+    "TokenEstimator",
+    "HeuristicTokenEstimator",
+    "TiktokenEstimator",
+    "default_token_estimator",
+    "ContextOverflowPolicy",
+    "DropOldestTurns",
+    "KeepLastTurns",
+    "SummarizeMiddle",
+    "AdaptiveConcurrencyLimiter",
+    "RateLimiter",
+    "RateLimitReservation",
+    "ConnectionPoolOptions",
+    "close_connection_pools",
+    "ResponseCache",
+    "InMemoryResponseCache",
+    "SQLiteResponseCache",
+    "PromptCachePlanner",
+    "CachePlan",
+    "CacheStrategy",
+    "BreakpointKind",
+    "PrefixStats",
 ]
@@ -1,17 +1,72 @@
+import asyncio
+import functools
+import inspect
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator
-from typing import Any, overload
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from typing import Any, Concatenate, Self, overload
 
 import httpx
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
-from llmify.messages import Message
-from llmify.retries import RetryCallback
+from llmify.cache import ResponseCache, request_fingerprint
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.exceptions import ContextLengthExceededError, LLMifyError, RateLimitError
+from llmify.instrumentation import RequestCallback, RequestTimer
+from llmify.messages import AssistantMessage, Message, ToolCall, ToolResultMessage
+from llmify.prompt_cache import CachePlan, PromptCachePlanner
+from llmify.rate_limit import RateLimiter, estimate_prompt_tokens
+from llmify.retries import (
+    AdaptiveConcurrencyLimiter,
+    ErrorMapper,
+    RetryCallback,
+    RetryEvent,
+    retry_call,
+    retry_delay,
+    retry_stream,
+)
+from llmify.tokens import TokenEstimator, TokenFamily, default_token_estimator
 from llmify.tools import Tool, ToolChoice
-from llmify.views import ChatInvokeCompletion, StreamEvent
+from llmify.tools.execution import (
+    ToolExecutor,
+    execute_tool_call,
+    execute_tool_calls,
+    tools_by_name,
+)
+from llmify.tracing import (
+    AttributeValue,
+    set_error,
+    set_response_attributes,
+    start_span,
+    tracing_enabled,
+)
+from llmify.usage_meter import UsageMeter
+from llmify.views import (
+    ChatInvokeCompletion,
+    ChatInvokeUsage,
+    StreamEnd,
+    StreamEvent,
+    StreamToolCall,
+    StreamToolResult,
+    add_usage,
+)
+
+# Share of a rejected prompt's estimate that the overflow policy trims towards.
+_OVERFLOW_SHRINK = 0.75
 
 
 class ChatModel(ABC):
+    _gen_ai_provider: str | None = None
+    """``gen_ai.provider.name`` reported on tracing spans."""
+    _cache_planner: PromptCachePlanner | None = None
+    _on_request: RequestCallback | None = None
+    _usage_meter: UsageMeter | None = None
+    _token_estimator: TokenEstimator | None = None
+    _context_window: int | None = None
+    _context_overflow: ContextOverflowPolicy | None = None
+    _token_family: TokenFamily = "generic"
+    """Tokenizer family ``default_token_estimator`` picks an estimator for."""
+
     def __init__(
         self,
         model: str,
@@ -26,12 +81,22 @@ class ChatModel(ABC):
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         **kwargs: Any,
     ):
         if not isinstance(max_retries, int) or isinstance(max_retries, bool):
             raise TypeError("'max_retries' must be an integer.")
         if max_retries < 0:
             raise ValueError("'max_retries' must be greater than or equal to 0.")
+        if context_window is not None and context_window < 1:
+            raise ValueError("'context_window' must be greater than or equal to 1.")
 
         self._model = model
         self._default_max_tokens = max_tokens
@@ -45,12 +110,59 @@ class ChatModel(ABC):
         self._default_timeout = timeout
         self._default_max_retries = max_retries
         self._on_retry = on_retry
+        self._rate_limiter = rate_limiter
+        self._cache = cache
+        self._single_flight = single_flight
+        self._on_request = on_request
+        self._usage_meter = usage_meter
+        self._token_estimator = token_estimator
+        self._context_window = context_window
+        self._context_overflow = context_overflow
+        self._invoke_flights: dict[str, asyncio.Future[Any]] = {}
+        self._stream_flights: dict[str, _StreamBroadcast[Any]] = {}
         self._default_kwargs = kwargs
 
     @property
     def model(self) -> str:
         return self._model
 
+    @property
+    def usage_meter(self) -> UsageMeter | None:
+        return self._usage_meter
+
+    @property
+    def token_estimator(self) -> TokenEstimator:
+        """The given estimator, else the best one installed for this provider."""
+        if self._token_estimator is not None:
+            return self._token_estimator
+        return default_token_estimator(self._token_family, self._model)
+
+    @property
+    def context_window(self) -> int | None:
+        return self._context_window
+
+    def count_tokens(self, messages: list[Message]) -> int:
+        """Estimate the prompt tokens of ``messages`` without calling the provider."""
+        return estimate_prompt_tokens(messages, self.token_estimator)
+
+    @property
+    def cache_planner(self) -> PromptCachePlanner | None:
+        """Breakpoint planner for ``cache_strategy="auto"``, else ``None``."""
+        return self._cache_planner
+
+    async def aclose(self) -> None:
+        """Release the provider client this model created.
+
+        Clients passed in by the caller and shared connection pools are left
+        open. The model cannot be used afterwards.
+        """
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
     def _merge_params(self, method_kwargs: dict[str, Any]) -> dict[str, Any]:
         defaults = {
             "max_tokens": self._default_max_tokens,
@@ -76,6 +188,355 @@ class ChatModel(ABC):
 
         return params
 
+    def _plan_cache(
+        self, messages: list[Message], tools: list[Tool | dict] | None
+    ) -> CachePlan | None:
+        if self._cache_planner is None:
+            return None
+        return self._cache_planner.plan(messages, tools)
+
+    def _record_cache(
+        self, plan: CachePlan | None, usage: ChatInvokeUsage | None
+    ) -> None:
+        if plan is not None and self._cache_planner is not None:
+            self._cache_planner.record(plan, usage)
+
+    async def _record_cache_stream[E](
+        self, plan: CachePlan | None, stream: AsyncIterator[E]
+    ) -> AsyncIterator[E]:
+        """Pass ``stream`` through, recording the usage on its ``StreamEnd``."""
+        async with aclosing(stream):
+            async for event in stream:
+                if isinstance(event, StreamEnd):
+                    self._record_cache(plan, event.usage)
+                yield event
+
+    async def _invoke_shared[C: ChatInvokeCompletion[Any]](
+        self,
+        request: Callable[[], dict[str, Any]],
+        completion_type: type[C],
+        invoke: Callable[[], Awaitable[C]],
+    ) -> C:
+        """Run ``invoke`` through the response cache and single-flight registry.
+
+        ``request`` builds the provider-native request; its fingerprint keys
+        both. With ``single_flight``, identical concurrent calls share one
+        provider call (and its retries) and each get their own copy of the
+        result.
+        """
+        if self._cache is None and not self._single_flight:
+            return await invoke()
+
+        key = request_fingerprint({"provider": type(self).__name__, **request()})
+        if not self._single_flight:
+            return await self._invoke_through_cache(key, completion_type, invoke)
+
+        flight = self._invoke_flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(
+                self._invoke_through_cache(key, completion_type, invoke)
+            )
+            self._invoke_flights[key] = flight
+
+            def land(done: asyncio.Future[C]) -> None:
+                self._invoke_flights.pop(key, None)
+                # Retrieved here so a failed flight whose callers all gave
+                # up does not log "exception was never retrieved".
+                if not done.cancelled():
+                    done.exception()
+
+            flight.add_done_callback(land)
+        # Shielded so one caller giving up does not cancel the others' call.
+        completion = await asyncio.shield(flight)
+        return completion.model_copy(deep=True)
+
+    async def _invoke_through_cache[C: ChatInvokeCompletion[Any]](
+        self,
+        key: str,
+        completion_type: type[C],
+        invoke: Callable[[], Awaitable[C]],
+    ) -> C:
+        cache = self._cache
+        if cache is None:
+            return await invoke()
+
+        cached = await cache.get(key)
+        if cached is not None:
+            # Entries that no longer validate, e.g. after an output schema
+            # changed, count as misses.
+            try:
+                completion = completion_type.model_validate(cached)
+            except ValidationError:
+                pass
+            else:
+                if completion.usage is not None:
+                    completion.usage.from_cache = True
+                name, attributes = self._call_span(streamed=False)
+                with start_span(
+                    name, {**attributes, "llmify.response_cache.hit": True}
+                ) as span:
+                    set_response_attributes(span, completion)
+                return completion
+
+        completion = await invoke()
+        await cache.set(key, completion.model_dump(mode="json"))
+        return completion
+
+    def _stream_shared[E](
+        self,
+        request: Callable[[], dict[str, Any]],
+        stream: Callable[[], AsyncIterator[E]],
+    ) -> AsyncIterator[E]:
+        """Share one provider stream between identical concurrent ``stream()`` calls.
+
+        A caller that joins late first receives every event buffered so far,
+        then the live ones. The provider stream is cancelled once its last
+        subscriber stops reading.
+        """
+        if not self._single_flight:
+            return stream()
+
+        key = request_fingerprint({"provider": type(self).__name__, **request()})
+        broadcast = self._stream_flights.get(key)
+        if broadcast is None:
+            broadcast = _StreamBroadcast(
+                stream(), on_close=lambda: self._stream_flights.pop(key, None)
+            )
+            self._stream_flights[key] = broadcast
+        return broadcast.subscribe()
+
+    def _request_timer(self, *, streamed: bool) -> RequestTimer | None:
+        if self._on_request is None:
+            return None
+        return RequestTimer(
+            self._on_request,
+            model=self._model,
+            provider=type(self).__name__,
+            streamed=streamed,
+        )
+
+    async def _call_with_retries[T](
+        self,
+        operation: Callable[[], Awaitable[T]],
+        *,
+        messages: list[Message],
+        on_retry: RetryCallback | None,
+        map_error: ErrorMapper,
+        replayed_tokens: int = 0,
+    ) -> T:
+        """Run one provider request under the model's retry and rate budgets.
+
+        ``replayed_tokens`` estimates history the request sends besides
+        ``messages``, such as items replayed from a provider state.
+        """
+        callback = on_retry if on_retry is not None else self._on_retry
+        timer = self._request_timer(streamed=False)
+        if timer is not None:
+            callback = timer.on_retry(callback)
+            operation = _timed_call(timer, operation)
+
+        prompt_tokens = self._preflight(messages, replayed_tokens)
+        limiter = self._rate_limiter
+        attempt = operation
+        if limiter is not None and prompt_tokens is not None:
+
+            async def attempt() -> T:
+                reservation = await limiter.acquire(prompt_tokens)
+                try:
+                    result = await operation()
+                except Exception:
+                    # A failed attempt returns its tokens; it still used a request.
+                    limiter.reconcile(reservation, 0)
+                    raise
+                usage = getattr(result, "usage", None)
+                if usage is not None:
+                    limiter.reconcile(reservation, usage.total_tokens)
+                return result
+
+        with start_span(*self._call_span(streamed=False)) as span:
+            if timer is not None:
+                await timer.start()
+            try:
+                result = await retry_call(
+                    attempt,
+                    max_retries=self._default_max_retries,
+                    on_retry=callback,
+                    map_error=map_error,
+                )
+            except Exception as exc:
+                set_error(span, exc)
+                if timer is not None:
+                    await timer.finish(error=exc)
+                raise
+            set_response_attributes(span, result)
+            self._meter_usage(result)
+            if timer is not None:
+                await timer.finish()
+            return result
+
+    def _stream_with_retries[E](
+        self,
+        stream_factory: Callable[[], AsyncIterator[E]],
+        *,
+        messages: list[Message],
+        on_retry: RetryCallback | None,
+        map_error: ErrorMapper,
+        replayed_tokens: int = 0,
+    ) -> AsyncIterator[E]:
+        """Stream one provider request under the model's retry and rate budgets."""
+        callback = on_retry if on_retry is not None else self._on_retry
+        timer = self._request_timer(streamed=True)
+        if timer is not None:
+            callback = timer.on_retry(callback)
+            stream_factory = _timed_attempts(timer, stream_factory)
+
+        prompt_tokens = self._preflight(messages, replayed_tokens)
+        limiter = self._rate_limiter
+        factory = stream_factory
+        if limiter is not None and prompt_tokens is not None:
+
+            async def factory() -> AsyncIterator[E]:
+                reservation = await limiter.acquire(prompt_tokens)
+                settled = False
+                try:
+                    async with aclosing(stream_factory()) as events:
+                        async for event in events:
+                            if isinstance(event, StreamEnd) and event.usage is not None:
+                                limiter.reconcile(reservation, event.usage.total_tokens)
+                                settled = True
+                            yield event
+                except Exception:
+                    if not settled:
+                        limiter.reconcile(reservation, 0)
+                    raise
+
+        stream = retry_stream(
+            factory,
+            max_retries=self._default_max_retries,
+            on_retry=callback,
+            map_error=map_error,
+        )
+        if timer is None and self._usage_meter is None and not tracing_enabled():
+            return stream
+        return _observed_stream(
+            self._call_span(streamed=True), timer, stream, self._meter_usage
+        )
+
+    def _trims_history(self, arguments: dict[str, Any]) -> bool:
+        """Whether ``messages`` is the whole history the call sends.
+
+        ``arguments`` are the bound arguments of ``invoke`` or ``stream``. The
+        overflow policy is skipped when they carry history of their own that
+        trimming ``messages`` would not shorten.
+        """
+        return True
+
+    async def _fit_context(self, messages: list[Message]) -> list[Message]:
+        """Trim ``messages`` up front when they are known not to fit."""
+        policy = self._context_overflow
+        window = self._context_window
+        if policy is None or window is None or self.count_tokens(messages) <= window:
+            return messages
+        return await policy.trim(
+            messages, budget=window, count_tokens=self.count_tokens
+        )
+
+    async def _trim_after_overflow(self, messages: list[Message]) -> list[Message]:
+        assert self._context_overflow is not None
+        # The provider's limit is unknown here, so aim a quarter below the
+        # estimate that it rejected.
+        budget = int(self.count_tokens(messages) * _OVERFLOW_SHRINK)
+        return await self._context_overflow.trim(
+            messages, budget=budget, count_tokens=self.count_tokens
+        )
+
+    async def _invoke_within_context[R](
+        self, messages: list[Message], send: Callable[[list[Message]], Awaitable[R]]
+    ) -> R:
+        """Send ``messages``, trimmed by the overflow policy if they do not fit.
+
+        A history is trimmed at most once: up front when it exceeds
+        ``context_window``, else after the provider rejects it, followed by a
+        single retry.
+        """
+        if self._context_overflow is None:
+            return await send(messages)
+        fitted = await self._fit_context(messages)
+        if fitted is not messages:
+            return await send(fitted)
+        try:
+            return await send(messages)
+        except ContextLengthExceededError:
+            trimmed = await self._trim_after_overflow(messages)
+            if trimmed is messages:
+                raise
+        return await send(trimmed)
+
+    async def _stream_within_context[E](
+        self,
+        messages: list[Message],
+        send: Callable[[list[Message]], AsyncIterator[E]],
+    ) -> AsyncIterator[E]:
+        """``_invoke_within_context`` for streams; retried only before the first event."""
+        fitted = await self._fit_context(messages)
+        if fitted is not messages:
+            async with aclosing(send(fitted)) as events:
+                async for event in events:
+                    yield event
+            return
+
+        started = False
+        try:
+            async with aclosing(send(messages)) as events:
+                async for event in events:
+                    started = True
+                    yield event
+            return
+        except ContextLengthExceededError:
+            if started:
+                raise
+            trimmed = await self._trim_after_overflow(messages)
+            if trimmed is messages:
+                raise
+        async with aclosing(send(trimmed)) as events:
+            async for event in events:
+                yield event
+
+    def _preflight(
+        self, messages: list[Message], replayed_tokens: int = 0
+    ) -> int | None:
+        """Estimate the prompt once for the rate limiter and the context window.
+
+        Raises ``ContextLengthExceededError`` without sending anything when
+        the estimate does not fit ``context_window``.
+        """
+        if self._rate_limiter is None and self._context_window is None:
+            return None
+        prompt_tokens = self.count_tokens(messages) + replayed_tokens
+        if self._context_window is not None and prompt_tokens > self._context_window:
+            raise ContextLengthExceededError(
+                f"Prompt is about {prompt_tokens} tokens, over the "
+                f"{self._context_window}-token context window of {self._model}.",
+                prompt_tokens=prompt_tokens,
+                context_window=self._context_window,
+            )
+        return prompt_tokens
+
+    def _meter_usage(self, response: object) -> None:
+        usage = getattr(response, "usage", None)
+        if self._usage_meter is not None and usage is not None:
+            self._usage_meter.record(self._model, usage)
+
+    def _call_span(self, *, streamed: bool) -> tuple[str, dict[str, AttributeValue]]:
+        attributes: dict[str, AttributeValue] = {
+            "gen_ai.operation.name": "chat",
+            "gen_ai.request.model": self._model,
+            "llmify.stream": streamed,
+        }
+        if self._gen_ai_provider is not None:
+            attributes["gen_ai.provider.name"] = self._gen_ai_provider
+        return f"chat {self._model}", attributes
+
     @overload
     async def invoke[T: BaseModel](
         self, messages: list[Message], output_format: type[T], **kwargs: Any
@@ -94,6 +555,349 @@ class ChatModel(ABC):
         **kwargs: Any,
     ) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]: ...
 
+    @overload
+    async def invoke_with_tools[T: BaseModel](
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict],
+        output_format: type[T],
+        *,
+        tool_choice: ToolChoice = "auto",
+        tool_executor: ToolExecutor | None = None,
+        max_tool_rounds: int = 8,
+        max_parallel_tools: int = 8,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> ChatInvokeCompletion[T]: ...
+
+    @overload
+    async def invoke_with_tools(
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict],
+        output_format: None = None,
+        *,
+        tool_choice: ToolChoice = "auto",
+        tool_executor: ToolExecutor | None = None,
+        max_tool_rounds: int = 8,
+        max_parallel_tools: int = 8,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> ChatInvokeCompletion[str]: ...
+
+    async def invoke_with_tools[T: BaseModel](
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict],
+        output_format: type[T] | None = None,
+        *,
+        tool_choice: ToolChoice = "auto",
+        tool_executor: ToolExecutor | None = None,
+        max_tool_rounds: int = 8,
+        max_parallel_tools: int = 8,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+        """Run tool calls to completion and return the final answer.
+
+        Each round invokes the model, runs the requested calls concurrently
+        (at most ``max_parallel_tools`` at a time) and appends the assistant
+        turn and its tool results to the history. FunctionTool instances
+        execute directly; dict and RawSchemaTool entries need
+        ``tool_executor``. Tool exceptions are sent back as JSON outputs.
+        ``max_tool_rounds`` bounds the round trips. The result's ``usage`` is
+        summed over all rounds and ``tool_calls`` lists every call made. With
+        ``output_format``, the final answer costs one extra structured-output
+        request once the model stops calling tools.
+        """
+        _validate_tool_loop(max_tool_rounds, max_parallel_tools)
+        history = list(messages)
+        all_tool_calls: list[ToolCall] = []
+        total_usage: ChatInvokeUsage | None = None
+
+        for round_index in range(max_tool_rounds + 1):
+            # Trimmed here, the shorter history carries over to later rounds.
+            history = await self._fit_context(history)
+            with start_span(*_round_span(round_index)) as span:
+                completion = await self.invoke(
+                    history,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    on_retry=on_retry,
+                    **kwargs,
+                )
+                total_usage = add_usage(total_usage, completion.usage)
+                all_tool_calls.extend(completion.tool_calls)
+                span.set_attribute(
+                    "llmify.tool_round.tool_calls", len(completion.tool_calls)
+                )
+
+                if not completion.tool_calls:
+                    break
+
+                if round_index == max_tool_rounds:
+                    raise LLMifyError(
+                        f"Tool loop exceeded max_tool_rounds={max_tool_rounds}."
+                    )
+
+                outputs = await execute_tool_calls(
+                    completion.tool_calls,
+                    tools,
+                    executor=tool_executor,
+                    max_parallel_tools=max_parallel_tools,
+                )
+            history.append(
+                AssistantMessage(
+                    content=completion.completion or None,
+                    tool_calls=completion.tool_calls,
+                )
+            )
+            history.extend(
+                ToolResultMessage(tool_call_id=call.id, content=output)
+                for call, output in zip(completion.tool_calls, outputs, strict=True)
+            )
+
+        if output_format is not None:
+            completion = await self.invoke(
+                history, output_format, on_retry=on_retry, **kwargs
+            )
+            total_usage = add_usage(total_usage, completion.usage)
+
+        completion.tool_calls = all_tool_calls
+        completion.usage = total_usage
+        return completion
+
+    def stream_with_tools(
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict],
+        *,
+        tool_choice: ToolChoice = "auto",
+        tool_executor: ToolExecutor | None = None,
+        max_tool_rounds: int = 8,
+        max_parallel_tools: int = 8,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a tool loop, starting each tool as soon as its call arrives.
+
+        A tool runs from the moment its ``StreamToolCall`` is emitted, while
+        the rest of the response keeps streaming. Once a round's stream ends,
+        one ``StreamToolResult`` per call follows in call order and the next
+        round starts. Only the final round's ``StreamEnd`` is emitted; its
+        ``usage`` is summed over all rounds and ``tool_calls`` lists every
+        call made. Execution and bounds work as in ``invoke_with_tools``.
+        """
+        _validate_tool_loop(max_tool_rounds, max_parallel_tools)
+        history = list(messages)
+
+        def open_round(
+            end: StreamEnd | None, results: list[ToolResultMessage]
+        ) -> AsyncIterator[StreamEvent]:
+            if end is not None:
+                history.append(
+                    AssistantMessage(
+                        content=end.completion or None, tool_calls=end.tool_calls
+                    )
+                )
+                history.extend(results)
+            return self._fitted_stream(
+                history,
+                tools=tools,
+                tool_choice=tool_choice,
+                on_retry=on_retry,
+                **kwargs,
+            )
+
+        return self._stream_tool_loop(
+            open_round,
+            tools,
+            tool_executor=tool_executor,
+            max_tool_rounds=max_tool_rounds,
+            max_parallel_tools=max_parallel_tools,
+        )
+
+    async def _fitted_stream(
+        self, history: list[Message], **kwargs: Any
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream ``history`` after trimming it in place to the context window."""
+        history[:] = await self._fit_context(history)
+        async with aclosing(self.stream(list(history), **kwargs)) as events:
+            async for event in events:
+                yield event
+
+    async def _stream_tool_loop[E: StreamEnd](
+        self,
+        open_round: Callable[
+            [E | None, list[ToolResultMessage]], AsyncIterator[StreamEvent]
+        ],
+        tools: list[Tool | dict],
+        *,
+        tool_executor: ToolExecutor | None,
+        max_tool_rounds: int,
+        max_parallel_tools: int,
+    ) -> AsyncIterator[StreamEvent]:
+        """Drive streamed tool rounds; ``open_round`` builds each next request.
+
+        It receives the previous round's end event (``None`` at first) and
+        that round's tool results.
+        """
+        by_name = tools_by_name(tools)
+        semaphore = asyncio.Semaphore(max_parallel_tools)
+        running: list[asyncio.Task[str]] = []
+        all_tool_calls: list[ToolCall] = []
+        total_usage: ChatInvokeUsage | None = None
+        end: E | None = None
+        results: list[ToolResultMessage] = []
+
+        async def execute(call: ToolCall) -> str:
+            async with semaphore:
+                return await execute_tool_call(call, by_name, executor=tool_executor)
+
+        def start(call: ToolCall) -> asyncio.Task[str]:
+            task = asyncio.create_task(execute(call))
+            running.append(task)
+            return task
+
+        try:
+            for round_index in range(max_tool_rounds + 1):
+                with start_span(*_round_span(round_index)) as span:
+                    may_call_tools = round_index < max_tool_rounds
+                    started: dict[str, asyncio.Task[str]] = {}
+                    round_end: E | None = None
+
+                    async with aclosing(open_round(end, results)) as events:
+                        async for event in events:
+                            if isinstance(event, StreamEnd):
+                                round_end = event  # type: ignore[assignment]
+                                continue
+                            if (
+                                may_call_tools
+                                and isinstance(event, StreamToolCall)
+                                and event.tool_call.id not in started
+                            ):
+                                started[event.tool_call.id] = start(event.tool_call)
+                            yield event
+
+                    if round_end is None:
+                        raise LLMifyError("The stream ended without a StreamEnd event.")
+                    total_usage = add_usage(total_usage, round_end.usage)
+                    all_tool_calls.extend(round_end.tool_calls)
+                    span.set_attribute(
+                        "llmify.tool_round.tool_calls", len(round_end.tool_calls)
+                    )
+
+                    if not round_end.tool_calls:
+                        yield round_end.model_copy(
+                            update={"usage": total_usage, "tool_calls": all_tool_calls}
+                        )
+                        return
+
+                    if not may_call_tools:
+                        raise LLMifyError(
+                            f"Tool loop exceeded max_tool_rounds={max_tool_rounds}."
+                        )
+
+                    results = []
+                    for call in round_end.tool_calls:
+                        task = started.get(call.id) or start(call)
+                        output = await task
+                        results.append(
+                            ToolResultMessage(tool_call_id=call.id, content=output)
+                        )
+                        yield StreamToolResult(tool_call_id=call.id, content=output)
+                    end = round_end
+        finally:
+            for task in running:
+                task.cancel()
+
+    @overload
+    async def batch_invoke[T: BaseModel](
+        self,
+        batch: list[list[Message]],
+        output_format: type[T],
+        *,
+        max_concurrency: int | AdaptiveConcurrencyLimiter = 8,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> list[ChatInvokeCompletion[T] | Exception]: ...
+
+    @overload
+    async def batch_invoke(
+        self,
+        batch: list[list[Message]],
+        output_format: None = None,
+        *,
+        max_concurrency: int | AdaptiveConcurrencyLimiter = 8,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> list[ChatInvokeCompletion[str] | Exception]: ...
+
+    async def batch_invoke[T: BaseModel](
+        self,
+        batch: list[list[Message]],
+        output_format: type[T] | None = None,
+        *,
+        max_concurrency: int | AdaptiveConcurrencyLimiter = 8,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> list[ChatInvokeCompletion[Any] | Exception]:
+        """Invoke every message list concurrently and return results in input order.
+
+        At most ``max_concurrency`` requests are in flight at once; pass an
+        ``AdaptiveConcurrencyLimiter`` instead of an integer to let retry
+        signals tune that bound. A failing item yields its exception in place
+        of a completion instead of failing the batch. A rate limit seen by any
+        item, on a retry or as its final error, pauses the whole batch until
+        the provider's ``retry_after`` (or the backoff delay) has passed, so
+        one 429 does not turn into a burst.
+        """
+        adaptive: AdaptiveConcurrencyLimiter | None = None
+        slots: asyncio.Semaphore | AdaptiveConcurrencyLimiter
+        if isinstance(max_concurrency, AdaptiveConcurrencyLimiter):
+            adaptive = slots = max_concurrency
+        elif not isinstance(max_concurrency, int) or isinstance(max_concurrency, bool):
+            raise TypeError("'max_concurrency' must be an integer.")
+        elif max_concurrency < 1:
+            raise ValueError("'max_concurrency' must be greater than or equal to 1.")
+        else:
+            slots = asyncio.Semaphore(max_concurrency)
+
+        callback = on_retry if on_retry is not None else self._on_retry
+        gate = _RateLimitGate()
+
+        async def report_retry(event: RetryEvent) -> None:
+            if callback is not None:
+                result = callback(event)
+                if inspect.isawaitable(result):
+                    await result
+            if adaptive is not None:
+                adaptive(event)
+            if isinstance(event.error, RateLimitError):
+                gate.pause(event.delay)
+            # The retry sleeps ``event.delay`` after this returns; only wait
+            # for whatever part of a sibling's pause outlasts that sleep.
+            await gate.wait(slack=event.delay)
+
+        async def invoke_one(
+            messages: list[Message],
+        ) -> ChatInvokeCompletion[Any] | Exception:
+            try:
+                async with slots:
+                    await gate.wait()
+                    return await self.invoke(
+                        messages,
+                        output_format,
+                        on_retry=report_retry,
+                        **kwargs,
+                    )
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                if isinstance(exc, RateLimitError):
+                    gate.pause(retry_delay(exc, 0))
+                return exc
+
+        return await asyncio.gather(*(invoke_one(messages) for messages in batch))
+
     @abstractmethod
     def stream(
         self,
@@ -102,3 +906,182 @@ class ChatModel(ABC):
         tool_choice: ToolChoice = "auto",
         **kwargs: Any,
     ) -> AsyncIterator[StreamEvent]: ...
+
+
+def within_context[M: ChatModel, **P, R](
+    method: Callable[Concatenate[M, list[Message], P], Awaitable[R]],
+) -> Callable[Concatenate[M, list[Message], P], Awaitable[R]]:
+    """Apply the model's ``context_overflow`` policy to a provider's ``invoke``."""
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def invoke(
+        self: M, messages: list[Message], *args: P.args, **kwargs: P.kwargs
+    ) -> R:
+        if self._context_overflow is None or not self._trims_history(
+            signature.bind(self, messages, *args, **kwargs).arguments
+        ):
+            return await method(self, messages, *args, **kwargs)
+        return await self._invoke_within_context(
+            messages, lambda history: method(self, history, *args, **kwargs)
+        )
+
+    return invoke
+
+
+def within_context_stream[M: ChatModel, **P, E](
+    method: Callable[Concatenate[M, list[Message], P], AsyncIterator[E]],
+) -> Callable[Concatenate[M, list[Message], P], AsyncIterator[E]]:
+    """Apply the model's ``context_overflow`` policy to a provider's ``stream``."""
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def stream(
+        self: M, messages: list[Message], *args: P.args, **kwargs: P.kwargs
+    ) -> AsyncIterator[E]:
+        if self._context_overflow is None or not self._trims_history(
+            signature.bind(self, messages, *args, **kwargs).arguments
+        ):
+            return method(self, messages, *args, **kwargs)
+        return self._stream_within_context(
+            messages, lambda history: method(self, history, *args, **kwargs)
+        )
+
+    return stream
+
+
+def _timed_call[T](
+    timer: RequestTimer, operation: Callable[[], Awaitable[T]]
+) -> Callable[[], Awaitable[T]]:
+    async def call() -> T:
+        timer.attempt_started()
+        result = await operation()
+        timer.received(result)
+        return result
+
+    return call
+
+
+def _timed_attempts[E](
+    timer: RequestTimer, stream_factory: Callable[[], AsyncIterator[E]]
+) -> Callable[[], AsyncIterator[E]]:
+    async def attempt() -> AsyncIterator[E]:
+        timer.attempt_started()
+        async with aclosing(stream_factory()) as events:
+            async for event in events:
+                timer.observe(event)
+                yield event
+
+    return attempt
+
+
+async def _observed_stream[E](
+    span: tuple[str, dict[str, AttributeValue]],
+    timer: RequestTimer | None,
+    stream: AsyncIterator[E],
+    on_end: Callable[[StreamEnd], None],
+) -> AsyncIterator[E]:
+    # Closing this generator early, by ``aclose()`` or cancellation, closes
+    # ``stream`` and ends the span and the timer before it returns.
+    with start_span(*span) as current:
+        if timer is not None:
+            await timer.start()
+        error: Exception | None = None
+        try:
+            async with aclosing(stream):
+                async for event in stream:
+                    if isinstance(event, StreamEnd):
+                        set_response_attributes(current, event)
+                        on_end(event)
+                    yield event
+        except Exception as exc:
+            error = exc
+            set_error(current, exc)
+            raise
+        finally:
+            if timer is not None:
+                await timer.finish(error=error)
+
+
+def _round_span(round_index: int) -> tuple[str, dict[str, AttributeValue]]:
+    return "llmify.tool_round", {"llmify.tool_round": round_index}
+
+
+def _validate_tool_loop(max_tool_rounds: int, max_parallel_tools: int) -> None:
+    if max_tool_rounds < 0:
+        raise ValueError("'max_tool_rounds' must be greater than or equal to 0.")
+    if max_parallel_tools < 1:
+        raise ValueError("'max_parallel_tools' must be greater than or equal to 1.")
+
+
+class _StreamBroadcast[E]:
+    """Fans one event stream out to any number of late-joining subscribers."""
+
+    def __init__(self, source: AsyncIterator[E], on_close: Callable[[], object]):
+        self._source = source
+        self._on_close: Callable[[], object] | None = on_close
+        self._events: list[E] = []
+        self._error: BaseException | None = None
+        self._done = False
+        self._updated = asyncio.Event()
+        self._subscribers = 0
+        self._pump: asyncio.Task[None] | None = None
+
+    async def subscribe(self) -> AsyncIterator[E]:
+        self._subscribers += 1
+        if self._pump is None:
+            self._pump = asyncio.create_task(self._run())
+        index = 0
+        try:
+            while True:
+                updated = self._updated
+                while index < len(self._events):
+                    yield self._events[index]
+                    index += 1
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await updated.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._done:
+                self._pump.cancel()
+                self._close()
+
+    async def _run(self) -> None:
+        try:
+            async for event in self._source:
+                self._events.append(event)
+                self._notify()
+        except Exception as exc:  # noqa: BLE001 - re-raised to every subscriber
+            self._error = exc
+        finally:
+            self._done = True
+            self._notify()
+            self._close()
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def _close(self) -> None:
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+
+class _RateLimitGate:
+    """Shared pause point for the requests of one batch."""
+
+    def __init__(self) -> None:
+        self._resume_at = 0.0
+
+    def pause(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        self._resume_at = max(self._resume_at, loop.time() + delay)
+
+    async def wait(self, slack: float = 0.0) -> None:
+        loop = asyncio.get_running_loop()
+        while (remaining := self._resume_at - slack - loop.time()) > 0:
+            await asyncio.sleep(remaining)
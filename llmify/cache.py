@@ -0,0 +1,175 @@
+import asyncio
+import base64
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from pydantic import BaseModel
+
+from llmify.conversion import shared_digest
+from llmify.messages import _FrozenMessage
+
+
+@runtime_checkable
+class ResponseCache(Protocol):
+    """Storage port for memoized ``invoke()`` results.
+
+    Values are JSON-compatible completion dumps keyed by
+    ``request_fingerprint``. ``get`` returns ``None`` for a miss or an
+    expired entry.
+    """
+
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+
+    async def set(self, key: str, value: dict[str, Any]) -> None: ...
+
+
+class InMemoryResponseCache:
+    """Process-local LRU cache with an optional time-to-live in seconds."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None) -> None:
+        if max_entries < 1:
+            raise ValueError("'max_entries' must be greater than or equal to 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("'ttl' must be greater than 0.")
+
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        expires_at = time.monotonic() + self._ttl if self._ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteResponseCache:
+    """On-disk cache that survives restarts, with an optional TTL in seconds.
+
+    Reads and writes run in a worker thread so the event loop never blocks on
+    disk I/O. Expiry uses wall-clock time because entries outlive the process.
+    """
+
+    def __init__(self, path: str | Path, ttl: float | None = None) -> None:
+        if ttl is not None and ttl <= 0:
+            raise ValueError("'ttl' must be greater than 0.")
+
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(Path(path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set, key, json.dumps(value))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and time.time() >= expires_at:
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM responses WHERE key = ?", (key,)
+                    )
+                return None
+        return json.loads(value)
+
+    def _set(self, key: str, value: str) -> None:
+        expires_at = time.time() + self._ttl if self._ttl is not None else None
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+
+def request_fingerprint(request: Any) -> str:
+    """Stable SHA-256 of a provider-native request.
+
+    Dict keys are sorted, so two requests that differ only in key order share
+    a fingerprint. Pydantic models, enums and raw bytes are normalized first.
+    Frozen messages, and the provider-native forms memoized for them in the
+    request's top-level lists, contribute their cached digest instead of
+    being serialized.
+    """
+    if isinstance(request, dict):
+        request = {key: _digested(value) for key, value in request.items()}
+    encoded = json.dumps(
+        request,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _digested(value: Any) -> Any:
+    if not isinstance(value, list):
+        return value
+    digests = [shared_digest(item) for item in value]
+    if not any(digests):
+        return value
+    return [
+        item if digest is None else {"frozen_message": digest}
+        for item, digest in zip(value, digests, strict=True)
+    ]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, _FrozenMessage):
+        return {"frozen_message": value.digest}
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, bytes | bytearray | memoryview):
+        return base64.b64encode(value).decode()
+    if isinstance(value, type) and issubclass(value, BaseModel):
+        return value.model_json_schema()
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=repr)
+    return repr(value)
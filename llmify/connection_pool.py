@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectionPoolOptions:
+    """Limits for a process-wide HTTP connection pool.
+
+    Models created with equal options share one ``httpx.AsyncClient``, so a
+    model built per tenant or per request reuses warm TLS connections instead
+    of opening its own. Credentials, base URL, headers and timeout stay on
+    each model and are sent per request. ``http2`` needs the ``h2`` package
+    (``pip install py-llmify[http2]``).
+    """
+
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 30.0
+    http2: bool = False
+
+
+_shared_clients: dict[ConnectionPoolOptions, httpx.AsyncClient] = {}
+
+
+def shared_http_client(options: ConnectionPoolOptions) -> httpx.AsyncClient:
+    """Return the process-wide client for ``options``, creating it on first use."""
+    client = _shared_clients.get(options)
+    if client is None or client.is_closed:
+        client = _shared_clients[options] = _build_client(options)
+    return client
+
+
+async def close_connection_pools() -> None:
+    """Close every shared client, e.g. on application shutdown.
+
+    Models that still hold a closed client fail on their next request; models
+    created afterwards get a fresh pool.
+    """
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def _build_client(options: ConnectionPoolOptions) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=options.max_connections,
+        max_keepalive_connections=options.max_keepalive_connections,
+        keepalive_expiry=options.keepalive_expiry,
+    )
+    try:
+        return httpx.AsyncClient(
+            limits=limits, http2=options.http2, follow_redirects=True
+        )
+    except ImportError:
+        raise ImportError(
+            "HTTP/2 connection pools require the 'h2' package. "
+            "Install it with: pip install py-llmify[http2]"
+        )
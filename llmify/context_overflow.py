@@ -0,0 +1,181 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from llmify.messages import (
+    AssistantMessage,
+    Message,
+    SystemMessage,
+    ToolResultMessage,
+    UserMessage,
+)
+
+if TYPE_CHECKING:
+    from llmify.base import ChatModel
+
+type TokenCounter = Callable[[list[Message]], int]
+
+_SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below for the assistant that continues it. "
+    "Keep facts, decisions, open questions, tool results that are still "
+    "relevant and the user's goals. Write only the summary."
+)
+
+
+class ContextOverflowPolicy(ABC):
+    """Shortens a history that does not fit the model's context window.
+
+    Histories are cut only at turn boundaries. A turn starts at a user message,
+    or at an assistant message that follows a round of tool results, once no
+    tool call is pending. An assistant message with ``tool_calls`` and its
+    ``ToolResultMessage`` replies are therefore always kept or dropped
+    together, and a long tool loop can be shortened one round at a time.
+    Leading system messages and the latest turn are always kept, and a kept
+    history that would start with an assistant message keeps the user message
+    that led to it.
+    """
+
+    @abstractmethod
+    async def trim(
+        self, messages: list[Message], *, budget: int, count_tokens: TokenCounter
+    ) -> list[Message]:
+        """Return a shorter history, or ``messages`` itself if nothing can go."""
+
+
+class DropOldestTurns(ContextOverflowPolicy):
+    """Drop the oldest turns until the history fits the budget."""
+
+    async def trim(
+        self, messages: list[Message], *, budget: int, count_tokens: TokenCounter
+    ) -> list[Message]:
+        pinned, turns = _split_turns(messages)
+        total = count_tokens(messages)
+        start = 0
+        while start < len(turns) - 1 and total > budget:
+            total -= count_tokens(turns[start])
+            start += 1
+        return _keep(pinned, turns, start) if start else messages
+
+
+class KeepLastTurns(ContextOverflowPolicy):
+    """Keep the leading system messages and the last ``turns`` turns."""
+
+    def __init__(self, turns: int) -> None:
+        if turns < 1:
+            raise ValueError("'turns' must be greater than or equal to 1.")
+        self._turns = turns
+
+    async def trim(
+        self, messages: list[Message], *, budget: int, count_tokens: TokenCounter
+    ) -> list[Message]:
+        pinned, turns = _split_turns(messages)
+        if len(turns) <= self._turns:
+            return messages
+        return _keep(pinned, turns, len(turns) - self._turns)
+
+
+class SummarizeMiddle(ContextOverflowPolicy):
+    """Replace the turns between the system messages and the last turns with a summary.
+
+    ``model`` writes the summary, typically a cheaper model than the one whose
+    history is trimmed. The summary is sent as a system message right after
+    the leading ones; providers with a single system prompt join them.
+    """
+
+    def __init__(
+        self,
+        model: "ChatModel",
+        *,
+        keep_last_turns: int = 2,
+        instructions: str = _SUMMARY_INSTRUCTIONS,
+    ) -> None:
+        if keep_last_turns < 1:
+            raise ValueError("'keep_last_turns' must be greater than or equal to 1.")
+        self._model = model
+        self._keep_last_turns = keep_last_turns
+        self._instructions = instructions
+
+    async def trim(
+        self, messages: list[Message], *, budget: int, count_tokens: TokenCounter
+    ) -> list[Message]:
+        pinned, turns = _split_turns(messages)
+        start = len(turns) - self._keep_last_turns
+        if start <= 0:
+            return messages
+
+        completion = await self._model.invoke(
+            [
+                SystemMessage(content=self._instructions),
+                UserMessage(content=_transcript(_join([], turns[:start]))),
+            ]
+        )
+        summary = SystemMessage(
+            content=f"Summary of the earlier conversation:\n{completion.completion}"
+        )
+        return _keep([*pinned, summary], turns, start)
+
+
+def _split_turns(messages: list[Message]) -> tuple[list[Message], list[list[Message]]]:
+    """Split ``messages`` into its leading system messages and its turns."""
+    pinned: list[Message] = []
+    turns: list[list[Message]] = []
+    pending: set[str] = set()
+    for message in messages:
+        if not turns and isinstance(message, SystemMessage):
+            pinned.append(message)
+            continue
+        if not turns or (
+            not pending
+            and (
+                isinstance(message, UserMessage)
+                or (
+                    isinstance(message, AssistantMessage)
+                    and isinstance(turns[-1][-1], ToolResultMessage)
+                )
+            )
+        ):
+            turns.append([])
+        turns[-1].append(message)
+
+        if isinstance(message, AssistantMessage):
+            pending.update(call.id for call in message.tool_calls)
+        elif isinstance(message, ToolResultMessage):
+            pending.discard(message.tool_call_id)
+    return pinned, turns
+
+
+def _keep(
+    pinned: list[Message], turns: list[list[Message]], start: int
+) -> list[Message]:
+    """Join ``pinned`` and ``turns[start:]``, led by a user message if possible."""
+    lead: list[Message] = []
+    if not isinstance(turns[start][0], UserMessage):
+        lead = next(
+            (
+                [turn[0]]
+                for turn in reversed(turns[:start])
+                if isinstance(turn[0], UserMessage)
+            ),
+            [],
+        )
+    return _join([*pinned, *lead], turns[start:])
+
+
+def _join(pinned: list[Message], turns: list[list[Message]]) -> list[Message]:
+    return [*pinned, *(message for turn in turns for message in turn)]
+
+
+def _transcript(messages: list[Message]) -> str:
+    lines: list[str] = []
+    for message in messages:
+        if isinstance(message, ToolResultMessage):
+            lines.append(f"tool result ({message.tool_call_id}): {message.content}")
+            continue
+        if message.text:
+            lines.append(f"{message.role.value}: {message.text}")
+        if isinstance(message, AssistantMessage):
+            lines.extend(
+                f"tool call ({call.id}): {call.function.name}({call.function.arguments})"
+                for call in message.tool_calls
+            )
+    return "\n".join(lines)
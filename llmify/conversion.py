@@ -0,0 +1,109 @@
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from llmify.messages import Message, _FrozenMessage
+
+# Digests of the converted values memoized for frozen messages, keyed by the
+# value's id, so request fingerprints can reuse the message digest instead of
+# serializing the value. An entry lives exactly as long as the memo keeps its
+# value alive, so ids are never stale.
+_shared_digests: dict[int, str] = {}
+
+
+def shared_digest(value: object) -> str | None:
+    """The digest behind a frozen message's memoized conversion, if ``value`` is one.
+
+    Converted values that are lists, such as the Responses API's input items,
+    register each item as well.
+    """
+    return _shared_digests.get(id(value))
+
+
+@dataclass(slots=True)
+class _Entry[T]:
+    ref: weakref.ref[Any]
+    fields: tuple[Any, ...]
+    converted: T
+
+
+class ConversionMemo[M: Message, T]:
+    """Remembers the provider-native form of each message between requests.
+
+    Long conversations resend the same message objects on every call, so only
+    messages not seen before are converted. Entries are keyed by identity and
+    die with their message. Each entry also holds every object reachable
+    through the message's fields, so assigning a field, e.g.
+    ``message.cache = True``, appending to ``content`` or editing a tool
+    call in place all invalidate it. Frozen messages are keyed by
+    their digest instead, so equal frozen messages share one conversion, and
+    their converted values are registered for ``shared_digest``. Converted
+    values are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, convert: Callable[[M], T]) -> None:
+        self._convert = convert
+        self._entries: dict[int | str, _Entry[T]] = {}
+
+    def __call__(self, message: M) -> T:
+        if isinstance(message, _FrozenMessage):
+            key: int | str = message.digest
+            fields: tuple[Any, ...] = ()
+        else:
+            key = id(message)
+            fields = _reachable(message)
+        entry = self._entries.get(key)
+        if entry is not None and (
+            isinstance(message, _FrozenMessage)
+            or (
+                entry.ref() is message
+                and len(entry.fields) == len(fields)
+                and all(a is b for a, b in zip(entry.fields, fields, strict=True))
+            )
+        ):
+            return entry.converted
+
+        converted = self._convert(message)
+        shared: dict[int, str] = {}
+        if isinstance(message, _FrozenMessage):
+            shared[id(converted)] = message.digest
+            if isinstance(converted, list):
+                for index, item in enumerate(converted):
+                    shared[id(item)] = f"{message.digest}:{index}"
+            _shared_digests.update(shared)
+
+        def forget(_: object) -> None:
+            self._entries.pop(key, None)
+            for value_id in shared:
+                _shared_digests.pop(value_id, None)
+
+        self._entries[key] = _Entry(weakref.ref(message, forget), fields, converted)
+        return converted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _reachable(message: Message) -> tuple[Any, ...]:
+    """Every field value of ``message``, walking into lists and nested models.
+
+    Only declared fields are followed, so cached properties a converter fills
+    in, such as an image's ``base64``, do not change the snapshot.
+    """
+    found: list[Any] = []
+    pending = _field_values(message)
+    while pending:
+        value = pending.pop()
+        found.append(value)
+        if isinstance(value, BaseModel):
+            pending.extend(_field_values(value))
+        elif isinstance(value, list):
+            pending.extend(value)
+    return tuple(found)
+
+
+def _field_values(model: BaseModel) -> list[Any]:
+    return [model.__dict__.get(name) for name in type(model).model_fields]
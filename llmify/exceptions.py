@@ -28,10 +28,21 @@ class OutOfCreditsError(LLMifyError):
 
 
 class ContextLengthExceededError(LLMifyError):
-    """Raised when the input exceeds the model's maximum context length."""
+    """Raised when the input exceeds the model's maximum context length.
 
-    def __init__(self, message: str = "Context length exceeded"):
+    ``prompt_tokens`` and ``context_window`` are set when the pre-flight check
+    rejected the request before it was sent.
+    """
+
+    def __init__(
+        self,
+        message: str = "Context length exceeded",
+        prompt_tokens: int | None = None,
+        context_window: int | None = None,
+    ):
         super().__init__(message)
+        self.prompt_tokens = prompt_tokens
+        self.context_window = context_window
 
 
 class AuthenticationError(LLMifyError):
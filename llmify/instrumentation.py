@@ -0,0 +1,166 @@
+import inspect
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from llmify.retries import RetryCallback, RetryEvent
+from llmify.views import ChatInvokeUsage, StreamEnd, StreamTextDelta
+
+
+@dataclass(frozen=True, slots=True)
+class RequestStartEvent:
+    """A provider request is about to be sent."""
+
+    model: str
+    provider: str
+    streamed: bool
+
+
+@dataclass(frozen=True, slots=True)
+class RequestEndEvent:
+    """Timings and outcome of one provider request, retries included.
+
+    All durations are in seconds. ``time_to_first_byte`` and
+    ``time_to_first_token`` are measured from the start of the request, so
+    they include failed attempts and the backoff between them; subtract
+    ``backoff_time`` for the provider's share. For ``invoke()`` the first byte
+    is the complete response and there are no text deltas.
+    """
+
+    model: str
+    provider: str
+    streamed: bool
+    duration: float
+    time_to_first_byte: float | None
+    time_to_first_token: float | None
+    inter_token_gaps: tuple[float, ...]
+    """Time between consecutive ``StreamTextDelta`` events."""
+    generation_time: float | None
+    """Time from the first text delta to the end of the stream, or the
+    duration of the successful attempt for ``invoke()``."""
+    retries: int
+    backoff_time: float
+    usage: ChatInvokeUsage | None
+    stop_reason: str | None
+    error: Exception | None = None
+
+    @property
+    def provider_time(self) -> float:
+        """Time spent on requests, excluding backoff sleeps."""
+        return self.duration - self.backoff_time
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        """Completion tokens over ``generation_time``."""
+        if self.usage is None or not self.generation_time:
+            return None
+        return self.usage.completion_tokens / self.generation_time
+
+
+type RequestEvent = RequestStartEvent | RequestEndEvent
+type RequestCallback = Callable[[RequestEvent], Awaitable[None] | None]
+
+
+class RequestTimer:
+    """Collects the timings of one request and reports them to a callback."""
+
+    def __init__(
+        self,
+        callback: RequestCallback,
+        *,
+        model: str,
+        provider: str,
+        streamed: bool,
+    ) -> None:
+        self._callback = callback
+        self._model = model
+        self._provider = provider
+        self._streamed = streamed
+        self._started_at = 0.0
+        self._attempt_started_at = 0.0
+        self._first_byte_at: float | None = None
+        self._first_token_at: float | None = None
+        self._last_token_at: float | None = None
+        self._gaps: list[float] = []
+        self._generation_time: float | None = None
+        self._retries = 0
+        self._backoff_time = 0.0
+        self._usage: ChatInvokeUsage | None = None
+        self._stop_reason: str | None = None
+
+    async def start(self) -> None:
+        self._started_at = time.perf_counter()
+        await _notify(
+            self._callback,
+            RequestStartEvent(
+                model=self._model, provider=self._provider, streamed=self._streamed
+            ),
+        )
+
+    def on_retry(self, callback: RetryCallback | None) -> RetryCallback:
+        """Wrap ``callback`` so retries and their backoff are counted."""
+
+        async def report(event: RetryEvent) -> None:
+            self._retries += 1
+            self._backoff_time += event.delay
+            if callback is not None:
+                await _notify(callback, event)
+
+        return report
+
+    def attempt_started(self) -> None:
+        self._attempt_started_at = time.perf_counter()
+
+    def received(self, result: object) -> None:
+        """Record a complete, non-streamed response."""
+        now = time.perf_counter()
+        self._first_byte_at = now
+        self._generation_time = now - self._attempt_started_at
+        self._usage = getattr(result, "usage", None)
+        self._stop_reason = getattr(result, "stop_reason", None)
+
+    def observe(self, event: object) -> None:
+        """Record one streamed event."""
+        now = time.perf_counter()
+        if self._first_byte_at is None:
+            self._first_byte_at = now
+        if isinstance(event, StreamTextDelta):
+            if self._last_token_at is None:
+                self._first_token_at = now
+            else:
+                self._gaps.append(now - self._last_token_at)
+            self._last_token_at = now
+        elif isinstance(event, StreamEnd):
+            self._usage = event.usage
+            self._stop_reason = event.stop_reason
+            if self._first_token_at is not None:
+                self._generation_time = now - self._first_token_at
+
+    async def finish(self, error: Exception | None = None) -> None:
+        await _notify(
+            self._callback,
+            RequestEndEvent(
+                model=self._model,
+                provider=self._provider,
+                streamed=self._streamed,
+                duration=time.perf_counter() - self._started_at,
+                time_to_first_byte=self._since_start(self._first_byte_at),
+                time_to_first_token=self._since_start(self._first_token_at),
+                inter_token_gaps=tuple(self._gaps),
+                generation_time=self._generation_time,
+                retries=self._retries,
+                backoff_time=self._backoff_time,
+                usage=self._usage,
+                stop_reason=self._stop_reason,
+                error=error,
+            ),
+        )
+
+    def _since_start(self, moment: float | None) -> float | None:
+        return None if moment is None else moment - self._started_at
+
+
+async def _notify[E](callback: Callable[[E], Awaitable[None] | None], event: E) -> None:
+    result = callback(event)
+    if inspect.isawaitable(result):
+        await result
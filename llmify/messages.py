@@ -1,7 +1,24 @@
+import hashlib
+import json
+import mmap
+import os
+import weakref
+from base64 import b64decode, b64encode
+from collections.abc import Callable, Mapping
 from enum import StrEnum
-from typing import Literal
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Literal, Self
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    field_serializer,
+    field_validator,
+    model_validator,
+)
 
 
 def _truncate(text: str, max_length: int = 50) -> str:
@@ -68,6 +85,89 @@ class ContentPartImageParam(BaseModel):
         return f"ContentPartImageParam(image_url={self.image_url!r})"
 
 
+class ContentPartImageBytes(BaseModel):
+    """An image sent from raw bytes, a ``memoryview`` or a file path.
+
+    Nothing is encoded up front: the base64 form each provider needs is built
+    on first use and cached on the part, so it is encoded once however often
+    the message is sent or retried. ``bytes`` and read-only byte
+    ``memoryview`` data is used without copying; a writable view is copied to
+    ``bytes``, since its contents could change under the cached encoding.
+    Files are read through ``mmap`` when first encoded. JSON dumps hold the
+    data as ``{"base64": ...}``, which validates back to ``bytes``.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    data: Path | bytes | memoryview
+    media_type: SupportedImageMediaType = "image/png"
+    detail: Literal["auto", "low", "high"] = "auto"
+    type: Literal["image_bytes"] = "image_bytes"
+
+    @cached_property
+    def base64(self) -> str:
+        """The image as base64, as Anthropic and Gemini expect it."""
+        return self._read(lambda data: b64encode(data).decode("ascii"))
+
+    @cached_property
+    def data_url(self) -> str:
+        """The image as a ``data:`` URL, as OpenAI expects it."""
+        return f"data:{self.media_type};base64,{self.base64}"
+
+    @cached_property
+    def digest(self) -> str:
+        """SHA-256 of the image data, without encoding it."""
+        return self._read(lambda data: hashlib.sha256(data).hexdigest())
+
+    def _read[T](self, use: Callable[[Any], T]) -> T:
+        if not isinstance(self.data, Path):
+            return use(self.data)
+        with self.data.open("rb") as file:
+            # mmap cannot map an empty file.
+            if os.fstat(file.fileno()).st_size == 0:
+                return use(b"")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return use(mapped)
+
+    @field_validator("data", mode="before")
+    @classmethod
+    def _load_data(cls, data: Any) -> Any:
+        if isinstance(data, dict) and isinstance(data.get("base64"), str):
+            return b64decode(data["base64"], validate=True)
+        if isinstance(data, memoryview) and (
+            not data.readonly or data.format not in ("B", "b", "c")
+        ):
+            return data.tobytes()
+        return data
+
+    @field_serializer("data", when_used="json")
+    def _serialize_data(self, data: Path | bytes | memoryview) -> dict[str, str]:
+        return {"base64": self.base64}
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            for name in ("base64", "data_url", "digest"):
+                copy.__dict__.pop(name, None)
+        return copy
+
+    def _describe_data(self) -> str:
+        if isinstance(self.data, Path):
+            return str(self.data)
+        return f"<{memoryview(self.data).nbytes} bytes>"
+
+    def __str__(self) -> str:
+        return f"🖼️  Image[{self.media_type}, detail={self.detail}]: {self._describe_data()}"
+
+    def __repr__(self) -> str:
+        return (
+            f"ContentPartImageBytes(data={self._describe_data()}, "
+            f"media_type={self.media_type!r}, detail={self.detail!r})"
+        )
+
+
 class Function(BaseModel):
     arguments: str
     name: str
@@ -105,12 +205,18 @@ class _MessageBase(BaseModel):
     role: _MessageRole
 
     cache: bool = False
-    """Whether to cache this message. This is only applicable when using Anthropic models."""
+    """Whether to place a prompt-cache breakpoint at the end of this message.
+
+    Honored by Anthropic, by OpenAI Responses models with explicit breakpoints
+    and by ``ChatGoogle`` with a ``GoogleContextCache``.
+    """
 
 
 class UserMessage(_MessageBase):
     role: _MessageRole = _MessageRole.USER
-    content: str | list[ContentPartTextParam | ContentPartImageParam]
+    content: (
+        str | list[ContentPartTextParam | ContentPartImageParam | ContentPartImageBytes]
+    )
     name: str | None = None
 
     @property
@@ -196,3 +302,192 @@ class ToolResultMessage(_MessageBase):
 
 
 type Message = UserMessage | SystemMessage | AssistantMessage | ToolResultMessage
+
+
+class _FrozenList[T](list[T]):
+    """A list that rejects in-place changes, so a frozen message stays frozen."""
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("Frozen messages cannot be changed in place.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (list(self),)
+
+
+class _FrozenTextPart(ContentPartTextParam, frozen=True):
+    pass
+
+
+class _FrozenRefusalPart(ContentPartRefusalParam, frozen=True):
+    pass
+
+
+class _FrozenImageURL(ImageURL, frozen=True):
+    pass
+
+
+class _FrozenImagePart(ContentPartImageParam, frozen=True):
+    _digest: str = PrivateAttr()
+
+
+class _FrozenFunction(Function, frozen=True):
+    pass
+
+
+class _FrozenToolCall(ToolCall, frozen=True):
+    pass
+
+
+# Identical images in frozen messages share one part, and with it one copy of
+# their payload and its digest, for as long as any message holds it.
+_shared_images: weakref.WeakValueDictionary[tuple[str, str, str], _FrozenImagePart] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _share_image(part: ContentPartImageParam) -> _FrozenImagePart:
+    image = part.image_url
+    key = (image.url, image.detail, image.media_type)
+    shared = _shared_images.get(key)
+    if shared is None:
+        shared = _FrozenImagePart.model_construct(
+            image_url=_FrozenImageURL.model_construct(
+                url=image.url, detail=image.detail, media_type=image.media_type
+            )
+        )
+        shared._digest = hashlib.sha256("\0".join(key).encode()).hexdigest()
+        _shared_images[key] = shared
+    return shared
+
+
+def _freeze_part(part: BaseModel) -> BaseModel:
+    if isinstance(part, ContentPartImageParam):
+        return _share_image(part)
+    if isinstance(part, ContentPartTextParam) and type(part) is not _FrozenTextPart:
+        return _FrozenTextPart.model_construct(text=part.text)
+    if (
+        isinstance(part, ContentPartRefusalParam)
+        and type(part) is not _FrozenRefusalPart
+    ):
+        return _FrozenRefusalPart.model_construct(refusal=part.refusal)
+    if isinstance(part, ToolCall) and type(part) is not _FrozenToolCall:
+        return _FrozenToolCall.model_construct(
+            id=part.id,
+            function=_FrozenFunction.model_construct(
+                arguments=part.function.arguments, name=part.function.name
+            ),
+            provider_metadata=part.provider_metadata,
+        )
+    return part
+
+
+class _FrozenMessage(BaseModel):
+    """Immutable message whose content digest is computed once and cached.
+
+    Frozen messages hash and compare by ``digest``, so they can key dicts and
+    sets, and caches that fingerprint messages reuse the digest instead of
+    serializing the message again.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    _digest: str | None = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _freeze_parts(self) -> Self:
+        for name in ("content", "tool_calls"):
+            value = self.__dict__.get(name)
+            if isinstance(value, list):
+                self.__dict__[name] = _FrozenList(_freeze_part(p) for p in value)
+        return self
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the message's fields; images count by their own digest."""
+        if self._digest is None:
+            self._digest = _message_digest(self)
+        return self._digest
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        copy = super().model_copy(update=update, deep=deep)
+        if update or deep:
+            copy._digest = None
+            copy._freeze_parts()
+        return copy
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is type(self):
+            return self.digest == other.digest
+        return super().__eq__(other)
+
+
+class FrozenUserMessage(_FrozenMessage, UserMessage):
+    pass
+
+
+class FrozenSystemMessage(_FrozenMessage, SystemMessage):
+    pass
+
+
+class FrozenAssistantMessage(_FrozenMessage, AssistantMessage):
+    pass
+
+
+class FrozenToolResultMessage(_FrozenMessage, ToolResultMessage):
+    pass
+
+
+type FrozenMessage = (
+    FrozenUserMessage
+    | FrozenSystemMessage
+    | FrozenAssistantMessage
+    | FrozenToolResultMessage
+)
+
+_FROZEN_TYPES: dict[type[BaseModel], type[_FrozenMessage]] = {
+    UserMessage: FrozenUserMessage,
+    SystemMessage: FrozenSystemMessage,
+    AssistantMessage: FrozenAssistantMessage,
+    ToolResultMessage: FrozenToolResultMessage,
+}
+
+
+def freeze(message: Message) -> FrozenMessage:
+    """Return a frozen copy of ``message``, or ``message`` if it is frozen."""
+    if isinstance(message, _FrozenMessage):
+        return message
+    frozen_type = next(
+        frozen for base, frozen in _FROZEN_TYPES.items() if isinstance(message, base)
+    )
+    return frozen_type.model_validate(dict(message))
+
+
+def _message_digest(message: _FrozenMessage) -> str:
+    fields: dict[str, Any] = {}
+    for name, value in message:
+        if isinstance(value, list):
+            value = [_part_key(part) for part in value]
+        fields[name] = value
+    encoded = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _part_key(part: BaseModel) -> Any:
+    """A part's digest input; images count by their digest, not their payload."""
+    if isinstance(part, _FrozenImagePart):
+        return {"image": part._digest}
+    if isinstance(part, ContentPartImageBytes):
+        return {
+            "image": part.digest,
+            "media_type": part.media_type,
+            "detail": part.detail,
+        }
+    return part.model_dump(mode="json")
@@ -0,0 +1,965 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import re
+import struct
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any, Self
+from urllib.parse import parse_qs, urlsplit
+
+from llmify.messages import Function, ToolCall
+from llmify.providers.fake import FakeBehavior, FakeFault, split_tokens
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_GEMINI_PATH = re.compile(r"/models/(?P<model>[^/:]+):(?P<method>\w+)$")
+_REASONS = {
+    101: "Switching Protocols",
+    200: "OK",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+# A stream item is (token index or None, payload). Items with a token index
+# are paced by the behavior and are where a dropped connection cuts in.
+type _StreamItem = tuple[int | None, str]
+
+
+class MockLLMServer:
+    """Local HTTP server that answers like the hosted model APIs.
+
+    It speaks enough of each wire format for the provider SDKs to parse:
+
+    * OpenAI Chat Completions: ``POST {base_url}/v1/chat/completions``
+    * OpenAI Responses: ``POST {base_url}/v1/responses`` and the WebSocket
+      transport on ``{base_url}/v1/responses``
+    * Anthropic Messages: ``POST {base_url}/v1/messages``
+    * Gemini: ``POST {base_url}/v1beta/models/{model}:generateContent`` and
+      ``:streamGenerateContent?alt=sse``
+
+    Output, pacing and fault injection come from ``behavior``, which can be
+    swapped between requests. The last ``max_recorded`` request bodies are
+    kept in ``requests``. Point the OpenAI-family models at it with
+    ``base_url=server.openai_base_url``; Anthropic and Gemini take a client
+    whose base URL is ``server.base_url``.
+    """
+
+    def __init__(
+        self,
+        behavior: FakeBehavior | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_recorded: int = 256,
+    ):
+        self.behavior = behavior or FakeBehavior()
+        self.requests: deque[dict[str, Any]] = deque(maxlen=max_recorded)
+        self._rng = random.Random(self.behavior.seed)
+        self._host = host
+        self._port = port
+        self._server: asyncio.Server | None = None
+        self._connections: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self._host}:{self._port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    async def start(self) -> None:
+        if self._server is not None:
+            return
+        self._server = await asyncio.start_server(
+            self._handle_connection, self._host, self._port
+        )
+        self._port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.close()
+        connections = dict(self._connections)
+        for writer in connections.values():
+            writer.close()
+        await asyncio.gather(*connections, return_exceptions=True)
+        await server.wait_closed()
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = writer
+        try:
+            while (request := await _read_request(reader)) is not None:
+                if not await self._dispatch(request, reader, writer):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _dispatch(
+        self,
+        request: "_Request",
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        """Answer one request; returns whether the connection stays open."""
+        path = request.path.rstrip("/")
+        if request.headers.get("upgrade", "").lower() == "websocket":
+            if not path.endswith("/responses"):
+                await _write_json(writer, 404, {"error": {"message": "Not found"}})
+                return False
+            await self._serve_websocket(request, reader, writer)
+            return False
+
+        body = request.json()
+        self.requests.append({"path": path, "body": body})
+        if path.endswith("/chat/completions"):
+            exchange = _OpenAIChat(body)
+        elif path.endswith("/responses"):
+            exchange = _Responses(body)
+        elif path.endswith("/messages"):
+            exchange = _AnthropicMessages(body)
+        elif match := _GEMINI_PATH.search(path):
+            exchange = _Gemini(
+                body,
+                model=match["model"],
+                stream=match["method"] == "streamGenerateContent",
+            )
+        else:
+            await _write_json(writer, 404, {"error": {"message": "Not found"}})
+            return True
+
+        behavior = self.behavior
+        reply = exchange.reply(behavior, prompt_tokens=_prompt_tokens(request.body))
+        fault = behavior.roll_fault(self._rng)
+        if fault is FakeFault.RATE_LIMIT:
+            await _write_json(
+                writer,
+                429,
+                exchange.error_body(429, "Rate limit exceeded"),
+                headers={"retry-after": f"{behavior.retry_after:g}"},
+            )
+            return True
+        if fault is FakeFault.SERVER_ERROR:
+            await _write_json(writer, 500, exchange.error_body(500, "Server error"))
+            return True
+
+        if not exchange.stream:
+            if fault is FakeFault.DISCONNECT:
+                return False
+            await asyncio.sleep(
+                sum(behavior.token_delay(i) for i in range(len(reply.tokens)))
+            )
+            await _write_json(writer, 200, exchange.body(reply))
+            return True
+
+        writer.write(
+            _head(
+                200,
+                {"content-type": "text/event-stream", "transfer-encoding": "chunked"},
+            )
+        )
+        cutoff = len(reply.tokens) // 2 if fault is FakeFault.DISCONNECT else None
+        for index, payload in exchange.events(reply):
+            if index is not None:
+                if index == cutoff:
+                    await writer.drain()
+                    return False
+                await asyncio.sleep(behavior.token_delay(index))
+            data = payload.encode()
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+        if cutoff is not None:
+            return False
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+
+    async def _serve_websocket(
+        self,
+        request: "_Request",
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        key = request.headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(
+            hashlib.sha1((key + _WEBSOCKET_GUID).encode()).digest()
+        ).decode()
+        writer.write(
+            _head(
+                101,
+                {
+                    "upgrade": "websocket",
+                    "connection": "Upgrade",
+                    "sec-websocket-accept": accept,
+                },
+            )
+        )
+        await writer.drain()
+
+        while (message := await _read_websocket_message(reader, writer)) is not None:
+            body = json.loads(message)
+            self.requests.append({"path": request.path, "body": body})
+            if body.get("type") != "response.create":
+                continue
+
+            behavior = self.behavior
+            exchange = _Responses(body)
+            reply = exchange.reply(
+                behavior, prompt_tokens=_prompt_tokens(message.encode())
+            )
+            fault = behavior.roll_fault(self._rng)
+            if fault in (FakeFault.RATE_LIMIT, FakeFault.SERVER_ERROR):
+                status = 429 if fault is FakeFault.RATE_LIMIT else 500
+                error = exchange.error_body(status, f"Fake {fault.value}")["error"]
+                event = {"type": "error", "status": status, "error": error}
+                await _write_websocket_text(writer, json.dumps(event))
+                continue
+
+            cutoff = len(reply.tokens) // 2 if fault is FakeFault.DISCONNECT else None
+            for index, event in exchange.websocket_events(reply):
+                if index is not None:
+                    if index == cutoff:
+                        return
+                    await asyncio.sleep(behavior.token_delay(index))
+                await _write_websocket_text(writer, event)
+            if cutoff is not None:
+                return
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m llmify.mock_server",
+        description="Serve fake OpenAI, Anthropic and Gemini responses locally.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--text", default=FakeBehavior.text)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(
+        FakeBehavior(
+            text=args.text,
+            latency=args.latency,
+            tokens_per_second=args.tokens_per_second,
+            rate_limit_rate=args.rate_limit_rate,
+            retry_after=args.retry_after,
+            server_error_rate=args.server_error_rate,
+            disconnect_rate=args.disconnect_rate,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Serving fake model APIs on {server.base_url}", flush=True)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+@dataclass(slots=True)
+class _Request:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> dict[str, Any]:
+        if not self.body:
+            return {}
+        return json.loads(self.body)
+
+
+@dataclass(slots=True)
+class _Reply:
+    model: str
+    tokens: list[str]
+    tool_calls: list[ToolCall]
+    prompt_tokens: int
+    completion_tokens: int
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:24])
+    created: int = field(default_factory=lambda: int(time.time()))
+
+    @property
+    def text(self) -> str:
+        return "".join(self.tokens)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class _Exchange:
+    """One provider wire format: reads the request, renders the reply."""
+
+    stream: bool
+
+    def __init__(self, body: dict[str, Any]):
+        self.request = body
+        self.stream = bool(body.get("stream"))
+
+    def reply(self, behavior: FakeBehavior, *, prompt_tokens: int) -> _Reply:
+        forced = self.forced_tool()
+        if forced is not None:
+            arguments = behavior.text if _is_json_object(behavior.text) else "{}"
+            calls = [
+                ToolCall(
+                    id=f"call_{uuid.uuid4().hex[:12]}",
+                    function=Function(name=forced, arguments=arguments),
+                )
+            ]
+            tokens: list[str] = []
+        else:
+            calls = (
+                [call.model_copy(deep=True) for call in behavior.tool_calls]
+                if self.offers_tools() and not self.answers_tools()
+                else []
+            )
+            tokens = behavior.tokens()
+        return _Reply(
+            model=self.model(),
+            tokens=tokens,
+            tool_calls=calls,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=len(tokens)
+            + len(split_tokens(" ".join(call.function.arguments for call in calls))),
+        )
+
+    def model(self) -> str:
+        return str(self.request.get("model", "fake"))
+
+    def offers_tools(self) -> bool:
+        return bool(self.request.get("tools")) and self.request.get(
+            "tool_choice"
+        ) not in ("none", {"type": "none"})
+
+    def answers_tools(self) -> bool:
+        raise NotImplementedError
+
+    def forced_tool(self) -> str | None:
+        return None
+
+    def body(self, reply: _Reply) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def events(self, reply: _Reply) -> Iterator[_StreamItem]:
+        raise NotImplementedError
+
+    def error_body(self, status: int, message: str) -> dict[str, Any]:
+        code = "rate_limit_exceeded" if status == 429 else "server_error"
+        return {"error": {"message": message, "type": code, "code": code}}
+
+
+class _OpenAIChat(_Exchange):
+    def answers_tools(self) -> bool:
+        messages = self.request.get("messages") or [{}]
+        return messages[-1].get("role") == "tool"
+
+    def forced_tool(self) -> str | None:
+        choice = self.request.get("tool_choice")
+        if isinstance(choice, dict) and choice.get("type") == "function":
+            return choice["function"]["name"]
+        return None
+
+    def body(self, reply: _Reply) -> dict[str, Any]:
+        message: dict[str, Any] = {
+            "role": "assistant",
+            "content": reply.text or (None if reply.tool_calls else ""),
+        }
+        if reply.tool_calls:
+            message["tool_calls"] = [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {
+                        "name": call.function.name,
+                        "arguments": call.function.arguments,
+                    },
+                }
+                for call in reply.tool_calls
+            ]
+        return {
+            "id": f"chatcmpl-{reply.id}",
+            "object": "chat.completion",
+            "created": reply.created,
+            "model": reply.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": self._finish_reason(reply),
+                    "logprobs": None,
+                }
+            ],
+            "usage": self._usage(reply),
+        }
+
+    def events(self, reply: _Reply) -> Iterator[_StreamItem]:
+        def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> str:
+            return _sse(
+                {
+                    "id": f"chatcmpl-{reply.id}",
+                    "object": "chat.completion.chunk",
+                    "created": reply.created,
+                    "model": reply.model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "delta": delta,
+                            "finish_reason": finish_reason,
+                        }
+                    ],
+                }
+            )
+
+        yield None, chunk({"role": "assistant", "content": ""})
+        for index, token in enumerate(reply.tokens):
+            yield index, chunk({"content": token})
+        for index, call in enumerate(reply.tool_calls):
+            yield (
+                None,
+                chunk(
+                    {
+                        "tool_calls": [
+                            {
+                                "index": index,
+                                "id": call.id,
+                                "type": "function",
+                                "function": {
+                                    "name": call.function.name,
+                                    "arguments": call.function.arguments,
+                                },
+                            }
+                        ]
+                    }
+                ),
+            )
+        yield None, chunk({}, self._finish_reason(reply))
+        if (self.request.get("stream_options") or {}).get("include_usage"):
+            yield (
+                None,
+                _sse(
+                    {
+                        "id": f"chatcmpl-{reply.id}",
+                        "object": "chat.completion.chunk",
+                        "created": reply.created,
+                        "model": reply.model,
+                        "choices": [],
+                        "usage": self._usage(reply),
+                    }
+                ),
+            )
+        yield None, "data: [DONE]\n\n"
+
+    def _finish_reason(self, reply: _Reply) -> str:
+        return "tool_calls" if reply.tool_calls else "stop"
+
+    def _usage(self, reply: _Reply) -> dict[str, Any]:
+        return {
+            "prompt_tokens": reply.prompt_tokens,
+            "completion_tokens": reply.completion_tokens,
+            "total_tokens": reply.total_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+
+
+class _Responses(_Exchange):
+    def answers_tools(self) -> bool:
+        items = self.request.get("input")
+        return (
+            isinstance(items, list)
+            and bool(items)
+            and items[-1].get("type") == "function_call_output"
+        )
+
+    def forced_tool(self) -> str | None:
+        choice = self.request.get("tool_choice")
+        if isinstance(choice, dict) and choice.get("type") == "function":
+            return choice["name"]
+        return None
+
+    def body(self, reply: _Reply) -> dict[str, Any]:
+        return self._response(reply, "completed", self._output(reply))
+
+    def events(self, reply: _Reply) -> Iterator[_StreamItem]:
+        for index, event in self._events(reply):
+            yield index, f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    def websocket_events(self, reply: _Reply) -> Iterator[_StreamItem]:
+        for index, event in self._events(reply):
+            yield index, json.dumps(event)
+
+    def _events(self, reply: _Reply) -> Iterator[tuple[int | None, dict[str, Any]]]:
+        sequence = iter(range(1 << 30))
+
+        def event(type_: str, **fields: Any) -> dict[str, Any]:
+            return {"type": type_, "sequence_number": next(sequence), **fields}
+
+        yield (
+            None,
+            event(
+                "response.created", response=self._response(reply, "in_progress", [])
+            ),
+        )
+        output = self._output(reply)
+        for output_index, item in enumerate(output):
+            pending = {**item, "status": "in_progress"}
+            if item["type"] == "message":
+                pending["content"] = []
+            elif item["type"] == "function_call":
+                pending["arguments"] = ""
+            yield (
+                None,
+                event(
+                    "response.output_item.added",
+                    output_index=output_index,
+                    item=pending,
+                ),
+            )
+            if item["type"] == "message":
+                for index, token in enumerate(reply.tokens):
+                    yield (
+                        index,
+                        event(
+                            "response.output_text.delta",
+                            item_id=item["id"],
+                            output_index=output_index,
+                            content_index=0,
+                            delta=token,
+                            logprobs=[],
+                        ),
+                    )
+            yield (
+                None,
+                event(
+                    "response.output_item.done", output_index=output_index, item=item
+                ),
+            )
+        yield (
+            None,
+            event(
+                "response.completed",
+                response=self._response(reply, "completed", output),
+            ),
+        )
+
+    def _output(self, reply: _Reply) -> list[dict[str, Any]]:
+        output: list[dict[str, Any]] = []
+        if reply.tokens:
+            output.append(
+                {
+                    "type": "message",
+                    "id": f"msg_{reply.id}",
+                    "status": "completed",
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "output_text",
+                            "text": reply.text,
+                            "annotations": [],
+                            "logprobs": [],
+                        }
+                    ],
+                }
+            )
+        output.extend(
+            {
+                "type": "function_call",
+                "id": f"fc_{call.id}",
+                "call_id": call.id,
+                "name": call.function.name,
+                "arguments": call.function.arguments,
+                "status": "completed",
+            }
+            for call in reply.tool_calls
+        )
+        return output
+
+    def _response(
+        self, reply: _Reply, status: str, output: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        return {
+            "id": f"resp_{reply.id}",
+            "object": "response",
+            "created_at": reply.created,
+            "model": reply.model,
+            "status": status,
+            "output": output,
+            "error": None,
+            "incomplete_details": None,
+            "instructions": self.request.get("instructions"),
+            "metadata": {},
+            "parallel_tool_calls": True,
+            "tool_choice": self.request.get("tool_choice", "auto"),
+            "tools": [],
+            "usage": {
+                "input_tokens": reply.prompt_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": reply.completion_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": reply.total_tokens,
+            }
+            if status == "completed"
+            else None,
+        }
+
+
+class _AnthropicMessages(_Exchange):
+    def offers_tools(self) -> bool:
+        choice = self.request.get("tool_choice") or {}
+        return bool(self.request.get("tools")) and choice.get("type") != "none"
+
+    def answers_tools(self) -> bool:
+        messages = self.request.get("messages") or [{}]
+        content = messages[-1].get("content")
+        return isinstance(content, list) and any(
+            block.get("type") == "tool_result" for block in content
+        )
+
+    def forced_tool(self) -> str | None:
+        choice = self.request.get("tool_choice") or {}
+        return choice.get("name") if choice.get("type") == "tool" else None
+
+    def body(self, reply: _Reply) -> dict[str, Any]:
+        content: list[dict[str, Any]] = []
+        if reply.tokens:
+            content.append({"type": "text", "text": reply.text})
+        content.extend(
+            {
+                "type": "tool_use",
+                "id": call.id,
+                "name": call.function.name,
+                "input": json.loads(call.function.arguments or "{}"),
+            }
+            for call in reply.tool_calls
+        )
+        return {
+            **self._message(reply),
+            "content": content,
+            "stop_reason": self._stop_reason(reply),
+            "usage": self._usage(reply, reply.completion_tokens),
+        }
+
+    def events(self, reply: _Reply) -> Iterator[_StreamItem]:
+        def event(type_: str, **fields: Any) -> str:
+            return f"event: {type_}\ndata: {json.dumps({'type': type_, **fields})}\n\n"
+
+        yield (
+            None,
+            event(
+                "message_start",
+                message={
+                    **self._message(reply),
+                    "content": [],
+                    "stop_reason": None,
+                    "usage": self._usage(reply, 1),
+                },
+            ),
+        )
+        block = 0
+        if reply.tokens:
+            yield (
+                None,
+                event(
+                    "content_block_start",
+                    index=block,
+                    content_block={"type": "text", "text": ""},
+                ),
+            )
+            for index, token in enumerate(reply.tokens):
+                yield (
+                    index,
+                    event(
+                        "content_block_delta",
+                        index=block,
+                        delta={"type": "text_delta", "text": token},
+                    ),
+                )
+            yield None, event("content_block_stop", index=block)
+            block += 1
+        for call in reply.tool_calls:
+            yield (
+                None,
+                event(
+                    "content_block_start",
+                    index=block,
+                    content_block={
+                        "type": "tool_use",
+                        "id": call.id,
+                        "name": call.function.name,
+                        "input": {},
+                    },
+                ),
+            )
+            yield (
+                None,
+                event(
+                    "content_block_delta",
+                    index=block,
+                    delta={
+                        "type": "input_json_delta",
+                        "partial_json": call.function.arguments,
+                    },
+                ),
+            )
+            yield None, event("content_block_stop", index=block)
+            block += 1
+        yield (
+            None,
+            event(
+                "message_delta",
+                delta={"stop_reason": self._stop_reason(reply), "stop_sequence": None},
+                usage={"output_tokens": reply.completion_tokens},
+            ),
+        )
+        yield None, event("message_stop")
+
+    def error_body(self, status: int, message: str) -> dict[str, Any]:
+        kind = "rate_limit_error" if status == 429 else "api_error"
+        return {"type": "error", "error": {"type": kind, "message": message}}
+
+    def _message(self, reply: _Reply) -> dict[str, Any]:
+        return {
+            "id": f"msg_{reply.id}",
+            "type": "message",
+            "role": "assistant",
+            "model": reply.model,
+            "stop_sequence": None,
+        }
+
+    def _stop_reason(self, reply: _Reply) -> str:
+        return "tool_use" if reply.tool_calls else "end_turn"
+
+    def _usage(self, reply: _Reply, output_tokens: int) -> dict[str, Any]:
+        return {
+            "input_tokens": reply.prompt_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+
+
+class _Gemini(_Exchange):
+    def __init__(self, body: dict[str, Any], *, model: str, stream: bool):
+        super().__init__(body)
+        self._model = model
+        self.stream = stream
+
+    def model(self) -> str:
+        return self._model
+
+    def offers_tools(self) -> bool:
+        config = (self.request.get("toolConfig") or {}).get(
+            "functionCallingConfig"
+        ) or {}
+        return bool(self.request.get("tools")) and config.get("mode") != "NONE"
+
+    def answers_tools(self) -> bool:
+        contents = self.request.get("contents") or [{}]
+        return any("functionResponse" in part for part in contents[-1].get("parts", []))
+
+    def body(self, reply: _Reply) -> dict[str, Any]:
+        parts: list[dict[str, Any]] = []
+        if reply.tokens:
+            parts.append({"text": reply.text})
+        parts.extend(self._call_parts(reply))
+        return self._chunk(reply, parts, final=True)
+
+    def events(self, reply: _Reply) -> Iterator[_StreamItem]:
+        last = len(reply.tokens) - 1
+        for index, token in enumerate(reply.tokens):
+            final = index == last and not reply.tool_calls
+            yield index, _sse(self._chunk(reply, [{"text": token}], final=final))
+        if reply.tool_calls or not reply.tokens:
+            yield None, _sse(self._chunk(reply, self._call_parts(reply), final=True))
+
+    def error_body(self, status: int, message: str) -> dict[str, Any]:
+        state = "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"
+        return {"error": {"code": status, "message": message, "status": state}}
+
+    def _call_parts(self, reply: _Reply) -> list[dict[str, Any]]:
+        return [
+            {
+                "functionCall": {
+                    "id": call.id,
+                    "name": call.function.name,
+                    "args": json.loads(call.function.arguments or "{}"),
+                }
+            }
+            for call in reply.tool_calls
+        ]
+
+    def _chunk(
+        self, reply: _Reply, parts: list[dict[str, Any]], *, final: bool
+    ) -> dict[str, Any]:
+        candidate: dict[str, Any] = {
+            "content": {"role": "model", "parts": parts},
+            "index": 0,
+        }
+        if final:
+            candidate["finishReason"] = "STOP"
+        return {
+            "candidates": [candidate],
+            "usageMetadata": {
+                "promptTokenCount": reply.prompt_tokens,
+                "candidatesTokenCount": reply.completion_tokens,
+                "totalTokenCount": reply.total_tokens,
+            },
+            "modelVersion": reply.model,
+            "responseId": reply.id,
+        }
+
+
+async def _read_request(reader: asyncio.StreamReader) -> _Request | None:
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers: dict[str, str] = {}
+    while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks: list[bytes] = []
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        await reader.readline()
+        body = b"".join(chunks)
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+    url = urlsplit(target)
+    return _Request(method, url.path, parse_qs(url.query), headers, body)
+
+
+def _head(status: int, headers: dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _write_json(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: dict[str, Any],
+    headers: dict[str, str] | None = None,
+) -> None:
+    data = json.dumps(body).encode()
+    writer.write(
+        _head(
+            status,
+            {
+                "content-type": "application/json",
+                "content-length": str(len(data)),
+                **(headers or {}),
+            },
+        )
+        + data
+    )
+    await writer.drain()
+
+
+async def _read_websocket_message(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> str | None:
+    """Return the next text message, answering pings; ``None`` on close."""
+    fragments: list[bytes] = []
+    while True:
+        first, second = await reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await reader.readexactly(8))
+        mask = await reader.readexactly(4) if second & 0x80 else b"\x00" * 4
+        payload = bytes(
+            byte ^ mask[i % 4]
+            for i, byte in enumerate(await reader.readexactly(length))
+        )
+
+        if opcode == 0x8:
+            await _write_websocket_frame(writer, 0x8, payload[:2])
+            return None
+        if opcode == 0x9:
+            await _write_websocket_frame(writer, 0xA, payload)
+            continue
+        if opcode == 0xA:
+            continue
+        fragments.append(payload)
+        if first & 0x80:
+            return b"".join(fragments).decode()
+
+
+async def _write_websocket_text(writer: asyncio.StreamWriter, text: str) -> None:
+    await _write_websocket_frame(writer, 0x1, text.encode())
+
+
+async def _write_websocket_frame(
+    writer: asyncio.StreamWriter, opcode: int, payload: bytes
+) -> None:
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    writer.write(header + payload)
+    await writer.drain()
+
+
+def _sse(data: dict[str, Any]) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def _prompt_tokens(body: bytes) -> int:
+    return max(1, len(body) // 4)
+
+
+def _is_json_object(text: str) -> bool:
+    try:
+        return isinstance(json.loads(text), dict)
+    except ValueError:
+        return False
+
+
+if __name__ == "__main__":
+    main()
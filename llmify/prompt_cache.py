@@ -0,0 +1,273 @@
+import hashlib
+import json
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Literal
+
+from llmify.conversion import ConversionMemo
+from llmify.messages import (
+    AssistantMessage,
+    ContentPartImageBytes,
+    ContentPartImageParam,
+    Message,
+    SystemMessage,
+    ToolResultMessage,
+    UserMessage,
+)
+from llmify.rate_limit import estimate_prompt_tokens
+from llmify.tools import Tool
+from llmify.views import ChatInvokeUsage
+
+type CacheStrategy = Literal["manual", "auto"]
+
+_CHARS_PER_TOKEN = 4
+# Prefix sizes are estimates, so a breakpoint counts as read once the
+# reported cached tokens cover this share of its estimated prefix.
+_HIT_TOLERANCE = 0.8
+
+
+class BreakpointKind(StrEnum):
+    TOOLS = "tools"
+    """After the last tool definition."""
+    SYSTEM = "system"
+    """After the system prompt."""
+    HISTORY = "history"
+    """Where the previous request ended, so this one reads its cached prefix."""
+    LATEST = "latest"
+    """After the last message, written for the next request to read."""
+
+
+@dataclass(frozen=True, slots=True)
+class Breakpoint:
+    kind: BreakpointKind
+    message_index: int | None
+    """Index into ``CachePlan.messages``; ``None`` for ``TOOLS``."""
+    digest: str
+    """Hash of the prefix the breakpoint closes."""
+    tokens: int
+    """Estimated prompt tokens up to and including the breakpoint."""
+
+
+@dataclass(frozen=True, slots=True)
+class CachePlan:
+    """Breakpoints chosen for one request.
+
+    ``messages`` is the request history with ``cache=True`` set on the chosen
+    messages. Manual flags from the caller are kept.
+    """
+
+    messages: list[Message]
+    breakpoints: tuple[Breakpoint, ...] = ()
+
+    @property
+    def cache_tools(self) -> bool:
+        return any(bp.kind is BreakpointKind.TOOLS for bp in self.breakpoints)
+
+    @property
+    def stable_digest(self) -> str | None:
+        """Digest of the longest tools-and-system prefix, e.g. for cache routing."""
+        stable = [
+            bp
+            for bp in self.breakpoints
+            if bp.kind in (BreakpointKind.TOOLS, BreakpointKind.SYSTEM)
+        ]
+        return stable[-1].digest if stable else None
+
+
+@dataclass(slots=True)
+class PrefixStats:
+    requests: int = 0
+    """Requests that placed a breakpoint on this prefix."""
+    hits: int = 0
+    """Requests whose reported cached tokens covered this prefix."""
+    tokens: int = 0
+    """Estimated prompt tokens in the prefix."""
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+
+class PromptCachePlanner:
+    """Places prompt-cache breakpoints for ``cache_strategy="auto"``.
+
+    Each request gets up to four breakpoints on its longest stable prefixes:
+    after the tool definitions, after the system prompt, where the previous
+    request ended (just before the last assistant turn), and, once the
+    conversation is multi-turn, after the last message so the next request can
+    read it. One-shot requests never pay to write their unique tail.
+
+    ``record`` attributes the reported cached tokens to those prefixes. Cache
+    writes are billed at a premium, so a tools or system breakpoint that
+    missed throughout the last ``window`` requests is dropped and re-probed
+    every ``window`` plans. The latest-message write stops while
+    previous-request breakpoints keep missing, e.g. when turns arrive after
+    the cache expired.
+
+    Share one planner between models that hit the same provider cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = 8,
+        min_hit_rate: float = 0.1,
+        max_prefixes: int = 1024,
+    ) -> None:
+        if window < 1:
+            raise ValueError("'window' must be greater than or equal to 1.")
+        if not 0 <= min_hit_rate <= 1:
+            raise ValueError("'min_hit_rate' must be between 0 and 1.")
+        if max_prefixes < 1:
+            raise ValueError("'max_prefixes' must be greater than or equal to 1.")
+
+        self._window = window
+        self._min_hit_rate = min_hit_rate
+        self._max_prefixes = max_prefixes
+        self._prefixes: OrderedDict[str, PrefixStats] = OrderedDict()
+        self._outcomes: dict[BreakpointKind, deque[bool]] = {
+            kind: deque(maxlen=window) for kind in BreakpointKind
+        }
+        self._plans_since_probe = dict.fromkeys(
+            (BreakpointKind.TOOLS, BreakpointKind.SYSTEM), 0
+        )
+        # Marked copies are reused while their message is unchanged, so the
+        # providers' conversion memos see the same object on every request.
+        self._marked: ConversionMemo[Message, Message] = ConversionMemo(
+            lambda message: message.model_copy(update={"cache": True})
+        )
+
+    def plan(
+        self, messages: list[Message], tools: list[Tool | dict] | None = None
+    ) -> CachePlan:
+        for kind in self._plans_since_probe:
+            self._plans_since_probe[kind] += 1
+
+        digest = hashlib.blake2b(digest_size=16)
+        tokens = 0
+        breakpoints: list[Breakpoint] = []
+        if tools:
+            for tool in tools:
+                schema = tool if isinstance(tool, dict) else tool.to_openai_schema()
+                encoded = json.dumps(schema, sort_keys=True, default=str).encode()
+                digest.update(encoded)
+                tokens += len(encoded) // _CHARS_PER_TOKEN
+            if self._should_place(BreakpointKind.TOOLS):
+                breakpoints.append(
+                    Breakpoint(BreakpointKind.TOOLS, None, digest.hexdigest(), tokens)
+                )
+
+        targets = self._targets(messages)
+        planned = list(messages)
+        for index, message in enumerate(messages):
+            digest.update(_message_key(message))
+            tokens += estimate_prompt_tokens([message])
+            kind = targets.get(index)
+            if kind is None:
+                continue
+            breakpoints.append(Breakpoint(kind, index, digest.hexdigest(), tokens))
+            if not message.cache:
+                planned[index] = self._marked(message)
+
+        return CachePlan(messages=planned, breakpoints=tuple(breakpoints))
+
+    def record(self, plan: CachePlan, usage: ChatInvokeUsage | None) -> None:
+        """Attribute a response's cached prompt tokens to the plan's prefixes."""
+        if usage is None or usage.from_cache or not plan.breakpoints:
+            return
+        cached = usage.prompt_cached_tokens or 0
+        for bp in plan.breakpoints:
+            hit = cached > 0 and cached >= bp.tokens * _HIT_TOLERANCE
+            stats = self._prefixes.get(bp.digest)
+            if stats is None:
+                stats = self._prefixes[bp.digest] = PrefixStats(tokens=bp.tokens)
+            self._prefixes.move_to_end(bp.digest)
+            stats.requests += 1
+            stats.hits += hit
+            self._outcomes[bp.kind].append(hit)
+        while len(self._prefixes) > self._max_prefixes:
+            self._prefixes.popitem(last=False)
+
+    def prefix_stats(self) -> dict[str, PrefixStats]:
+        """Per-prefix counters keyed by ``Breakpoint.digest``, least recent first."""
+        return {
+            digest: PrefixStats(stats.requests, stats.hits, stats.tokens)
+            for digest, stats in self._prefixes.items()
+        }
+
+    def hit_rate(self, kind: BreakpointKind) -> float | None:
+        """Hit rate of ``kind`` over the recent window; ``None`` before any data."""
+        outcomes = self._outcomes[kind]
+        return sum(outcomes) / len(outcomes) if outcomes else None
+
+    def _targets(self, messages: list[Message]) -> dict[int, BreakpointKind]:
+        targets: dict[int, BreakpointKind] = {}
+        system_index = _last_index(messages, SystemMessage)
+        if system_index is not None and self._should_place(BreakpointKind.SYSTEM):
+            targets[system_index] = BreakpointKind.SYSTEM
+
+        assistant_index = _last_index(messages, AssistantMessage)
+        if assistant_index is None:
+            return targets
+        if assistant_index > 0:
+            targets.setdefault(assistant_index - 1, BreakpointKind.HISTORY)
+        if not self._missing(BreakpointKind.HISTORY):
+            targets.setdefault(len(messages) - 1, BreakpointKind.LATEST)
+        return targets
+
+    def _should_place(self, kind: BreakpointKind) -> bool:
+        if self._missing(kind) and self._plans_since_probe[kind] < self._window:
+            return False
+        self._plans_since_probe[kind] = 0
+        return True
+
+    def _missing(self, kind: BreakpointKind) -> bool:
+        """Whether ``kind`` missed too often across a full window."""
+        outcomes = self._outcomes[kind]
+        return (
+            len(outcomes) == self._window
+            and sum(outcomes) / self._window < self._min_hit_rate
+        )
+
+
+def _last_index(messages: list[Message], kind: type[Message]) -> int | None:
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], kind):
+            return index
+    return None
+
+
+def _message_key(message: Message) -> bytes:
+    if isinstance(message, ToolResultMessage):
+        parts = [message.role.value, message.tool_call_id, message.content]
+    else:
+        parts = [message.role.value, message.text]
+    if isinstance(message, UserMessage) and isinstance(message.content, list):
+        parts.extend(
+            part.image_url.url
+            if isinstance(part, ContentPartImageParam)
+            else f"bytes:{part.digest}"
+            for part in message.content
+            if isinstance(part, ContentPartImageParam | ContentPartImageBytes)
+        )
+    elif isinstance(message, AssistantMessage):
+        parts.extend(
+            f"{call.id}:{call.function.name}:{call.function.arguments}"
+            for call in message.tool_calls
+        )
+    return json.dumps(parts).encode()
+
+
+def resolve_cache_planner(
+    strategy: CacheStrategy | PromptCachePlanner,
+) -> PromptCachePlanner | None:
+    if isinstance(strategy, PromptCachePlanner):
+        return strategy
+    if strategy == "auto":
+        return PromptCachePlanner()
+    if strategy == "manual":
+        return None
+    raise ValueError(
+        "'cache_strategy' must be 'manual', 'auto' or a PromptCachePlanner."
+    )
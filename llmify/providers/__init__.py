@@ -2,12 +2,13 @@ from llmify.base import ChatModel
 from llmify.views import (
     ChatInvokeCompletion,
     ChatInvokeUsage,
+    StreamEnd,
+    StreamEvent,
     StreamEventType,
     StreamProviderEvent,
     StreamTextDelta,
     StreamToolCall,
-    StreamEnd,
-    StreamEvent,
+    StreamToolResult,
 )
 
 
@@ -55,6 +56,7 @@ def __getattr__(name: str):
         "OpenAIResponsesStreamEventType",
         "OpenAIResponsesUsage",
         "PromptCacheOptions",
+        "CompactionPolicy",
         "ResponsesOptions",
         "StreamOutputItemAdded",
         "StreamOutputItemDone",
@@ -66,6 +68,7 @@ def __getattr__(name: str):
 
     if name in {
         "HTTPResponsesTransport",
+        "PooledWebSocketResponsesTransport",
         "ResponsesSession",
         "ResponsesTransport",
         "WebSocketResponsesTransport",
@@ -98,6 +101,11 @@ def __getattr__(name: str):
 
         return ChatGoogle
 
+    if name == "GoogleContextCache":
+        from .google_context_cache import GoogleContextCache
+
+        return GoogleContextCache
+
     if name in {
         "GoogleCompletion",
         "GoogleStreamEnd",
@@ -107,6 +115,11 @@ def __getattr__(name: str):
 
         return getattr(google_types, name)
 
+    if name in {"ChatFake", "FakeBehavior"}:
+        from . import fake
+
+        return getattr(fake, name)
+
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -131,6 +144,7 @@ __all__ = [
     "OpenAIResponsesStreamEventType",
     "OpenAIResponsesUsage",
     "PromptCacheOptions",
+    "CompactionPolicy",
     "ResponsesOptions",
     "StreamOutputItemAdded",
     "StreamOutputItemDone",
@@ -139,14 +153,18 @@ __all__ = [
     "ResponsesSession",
     "ResponsesTransport",
     "WebSocketResponsesTransport",
+    "PooledWebSocketResponsesTransport",
     "ChatAnthropic",
     "AnthropicCompletion",
     "AnthropicStreamEnd",
     "AnthropicUsage",
     "ChatGoogle",
+    "GoogleContextCache",
     "GoogleCompletion",
     "GoogleStreamEnd",
     "GoogleUsage",
+    "ChatFake",
+    "FakeBehavior",
     "ChatModel",
     "OpenAICompatible",
     "ChatInvokeCompletion",
@@ -155,6 +173,7 @@ __all__ = [
     "StreamProviderEvent",
     "StreamTextDelta",
     "StreamToolCall",
+    "StreamToolResult",
     "StreamEnd",
     "StreamEvent",
 ]
@@ -23,6 +23,7 @@ except ImportError:
     if TYPE_CHECKING:
         raise
 
+from llmify.connection_pool import ConnectionPoolOptions, shared_http_client
 from llmify.exceptions import (
     ContextLengthExceededError,
     CredentialsUnavailableError,
@@ -58,6 +59,14 @@ def resolve_api_key(
     return resolved
 
 
+def pooled_client_options(
+    connection_pool: ConnectionPoolOptions | None,
+) -> dict[str, Any]:
+    if connection_pool is None:
+        return {}
+    return {"http_client": shared_http_client(connection_pool)}
+
+
 def tool_schemas(tools: list[Tool | dict]) -> list[dict]:
     return [
         tool if isinstance(tool, dict) else tool.to_openai_schema() for tool in tools
@@ -1,8 +1,9 @@
 import json
 import os
 from collections.abc import AsyncIterator
+from contextlib import aclosing
 from enum import StrEnum
-from typing import Any, cast, overload
+from typing import Any, Literal, cast, overload
 
 import httpx
 from pydantic import BaseModel
@@ -36,7 +37,10 @@ except ImportError:
     )
 
 
-from llmify.base import ChatModel
+from llmify.base import ChatModel, within_context, within_context_stream
+from llmify.cache import ResponseCache
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.conversion import ConversionMemo
 from llmify.exceptions import (
     AuthenticationError,
     ContextLengthExceededError,
@@ -44,8 +48,10 @@ from llmify.exceptions import (
     RateLimitError,
     RetryableError,
 )
+from llmify.instrumentation import RequestCallback
 from llmify.messages import (
     AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
     Function,
@@ -55,14 +61,22 @@ from llmify.messages import (
     ToolResultMessage,
     UserMessage,
 )
+from llmify.prompt_cache import (
+    CacheStrategy,
+    PromptCachePlanner,
+    resolve_cache_planner,
+)
 from llmify.providers.anthropic_types import (
     AnthropicCompletion,
     AnthropicStreamEnd,
     AnthropicStreamEvent,
     AnthropicUsage,
 )
-from llmify.retries import RetryCallback, retry_call, retry_stream
+from llmify.rate_limit import RateLimiter
+from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
 from llmify.tools import Tool, ToolChoice
+from llmify.usage_meter import UsageMeter
 from llmify.views import StreamTextDelta, StreamToolCall
 
 
@@ -77,9 +91,18 @@ class AnthropicModel(StrEnum):
     CLAUDE_SONNET_4_6 = "claude-sonnet-4-6"
 
 
+type AnthropicCacheTTL = Literal["5m", "1h"]
+
+MAX_CACHE_BREAKPOINTS = 4
+"""Anthropic rejects requests with more ``cache_control`` blocks than this."""
+
+
 class ChatAnthropic(ChatModel):
+    _gen_ai_provider = "anthropic"
+    _token_family = "anthropic"
     _client: AsyncAnthropic
     _model: str
+    _cache_ttl: AnthropicCacheTTL | None = None
 
     def __init__(
         self,
@@ -97,7 +120,17 @@ class ChatAnthropic(ChatModel):
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         default_headers: dict[str, str] | None = None,
+        cache_ttl: AnthropicCacheTTL | None = None,
+        cache_strategy: CacheStrategy | PromptCachePlanner = "manual",
         **kwargs: Any,
     ):
         super().__init__(
@@ -113,8 +146,19 @@ class ChatAnthropic(ChatModel):
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             **kwargs,
         )
+        self._cache_ttl = cache_ttl
+        self._cache_planner = resolve_cache_planner(cache_strategy)
+        self._owns_client = client is None
         if client is not None:
             self._client = client
             return
@@ -129,6 +173,10 @@ class ChatAnthropic(ChatModel):
             default_headers=default_headers or {},
         )
 
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.close()
+
     @overload
     async def invoke[T: BaseModel](
         self, messages: list[Message], output_format: type[T], **kwargs: Any
@@ -139,6 +187,7 @@ class ChatAnthropic(ChatModel):
         self, messages: list[Message], output_format: None = None, **kwargs: Any
     ) -> AnthropicCompletion[str]: ...
 
+    @within_context
     async def invoke[T: BaseModel](
         self,
         messages: list[Message],
@@ -148,22 +197,46 @@ class ChatAnthropic(ChatModel):
         on_retry: RetryCallback | None = None,
         **kwargs: Any,
     ) -> AnthropicCompletion[T] | AnthropicCompletion[str]:
-        async def invoke_once() -> AnthropicCompletion[T] | AnthropicCompletion[str]:
-            params = _build_params(self._model, messages, self._merge_params(kwargs))
+        if output_format is not None:
+            tools = None
+        plan = self._plan_cache(messages, tools)
+        params = _build_params(
+            self._model,
+            plan.messages if plan else messages,
+            self._merge_params(kwargs),
+            tools=tools,
+            cache_ttl=self._cache_ttl,
+            cache_tools=plan.cache_tools if plan else False,
+        )
 
+        async def invoke_once() -> AnthropicCompletion[T] | AnthropicCompletion[str]:
             if output_format is not None:
-                return await self._invoke_with_structured_output(params, output_format)
-
+                completion = await self._invoke_with_structured_output(
+                    params, output_format
+                )
+            elif tools:
+                completion = await self._invoke_with_tools(params, tool_choice)
+            else:
+                completion = await self._invoke_plain(params)
+            self._record_cache(plan, completion.usage)
+            return completion
+
+        def request() -> dict[str, Any]:
+            if output_format is not None:
+                return {**params, "output_format": output_format}
             if tools:
-                return await self._invoke_with_tools(params, tools, tool_choice)
-
-            return await self._invoke_plain(params)
-
-        return await retry_call(
-            invoke_once,
-            max_retries=self._default_max_retries,
-            on_retry=on_retry if on_retry is not None else self._on_retry,
-            map_error=_map_anthropic_error,
+                return {**params, "tool_choice": tool_choice}
+            return params
+
+        return await self._invoke_shared(
+            request,
+            AnthropicCompletion[output_format or str],
+            lambda: self._call_with_retries(
+                invoke_once,
+                messages=messages,
+                on_retry=on_retry,
+                map_error=_map_anthropic_error,
+            ),
         )
 
     async def _invoke_plain(self, params: dict[str, Any]) -> AnthropicCompletion[str]:
@@ -177,10 +250,8 @@ class ChatAnthropic(ChatModel):
     async def _invoke_with_tools(
         self,
         params: dict[str, Any],
-        tools: list[Tool | dict],
         tool_choice: ToolChoice = "auto",
     ) -> AnthropicCompletion[str]:
-        anthropic_tools = _convert_tools(tools)
         tool_choice_map: dict[ToolChoice, ToolChoiceParam] = {
             "auto": {"type": "auto"},
             "required": {"type": "any"},
@@ -188,11 +259,7 @@ class ChatAnthropic(ChatModel):
         }
         request = cast(
             MessageCreateParamsNonStreaming,
-            {
-                **params,
-                "tools": anthropic_tools,
-                "tool_choice": tool_choice_map[tool_choice],
-            },
+            {**params, "tool_choice": tool_choice_map[tool_choice]},
         )
         response: AnthropicMessage = await self._client.messages.create(**request)
         return AnthropicCompletion(
@@ -234,6 +301,7 @@ class ChatAnthropic(ChatModel):
 
         raise ValueError("No structured output returned from Anthropic API")
 
+    @within_context_stream
     async def stream(
         self,
         messages: list[Message],
@@ -242,24 +310,38 @@ class ChatAnthropic(ChatModel):
         on_retry: RetryCallback | None = None,
         **kwargs: Any,
     ) -> AsyncIterator[AnthropicStreamEvent]:
-        params = _build_params(self._model, messages, self._merge_params(kwargs))
-
-        anthropic_tools = _convert_tools(tools or [])
-        if anthropic_tools:
-            params["tools"] = anthropic_tools
+        plan = self._plan_cache(messages, tools)
+        params = _build_params(
+            self._model,
+            plan.messages if plan else messages,
+            self._merge_params(kwargs),
+            tools=tools,
+            cache_ttl=self._cache_ttl,
+            cache_tools=plan.cache_tools if plan else False,
+        )
+        if tools:
             params["tool_choice"] = {
                 "auto": {"type": "auto"},
                 "required": {"type": "any"},
                 "none": {"type": "none"},
             }[tool_choice]
 
-        async for event in retry_stream(
-            lambda: self._stream_once(params),
-            max_retries=self._default_max_retries,
-            on_retry=on_retry if on_retry is not None else self._on_retry,
-            map_error=_map_anthropic_error,
-        ):
-            yield event
+        async with aclosing(
+            self._stream_shared(
+                lambda: params,
+                lambda: self._record_cache_stream(
+                    plan,
+                    self._stream_with_retries(
+                        lambda: self._stream_once(params),
+                        messages=messages,
+                        on_retry=on_retry,
+                        map_error=_map_anthropic_error,
+                    ),
+                ),
+            )
+        ) as events:
+            async for event in events:
+                yield event
 
     async def _stream_once(
         self, params: dict[str, Any]
@@ -396,9 +478,15 @@ def _error_details(body: object | None) -> dict[str, Any]:
 
 
 def _build_params(
-    model: str, messages: list[Message], merged: dict[str, Any]
+    model: str,
+    messages: list[Message],
+    merged: dict[str, Any],
+    *,
+    tools: list[Tool | dict] | None = None,
+    cache_ttl: AnthropicCacheTTL | None = None,
+    cache_tools: bool = False,
 ) -> dict[str, Any]:
-    system_text, converted = _convert_messages(messages)
+    system, converted = _convert_messages(messages)
 
     params: dict[str, Any] = {
         "model": model,
@@ -406,8 +494,13 @@ def _build_params(
         "max_tokens": merged.pop("max_tokens", 4096) or 4096,
     }
 
-    if system_text:
-        params["system"] = system_text
+    if system:
+        params["system"] = system
+    if tools:
+        params["tools"] = _convert_tools(tools)
+        if cache_tools:
+            last = params["tools"][-1]
+            params["tools"][-1] = {"cache_control": {"type": "ephemeral"}, **last}
 
     if "temperature" in merged:
         params["temperature"] = merged.pop("temperature")
@@ -424,86 +517,178 @@ def _build_params(
     merged.pop("response_format", None)
 
     params.update(merged)
+    _limit_cache_breakpoints(params, cache_ttl)
     return params
 
 
+def _limit_cache_breakpoints(
+    params: dict[str, Any], ttl: AnthropicCacheTTL | None
+) -> None:
+    """Keep at most ``MAX_CACHE_BREAKPOINTS`` and stamp ``ttl`` on the survivors.
+
+    Tool and system breakpoints cover the most stable prefix, so they are kept
+    first. The remaining slots go to the latest message breakpoints, which
+    cover the longest prefix. Blocks are replaced rather than mutated, so
+    caller-supplied tool dicts stay untouched.
+    """
+    stable: list[tuple[list[Any], int]] = []
+    recent: list[tuple[list[Any], int]] = []
+    sections = [(params.get("tools"), stable), (params.get("system"), stable)]
+    messages = params["messages"]
+    for position, message in enumerate(messages):
+        content = message["content"]
+        if isinstance(content, list) and any("cache_control" in b for b in content):
+            # Converted messages are shared through the conversion memo, so
+            # the ones whose blocks may change are copied first.
+            content = list(content)
+            messages[position] = {**message, "content": content}
+            sections.append((content, recent))
+    for blocks, found in sections:
+        if isinstance(blocks, list):
+            found.extend(
+                (blocks, index)
+                for index, block in enumerate(blocks)
+                if "cache_control" in block
+            )
+
+    keep_stable = min(len(stable), MAX_CACHE_BREAKPOINTS)
+    keep_recent = min(len(recent), MAX_CACHE_BREAKPOINTS - keep_stable)
+    dropped = stable[: len(stable) - keep_stable] + recent[: len(recent) - keep_recent]
+    for blocks, index in dropped:
+        blocks[index] = {
+            key: value for key, value in blocks[index].items() if key != "cache_control"
+        }
+
+    if ttl is None:
+        return
+    kept = stable[len(stable) - keep_stable :] + recent[len(recent) - keep_recent :]
+    for blocks, index in kept:
+        block = blocks[index]
+        blocks[index] = {
+            **block,
+            "cache_control": {"ttl": ttl, **block["cache_control"]},
+        }
+
+
 def _convert_messages(
     messages: list[Message],
-) -> tuple[str | None, list[dict[str, Any]]]:
-    system_text: str | None = None
+) -> tuple[str | list[dict[str, Any]] | None, list[dict[str, Any]]]:
+    system: list[dict[str, Any]] = []
     converted: list[dict[str, Any]] = []
 
     for message in messages:
         if isinstance(message, SystemMessage):
-            system_text = message.text
+            if message.text:
+                block = [{"type": "text", "text": message.text}]
+                system.extend(_cached(block) if message.cache else block)
             continue
+        converted.append(_converted(message))
+
+    return _system_prompt(system), converted
+
 
-        if isinstance(message, ToolResultMessage):
-            converted.append(
+def _system_prompt(
+    blocks: list[dict[str, Any]],
+) -> str | list[dict[str, Any]] | None:
+    """Every system message in order; plain text unless one is cached."""
+    if not blocks:
+        return None
+    if any("cache_control" in block for block in blocks):
+        return blocks
+    return "\n\n".join(block["text"] for block in blocks)
+
+
+def _convert_message(
+    message: UserMessage | AssistantMessage | ToolResultMessage,
+) -> dict[str, Any]:
+    if isinstance(message, ToolResultMessage):
+        return {
+            "role": "user",
+            "content": _cache_if(
+                message,
+                [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": message.tool_call_id,
+                        "content": message.content,
+                    }
+                ],
+            ),
+        }
+
+    if isinstance(message, AssistantMessage) and message.tool_calls:
+        content: list[dict[str, Any]] = []
+        if message.text:
+            content.append({"type": "text", "text": message.text})
+        for tool_call in message.tool_calls:
+            content.append(
                 {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": message.tool_call_id,
-                            "content": message.content,
-                        }
-                    ],
+                    "type": "tool_use",
+                    "id": tool_call.id,
+                    "name": tool_call.function.name,
+                    "input": json.loads(tool_call.function.arguments),
                 }
             )
-            continue
-
-        if isinstance(message, AssistantMessage) and message.tool_calls:
-            content: list[dict[str, Any]] = []
-            if message.text:
-                content.append({"type": "text", "text": message.text})
-            for tool_call in message.tool_calls:
-                content.append(
+        return {"role": "assistant", "content": _cache_if(message, content)}
+
+    if isinstance(message, UserMessage) and isinstance(message.content, list):
+        content_parts: list[dict[str, Any]] = []
+        for part in message.content:
+            if isinstance(part, ContentPartTextParam):
+                content_parts.append({"type": "text", "text": part.text})
+            elif isinstance(part, ContentPartImageParam):
+                url = part.image_url.url
+                if url.startswith("data:"):
+                    media_type, _, data = url.partition(";base64,")
+                    content_parts.append(
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": media_type.removeprefix("data:"),
+                                "data": data,
+                            },
+                        }
+                    )
+                else:
+                    content_parts.append(
+                        {
+                            "type": "image",
+                            "source": {"type": "url", "url": url},
+                        }
+                    )
+            elif isinstance(part, ContentPartImageBytes):
+                content_parts.append(
                     {
-                        "type": "tool_use",
-                        "id": tool_call.id,
-                        "name": tool_call.function.name,
-                        "input": json.loads(tool_call.function.arguments),
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": part.media_type,
+                            "data": part.base64,
+                        },
                     }
                 )
-            converted.append({"role": "assistant", "content": content})
-            continue
+        return {"role": "user", "content": _cache_if(message, content_parts)}
 
-        if isinstance(message, UserMessage) and isinstance(message.content, list):
-            content_parts: list[dict[str, Any]] = []
-            for part in message.content:
-                if isinstance(part, ContentPartTextParam):
-                    content_parts.append({"type": "text", "text": part.text})
-                elif isinstance(part, ContentPartImageParam):
-                    url = part.image_url.url
-                    if url.startswith("data:"):
-                        media_type, _, data = url.partition(";base64,")
-                        content_parts.append(
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type.removeprefix("data:"),
-                                    "data": data,
-                                },
-                            }
-                        )
-                    else:
-                        content_parts.append(
-                            {
-                                "type": "image",
-                                "source": {"type": "url", "url": url},
-                            }
-                        )
-            converted.append({"role": "user", "content": content_parts})
-            continue
+    text: str | list[dict[str, Any]] = message.text
+    if message.cache and text:
+        text = _cached([{"type": "text", "text": text}])
+    return {"role": message.role.value, "content": text}
+
+
+# Tool-call arguments are parsed once per message instead of on every request.
+_converted = ConversionMemo(_convert_message)
+
+
+def _cache_if(message: Message, blocks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return _cached(blocks) if message.cache else blocks
 
-        if isinstance(message, UserMessage):
-            converted.append({"role": "user", "content": message.text})
-        elif isinstance(message, AssistantMessage):
-            converted.append({"role": "assistant", "content": message.text})
 
-    return system_text, converted
+def _cached(blocks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Mark a cache breakpoint on the last block, ending the cached prefix there."""
+    if blocks:
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    return blocks
 
 
 def _convert_tools(tools: list[Tool | dict]) -> list[ToolUnionParam]:
@@ -516,11 +701,14 @@ def _convert_tools(tools: list[Tool | dict]) -> list[ToolUnionParam]:
 def _convert_tool(tool: Tool) -> dict[str, Any]:
     openai_schema = tool.to_openai_schema()
     function = openai_schema.get("function", openai_schema)
-    return {
+    converted: dict[str, Any] = {
         "name": function["name"],
         "description": function.get("description", ""),
         "input_schema": function.get("parameters", {}),
     }
+    if getattr(tool, "cache", False):
+        converted["cache_control"] = {"type": "ephemeral"}
+    return converted
 
 
 def _extract_text(response: AnthropicMessage) -> str:
@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 from llmify.views import (
     ChatInvokeCompletion,
     ChatInvokeUsage,
@@ -11,6 +13,24 @@ class AnthropicUsage(ChatInvokeUsage):
     prompt_cache_creation_tokens: int | None = None
     """Tokens written to the prompt cache by this request."""
 
+    prompt_includes_cache: ClassVar[bool] = False
+
+    @property
+    def prompt_cache_hit_rate(self) -> float | None:
+        """Share of the prompt read from the cache, or ``None`` without cache data.
+
+        Anthropic's ``prompt_tokens`` excludes cache reads and writes, so both
+        are added back to get the full prompt size.
+        """
+        if (
+            self.prompt_cached_tokens is None
+            and self.prompt_cache_creation_tokens is None
+        ):
+            return None
+        cached = self.prompt_cached_tokens or 0
+        total = self.prompt_tokens + cached + (self.prompt_cache_creation_tokens or 0)
+        return cached / total if total else 0.0
+
 
 class AnthropicCompletion[T](ChatInvokeCompletion[T]):
     usage: AnthropicUsage | None = None
@@ -12,20 +12,32 @@ except ImportError:
         "Install it with: pip install py-llmify[openai]"
     )
 
-from llmify.providers._openai_utils import resolve_api_key
+from llmify.cache import ResponseCache
+from llmify.connection_pool import ConnectionPoolOptions
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.instrumentation import RequestCallback
+from llmify.prompt_cache import CacheStrategy, PromptCachePlanner
+from llmify.providers._openai_utils import pooled_client_options, resolve_api_key
 from llmify.providers.openai_compatible import OpenAICompatible
 from llmify.providers.openai_responses import ChatOpenAIResponses, ReasoningEffort
 from llmify.providers.openai_responses_transport import ResponsesTransport
 from llmify.providers.openai_responses_types import (
+    CompactionPolicy,
     ContinuationMode,
     PromptCacheOptions,
     ReasoningSummary,
     ResponsesOptions,
 )
+from llmify.rate_limit import RateLimiter
 from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
+from llmify.usage_meter import UsageMeter
 
 
 class ChatAzureOpenAI(OpenAICompatible):
+    _gen_ai_provider = "azure.ai.openai"
+    _token_family = "openai"
+
     def __init__(
         self,
         model: str = "gpt-4o",
@@ -43,6 +55,15 @@ class ChatAzureOpenAI(OpenAICompatible):
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
+        connection_pool: ConnectionPoolOptions | None = None,
         **kwargs: Any,
     ):
         super().__init__(
@@ -58,6 +79,14 @@ class ChatAzureOpenAI(OpenAICompatible):
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             **kwargs,
         )
         if api_key is None:
@@ -65,18 +94,22 @@ class ChatAzureOpenAI(OpenAICompatible):
         if azure_endpoint is None:
             azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
 
+        self._connection_pool = connection_pool
         self._client = AsyncAzureOpenAI(
             api_key=api_key,
             azure_endpoint=cast(str, azure_endpoint),
             api_version=api_version,
             timeout=timeout,
             max_retries=0,
+            **pooled_client_options(connection_pool),
         )
 
 
 class ChatAzureOpenAIResponses(ChatOpenAIResponses):
     """Azure OpenAI provider backed by the Responses API."""
 
+    _gen_ai_provider = "azure.ai.openai"
+
     def __init__(
         self,
         model: str,
@@ -94,10 +127,21 @@ class ChatAzureOpenAIResponses(ChatOpenAIResponses):
         reasoning_summary: ReasoningSummary | None = None,
         prompt_cache_key: str | None = None,
         prompt_cache_options: PromptCacheOptions | None = None,
+        compaction: CompactionPolicy | None = None,
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         default_headers: dict[str, str] | None = None,
+        connection_pool: ConnectionPoolOptions | None = None,
+        cache_strategy: CacheStrategy | PromptCachePlanner = "manual",
         **kwargs: Any,
     ):
         azure_endpoint = azure_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -123,10 +167,21 @@ class ChatAzureOpenAIResponses(ChatOpenAIResponses):
             reasoning_summary=reasoning_summary,
             prompt_cache_key=prompt_cache_key,
             prompt_cache_options=prompt_cache_options,
+            compaction=compaction,
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             default_headers=default_headers,
+            connection_pool=connection_pool,
+            cache_strategy=cache_strategy,
             **kwargs,
         )
 
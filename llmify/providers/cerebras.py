@@ -12,8 +12,16 @@ except ImportError:
         "Install it with: pip install py-llmify[cerebras]"
     )
 
+from llmify.cache import ResponseCache
+from llmify.connection_pool import ConnectionPoolOptions
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.instrumentation import RequestCallback
+from llmify.providers._openai_utils import pooled_client_options
 from llmify.providers.openai_compatible import OpenAICompatible
+from llmify.rate_limit import RateLimiter
 from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
+from llmify.usage_meter import UsageMeter
 
 
 class CerebrasModel(StrEnum):
@@ -23,6 +31,9 @@ class CerebrasModel(StrEnum):
 
 
 class ChatCerebras(OpenAICompatible):
+    _gen_ai_provider = "cerebras"
+    _token_family = "cerebras"
+
     def __init__(
         self,
         model: str | CerebrasModel = CerebrasModel.GPT_OSS_120B,
@@ -38,7 +49,16 @@ class ChatCerebras(OpenAICompatible):
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         default_headers: dict[str, str] | None = None,
+        connection_pool: ConnectionPoolOptions | None = None,
         **kwargs: Any,
     ):
         super().__init__(
@@ -54,15 +74,25 @@ class ChatCerebras(OpenAICompatible):
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             **kwargs,
         )
         if api_key is None:
             api_key = os.getenv("CEREBRAS_API_KEY")
 
+        self._connection_pool = connection_pool
         self._client = AsyncOpenAI(
             api_key=api_key,
             base_url="https://api.cerebras.ai/v1",
             timeout=timeout,
             max_retries=0,
             default_headers=default_headers,
+            **pooled_client_options(connection_pool),
         )
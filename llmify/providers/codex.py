@@ -5,16 +5,25 @@ from typing import Any, Self
 import httpx
 
 from llmify.auth.codex_cli import CodexCliAuth, read_codex_credentials
+from llmify.cache import ResponseCache
+from llmify.connection_pool import ConnectionPoolOptions
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.instrumentation import RequestCallback
+from llmify.prompt_cache import CacheStrategy, PromptCachePlanner
 from llmify.providers._openai_utils import resolve_api_key
 from llmify.providers.openai_responses import ChatOpenAIResponses, ReasoningEffort
 from llmify.providers.openai_responses_transport import ResponsesTransport
 from llmify.providers.openai_responses_types import (
+    CompactionPolicy,
     ContinuationMode,
     PromptCacheOptions,
     ReasoningSummary,
     ResponsesOptions,
 )
+from llmify.rate_limit import RateLimiter
 from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
+from llmify.usage_meter import UsageMeter
 
 _CODEX_BASE_URL = "https://chatgpt.com/backend-api/codex"
 
@@ -37,10 +46,21 @@ class ChatCodex(ChatOpenAIResponses):
         reasoning_summary: ReasoningSummary | None = None,
         prompt_cache_key: str | None = None,
         prompt_cache_options: PromptCacheOptions | None = None,
+        compaction: CompactionPolicy | None = None,
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         default_headers: dict[str, str] | None = None,
+        connection_pool: ConnectionPoolOptions | None = None,
+        cache_strategy: CacheStrategy | PromptCachePlanner = "manual",
         **kwargs: Any,
     ):
         if not chatgpt_account_id:
@@ -68,10 +88,21 @@ class ChatCodex(ChatOpenAIResponses):
             reasoning_summary=reasoning_summary,
             prompt_cache_key=prompt_cache_key,
             prompt_cache_options=prompt_cache_options,
+            compaction=compaction,
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             default_headers=headers,
+            connection_pool=connection_pool,
+            cache_strategy=cache_strategy,
             **kwargs,
         )
 
@@ -93,10 +124,21 @@ class ChatCodex(ChatOpenAIResponses):
         reasoning_summary: ReasoningSummary | None = None,
         prompt_cache_key: str | None = None,
         prompt_cache_options: PromptCacheOptions | None = None,
+        compaction: CompactionPolicy | None = None,
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         default_headers: dict[str, str] | None = None,
+        connection_pool: ConnectionPoolOptions | None = None,
+        cache_strategy: CacheStrategy | PromptCachePlanner = "manual",
         **kwargs: Any,
     ) -> Self:
         """Build a client from the login of the locally installed Codex CLI.
@@ -129,9 +171,20 @@ class ChatCodex(ChatOpenAIResponses):
             reasoning_summary=reasoning_summary,
             prompt_cache_key=prompt_cache_key,
             prompt_cache_options=prompt_cache_options,
+            compaction=compaction,
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             default_headers=default_headers,
+            connection_pool=connection_pool,
+            cache_strategy=cache_strategy,
             **kwargs,
         )
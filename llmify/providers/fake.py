@@ -0,0 +1,321 @@
+import asyncio
+import random
+import re
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, overload
+
+import httpx
+from pydantic import BaseModel
+
+from llmify.base import ChatModel, within_context, within_context_stream
+from llmify.cache import ResponseCache
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.exceptions import RateLimitError, RetryableError
+from llmify.instrumentation import RequestCallback
+from llmify.messages import Message, ToolCall, ToolResultMessage
+from llmify.rate_limit import RateLimiter, estimate_prompt_tokens
+from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
+from llmify.tools import Tool, ToolChoice
+from llmify.usage_meter import UsageMeter
+from llmify.views import (
+    ChatInvokeCompletion,
+    ChatInvokeUsage,
+    StreamEnd,
+    StreamEvent,
+    StreamTextDelta,
+    StreamToolCall,
+)
+
+_TOKEN_PATTERN = re.compile(r"\s*\S+")
+
+
+def split_tokens(text: str) -> list[str]:
+    """Split ``text`` into the whitespace-delimited tokens fakes stream."""
+    return _TOKEN_PATTERN.findall(text)
+
+
+class FakeFault(StrEnum):
+    RATE_LIMIT = "rate_limit"
+    SERVER_ERROR = "server_error"
+    DISCONNECT = "disconnect"
+
+
+@dataclass(frozen=True, slots=True)
+class FakeBehavior:
+    """Scripted output and failure profile for ``ChatFake`` and ``MockLLMServer``.
+
+    ``text`` is streamed one whitespace-delimited token at a time: the first
+    after ``latency`` seconds, the rest at ``tokens_per_second`` (unpaced when
+    ``None``). ``tool_calls`` are returned when the request offers tools and
+    its last message is not a tool result, so a tool loop ends after one
+    round. Each request independently fails with a 429 (carrying
+    ``retry_after``), a 5xx, or a dropped connection at the given rates; a
+    dropped stream stops halfway through its tokens. ``seed`` makes the
+    failure sequence reproducible.
+    """
+
+    text: str = "This is a fake response."
+    tool_calls: tuple[ToolCall, ...] = ()
+    latency: float = 0.0
+    tokens_per_second: float | None = None
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    server_error_rate: float = 0.0
+    disconnect_rate: float = 0.0
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.latency < 0:
+            raise ValueError("'latency' must be greater than or equal to 0.")
+        if self.tokens_per_second is not None and self.tokens_per_second <= 0:
+            raise ValueError("'tokens_per_second' must be greater than 0.")
+        rates = (self.rate_limit_rate, self.server_error_rate, self.disconnect_rate)
+        if any(rate < 0 for rate in rates) or sum(rates) > 1:
+            raise ValueError("Fault rates must be non-negative and sum to at most 1.")
+
+    def tokens(self) -> list[str]:
+        return split_tokens(self.text)
+
+    def token_delay(self, index: int) -> float:
+        """Seconds to wait before emitting token ``index``."""
+        if index == 0:
+            return self.latency
+        if self.tokens_per_second is None:
+            return 0.0
+        return 1 / self.tokens_per_second
+
+    def roll_fault(self, rng: random.Random) -> FakeFault | None:
+        roll = rng.random()
+        for fault, rate in (
+            (FakeFault.RATE_LIMIT, self.rate_limit_rate),
+            (FakeFault.SERVER_ERROR, self.server_error_rate),
+            (FakeFault.DISCONNECT, self.disconnect_rate),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def completion_tokens(self, tool_calls: list[ToolCall]) -> int:
+        arguments = " ".join(call.function.arguments for call in tool_calls)
+        return len(self.tokens()) + len(split_tokens(arguments))
+
+
+class ChatFake(ChatModel):
+    """In-process model that answers from a ``FakeBehavior`` without any I/O.
+
+    It runs through the same retry, rate-limit, cache and single-flight paths
+    as the real providers, so it stands in for them in tests and load tests.
+    Structured output parses ``behavior.text`` as JSON.
+    """
+
+    def __init__(
+        self,
+        model: str = "fake",
+        behavior: FakeBehavior | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+        top_p: float | None = None,
+        frequency_penalty: float | None = None,
+        presence_penalty: float | None = None,
+        stop: str | list[str] | None = None,
+        seed: int | None = None,
+        response_format: dict | None = None,
+        timeout: float | httpx.Timeout | None = 60.0,
+        max_retries: int = 2,
+        on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            frequency_penalty=frequency_penalty,
+            presence_penalty=presence_penalty,
+            stop=stop,
+            seed=seed,
+            response_format=response_format,
+            timeout=timeout,
+            max_retries=max_retries,
+            on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
+            **kwargs,
+        )
+        self._behavior = behavior or FakeBehavior()
+        self._rng = random.Random(self._behavior.seed)
+
+    @property
+    def behavior(self) -> FakeBehavior:
+        return self._behavior
+
+    @overload
+    async def invoke[T: BaseModel](
+        self, messages: list[Message], output_format: type[T], **kwargs: Any
+    ) -> ChatInvokeCompletion[T]: ...
+
+    @overload
+    async def invoke(
+        self, messages: list[Message], output_format: None = None, **kwargs: Any
+    ) -> ChatInvokeCompletion[str]: ...
+
+    @within_context
+    async def invoke[T: BaseModel](
+        self,
+        messages: list[Message],
+        output_format: type[T] | None = None,
+        tools: list[Tool | dict] | None = None,
+        tool_choice: ToolChoice = "auto",
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+        params = self._merge_params(kwargs)
+        behavior = self._behavior
+        tool_calls = self._tool_calls(messages, tools, tool_choice)
+
+        async def invoke_once() -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+            self._raise_fault(behavior.roll_fault(self._rng))
+            await asyncio.sleep(
+                sum(behavior.token_delay(i) for i in range(len(behavior.tokens())))
+            )
+            completion: Any = behavior.text
+            if output_format is not None:
+                completion = output_format.model_validate_json(behavior.text)
+            return ChatInvokeCompletion(
+                completion=completion,
+                usage=self._usage(messages, tool_calls),
+                stop_reason="tool_calls" if tool_calls else "stop",
+                tool_calls=tool_calls,
+            )
+
+        return await self._invoke_shared(
+            lambda: {
+                "model": self._model,
+                "messages": messages,
+                "output_format": output_format,
+                "tool_calls": tool_calls,
+                **params,
+            },
+            ChatInvokeCompletion[output_format or str],
+            lambda: self._call_with_retries(
+                invoke_once,
+                messages=messages,
+                on_retry=on_retry,
+                map_error=_map_fake_error,
+            ),
+        )
+
+    @within_context_stream
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict] | None = None,
+        tool_choice: ToolChoice = "auto",
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamEvent]:
+        params = self._merge_params(kwargs)
+        tool_calls = self._tool_calls(messages, tools, tool_choice)
+
+        async with aclosing(
+            self._stream_shared(
+                lambda: {
+                    "model": self._model,
+                    "messages": messages,
+                    "tool_calls": tool_calls,
+                    **params,
+                },
+                lambda: self._stream_with_retries(
+                    lambda: self._stream_once(messages, tool_calls),
+                    messages=messages,
+                    on_retry=on_retry,
+                    map_error=_map_fake_error,
+                ),
+            )
+        ) as events:
+            async for event in events:
+                yield event
+
+    async def _stream_once(
+        self, messages: list[Message], tool_calls: list[ToolCall]
+    ) -> AsyncIterator[StreamEvent]:
+        behavior = self._behavior
+        fault = behavior.roll_fault(self._rng)
+        if fault is not FakeFault.DISCONNECT:
+            self._raise_fault(fault)
+
+        tokens = behavior.tokens()
+        cutoff = len(tokens) // 2 if fault is FakeFault.DISCONNECT else None
+        for index, token in enumerate(tokens):
+            if index == cutoff:
+                self._raise_fault(fault)
+            await asyncio.sleep(behavior.token_delay(index))
+            yield StreamTextDelta(delta=token)
+        if cutoff is not None:
+            self._raise_fault(fault)
+
+        for call in tool_calls:
+            yield StreamToolCall(tool_call=call)
+
+        yield StreamEnd(
+            stop_reason="tool_calls" if tool_calls else "stop",
+            usage=self._usage(messages, tool_calls),
+            tool_calls=tool_calls,
+            completion=behavior.text,
+        )
+
+    def _tool_calls(
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict] | None,
+        tool_choice: ToolChoice,
+    ) -> list[ToolCall]:
+        if not tools or tool_choice == "none":
+            return []
+        if messages and isinstance(messages[-1], ToolResultMessage):
+            return []
+        return [call.model_copy(deep=True) for call in self._behavior.tool_calls]
+
+    def _usage(
+        self, messages: list[Message], tool_calls: list[ToolCall]
+    ) -> ChatInvokeUsage:
+        prompt_tokens = estimate_prompt_tokens(messages)
+        completion_tokens = self._behavior.completion_tokens(tool_calls)
+        return ChatInvokeUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+
+    def _raise_fault(self, fault: FakeFault | None) -> None:
+        if fault is FakeFault.RATE_LIMIT:
+            raise RateLimitError(
+                "Fake rate limit exceeded", retry_after=self._behavior.retry_after
+            )
+        if fault is FakeFault.SERVER_ERROR:
+            raise RetryableError("Fake server error", status_code=500)
+        if fault is FakeFault.DISCONNECT:
+            raise RetryableError("Fake connection dropped")
+
+
+def _map_fake_error(exc: Exception) -> Exception:
+    return exc
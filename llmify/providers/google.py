@@ -1,6 +1,8 @@
 import json
 import os
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from dataclasses import dataclass
 from enum import StrEnum
 from typing import Any, cast, overload
 
@@ -18,7 +20,10 @@ except ImportError:
         "Install it with: pip install py-llmify[google]"
     )
 
-from llmify.base import ChatModel
+from llmify.base import ChatModel, within_context, within_context_stream
+from llmify.cache import ResponseCache
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.conversion import ConversionMemo
 from llmify.exceptions import (
     AuthenticationError,
     ContextLengthExceededError,
@@ -26,8 +31,10 @@ from llmify.exceptions import (
     RateLimitError,
     RetryableError,
 )
+from llmify.instrumentation import RequestCallback
 from llmify.messages import (
     AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
     Function,
@@ -37,14 +44,26 @@ from llmify.messages import (
     ToolResultMessage,
     UserMessage,
 )
+from llmify.prompt_cache import (
+    CacheStrategy,
+    PromptCachePlanner,
+    resolve_cache_planner,
+)
+from llmify.providers.google_context_cache import (
+    CACHED_CONFIG_FIELDS,
+    GoogleContextCache,
+)
 from llmify.providers.google_types import (
     GoogleCompletion,
     GoogleStreamEnd,
     GoogleStreamEvent,
     GoogleUsage,
 )
-from llmify.retries import RetryCallback, retry_call, retry_stream
+from llmify.rate_limit import RateLimiter, estimate_prompt_tokens
+from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
 from llmify.tools import Tool, ToolChoice
+from llmify.usage_meter import UsageMeter
 from llmify.views import StreamTextDelta, StreamToolCall
 
 
@@ -58,9 +77,19 @@ class GoogleModel(StrEnum):
     GEMINI_3_FLASH_PREVIEW = "gemini-3-flash-preview"
 
 
+@dataclass(frozen=True, slots=True)
+class _ContextPrefix:
+    contents: int
+    """Leading ``contents`` entries covered by the cache."""
+    tokens: int
+
+
 class ChatGoogle(ChatModel):
+    _gen_ai_provider = "gcp.gemini"
+    _token_family = "google"
     _client: AsyncClient
     _model: str
+    _context_cache: GoogleContextCache | None = None
 
     def __init__(
         self,
@@ -78,6 +107,16 @@ class ChatGoogle(ChatModel):
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
+        cache_strategy: CacheStrategy | PromptCachePlanner = "manual",
+        context_cache: GoogleContextCache | None = None,
         **kwargs: Any,
     ):
         super().__init__(
@@ -93,8 +132,19 @@ class ChatGoogle(ChatModel):
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             **kwargs,
         )
+        self._cache_planner = resolve_cache_planner(cache_strategy)
+        self._context_cache = context_cache
+        self._owns_client = client is None
         if client is None:
             if api_key is None:
                 api_key = os.getenv("GEMINI_API_KEY")
@@ -108,6 +158,10 @@ class ChatGoogle(ChatModel):
 
         self._client = client.aio
 
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
     @overload
     async def invoke[T: BaseModel](
         self, messages: list[Message], output_format: type[T], **kwargs: Any
@@ -118,6 +172,7 @@ class ChatGoogle(ChatModel):
         self, messages: list[Message], output_format: None = None, **kwargs: Any
     ) -> GoogleCompletion[str]: ...
 
+    @within_context
     async def invoke[T: BaseModel](
         self,
         messages: list[Message],
@@ -127,44 +182,64 @@ class ChatGoogle(ChatModel):
         on_retry: RetryCallback | None = None,
         **kwargs: Any,
     ) -> GoogleCompletion[T] | GoogleCompletion[str]:
+        plan = self._plan_cache(messages, tools)
+        contents, system_instruction = _convert_messages(messages)
+        config = _build_config(
+            self._merge_params(kwargs),
+            system_instruction=system_instruction,
+            tools=tools,
+            tool_choice=tool_choice,
+            output_format=output_format,
+        )
+        prefix = _context_prefix(plan.messages if plan else messages, tools)
+
         async def invoke_once() -> GoogleCompletion[T] | GoogleCompletion[str]:
-            contents, system_instruction = _convert_messages(messages)
-            config = _build_config(
-                self._merge_params(kwargs),
-                system_instruction=system_instruction,
-                tools=tools,
-                tool_choice=tool_choice,
-                output_format=output_format,
-            )
-            response = await self._client.models.generate_content(
-                model=self._model,
-                contents=contents,
-                config=config or None,
+            response = await self._send_with_context(
+                contents,
+                config,
+                prefix,
+                lambda contents, config: self._client.models.generate_content(
+                    model=self._model,
+                    contents=contents,
+                    config=config or None,
+                ),
             )
 
+            usage = _parse_usage(response.usage_metadata)
+            self._record_cache(plan, usage)
             if output_format is not None:
                 return GoogleCompletion(
                     completion=output_format.model_validate_json(
                         _parse_text(response) or "{}"
                     ),
                     stop_reason=_stop_reason(response),
-                    usage=_parse_usage(response.usage_metadata),
+                    usage=usage,
                 )
 
             return GoogleCompletion(
                 completion=_parse_text(response),
                 tool_calls=_parse_tool_calls(response),
                 stop_reason=_stop_reason(response),
-                usage=_parse_usage(response.usage_metadata),
+                usage=usage,
             )
 
-        return await retry_call(
-            invoke_once,
-            max_retries=self._default_max_retries,
-            on_retry=on_retry if on_retry is not None else self._on_retry,
-            map_error=_map_google_error,
+        return await self._invoke_shared(
+            lambda: {
+                "model": self._model,
+                "contents": contents,
+                "config": config,
+                "output_format": output_format,
+            },
+            GoogleCompletion[output_format or str],
+            lambda: self._call_with_retries(
+                invoke_once,
+                messages=messages,
+                on_retry=on_retry,
+                map_error=_map_google_error,
+            ),
         )
 
+    @within_context_stream
     async def stream(
         self,
         messages: list[Message],
@@ -173,6 +248,7 @@ class ChatGoogle(ChatModel):
         on_retry: RetryCallback | None = None,
         **kwargs: Any,
     ) -> AsyncIterator[GoogleStreamEvent]:
+        plan = self._plan_cache(messages, tools)
         contents, system_instruction = _convert_messages(messages)
         config = _build_config(
             self._merge_params(kwargs),
@@ -180,24 +256,40 @@ class ChatGoogle(ChatModel):
             tools=tools,
             tool_choice=tool_choice,
         )
-
-        async for event in retry_stream(
-            lambda: self._stream_once(contents, config),
-            max_retries=self._default_max_retries,
-            on_retry=on_retry if on_retry is not None else self._on_retry,
-            map_error=_map_google_error,
-        ):
-            yield event
+        prefix = _context_prefix(plan.messages if plan else messages, tools)
+
+        async with aclosing(
+            self._stream_shared(
+                lambda: {"model": self._model, "contents": contents, "config": config},
+                lambda: self._record_cache_stream(
+                    plan,
+                    self._stream_with_retries(
+                        lambda: self._stream_once(contents, config, prefix),
+                        messages=messages,
+                        on_retry=on_retry,
+                        map_error=_map_google_error,
+                    ),
+                ),
+            )
+        ) as events:
+            async for event in events:
+                yield event
 
     async def _stream_once(
         self,
         contents: list[dict[str, Any]],
         config: google_types.GenerateContentConfig | None,
+        prefix: _ContextPrefix | None = None,
     ) -> AsyncIterator[GoogleStreamEvent]:
-        stream = await self._client.models.generate_content_stream(
-            model=self._model,
-            contents=contents,
-            config=config or None,
+        stream = await self._send_with_context(
+            contents,
+            config,
+            prefix,
+            lambda contents, config: self._client.models.generate_content_stream(
+                model=self._model,
+                contents=contents,
+                config=config or None,
+            ),
         )
 
         text_acc: list[str] = []
@@ -227,6 +319,83 @@ class ChatGoogle(ChatModel):
             completion="".join(text_acc),
         )
 
+    async def _send_with_context[R](
+        self,
+        contents: list[dict[str, Any]],
+        config: google_types.GenerateContentConfig | None,
+        prefix: _ContextPrefix | None,
+        send: Callable[
+            [list[dict[str, Any]], google_types.GenerateContentConfig | None],
+            Awaitable[R],
+        ],
+    ) -> R:
+        """Send through ``context_cache`` when the request has a cacheable prefix.
+
+        A cache that expired or was deleted on the server is forgotten and the
+        full request is sent instead.
+        """
+        if self._context_cache is None or prefix is None:
+            return await send(contents, config)
+
+        name = await self._context_cache.lookup(
+            self._client,
+            self._model,
+            contents[: prefix.contents],
+            config,
+            tokens=prefix.tokens,
+        )
+        if name is None:
+            return await send(contents, config)
+        try:
+            return await send(
+                contents[prefix.contents :], _with_cached_content(config, name)
+            )
+        except google_errors.APIError as exc:
+            if exc.code not in (400, 403, 404) or "cache" not in str(exc).lower():
+                raise
+            self._context_cache.invalidate(name)
+        return await send(contents, config)
+
+
+def _context_prefix(
+    messages: list[Message], tools: list[Tool | dict[str, Any]] | None
+) -> _ContextPrefix | None:
+    """The prefix ending at the last ``cache=True`` message before the final one.
+
+    Cached tools alone make the system instruction and tool declarations a
+    prefix. Every non-system message maps to one ``contents`` entry.
+    """
+    marked = [index for index, message in enumerate(messages[:-1]) if message.cache]
+    cached_tools = any(getattr(tool, "cache", False) for tool in tools or [])
+    if not marked and not cached_tools:
+        return None
+
+    end = marked[-1] + 1 if marked else 0
+    covered = [
+        *messages[:end],
+        *(m for m in messages[end:] if isinstance(m, SystemMessage)),
+    ]
+    tool_chars = sum(
+        len(json.dumps(_convert_tool(tool), default=str)) for tool in tools or []
+    )
+    return _ContextPrefix(
+        contents=sum(not isinstance(m, SystemMessage) for m in messages[:end]),
+        tokens=estimate_prompt_tokens(covered) + tool_chars // 4,
+    )
+
+
+def _with_cached_content(
+    config: google_types.GenerateContentConfig | None, name: str
+) -> google_types.GenerateContentConfig:
+    if config is None:
+        return google_types.GenerateContentConfig(cached_content=name)
+    return config.model_copy(
+        update={
+            **dict.fromkeys(CACHED_CONFIG_FIELDS),
+            "cached_content": name,
+        }
+    )
+
 
 def _map_google_error(exc: Exception) -> Exception:
     if isinstance(exc, httpx.TransportError):
@@ -319,12 +488,13 @@ def _convert_messages(
     messages: list[Message],
 ) -> tuple[list[dict[str, Any]], str | None]:
     contents: list[dict[str, Any]] = []
-    system_instruction: str | None = None
+    system_texts: list[str] = []
     tool_names_by_id: dict[str, str] = {}
 
     for message in messages:
         if isinstance(message, SystemMessage):
-            system_instruction = message.text
+            if message.text:
+                system_texts.append(message.text)
             continue
 
         if isinstance(message, ToolResultMessage):
@@ -345,34 +515,43 @@ def _convert_messages(
             )
             continue
 
-        if isinstance(message, AssistantMessage) and message.tool_calls:
-            parts: list[dict[str, Any]] = []
-            if message.text:
-                parts.append({"text": message.text})
+        if isinstance(message, AssistantMessage):
             for tool_call in message.tool_calls:
                 tool_names_by_id[tool_call.id] = tool_call.function.name
-                part: dict[str, Any] = {
-                    "function_call": {
-                        "id": tool_call.id,
-                        "name": tool_call.function.name,
-                        "args": json.loads(tool_call.function.arguments or "{}"),
-                    }
-                }
-                google_metadata = tool_call.provider_metadata.get("google")
-                if isinstance(google_metadata, dict):
-                    thought_signature = google_metadata.get("thought_signature")
-                    if isinstance(thought_signature, bytes):
-                        part["thought_signature"] = thought_signature
-                parts.append(part)
-            contents.append({"role": "model", "parts": parts})
-            continue
+        contents.append(_converted(message))
+
+    return contents, "\n\n".join(system_texts) or None
 
-        if isinstance(message, UserMessage):
-            contents.append({"role": "user", "parts": _convert_user_parts(message)})
-        elif isinstance(message, AssistantMessage):
-            contents.append({"role": "model", "parts": [{"text": message.text}]})
 
-    return contents, system_instruction
+def _convert_message(message: UserMessage | AssistantMessage) -> dict[str, Any]:
+    if isinstance(message, UserMessage):
+        return {"role": "user", "parts": _convert_user_parts(message)}
+    if not message.tool_calls:
+        return {"role": "model", "parts": [{"text": message.text}]}
+
+    parts: list[dict[str, Any]] = []
+    if message.text:
+        parts.append({"text": message.text})
+    for tool_call in message.tool_calls:
+        part: dict[str, Any] = {
+            "function_call": {
+                "id": tool_call.id,
+                "name": tool_call.function.name,
+                "args": json.loads(tool_call.function.arguments or "{}"),
+            }
+        }
+        google_metadata = tool_call.provider_metadata.get("google")
+        if isinstance(google_metadata, dict):
+            thought_signature = google_metadata.get("thought_signature")
+            if isinstance(thought_signature, bytes):
+                part["thought_signature"] = thought_signature
+        parts.append(part)
+    return {"role": "model", "parts": parts}
+
+
+# Tool results are converted per request: their function name comes from the
+# assistant message that made the call.
+_converted = ConversionMemo(_convert_message)
 
 
 def _convert_user_parts(message: UserMessage) -> list[dict[str, Any]]:
@@ -404,6 +583,10 @@ def _convert_user_parts(message: UserMessage) -> list[dict[str, Any]]:
                         }
                     }
                 )
+        elif isinstance(part, ContentPartImageBytes):
+            parts.append(
+                {"inline_data": {"mime_type": part.media_type, "data": part.base64}}
+            )
     return parts
 
 
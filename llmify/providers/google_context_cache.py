@@ -0,0 +1,217 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    from google.genai import errors as google_errors
+    from google.genai import types as google_types
+    from google.genai.client import AsyncClient
+except ImportError:
+    raise ImportError(
+        "The 'google-genai' package is required for GoogleContextCache. "
+        "Install it with: pip install py-llmify[google]"
+    )
+
+from llmify.cache import request_fingerprint
+
+# Request fields a cachedContents entry owns. A request that references the
+# entry must leave them unset.
+CACHED_CONFIG_FIELDS = ("system_instruction", "tools", "tool_config")
+
+
+@dataclass(slots=True)
+class _Entry:
+    name: str | None
+    """``cachedContents/...`` resource; ``None`` if the prefix cannot be cached."""
+    expires_at: float
+
+
+class GoogleContextCache:
+    """Registry of Gemini ``cachedContents`` keyed by a hash of the cached prefix.
+
+    The prefix is the model, system instruction, tool declarations and the
+    leading contents. The first request with a prefix creates the entry; later
+    ones reference it through ``GenerateContentConfig.cached_content`` and send
+    only the remaining contents. An entry used within ``renew_within`` seconds
+    of its expiry has its TTL extended, so prefixes in use stay cached while
+    idle ones expire on the server.
+
+    Prefixes estimated below ``min_tokens`` are sent uncached, as Gemini rejects
+    small caches. A failed creation is remembered for one TTL and the request
+    goes out uncached. Entries are bound to the API key or project that created
+    them; share one registry only between models using the same credentials.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 3600.0,
+        renew_within: float = 600.0,
+        min_tokens: int = 4096,
+        max_entries: int = 256,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError("'ttl' must be greater than 0.")
+        if not 0 <= renew_within < ttl:
+            raise ValueError("'renew_within' must be between 0 and 'ttl'.")
+        if min_tokens < 0:
+            raise ValueError("'min_tokens' must be greater than or equal to 0.")
+        if max_entries < 1:
+            raise ValueError("'max_entries' must be greater than or equal to 1.")
+
+        self._ttl = ttl
+        self._renew_within = renew_within
+        self._min_tokens = min_tokens
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._pending: dict[str, asyncio.Future[_Entry]] = {}
+
+    def __len__(self) -> int:
+        return sum(entry.name is not None for entry in self._entries.values())
+
+    @property
+    def names(self) -> list[str]:
+        """Live cache resources, least recently used first."""
+        return [entry.name for entry in self._entries.values() if entry.name]
+
+    async def lookup(
+        self,
+        client: AsyncClient,
+        model: str,
+        contents: list[dict[str, Any]],
+        config: google_types.GenerateContentConfig | None,
+        *,
+        tokens: int,
+    ) -> str | None:
+        """Return the cache name for this prefix, creating or renewing it as needed.
+
+        ``tokens`` is the estimated size of the prefix.
+        """
+        if tokens < self._min_tokens:
+            return None
+
+        key = _prefix_key(model, contents, config)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            entry = await self._create_once(key, client, model, contents, config)
+        elif entry.name is not None and entry.expires_at - now < self._renew_within:
+            await self._renew(key, entry, client)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        return entry.name
+
+    def invalidate(self, name: str) -> None:
+        """Forget ``name``, e.g. after Gemini reported it missing."""
+        for key, entry in list(self._entries.items()):
+            if entry.name == name:
+                del self._entries[key]
+
+    async def clear(self, client: AsyncClient) -> None:
+        """Delete every cache this registry created instead of waiting for expiry."""
+        names = self.names
+        self._entries.clear()
+        for name in names:
+            try:
+                await client.caches.delete(name=name)
+            except google_errors.APIError:
+                pass
+
+    async def _create_once(
+        self,
+        key: str,
+        client: AsyncClient,
+        model: str,
+        contents: list[dict[str, Any]],
+        config: google_types.GenerateContentConfig | None,
+    ) -> _Entry:
+        # Concurrent first requests for one prefix share a single creation.
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._create(key, client, model, contents, config)
+            )
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _create(
+        self,
+        key: str,
+        client: AsyncClient,
+        model: str,
+        contents: list[dict[str, Any]],
+        config: google_types.GenerateContentConfig | None,
+    ) -> _Entry:
+        cached: dict[str, Any] = {
+            field: getattr(config, field)
+            for field in CACHED_CONFIG_FIELDS
+            if config is not None and getattr(config, field) is not None
+        }
+        try:
+            created = await client.caches.create(
+                model=model,
+                config=google_types.CreateCachedContentConfig(
+                    contents=contents or None,
+                    ttl=_duration(self._ttl),
+                    display_name=f"llmify-{key[:16]}",
+                    **cached,
+                ),
+            )
+            name = created.name
+        except google_errors.APIError:
+            name = None
+
+        entry = _Entry(name=name, expires_at=time.monotonic() + self._ttl)
+        self._entries[key] = entry
+        await self._evict(client)
+        return entry
+
+    async def _renew(self, key: str, entry: _Entry, client: AsyncClient) -> None:
+        assert entry.name is not None
+        # Extended up front so concurrent requests do not all renew.
+        entry.expires_at = time.monotonic() + self._ttl
+        try:
+            await client.caches.update(
+                name=entry.name,
+                config=google_types.UpdateCachedContentConfig(ttl=_duration(self._ttl)),
+            )
+        except google_errors.APIError:
+            self._entries.pop(key, None)
+            entry.name = None
+
+    async def _evict(self, client: AsyncClient) -> None:
+        while len(self._entries) > self._max_entries:
+            _, entry = self._entries.popitem(last=False)
+            if entry.name is None:
+                continue
+            try:
+                await client.caches.delete(name=entry.name)
+            except google_errors.APIError:
+                pass
+
+
+def _prefix_key(
+    model: str,
+    contents: list[dict[str, Any]],
+    config: google_types.GenerateContentConfig | None,
+) -> str:
+    cached = (
+        config.model_dump(
+            mode="json", include=set(CACHED_CONFIG_FIELDS), exclude_none=True
+        )
+        if config is not None
+        else {}
+    )
+    return request_fingerprint({"model": model, "contents": contents, **cached})
+
+
+def _duration(seconds: float) -> str:
+    return f"{seconds:g}s"
@@ -12,9 +12,16 @@ except ImportError:
         "Install it with: pip install py-llmify[openai]"
     )
 
-from llmify.providers._openai_utils import resolve_api_key
+from llmify.cache import ResponseCache
+from llmify.connection_pool import ConnectionPoolOptions
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.instrumentation import RequestCallback
+from llmify.providers._openai_utils import pooled_client_options, resolve_api_key
 from llmify.providers.openai_compatible import OpenAICompatible
+from llmify.rate_limit import RateLimiter
 from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
+from llmify.usage_meter import UsageMeter
 
 
 class OpenAIModel(StrEnum):
@@ -34,6 +41,9 @@ class OpenAIModel(StrEnum):
 
 
 class ChatOpenAI(OpenAICompatible):
+    _gen_ai_provider = "openai"
+    _token_family = "openai"
+
     def __init__(
         self,
         model: str | OpenAIModel = OpenAIModel.GPT_5_6_TERRA,
@@ -50,7 +60,16 @@ class ChatOpenAI(OpenAICompatible):
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         default_headers: dict[str, str] | None = None,
+        connection_pool: ConnectionPoolOptions | None = None,
         **kwargs: Any,
     ):
         super().__init__(
@@ -66,14 +85,24 @@ class ChatOpenAI(OpenAICompatible):
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             **kwargs,
         )
         api_key = resolve_api_key(api_key, "OPENAI_API_KEY", "OpenAI")
 
+        self._connection_pool = connection_pool
         self._client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
             timeout=timeout,
             max_retries=0,
             default_headers=default_headers,
+            **pooled_client_options(connection_pool),
         )
@@ -1,4 +1,5 @@
 from collections.abc import AsyncIterator
+from contextlib import aclosing
 from typing import TYPE_CHECKING, Any, cast, overload
 
 from pydantic import BaseModel
@@ -21,9 +22,12 @@ except ImportError:
     if TYPE_CHECKING:
         raise
 
-from llmify.base import ChatModel
+from llmify.base import ChatModel, within_context, within_context_stream
+from llmify.connection_pool import ConnectionPoolOptions
+from llmify.conversion import ConversionMemo
 from llmify.messages import (
     AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
     Message,
@@ -39,7 +43,7 @@ from llmify.providers._openai_utils import (
     tool_call,
     tool_schemas,
 )
-from llmify.retries import RetryCallback, retry_call, retry_stream
+from llmify.retries import RetryCallback
 from llmify.tools import Tool, ToolChoice
 from llmify.views import (
     ChatInvokeCompletion,
@@ -54,11 +58,17 @@ from llmify.views import (
 class OpenAICompatible(ChatModel):
     _client: AsyncOpenAI | AsyncAzureOpenAI
     _model: str
+    _connection_pool: ConnectionPoolOptions | None = None
 
     def __init__(self, *args: Any, **kwargs: Any):
         reject_stream_parameter(kwargs)
         super().__init__(*args, **kwargs)
 
+    async def aclose(self) -> None:
+        # A shared pool outlives the model; only a private client is closed.
+        if self._connection_pool is None:
+            await self._client.close()
+
     @overload
     async def invoke[T: BaseModel](
         self, messages: list[Message], output_format: type[T], **kwargs: Any
@@ -69,6 +79,7 @@ class OpenAICompatible(ChatModel):
         self, messages: list[Message], output_format: None = None, **kwargs: Any
     ) -> ChatInvokeCompletion[str]: ...
 
+    @within_context
     async def invoke[T: BaseModel](
         self,
         messages: list[Message],
@@ -79,11 +90,10 @@ class OpenAICompatible(ChatModel):
         **kwargs: Any,
     ) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
         reject_stream_parameter(kwargs)
+        params = self._merge_params(kwargs)
+        converted_messages = _convert_messages(messages)
 
         async def invoke_once() -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
-            params = self._merge_params(kwargs)
-            converted_messages = _convert_messages(messages)
-
             if output_format is not None:
                 return await self._invoke_with_structured_output(
                     converted_messages, output_format, params
@@ -96,11 +106,28 @@ class OpenAICompatible(ChatModel):
 
             return await self._invoke_plain(converted_messages, params)
 
-        return await retry_call(
-            invoke_once,
-            max_retries=self._default_max_retries,
-            on_retry=on_retry if on_retry is not None else self._on_retry,
-            map_error=map_openai_error,
+        def request() -> dict[str, Any]:
+            request: dict[str, Any] = {
+                "model": self._model,
+                "messages": converted_messages,
+                **params,
+            }
+            if output_format is not None:
+                request["output_format"] = output_format
+            elif tools:
+                request["tools"] = tool_schemas(tools)
+                request["tool_choice"] = tool_choice
+            return request
+
+        return await self._invoke_shared(
+            request,
+            ChatInvokeCompletion[output_format or str],
+            lambda: self._call_with_retries(
+                invoke_once,
+                messages=messages,
+                on_retry=on_retry,
+                map_error=map_openai_error,
+            ),
         )
 
     async def _invoke_with_structured_output[T: BaseModel](
@@ -165,6 +192,7 @@ class OpenAICompatible(ChatModel):
             usage=parse_usage(response.usage),
         )
 
+    @within_context_stream
     async def stream(
         self,
         messages: list[Message],
@@ -194,13 +222,19 @@ class OpenAICompatible(ChatModel):
             request_args["tools"] = openai_tools
             request_args["tool_choice"] = tool_choice
 
-        async for event in retry_stream(
-            lambda: self._stream_once(request_args),
-            max_retries=self._default_max_retries,
-            on_retry=on_retry if on_retry is not None else self._on_retry,
-            map_error=map_openai_error,
-        ):
-            yield event
+        async with aclosing(
+            self._stream_shared(
+                lambda: request_args,
+                lambda: self._stream_with_retries(
+                    lambda: self._stream_once(request_args),
+                    messages=messages,
+                    on_retry=on_retry,
+                    map_error=map_openai_error,
+                ),
+            )
+        ) as events:
+            async for event in events:
+                yield event
 
     async def _stream_once(
         self, request_args: dict[str, Any]
@@ -227,6 +261,13 @@ class OpenAICompatible(ChatModel):
                 yield StreamTextDelta(delta=delta.content)
 
             for tc_delta in delta.tool_calls or []:
+                if tc_delta.index not in buffers:
+                    # Calls stream one after another, so a new index means
+                    # every earlier call's arguments are complete.
+                    for idx in sorted(buffers):
+                        if idx < tc_delta.index and not buffers[idx]["emitted"]:
+                            yield _complete_tool_call(buffers[idx])
+
                 buf = buffers.setdefault(
                     tc_delta.index,
                     {"id": "", "name": "", "arguments": "", "emitted": False},
@@ -243,18 +284,8 @@ class OpenAICompatible(ChatModel):
             if choice.finish_reason:
                 stop_reason = choice.finish_reason
                 for idx in sorted(buffers):
-                    buf = buffers[idx]
-                    if buf["emitted"]:
-                        continue
-
-                    buf["emitted"] = True
-                    yield StreamToolCall(
-                        tool_call=tool_call(
-                            call_id=buf["id"],
-                            name=buf["name"],
-                            arguments=buf["arguments"],
-                        )
-                    )
+                    if not buffers[idx]["emitted"]:
+                        yield _complete_tool_call(buffers[idx])
 
         yield StreamEnd(
             stop_reason=stop_reason,
@@ -271,8 +302,17 @@ class OpenAICompatible(ChatModel):
         )
 
 
+def _complete_tool_call(buf: dict[str, Any]) -> StreamToolCall:
+    buf["emitted"] = True
+    return StreamToolCall(
+        tool_call=tool_call(
+            call_id=buf["id"], name=buf["name"], arguments=buf["arguments"]
+        )
+    )
+
+
 def _convert_messages(messages: list[Message]) -> list[ChatCompletionMessageParam]:
-    return [_convert_message(message) for message in messages]
+    return [_converted(message) for message in messages]
 
 
 def _convert_message(message: Message) -> ChatCompletionMessageParam:
@@ -321,6 +361,13 @@ def _convert_message(message: Message) -> ChatCompletionMessageParam:
                         },
                     }
                 )
+            elif isinstance(part, ContentPartImageBytes):
+                content.append(
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": part.data_url, "detail": part.detail},
+                    }
+                )
         return cast(
             ChatCompletionMessageParam,
             {"role": message.role, "content": content},
@@ -354,6 +401,9 @@ def _convert_message(message: Message) -> ChatCompletionMessageParam:
     )
 
 
+_converted = ConversionMemo(_convert_message)
+
+
 def _parse_tool_calls(
     raw_tool_calls: list[ChatCompletionMessageToolCallUnion] | None,
 ) -> list[ToolCall]:
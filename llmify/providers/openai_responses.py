@@ -1,7 +1,6 @@
-import inspect
-import json
-from collections.abc import AsyncIterator, Awaitable, Callable
-from typing import Any, Literal, cast, overload
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import aclosing
+from typing import Any, Literal, overload
 
 import httpx
 from pydantic import BaseModel
@@ -27,10 +26,20 @@ except ImportError:
         "Install it with: pip install py-llmify[openai]"
     )
 
-from llmify.base import ChatModel
+from llmify.base import (
+    ChatModel,
+    _round_span,
+    within_context,
+    within_context_stream,
+)
+from llmify.cache import ResponseCache
+from llmify.connection_pool import ConnectionPoolOptions
+from llmify.context_overflow import ContextOverflowPolicy
+from llmify.conversion import ConversionMemo
 from llmify.exceptions import LLMifyError, RateLimitError, RetryableError
+from llmify.instrumentation import RequestCallback
 from llmify.messages import (
-    AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
     Message,
@@ -39,19 +48,28 @@ from llmify.messages import (
     ToolResultMessage,
     UserMessage,
 )
+from llmify.prompt_cache import (
+    CachePlan,
+    CacheStrategy,
+    PromptCachePlanner,
+    resolve_cache_planner,
+)
 from llmify.providers._openai_utils import (
     map_openai_error,
+    pooled_client_options,
     reject_stream_parameter,
     resolve_api_key,
     tool_call,
     tool_schemas,
 )
+from llmify.providers.openai_responses_compaction import compact_input_items
 from llmify.providers.openai_responses_transport import (
     HTTPResponsesTransport,
     ResponsesSession,
     ResponsesTransport,
 )
 from llmify.providers.openai_responses_types import (
+    CompactionPolicy,
     ContinuationMode,
     OpenAIResponsesCompletion,
     OpenAIResponsesState,
@@ -65,23 +83,39 @@ from llmify.providers.openai_responses_types import (
     StreamOutputItemDone,
     StreamReasoningSummaryDelta,
 )
-from llmify.retries import RetryCallback, retry_call, retry_stream
+from llmify.rate_limit import RateLimiter
+from llmify.retries import RetryCallback
+from llmify.tokens import TokenEstimator
 from llmify.tools import Tool, ToolChoice
-from llmify.views import StreamTextDelta, StreamToolCall
+from llmify.tools.execution import ToolExecutor, execute_tool_calls
+from llmify.tracing import start_span
+from llmify.usage_meter import UsageMeter
+from llmify.views import (
+    StreamTextDelta,
+    StreamToolCall,
+    StreamToolResult,
+    add_usage,
+)
 
 _CHAT_ONLY_PARAMS = frozenset(
     {"frequency_penalty", "presence_penalty", "stop", "seed", "response_format"}
 )
 
+# Item fields whose text the model reads. Encrypted reasoning and image
+# payloads are left out, as ``estimate_prompt_tokens`` leaves out images.
+_TEXT_FIELDS = frozenset({"content", "text", "output", "arguments", "summary", "name"})
+_TOKENS_PER_ITEM = 4
+
 type ReasoningEffort = Literal[
     "none", "minimal", "low", "medium", "high", "xhigh", "max"
 ]
 """Reasoning effort levels accepted by current Responses models."""
 
-type ToolExecutor = Callable[[ToolCall], object | Awaitable[object]]
-
 
 class ChatOpenAIResponses(ChatModel):
+    _gen_ai_provider = "openai"
+    _token_family = "openai"
+
     def __init__(
         self,
         model: str,
@@ -99,10 +133,21 @@ class ChatOpenAIResponses(ChatModel):
         reasoning_summary: ReasoningSummary | None = None,
         prompt_cache_key: str | None = None,
         prompt_cache_options: PromptCacheOptions | None = None,
+        compaction: CompactionPolicy | None = None,
         timeout: float | httpx.Timeout | None = 60.0,
         max_retries: int = 2,
         on_retry: RetryCallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        on_request: RequestCallback | None = None,
+        usage_meter: UsageMeter | None = None,
+        token_estimator: TokenEstimator | None = None,
+        context_window: int | None = None,
+        context_overflow: ContextOverflowPolicy | None = None,
         default_headers: dict[str, str] | None = None,
+        connection_pool: ConnectionPoolOptions | None = None,
+        cache_strategy: CacheStrategy | PromptCachePlanner = "manual",
         **kwargs: Any,
     ):
         reject_stream_parameter(kwargs)
@@ -117,6 +162,14 @@ class ChatOpenAIResponses(ChatModel):
             timeout=timeout,
             max_retries=max_retries,
             on_retry=on_retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            on_request=on_request,
+            usage_meter=usage_meter,
+            token_estimator=token_estimator,
+            context_window=context_window,
+            context_overflow=context_overflow,
             **kwargs,
         )
         api_key = self._resolve_api_key(api_key)
@@ -129,15 +182,24 @@ class ChatOpenAIResponses(ChatModel):
             reasoning_summary=reasoning_summary,
             prompt_cache_key=prompt_cache_key,
             prompt_cache_options=prompt_cache_options,
+            compaction=compaction,
         )
+        self._cache_planner = resolve_cache_planner(cache_strategy)
+        self._connection_pool = connection_pool
         self._client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
             timeout=timeout,
             max_retries=0,
             default_headers=default_headers,
+            **pooled_client_options(connection_pool),
         )
 
+    async def aclose(self) -> None:
+        # A shared pool outlives the model; only a private client is closed.
+        if self._connection_pool is None:
+            await self._client.close()
+
     def _resolve_api_key(
         self,
         api_key: str | Callable[[], Awaitable[str]] | None,
@@ -168,6 +230,7 @@ class ChatOpenAIResponses(ChatModel):
         **kwargs: Any,
     ) -> OpenAIResponsesCompletion[str]: ...
 
+    @within_context
     async def invoke[T: BaseModel](
         self,
         messages: list[Message],
@@ -181,19 +244,38 @@ class ChatOpenAIResponses(ChatModel):
     ) -> OpenAIResponsesCompletion[T] | OpenAIResponsesCompletion[str]:
         reject_stream_parameter(kwargs)
         options = responses_options or self._responses_options
-        async with self._transport.session(self._client) as session:
-            end = await self._collect(
-                messages,
-                tools=tools,
-                tool_choice=tool_choice,
-                provider_state=provider_state,
-                options=options,
-                params=_responses_params(self._merge_params(kwargs)),
-                text=_json_schema_format(output_format),
-                on_retry=on_retry if on_retry is not None else self._on_retry,
-                session=session,
-            )
-        return _completion_from_end(end, output_format)
+        params = _responses_params(self._merge_params(kwargs))
+        text = _json_schema_format(output_format)
+        plan = self._plan_cache(messages, tools)
+        if plan is not None:
+            messages = plan.messages
+            options = _with_cache_key(options, plan, provider_state)
+
+        async def invoke_uncached() -> (
+            OpenAIResponsesCompletion[T] | OpenAIResponsesCompletion[str]
+        ):
+            async with self._transport.session(self._client) as session:
+                end = await self._collect(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    provider_state=provider_state,
+                    options=options,
+                    params=params,
+                    text=text,
+                    on_retry=on_retry if on_retry is not None else self._on_retry,
+                    session=session,
+                )
+            self._record_cache(plan, end.usage)
+            return _completion_from_end(end, output_format)
+
+        return await self._invoke_shared(
+            lambda: self._replay_request(
+                messages, tools, tool_choice, provider_state, options, params, text
+            ),
+            OpenAIResponsesCompletion[output_format or str],
+            invoke_uncached,
+        )
 
     async def invoke_with_tools[T: BaseModel](
         self,
@@ -204,6 +286,7 @@ class ChatOpenAIResponses(ChatModel):
         tool_choice: ToolChoice = "auto",
         tool_executor: ToolExecutor | None = None,
         max_tool_rounds: int = 8,
+        max_parallel_tools: int = 8,
         provider_state: OpenAIResponsesState | None = None,
         responses_options: ResponsesOptions | None = None,
         on_retry: RetryCallback | None = None,
@@ -214,10 +297,15 @@ class ChatOpenAIResponses(ChatModel):
         FunctionTool instances execute directly. Dict and RawSchemaTool entries
         require ``tool_executor`` because they do not contain an implementation.
         Tool exceptions are serialized as function-call outputs so the model can
-        recover. ``max_tool_rounds`` bounds model/tool round trips.
+        recover. ``max_tool_rounds`` bounds model/tool round trips. The calls of
+        one round run concurrently, at most ``max_parallel_tools`` at a time;
+        synchronous FunctionTool callables run in worker threads. Outputs keep
+        the order of the calls.
         """
         if max_tool_rounds < 0:
             raise ValueError("'max_tool_rounds' must be greater than or equal to 0.")
+        if max_parallel_tools < 1:
+            raise ValueError("'max_parallel_tools' must be greater than or equal to 1.")
         reject_stream_parameter(kwargs)
 
         options = responses_options or self._responses_options
@@ -229,37 +317,48 @@ class ChatOpenAIResponses(ChatModel):
 
         async with self._transport.session(self._client) as session:
             for round_index in range(max_tool_rounds + 1):
-                end = await self._collect(
-                    next_messages,
-                    tools=tools,
-                    tool_choice=tool_choice,
-                    provider_state=state,
-                    options=options,
-                    params=params,
-                    text=_json_schema_format(output_format),
-                    on_retry=on_retry if on_retry is not None else self._on_retry,
-                    session=session,
-                )
-                state = end.provider_state
-                total_usage = _add_usage(total_usage, end.usage)
-                all_tool_calls.extend(end.tool_calls)
-
-                if not end.tool_calls:
-                    completed = _completion_from_end(end, output_format)
-                    completed.tool_calls = all_tool_calls
-                    completed.usage = total_usage
-                    return completed
-
-                if round_index == max_tool_rounds:
-                    raise LLMifyError(
-                        f"Tool loop exceeded max_tool_rounds={max_tool_rounds}."
+                with start_span(*_round_span(round_index)) as span:
+                    round_options = options
+                    plan = self._plan_cache(next_messages, tools)
+                    if plan is not None:
+                        next_messages = plan.messages
+                        round_options = _with_cache_key(options, plan, state)
+                    end = await self._collect(
+                        next_messages,
+                        tools=tools,
+                        tool_choice=tool_choice,
+                        provider_state=state,
+                        options=round_options,
+                        params=params,
+                        text=_json_schema_format(output_format),
+                        on_retry=on_retry if on_retry is not None else self._on_retry,
+                        session=session,
+                    )
+                    self._record_cache(plan, end.usage)
+                    state = end.provider_state
+                    total_usage = add_usage(total_usage, end.usage)
+                    all_tool_calls.extend(end.tool_calls)
+                    span.set_attribute(
+                        "llmify.tool_round.tool_calls", len(end.tool_calls)
                     )
 
-                outputs = await _execute_tool_calls(
-                    end.tool_calls,
-                    tools,
-                    executor=tool_executor,
-                )
+                    if not end.tool_calls:
+                        completed = _completion_from_end(end, output_format)
+                        completed.tool_calls = all_tool_calls
+                        completed.usage = total_usage
+                        return completed
+
+                    if round_index == max_tool_rounds:
+                        raise LLMifyError(
+                            f"Tool loop exceeded max_tool_rounds={max_tool_rounds}."
+                        )
+
+                    outputs = await execute_tool_calls(
+                        end.tool_calls,
+                        tools,
+                        executor=tool_executor,
+                        max_parallel_tools=max_parallel_tools,
+                    )
                 next_messages = [
                     ToolResultMessage(tool_call_id=call.id, content=output)
                     for call, output in zip(end.tool_calls, outputs, strict=True)
@@ -267,6 +366,54 @@ class ChatOpenAIResponses(ChatModel):
 
         raise AssertionError("unreachable")
 
+    def stream_with_tools(
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict],
+        *,
+        tool_choice: ToolChoice = "auto",
+        tool_executor: ToolExecutor | None = None,
+        max_tool_rounds: int = 8,
+        max_parallel_tools: int = 8,
+        provider_state: OpenAIResponsesState | None = None,
+        responses_options: ResponsesOptions | None = None,
+        on_retry: RetryCallback | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[OpenAIResponsesStreamEvent | StreamToolResult]:
+        """Stream function calls to completion, continuing from native state.
+
+        Tools start as soon as their ``StreamToolCall`` arrives. Each next
+        round sends only the tool outputs on top of the previous round's
+        ``provider_state``. See ``ChatModel.stream_with_tools``.
+        """
+        if max_tool_rounds < 0:
+            raise ValueError("'max_tool_rounds' must be greater than or equal to 0.")
+        if max_parallel_tools < 1:
+            raise ValueError("'max_parallel_tools' must be greater than or equal to 1.")
+        reject_stream_parameter(kwargs)
+
+        def open_round(
+            end: OpenAIResponsesStreamEnd | None, results: list[ToolResultMessage]
+        ) -> AsyncIterator[OpenAIResponsesStreamEvent]:
+            return self.stream(
+                messages if end is None else results,
+                tools=tools,
+                tool_choice=tool_choice,
+                provider_state=provider_state if end is None else end.provider_state,
+                responses_options=responses_options,
+                on_retry=on_retry,
+                **kwargs,
+            )
+
+        return self._stream_tool_loop(
+            open_round,
+            tools,
+            tool_executor=tool_executor,
+            max_tool_rounds=max_tool_rounds,
+            max_parallel_tools=max_parallel_tools,
+        )
+
+    @within_context_stream
     async def stream(
         self,
         messages: list[Message],
@@ -278,16 +425,82 @@ class ChatOpenAIResponses(ChatModel):
         **kwargs: Any,
     ) -> AsyncIterator[OpenAIResponsesStreamEvent]:
         reject_stream_parameter(kwargs)
-        async for event in self._stream(
-            messages,
+        options = responses_options or self._responses_options
+        params = _responses_params(self._merge_params(kwargs))
+        plan = self._plan_cache(messages, tools)
+        if plan is not None:
+            messages = plan.messages
+            options = _with_cache_key(options, plan, provider_state)
+        async with aclosing(
+            self._stream_shared(
+                lambda: self._replay_request(
+                    messages, tools, tool_choice, provider_state, options, params
+                ),
+                lambda: self._record_cache_stream(
+                    plan,
+                    self._stream(
+                        messages,
+                        tools=tools,
+                        tool_choice=tool_choice,
+                        provider_state=provider_state,
+                        options=options,
+                        params=params,
+                        on_retry=on_retry if on_retry is not None else self._on_retry,
+                    ),
+                ),
+            )
+        ) as events:
+            async for event in events:
+                yield event
+
+    def _replay_request(
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict] | None,
+        tool_choice: ToolChoice,
+        provider_state: OpenAIResponsesState | None,
+        options: ResponsesOptions,
+        params: dict[str, Any],
+        text: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Full stateless request, used to key caching and request sharing.
+
+        Keying on the replay keeps continuation mode from splitting entries.
+        """
+        request, _, _ = _build_request(
+            model=self._model,
+            messages=messages,
             tools=tools,
             tool_choice=tool_choice,
-            provider_state=provider_state,
-            options=responses_options or self._responses_options,
-            params=_responses_params(self._merge_params(kwargs)),
-            on_retry=on_retry if on_retry is not None else self._on_retry,
+            state=provider_state,
+            options=options,
+            params=params,
+            text=text,
+            store=self._store,
+            can_continue=False,
+        )
+        return request
+
+    def _trims_history(self, arguments: dict[str, Any]) -> bool:
+        # A provider_state replays its input_items ahead of ``messages``;
+        # bound those with ``ResponsesOptions.compaction`` instead.
+        state = arguments.get("provider_state")
+        return state is None or not state.input_items
+
+    def _replayed_tokens(self, state: OpenAIResponsesState | None) -> int:
+        """Estimated prompt tokens of the input items replayed from ``state``.
+
+        The server counts them even when continuing by ``previous_response_id``,
+        so they belong in the context-window check and the rate-limit debit.
+        """
+        if state is None or (
+            self._rate_limiter is None and self._context_window is None
         ):
-            yield event
+            return 0
+        text = "".join(_item_texts(state.input_items))
+        return self.token_estimator.count(text) + _TOKENS_PER_ITEM * len(
+            state.input_items
+        )
 
     async def _collect(
         self,
@@ -321,11 +534,12 @@ class ChatOpenAIResponses(ChatModel):
                 )
             return end
 
-        return await retry_call(
+        return await self._call_with_retries(
             collect_once,
-            max_retries=self._default_max_retries,
+            messages=messages,
             on_retry=on_retry,
             map_error=map_openai_error,
+            replayed_tokens=self._replayed_tokens(provider_state),
         )
 
     async def _stream(
@@ -339,22 +553,28 @@ class ChatOpenAIResponses(ChatModel):
         text: dict[str, Any] | None = None,
         on_retry: RetryCallback | None = None,
     ) -> AsyncIterator[OpenAIResponsesStreamEvent]:
-        async with self._transport.session(self._client) as session:
-            async for event in retry_stream(
-                lambda: self._stream_once(
-                    messages,
-                    tools=tools,
-                    tool_choice=tool_choice,
-                    provider_state=provider_state,
-                    options=options,
-                    params=params,
-                    text=text,
-                    session=session,
-                ),
-                max_retries=self._default_max_retries,
-                on_retry=on_retry,
-                map_error=map_openai_error,
-            ):
+        async with (
+            self._transport.session(self._client) as session,
+            aclosing(
+                self._stream_with_retries(
+                    lambda: self._stream_once(
+                        messages,
+                        tools=tools,
+                        tool_choice=tool_choice,
+                        provider_state=provider_state,
+                        options=options,
+                        params=params,
+                        text=text,
+                        session=session,
+                    ),
+                    messages=messages,
+                    on_retry=on_retry,
+                    map_error=map_openai_error,
+                    replayed_tokens=self._replayed_tokens(provider_state),
+                )
+            ) as events,
+        ):
+            async for event in events:
                 yield event
 
     async def _stream_once(
@@ -442,13 +662,19 @@ class ChatOpenAIResponses(ChatModel):
             elif isinstance(event, (ResponseFailedEvent, ResponseErrorEvent)):
                 raise _event_error(event)
 
+            elif getattr(event, "type", None) == "error":
+                raise _websocket_error(event)
+
         full_input_items = [*previous_items, *new_input_items, *output_items]
+        if options.compaction is not None:
+            full_input_items = compact_input_items(full_input_items, options.compaction)
         state = OpenAIResponsesState(
             continuation_mode=options.continuation_mode,
             input_items=full_input_items,
             output_items=output_items,
             response_id=response_id,
             instructions=instructions,
+            prompt_cache_key=options.prompt_cache_key,
         )
         if response_id is not None:
             session.remember(response_id)
@@ -463,6 +689,18 @@ class ChatOpenAIResponses(ChatModel):
         )
 
 
+def _item_texts(value: Any, field: str | None = None) -> Iterator[str]:
+    if isinstance(value, str):
+        if field in _TEXT_FIELDS:
+            yield value
+    elif isinstance(value, dict):
+        for key, nested in value.items():
+            yield from _item_texts(nested, key)
+    elif isinstance(value, list):
+        for nested in value:
+            yield from _item_texts(nested, field)
+
+
 def _completion_from_end[T: BaseModel](
     end: OpenAIResponsesStreamEnd,
     output_format: type[T] | None,
@@ -488,56 +726,24 @@ def _completion_from_end[T: BaseModel](
     )
 
 
-async def _execute_tool_calls(
-    calls: list[ToolCall],
-    tools: list[Tool | dict],
-    *,
-    executor: ToolExecutor | None,
-) -> list[str]:
-    by_name = {
-        tool.name: tool
-        for tool in tools
-        if not isinstance(tool, dict) and hasattr(tool, "name")
-    }
-    outputs: list[str] = []
-    for call in calls:
-        try:
-            if executor is not None:
-                result = executor(call)
-            else:
-                tool = by_name.get(call.function.name)
-                if tool is None or not callable(tool):
-                    raise LookupError(
-                        f"No executable tool named {call.function.name!r}."
-                    )
-                arguments = tool.parse_arguments(call.function.arguments)
-                if not isinstance(arguments, dict):
-                    raise TypeError("Function tool arguments must decode to an object.")
-                result = cast(Callable[..., object], tool)(**arguments)
-            if inspect.isawaitable(result):
-                result = await result
-            outputs.append(_serialize_tool_output(result))
-        except Exception as exc:  # noqa: BLE001 - failures become tool outputs
-            outputs.append(
-                json.dumps(
-                    {
-                        "error": {
-                            "type": type(exc).__name__,
-                            "message": str(exc),
-                        }
-                    },
-                    ensure_ascii=False,
-                )
-            )
-    return outputs
-
+def _with_cache_key(
+    options: ResponsesOptions,
+    plan: CachePlan,
+    state: OpenAIResponsesState | None,
+) -> ResponsesOptions:
+    """Default ``prompt_cache_key`` to the planned stable prefix.
 
-def _serialize_tool_output(value: object) -> str:
-    if isinstance(value, str):
-        return value
-    if isinstance(value, BaseModel):
-        return value.model_dump_json()
-    return json.dumps(value, ensure_ascii=False, default=str)
+    Requests sharing tools and system prompt then route to the same cache
+    shard. A continuation keeps the key its conversation started with.
+    """
+    if options.prompt_cache_key is not None:
+        return options
+    key = state.prompt_cache_key if state is not None else None
+    if key is None and plan.stable_digest is not None:
+        key = f"llmify-{plan.stable_digest}"
+    if key is None:
+        return options
+    return options.model_copy(update={"prompt_cache_key": key})
 
 
 def _build_request(
@@ -610,11 +816,15 @@ def _user_content(msg: UserMessage) -> str | list[dict]:
         cache = msg.cache and index == last_index
         if isinstance(part, ContentPartTextParam):
             content.append(_input_text(part.text, cache=cache))
-        elif isinstance(part, ContentPartImageParam):
+        elif isinstance(part, ContentPartImageParam | ContentPartImageBytes):
+            if isinstance(part, ContentPartImageParam):
+                url, detail = part.image_url.url, part.image_url.detail
+            else:
+                url, detail = part.data_url, part.detail
             image: dict[str, Any] = {
                 "type": "input_image",
-                "image_url": part.image_url.url,
-                "detail": part.image_url.detail,
+                "image_url": url,
+                "detail": detail,
             }
             if cache:
                 image["prompt_cache_breakpoint"] = {"mode": "explicit"}
@@ -634,44 +844,51 @@ def _convert_messages(messages: list[Message]) -> tuple[str | None, list[dict]]:
     items: list[dict] = []
 
     for message in messages:
-        if isinstance(message, SystemMessage):
-            if not message.text:
-                continue
-            if message.cache:
-                items.append(
-                    {
-                        "role": "developer",
-                        "content": [_input_text(message.text, cache=True)],
-                    }
-                )
-            else:
-                instructions.append(message.text)
-        elif isinstance(message, UserMessage):
-            items.append({"role": "user", "content": _user_content(message)})
-        elif isinstance(message, AssistantMessage):
+        if isinstance(message, SystemMessage) and not message.cache:
             if message.text:
-                items.append({"role": "assistant", "content": message.text})
-            for call in message.tool_calls:
-                items.append(
-                    {
-                        "type": "function_call",
-                        "call_id": call.id,
-                        "name": call.function.name,
-                        "arguments": call.function.arguments,
-                    }
-                )
-        elif isinstance(message, ToolResultMessage):
-            items.append(
-                {
-                    "type": "function_call_output",
-                    "call_id": message.tool_call_id,
-                    "output": message.content,
-                }
-            )
+                instructions.append(message.text)
+            continue
+        items.extend(_converted(message))
 
     return "\n\n".join(instructions) or None, items
 
 
+def _convert_message(message: Message) -> list[dict]:
+    if isinstance(message, SystemMessage):
+        if not message.text:
+            return []
+        return [
+            {"role": "developer", "content": [_input_text(message.text, cache=True)]}
+        ]
+    if isinstance(message, UserMessage):
+        return [{"role": "user", "content": _user_content(message)}]
+    if isinstance(message, ToolResultMessage):
+        return [
+            {
+                "type": "function_call_output",
+                "call_id": message.tool_call_id,
+                "output": message.content,
+            }
+        ]
+
+    items: list[dict] = []
+    if message.text:
+        items.append({"role": "assistant", "content": message.text})
+    for call in message.tool_calls:
+        items.append(
+            {
+                "type": "function_call",
+                "call_id": call.id,
+                "name": call.function.name,
+                "arguments": call.function.arguments,
+            }
+        )
+    return items
+
+
+_converted = ConversionMemo(_convert_message)
+
+
 def _convert_tools(tools: list[Tool | dict]) -> list[dict]:
     converted = []
     for schema in tool_schemas(tools):
@@ -781,32 +998,6 @@ def _parse_responses_usage(usage: Any | None) -> OpenAIResponsesUsage | None:
     )
 
 
-def _add_usage(
-    left: OpenAIResponsesUsage | None,
-    right: OpenAIResponsesUsage | None,
-) -> OpenAIResponsesUsage | None:
-    if left is None:
-        return right
-    if right is None:
-        return left
-
-    def add_optional(a: int | None, b: int | None) -> int | None:
-        return None if a is None and b is None else (a or 0) + (b or 0)
-
-    return OpenAIResponsesUsage(
-        prompt_tokens=left.prompt_tokens + right.prompt_tokens,
-        prompt_cached_tokens=add_optional(
-            left.prompt_cached_tokens, right.prompt_cached_tokens
-        ),
-        prompt_cache_write_tokens=add_optional(
-            left.prompt_cache_write_tokens, right.prompt_cache_write_tokens
-        ),
-        completion_tokens=left.completion_tokens + right.completion_tokens,
-        reasoning_tokens=add_optional(left.reasoning_tokens, right.reasoning_tokens),
-        total_tokens=left.total_tokens + right.total_tokens,
-    )
-
-
 def _parse_stop_reason(response: Response, tool_calls: list[ToolCall]) -> str:
     if response.incomplete_details is not None:
         return response.incomplete_details.reason or "incomplete"
@@ -839,3 +1030,14 @@ def _event_error(
     if code in {"server_error", "vector_store_timeout"}:
         return RetryableError(message)
     return LLMifyError(message)
+
+
+def _websocket_error(event: Any) -> LLMifyError:
+    """Map the WebSocket ``error`` event, which nests its details and status."""
+    message = event.error.message
+    status = getattr(event, "status", None)
+    if event.error.code == "rate_limit_exceeded" or status == 429:
+        return RateLimitError(message)
+    if event.error.code == "server_error" or (status is not None and status >= 500):
+        return RetryableError(message, status_code=status)
+    return LLMifyError(message)
@@ -0,0 +1,97 @@
+import json
+from typing import Any
+
+from llmify.providers.openai_responses_types import CompactionPolicy
+
+type Item = dict[str, Any]
+
+# Output items that may belong to the reasoning item they followed. Their ids
+# are removed together with that reasoning item.
+_REASONING_LINKED_TYPES = frozenset({"function_call", "message"})
+
+
+def compact_input_items(items: list[Item], policy: CompactionPolicy) -> list[Item]:
+    """Bound a stateless replay window according to ``policy``.
+
+    Items before the first user message, such as cached developer
+    instructions, are always kept. The rest is split into turns, each starting
+    at a user message that does not interrupt a pending tool call, so a
+    ``function_call`` and its output are always kept or dropped together. The
+    latest turn is never dropped, even if it alone exceeds ``max_bytes``.
+    """
+    pinned, turns = _split_turns(items)
+    if policy.max_turns is not None:
+        turns = turns[-policy.max_turns :]
+    if policy.keep_reasoning_turns is not None:
+        turns = _drop_reasoning(turns, keep=policy.keep_reasoning_turns)
+    if policy.max_bytes is not None:
+        turns = _fit_bytes(pinned, turns, policy.max_bytes)
+    return [*pinned, *(item for turn in turns for item in turn)]
+
+
+def _split_turns(items: list[Item]) -> tuple[list[Item], list[list[Item]]]:
+    pinned: list[Item] = []
+    turns: list[list[Item]] = []
+    open_calls: set[str] = set()
+    for item in items:
+        if item.get("role") == "user" and not open_calls:
+            turns.append([])
+        (turns[-1] if turns else pinned).append(item)
+
+        call_id = item.get("call_id")
+        if not isinstance(call_id, str):
+            continue
+        if str(item.get("type", "")).endswith("_output"):
+            open_calls.discard(call_id)
+        else:
+            open_calls.add(call_id)
+    return pinned, turns
+
+
+def _drop_reasoning(turns: list[list[Item]], *, keep: int) -> list[list[Item]]:
+    cutoff = max(len(turns) - keep, 0)
+    return [_without_reasoning(turn) for turn in turns[:cutoff]] + turns[cutoff:]
+
+
+def _without_reasoning(turn: list[Item]) -> list[Item]:
+    if not any(item.get("type") == "reasoning" for item in turn):
+        return turn
+    # Ids would point the server at the dropped reasoning item, so the linked
+    # items are replayed by value instead.
+    return [
+        {key: value for key, value in item.items() if key != "id"}
+        if item.get("type") in _REASONING_LINKED_TYPES
+        else item
+        for item in turn
+        if item.get("type") != "reasoning"
+    ]
+
+
+def _fit_bytes(
+    pinned: list[Item], turns: list[list[Item]], max_bytes: int
+) -> list[list[Item]]:
+    budget = max_bytes - sum(map(_size, pinned))
+    sizes = [sum(map(_size, turn)) for turn in turns]
+    if sum(sizes) <= budget:
+        return turns
+
+    # Reasoning blobs are the cheapest to lose, so older turns shed them
+    # before whole turns are dropped.
+    for index in range(len(turns) - 1):
+        slimmed = _without_reasoning(turns[index])
+        if slimmed is not turns[index]:
+            turns = [*turns[:index], slimmed, *turns[index + 1 :]]
+            sizes[index] = sum(map(_size, slimmed))
+        if sum(sizes) <= budget:
+            return turns
+
+    start = 0
+    total = sum(sizes)
+    while total > budget and start < len(turns) - 1:
+        total -= sizes[start]
+        start += 1
+    return turns[start:]
+
+
+def _size(item: Item) -> int:
+    return len(json.dumps(item, separators=(",", ":"), ensure_ascii=False).encode())
@@ -1,11 +1,13 @@
-from collections.abc import AsyncGenerator, AsyncIterator
-from contextlib import AbstractAsyncContextManager, asynccontextmanager
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
 from typing import Any, Protocol, runtime_checkable
 
 from openai import AsyncOpenAI, OpenAIError
 from openai.types.responses import (
     ResponseCompletedEvent,
-    ResponseErrorEvent,
     ResponseFailedEvent,
     ResponseIncompleteEvent,
 )
@@ -46,23 +48,10 @@ class WebSocketResponsesTransport:
     async def session(
         self, client: AsyncOpenAI
     ) -> AsyncGenerator[ResponsesSession, None]:
-        connect = getattr(client.responses, "connect", None)
-        if connect is None:
-            raise LLMifyError(
-                "Responses WebSocket transport requires a newer OpenAI SDK. "
-                "Install py-llmify[websocket]."
-            )
-
-        try:
+        connect = _connect_method(client)
+        with _websocket_errors():
             async with connect() as connection:
                 yield _WebSocketResponsesSession(connection)
-        except OpenAIError as exc:
-            if "openai[realtime]" not in str(exc):
-                raise
-            raise LLMifyError(
-                "Responses WebSocket transport requires the 'websockets' package. "
-                "Install py-llmify[websocket]."
-            ) from exc
 
 
 class _HTTPResponsesSession:
@@ -86,6 +75,10 @@ class _WebSocketResponsesSession:
         self._connection = connection
         self._response_ids: set[str] = set()
 
+    @property
+    def connection(self) -> Any:
+        return self._connection
+
     async def events(self, request: dict[str, Any]) -> AsyncIterator[Any]:
         websocket_request = {"type": "response.create", **request}
         websocket_request.pop("stream", None)
@@ -98,13 +91,14 @@ class _WebSocketResponsesSession:
         while True:
             event = await self._connection.recv()
             yield event
-            if isinstance(
+            # WebSocket errors arrive as their own event type, not as
+            # ResponseErrorEvent; either ends the response.
+            if getattr(event, "type", None) == "error" or isinstance(
                 event,
                 (
                     ResponseCompletedEvent,
                     ResponseIncompleteEvent,
                     ResponseFailedEvent,
-                    ResponseErrorEvent,
                 ),
             ):
                 return
@@ -115,6 +109,283 @@ class _WebSocketResponsesSession:
     def remember(self, response_id: str) -> None:
         self._response_ids.add(response_id)
 
+    def forget(self) -> None:
+        self._response_ids.clear()
+
+
+@dataclass(slots=True)
+class _PooledConnection:
+    client: AsyncOpenAI
+    manager: Any
+    session: _WebSocketResponsesSession
+    idle_since: float = field(default_factory=time.monotonic)
+
+    async def close(self) -> None:
+        try:
+            await self.manager.__aexit__(None, None, None)
+        except Exception:  # noqa: BLE001 - the connection is dropped either way
+            return
+
+
+class PooledWebSocketResponsesTransport:
+    """WebSocket transport that keeps connections open between sessions.
+
+    A connection goes back to the pool when its session ends, together with
+    the response ids it produced. A later session that continues from one of
+    those ids gets the same connection back, so ``previous_response_id`` keeps
+    working across standalone calls even with ``store=False``. Sessions that do
+    not continue a pooled conversation open a new connection, or recycle the
+    least recently used one once ``max_idle`` connections are idle.
+    ``max_idle`` bounds the idle connections kept per pool, not the number
+    open at once: concurrent sessions each hold their own connection.
+
+    Idle connections are closed after ``idle_timeout`` seconds by a timer the
+    pool arms while it holds any, so a burst's sockets do not linger until the
+    next request. Before reuse a
+    connection must still be open, and one idle for longer than ``ping_after``
+    seconds must also answer a ping within ``ping_timeout``. Connections left
+    mid-response by an error or cancellation are closed instead of pooled.
+    Call ``aclose()`` to close the idle connections on shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_idle: int = 8,
+        idle_timeout: float = 300.0,
+        ping_after: float = 30.0,
+        ping_timeout: float = 5.0,
+    ) -> None:
+        if max_idle < 1:
+            raise ValueError("'max_idle' must be greater than or equal to 1.")
+        if idle_timeout <= 0:
+            raise ValueError("'idle_timeout' must be greater than 0.")
+        if ping_after < 0:
+            raise ValueError("'ping_after' must be greater than or equal to 0.")
+        if ping_timeout <= 0:
+            raise ValueError("'ping_timeout' must be greater than 0.")
+
+        self._max_idle = max_idle
+        self._idle_timeout = idle_timeout
+        self._ping_after = ping_after
+        self._ping_timeout = ping_timeout
+        # Least recently released first.
+        self._idle: list[_PooledConnection] = []
+        self._sweep: asyncio.TimerHandle | None = None
+        self._sweeping: asyncio.Task[None] | None = None
+
+    @property
+    def idle_connections(self) -> int:
+        """Number of pooled connections waiting for a session."""
+        return len(self._idle)
+
+    @asynccontextmanager
+    async def session(
+        self, client: AsyncOpenAI
+    ) -> AsyncGenerator[ResponsesSession, None]:
+        connect = _connect_method(client)
+        session = _PooledWebSocketResponsesSession(self, client, connect)
+        try:
+            with _websocket_errors():
+                yield session
+        except BaseException:
+            await session.discard()
+            raise
+        else:
+            await session.release()
+
+    async def aclose(self) -> None:
+        """Close every idle connection."""
+        if self._sweep is not None:
+            self._sweep.cancel()
+            self._sweep = None
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await pooled.close()
+
+    def _take(self, client: AsyncOpenAI, response_id: str) -> _PooledConnection | None:
+        for pooled in reversed(self._idle):
+            if (
+                pooled.client is client
+                and pooled.session.can_continue_from(response_id)
+                and self._usable(pooled)
+            ):
+                self._idle.remove(pooled)
+                return pooled
+        return None
+
+    def _recycle(self, client: AsyncOpenAI) -> _PooledConnection | None:
+        candidates = [pooled for pooled in self._idle if pooled.client is client]
+        if len(candidates) < self._max_idle:
+            return None
+        pooled = candidates[0]
+        self._idle.remove(pooled)
+        # The connection-local state of the previous conversation is about to
+        # be replaced, so that conversation must fall back to a full replay.
+        pooled.session.forget()
+        return pooled
+
+    async def _put(self, pooled: _PooledConnection) -> None:
+        pooled.idle_since = time.monotonic()
+        self._idle.append(pooled)
+        while len(self._idle) > self._max_idle:
+            await self._idle.pop(0).close()
+        self._arm_sweep()
+
+    def _arm_sweep(self) -> None:
+        """Schedule the eviction of the oldest idle connection when it expires."""
+        if self._sweep is not None or not self._idle:
+            return
+        oldest = min(pooled.idle_since for pooled in self._idle)
+        delay = max(oldest + self._idle_timeout - time.monotonic(), 0.0)
+        self._sweep = asyncio.get_running_loop().call_later(delay, self._start_sweep)
+
+    def _start_sweep(self) -> None:
+        self._sweep = None
+        self._sweeping = asyncio.create_task(self._sweep_idle())
+
+    async def _sweep_idle(self) -> None:
+        await self._evict_idle()
+        self._arm_sweep()
+
+    async def _evict_idle(self) -> None:
+        expired = [pooled for pooled in self._idle if not self._usable(pooled)]
+        # Unlinked before the first await, so a concurrent sweep, checkout or
+        # aclose() never sees a connection that is being closed.
+        for pooled in expired:
+            self._idle.remove(pooled)
+        for pooled in expired:
+            await pooled.close()
+
+    def _usable(self, pooled: _PooledConnection) -> bool:
+        idle_for = time.monotonic() - pooled.idle_since
+        return idle_for < self._idle_timeout and _is_open(pooled)
+
+    async def _healthy(self, pooled: _PooledConnection) -> bool:
+        if not _is_open(pooled):
+            return False
+        if time.monotonic() - pooled.idle_since < self._ping_after:
+            return True
+        websocket = _websocket(pooled)
+        if websocket is None:
+            return True
+        try:
+            pong = await websocket.ping()
+            await asyncio.wait_for(pong, self._ping_timeout)
+        except Exception:  # noqa: BLE001 - any failure means a dead socket
+            return False
+        return True
+
+
+def _websocket(pooled: _PooledConnection) -> Any:
+    return getattr(pooled.session.connection, "_connection", None)
+
+
+def _is_open(pooled: _PooledConnection) -> bool:
+    # The SDK connection wraps a websockets connection whose background reader
+    # keeps its state current, so dropped sockets are caught without a round
+    # trip. Only long idle connections pay for a ping.
+    state = getattr(_websocket(pooled), "state", None)
+    return state is None or getattr(state, "name", None) == "OPEN"
+
+
+class _PooledWebSocketResponsesSession:
+    def __init__(
+        self,
+        pool: PooledWebSocketResponsesTransport,
+        client: AsyncOpenAI,
+        connect: Callable[[], Any],
+    ) -> None:
+        self._pool = pool
+        self._client = client
+        self._connect = connect
+        self._pooled: _PooledConnection | None = None
+        self._checked = False
+        self._in_flight = False
+
+    async def events(self, request: dict[str, Any]) -> AsyncIterator[Any]:
+        pooled = await self._acquire()
+        self._in_flight = True
+        async for event in pooled.session.events(request):
+            yield event
+        self._in_flight = False
+
+    def can_continue_from(self, response_id: str) -> bool:
+        if self._pooled is None:
+            self._pooled = self._pool._take(self._client, response_id)
+        return self._pooled is not None and self._pooled.session.can_continue_from(
+            response_id
+        )
+
+    def remember(self, response_id: str) -> None:
+        if self._pooled is not None:
+            self._pooled.session.remember(response_id)
+
+    async def release(self) -> None:
+        pooled, self._pooled = self._pooled, None
+        if pooled is None:
+            return
+        if self._in_flight:
+            await pooled.close()
+        else:
+            await self._pool._put(pooled)
+
+    async def discard(self) -> None:
+        pooled, self._pooled = self._pooled, None
+        if pooled is not None:
+            await pooled.close()
+
+    async def _acquire(self) -> _PooledConnection:
+        if self._pooled is not None and not self._checked:
+            self._checked = True
+            if not await self._pool._healthy(self._pooled):
+                # The request may already reference connection-local state;
+                # the server reports it missing and the caller replays.
+                await self._pooled.close()
+                self._pooled = None
+        if self._pooled is not None:
+            return self._pooled
+
+        await self._pool._evict_idle()
+        pooled = self._pool._recycle(self._client)
+        if pooled is not None and not await self._pool._healthy(pooled):
+            await pooled.close()
+            pooled = None
+        if pooled is None:
+            manager = self._connect()
+            connection = await manager.__aenter__()
+            pooled = _PooledConnection(
+                client=self._client,
+                manager=manager,
+                session=_WebSocketResponsesSession(connection),
+            )
+        self._checked = True
+        self._pooled = pooled
+        return pooled
+
+
+def _connect_method(client: AsyncOpenAI) -> Callable[[], Any]:
+    connect = getattr(client.responses, "connect", None)
+    if connect is None:
+        raise LLMifyError(
+            "Responses WebSocket transport requires a newer OpenAI SDK. "
+            "Install py-llmify[websocket]."
+        )
+    return connect
+
+
+@contextmanager
+def _websocket_errors() -> Iterator[None]:
+    try:
+        yield
+    except OpenAIError as exc:
+        if "openai[realtime]" not in str(exc):
+            raise
+        raise LLMifyError(
+            "Responses WebSocket transport requires the 'websockets' package. "
+            "Install py-llmify[websocket]."
+        ) from exc
+
 
 def _http_request(request: dict[str, Any]) -> dict[str, Any]:
     request = {**request, "stream": True}
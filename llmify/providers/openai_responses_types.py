@@ -1,5 +1,8 @@
+import hashlib
+import json
+import zlib
 from enum import StrEnum
-from typing import Any, Literal
+from typing import Any, Literal, Self
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -28,6 +31,24 @@ class PromptCacheOptions(BaseModel):
     ttl: Literal["30m"] | None = None
 
 
+class CompactionPolicy(BaseModel):
+    """Bounds for the stateless replay window kept in ``OpenAIResponsesState``.
+
+    A turn starts at a user message. ``None`` leaves a dimension unbounded.
+    Dropping turns changes the replayed prefix, so the next request misses the
+    provider's prompt cache once.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    max_turns: int | None = Field(default=None, ge=1)
+    """Keep only the most recent turns."""
+    keep_reasoning_turns: int | None = Field(default=None, ge=0)
+    """Drop reasoning items, including encrypted content, from older turns."""
+    max_bytes: int | None = Field(default=None, ge=1)
+    """Cap on the serialized items; older turns lose reasoning, then whole turns."""
+
+
 class ResponsesOptions(BaseModel):
     """Responses-only request, continuation, and transport behavior."""
 
@@ -38,6 +59,7 @@ class ResponsesOptions(BaseModel):
     reasoning_summary: ReasoningSummary | None = None
     prompt_cache_key: str | None = None
     prompt_cache_options: PromptCacheOptions | None = None
+    compaction: CompactionPolicy | None = None
 
 
 class OpenAIResponsesState(BaseModel):
@@ -53,6 +75,106 @@ class OpenAIResponsesState(BaseModel):
     output_items: list[dict[str, Any]] = Field(default_factory=list)
     response_id: str | None = None
     instructions: str | None = None
+    prompt_cache_key: str | None = None
+
+    def to_bytes(self, *, since: int = 0) -> bytes:
+        """Compact binary form for session stores.
+
+        Identical items are stored once, which mostly dedups ``output_items``
+        against the tail of ``input_items``, and the result is
+        zlib-compressed behind a version header. With ``since``, only
+        ``input_items[since:]`` is included; restore such a delta with
+        ``from_bytes(data, base=...)`` on a state whose first ``since`` input
+        items are the ones this state started with. The delta records a digest
+        of that prefix, so a base whose history was since compacted or
+        otherwise rewritten is rejected instead of silently restored.
+        """
+        if not 0 <= since <= len(self.input_items):
+            raise ValueError("'since' must be between 0 and len(input_items).")
+
+        table: dict[str, int] = {}
+
+        def index(item: dict[str, Any]) -> int:
+            encoded = json.dumps(item, separators=(",", ":"), ensure_ascii=False)
+            return table.setdefault(encoded, len(table))
+
+        inputs = [index(item) for item in self.input_items[since:]]
+        outputs = [index(item) for item in self.output_items]
+        header = json.dumps(
+            [
+                self.continuation_mode.value,
+                self.response_id,
+                self.instructions,
+                self.prompt_cache_key,
+                since,
+                _prefix_digest(self.input_items[:since]) if since else None,
+                inputs,
+                outputs,
+            ],
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        payload = f"[{header},[{','.join(table)}]]".encode()
+        return _STATE_HEADER + zlib.compress(payload)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *, base: Self | None = None) -> Self:
+        """Restore a state written by ``to_bytes``.
+
+        A delta needs the ``base`` state it was taken from; its first
+        ``since`` input items are kept and the delta's items appended. A base
+        whose first ``since`` items differ from the delta's raises
+        ``ValueError``.
+        """
+        if data[: len(_STATE_HEADER)] != _STATE_HEADER:
+            raise ValueError(
+                "Not an OpenAIResponsesState payload or unsupported version."
+            )
+        try:
+            header, table = json.loads(zlib.decompress(data[len(_STATE_HEADER) :]))
+        except (zlib.error, ValueError) as exc:
+            raise ValueError(f"Corrupt OpenAIResponsesState payload: {exc}") from exc
+        (
+            mode,
+            response_id,
+            instructions,
+            cache_key,
+            since,
+            prefix_digest,
+            inputs,
+            outputs,
+        ) = header
+
+        prefix: list[dict[str, Any]] = []
+        if since:
+            if base is None or len(base.input_items) < since:
+                raise ValueError(
+                    f"Delta continues {since} input items; pass the base state."
+                )
+            prefix = base.input_items[:since]
+            if _prefix_digest(prefix) != prefix_digest:
+                raise ValueError(
+                    f"The base state's first {since} input items differ from the "
+                    "ones the delta continues, e.g. after compaction."
+                )
+
+        return cls(
+            continuation_mode=mode,
+            input_items=[*prefix, *(table[i] for i in inputs)],
+            output_items=[table[i] for i in outputs],
+            response_id=response_id,
+            instructions=instructions,
+            prompt_cache_key=cache_key,
+        )
+
+
+_STATE_HEADER = b"LRS\x01"
+"""Magic bytes plus format version of ``OpenAIResponsesState.to_bytes``."""
+
+
+def _prefix_digest(items: list[dict[str, Any]]) -> str:
+    encoded = json.dumps(items, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
 
 
 class OpenAIResponsesUsage(ChatInvokeUsage):
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from llmify.messages import AssistantMessage, Message, ToolResultMessage
+from llmify.tokens import TokenEstimator
+
+_CHARS_PER_TOKEN = 4
+_TOKENS_PER_MESSAGE = 4
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitReservation:
+    """Budget debited for one request, settled by ``RateLimiter.reconcile``."""
+
+    tokens: int
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        return max(amount - self.level, 0.0) / self.rate
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute budget.
+
+    Each request waits until both buckets can cover it, then debits one
+    request and its estimated prompt tokens. Once the provider reports usage,
+    ``reconcile`` corrects the token debit to the actual total, so long
+    completions borrow from the next requests' budget; a failed attempt is
+    reconciled to zero. Waiters are served in
+    arrival order. Share one instance between models that draw from the same
+    provider quota.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+    ) -> None:
+        for name, value in (
+            ("requests_per_minute", requests_per_minute),
+            ("tokens_per_minute", tokens_per_minute),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"'{name}' must be greater than 0.")
+
+        self._requests = (
+            _TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> RateLimitReservation:
+        """Wait for budget, then debit one request and ``tokens`` tokens."""
+        if self._tokens is not None:
+            # A single request larger than the whole budget could never run.
+            tokens = min(tokens, int(self._tokens.capacity))
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                delay = 0.0
+                if self._requests is not None:
+                    self._requests.refill(now)
+                    delay = max(delay, self._requests.wait_time(1))
+                if self._tokens is not None:
+                    self._tokens.refill(now)
+                    delay = max(delay, self._tokens.wait_time(tokens))
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            if self._requests is not None:
+                self._requests.level -= 1
+            if self._tokens is not None:
+                self._tokens.level -= tokens
+        return RateLimitReservation(tokens=tokens)
+
+    def reconcile(self, reservation: RateLimitReservation, total_tokens: int) -> None:
+        """Replace the estimated token debit with the reported total."""
+        if self._tokens is None:
+            return
+        self._tokens.refill(time.monotonic())
+        self._tokens.level = min(
+            self._tokens.capacity,
+            self._tokens.level - (total_tokens - reservation.tokens),
+        )
+
+
+def estimate_prompt_tokens(
+    messages: list[Message], estimator: TokenEstimator | None = None
+) -> int:
+    """Estimate a request's prompt tokens, by default from its character count."""
+    parts: list[str] = []
+    for message in messages:
+        if isinstance(message, ToolResultMessage):
+            parts.append(message.content)
+            continue
+        parts.append(message.text)
+        if isinstance(message, AssistantMessage):
+            parts.extend(call.function.arguments for call in message.tool_calls)
+    text = "".join(parts)
+    tokens = (
+        len(text) // _CHARS_PER_TOKEN if estimator is None else estimator.count(text)
+    )
+    return tokens + _TOKENS_PER_MESSAGE * len(messages)
@@ -1,11 +1,15 @@
 import asyncio
 import inspect
 import random
+import time
 from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Never
+from types import TracebackType
+from typing import Never, Self
 
 from llmify.exceptions import RateLimitError, RetryableError
+from llmify.tracing import AttributeValue, set_error, start_span
 
 
 @dataclass(frozen=True, slots=True)
@@ -54,12 +58,13 @@ async def sleep_before_retry(
         error=error,
     )
 
-    if on_retry is not None:
-        result = on_retry(event)
-        if inspect.isawaitable(result):
-            await result
+    with start_span("llmify.backoff", {"llmify.retry.delay": delay}):
+        if on_retry is not None:
+            result = on_retry(event)
+            if inspect.isawaitable(result):
+                await result
 
-    await asyncio.sleep(delay)
+        await asyncio.sleep(delay)
 
 
 async def retry_call[T](
@@ -71,15 +76,17 @@ async def retry_call[T](
 ) -> T:
     """Run an idempotent operation, retrying mapped transient failures."""
     for retry_number in range(max_retries + 1):
-        try:
-            return await operation()
-        except Exception as exc:  # noqa: BLE001 - provider SDK errors vary
-            error = map_error(exc) if map_error is not None else exc
-            if not isinstance(error, RetryableError):
-                _raise_mapped(error, exc)
-            if retry_number == max_retries:
-                _raise_mapped(error, exc)
-            await sleep_before_retry(error, retry_number, max_retries, on_retry)
+        with start_span(*_attempt_span(retry_number)) as span:
+            try:
+                return await operation()
+            except Exception as exc:  # noqa: BLE001 - provider SDK errors vary
+                error = map_error(exc) if map_error is not None else exc
+                set_error(span, error)
+                if not isinstance(error, RetryableError):
+                    _raise_mapped(error, exc)
+                if retry_number == max_retries:
+                    _raise_mapped(error, exc)
+        await sleep_before_retry(error, retry_number, max_retries, on_retry)
 
     raise RuntimeError("Retry loop exhausted without returning or raising.")
 
@@ -94,18 +101,129 @@ async def retry_stream[T](
     """Retry a stream only while doing so cannot replay already emitted output."""
     for retry_number in range(max_retries + 1):
         emitted = False
-        try:
-            async for event in stream_factory():
-                emitted = True
-                yield event
+        with start_span(*_attempt_span(retry_number)) as span:
+            try:
+                async with aclosing(stream_factory()) as stream:
+                    async for event in stream:
+                        emitted = True
+                        yield event
+                return
+            except Exception as exc:  # noqa: BLE001 - provider SDK errors vary
+                error = map_error(exc) if map_error is not None else exc
+                set_error(span, error)
+                if not isinstance(error, RetryableError):
+                    _raise_mapped(error, exc)
+                if emitted or retry_number == max_retries:
+                    _raise_mapped(error, exc)
+        await sleep_before_retry(error, retry_number, max_retries, on_retry)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent requests, driven by retry signals.
+
+    Use it as an async context manager around each request and pass it as
+    the ``on_retry`` callback. Every successful request grows the limit by
+    ``increase / limit``, about one slot per window of successes. A rate
+    limit or 5xx, whether reported as a ``RetryEvent`` or raised out of the
+    context, multiplies the limit by ``decrease_factor``; further signals
+    within ``cooldown`` seconds count as the same congestion event.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit."
+            )
+        if not 0 < decrease_factor < 1:
+            raise ValueError("'decrease_factor' must be between 0 and 1.")
+
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._increase = increase
+        self._decrease_factor = decrease_factor
+        self._cooldown = cooldown
+        self._last_decrease: float | None = None
+        self._in_flight = 0
+        self._waiting = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    def __call__(self, event: RetryEvent) -> None:
+        self.record_error(event.error)
+
+    def record_success(self) -> None:
+        self._limit = min(self._limit + self._increase / self._limit, self._max_limit)
+
+    def record_error(self, error: BaseException) -> None:
+        if not _signals_congestion(error):
+            return
+        now = time.monotonic()
+        if (
+            self._last_decrease is not None
+            and now - self._last_decrease < self._cooldown
+        ):
             return
-        except Exception as exc:  # noqa: BLE001 - provider SDK errors vary
-            error = map_error(exc) if map_error is not None else exc
-            if not isinstance(error, RetryableError):
-                _raise_mapped(error, exc)
-            if emitted or retry_number == max_retries:
-                _raise_mapped(error, exc)
-            await sleep_before_retry(error, retry_number, max_retries, on_retry)
+        self._last_decrease = now
+        self._limit = max(self._limit * self._decrease_factor, self._min_limit)
+
+    async def __aenter__(self) -> Self:
+        async with self._condition:
+            self._waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc is None:
+            self.record_success()
+        else:
+            self.record_error(exc)
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+
+def _signals_congestion(error: BaseException) -> bool:
+    if isinstance(error, RateLimitError):
+        return True
+    return (
+        isinstance(error, RetryableError)
+        and error.status_code is not None
+        and error.status_code >= 500
+    )
+
+
+def _attempt_span(retry_number: int) -> tuple[str, dict[str, AttributeValue]]:
+    return "llmify.attempt", {"llmify.attempt": retry_number + 1}
 
 
 def _raise_mapped(error: Exception, original: Exception) -> Never:
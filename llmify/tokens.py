@@ -0,0 +1,76 @@
+from functools import lru_cache
+from typing import Literal, Protocol, runtime_checkable
+
+type TokenFamily = Literal["openai", "anthropic", "google", "cerebras", "generic"]
+
+# Characters per token of each family's tokenizer on English prose and code.
+_CHARS_PER_TOKEN: dict[TokenFamily, float] = {
+    "openai": 4.0,
+    "anthropic": 3.5,
+    "google": 4.0,
+    "cerebras": 4.0,
+    "generic": 4.0,
+}
+
+
+@runtime_checkable
+class TokenEstimator(Protocol):
+    """Counts the tokens a model's tokenizer would produce for ``text``."""
+
+    def count(self, text: str) -> int: ...
+
+
+class HeuristicTokenEstimator:
+    """Character-based estimate; fast and dependency-free, but approximate."""
+
+    def __init__(self, chars_per_token: float = 4.0) -> None:
+        if chars_per_token <= 0:
+            raise ValueError("'chars_per_token' must be greater than 0.")
+        self._chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return int(len(text) / self._chars_per_token)
+
+
+class TiktokenEstimator:
+    """Exact counts for OpenAI models via the ``tiktoken`` package.
+
+    Models ``tiktoken`` does not know fall back to ``encoding``.
+    """
+
+    def __init__(self, model: str | None = None, encoding: str = "o200k_base") -> None:
+        try:
+            import tiktoken
+        except ImportError:
+            raise ImportError(
+                "The 'tiktoken' package is required for TiktokenEstimator. "
+                "Install it with: pip install py-llmify[tiktoken]"
+            )
+        try:
+            self._encoding = (
+                tiktoken.encoding_for_model(model)
+                if model is not None
+                else tiktoken.get_encoding(encoding)
+            )
+        except KeyError:
+            self._encoding = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=64)
+def default_token_estimator(family: TokenFamily, model: str) -> TokenEstimator:
+    """The most accurate estimator available locally for ``family``.
+
+    OpenAI models are counted exactly when ``tiktoken`` is installed. Anthropic
+    and Gemini tokenizers are only reachable through their count-tokens APIs,
+    which cost a round trip, so those families use a heuristic tuned to their
+    tokenizer, as does every family without ``tiktoken``.
+    """
+    if family == "openai":
+        try:
+            return TiktokenEstimator(model)
+        except Exception:  # noqa: BLE001 - missing package or encoding download failed
+            return HeuristicTokenEstimator(_CHARS_PER_TOKEN[family])
+    return HeuristicTokenEstimator(_CHARS_PER_TOKEN[family])
@@ -0,0 +1,97 @@
+import asyncio
+import inspect
+import json
+from collections.abc import Awaitable, Callable
+from typing import cast
+
+from pydantic import BaseModel
+
+from llmify.messages import ToolCall
+from llmify.tools.function import FunctionTool
+from llmify.tools.protocol import Tool
+from llmify.tracing import AttributeValue, set_error, start_span
+
+type ToolExecutor = Callable[[ToolCall], object | Awaitable[object]]
+
+
+async def execute_tool_calls(
+    calls: list[ToolCall],
+    tools: list[Tool | dict],
+    *,
+    executor: ToolExecutor | None,
+    max_parallel_tools: int,
+) -> list[str]:
+    """Run tool calls concurrently and return their outputs in call order.
+
+    FunctionTool instances execute directly, synchronous ones in a worker
+    thread. Any other tool needs ``executor``. Exceptions become JSON error
+    outputs so the model can recover.
+    """
+    by_name = tools_by_name(tools)
+    semaphore = asyncio.Semaphore(max_parallel_tools)
+
+    async def execute(call: ToolCall) -> str:
+        async with semaphore:
+            return await execute_tool_call(call, by_name, executor=executor)
+
+    return list(await asyncio.gather(*(execute(call) for call in calls)))
+
+
+def tools_by_name(tools: list[Tool | dict]) -> dict[str, Tool]:
+    return {
+        tool.name: tool
+        for tool in tools
+        if not isinstance(tool, dict) and hasattr(tool, "name")
+    }
+
+
+async def execute_tool_call(
+    call: ToolCall,
+    tools_by_name: dict[str, Tool],
+    *,
+    executor: ToolExecutor | None,
+) -> str:
+    attributes: dict[str, AttributeValue] = {
+        "gen_ai.operation.name": "execute_tool",
+        "gen_ai.tool.name": call.function.name,
+        "gen_ai.tool.call.id": call.id,
+    }
+    with start_span(f"execute_tool {call.function.name}", attributes) as span:
+        try:
+            if executor is not None:
+                result = executor(call)
+            else:
+                tool = tools_by_name.get(call.function.name)
+                if tool is None or not callable(tool):
+                    raise LookupError(
+                        f"No executable tool named {call.function.name!r}."
+                    )
+                arguments = tool.parse_arguments(call.function.arguments)
+                if not isinstance(arguments, dict):
+                    raise TypeError("Function tool arguments must decode to an object.")
+                if isinstance(tool, FunctionTool):
+                    result = await tool.acall(**arguments)
+                else:
+                    result = cast(Callable[..., object], tool)(**arguments)
+            if inspect.isawaitable(result):
+                result = await result
+            return serialize_tool_output(result)
+        except Exception as exc:  # noqa: BLE001 - failures become tool outputs
+            set_error(span, exc)
+            return json.dumps(
+                {
+                    "error": {
+                        "type": type(exc).__name__,
+                        "message": str(exc),
+                    }
+                },
+                ensure_ascii=False,
+            )
+
+
+def serialize_tool_output(value: object) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    return json.dumps(value, ensure_ascii=False, default=str)
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 import json
 from typing import Any, Callable, get_type_hints, overload
@@ -25,15 +26,22 @@ class FunctionTool:
         fn: Callable,
         name: str | None = None,
         description: str | None = None,
+        cache: bool = False,
     ):
         self._fn = fn
         self._name = name or fn.__name__
         self._description = description or (fn.__doc__.strip() if fn.__doc__ else "")
+        self._cache = cache
 
     @property
     def name(self) -> str:
         return self._name
 
+    @property
+    def cache(self) -> bool:
+        """Whether to place a prompt-cache breakpoint after this tool's definition."""
+        return self._cache
+
     def to_openai_schema(self) -> dict[str, Any]:
         return {
             "type": "function",
@@ -107,6 +115,18 @@ class FunctionTool:
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         return self._fn(*args, **kwargs)
 
+    async def acall(self, *args: Any, **kwargs: Any) -> Any:
+        """Call the function without blocking the event loop.
+
+        Coroutine functions are awaited; plain functions run in a worker thread.
+        """
+        if inspect.iscoroutinefunction(self._fn):
+            return await self._fn(*args, **kwargs)
+        result = await asyncio.to_thread(self._fn, *args, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
 
 @overload
 def tool(fn: _AnyCallable) -> FunctionTool: ...
@@ -118,6 +138,7 @@ def tool(
     *,
     name: str | None = None,
     description: str | None = None,
+    cache: bool = False,
 ) -> Callable[[_AnyCallable], FunctionTool]: ...
 
 
@@ -126,9 +147,10 @@ def tool(
     *,
     name: str | None = None,
     description: str | None = None,
+    cache: bool = False,
 ) -> FunctionTool | Callable[[_AnyCallable], FunctionTool]:
     def decorator(func: _AnyCallable) -> FunctionTool:
-        return FunctionTool(func, name=name, description=description)
+        return FunctionTool(func, name=name, description=description, cache=cache)
 
     if fn is None:
         return decorator
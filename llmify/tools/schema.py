@@ -27,15 +27,22 @@ class RawSchemaTool:
         name: str,
         schema: dict[str, Any],
         description: str = "",
+        cache: bool = False,
     ):
         self._name = name
         self._schema = schema
         self._description = description
+        self._cache = cache
 
     @property
     def name(self) -> str:
         return self._name
 
+    @property
+    def cache(self) -> bool:
+        """Whether to place a prompt-cache breakpoint after this tool's definition."""
+        return self._cache
+
     def to_openai_schema(self) -> dict[str, Any]:
         return {
             "type": "function",
@@ -0,0 +1,95 @@
+from collections.abc import Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Protocol, runtime_checkable
+
+type AttributeValue = str | bool | int | float | Sequence[str]
+
+
+@runtime_checkable
+class Span(Protocol):
+    def set_attribute(self, key: str, value: AttributeValue) -> None: ...
+
+
+@runtime_checkable
+class Tracer(Protocol):
+    """The part of an OpenTelemetry ``Tracer`` llmify uses.
+
+    The tracer records exceptions raised out of a span and marks it failed, as
+    OpenTelemetry's ``start_as_current_span`` does by default.
+    """
+
+    def start_as_current_span(
+        self, name: str, *, attributes: Mapping[str, AttributeValue] | None = None
+    ) -> AbstractContextManager[Span]: ...
+
+
+class _NoOpSpan:
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+
+NO_SPAN = _NoOpSpan()
+_NO_SPAN_CONTEXT = nullcontext(NO_SPAN)
+
+_tracer: Tracer | None = None
+
+
+def enable_tracing(tracer: Tracer | None = None) -> None:
+    """Emit spans for model calls, retry attempts, tool executions and tool rounds.
+
+    Without ``tracer``, spans go to OpenTelemetry's global tracer provider,
+    which needs the ``opentelemetry-api`` package. Until this is called every
+    span is a shared no-op.
+    """
+    if tracer is None:
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "The 'opentelemetry-api' package is required for enable_tracing() "
+                "without a tracer. Install it with: pip install py-llmify[tracing]"
+            )
+        tracer = trace.get_tracer("llmify")
+    global _tracer
+    _tracer = tracer
+
+
+def disable_tracing() -> None:
+    """Stop emitting spans."""
+    global _tracer
+    _tracer = None
+
+
+def start_span(
+    name: str, attributes: Mapping[str, AttributeValue]
+) -> AbstractContextManager[Span]:
+    """Open ``name`` as the current span, or a no-op while tracing is disabled."""
+    if _tracer is None:
+        return _NO_SPAN_CONTEXT
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def set_error(span: Span, error: BaseException) -> None:
+    if span is not NO_SPAN:
+        span.set_attribute("error.type", type(error).__qualname__)
+
+
+def set_response_attributes(span: Span, response: Any) -> None:
+    """Record the usage and stop reason of a completion or ``StreamEnd``."""
+    if span is NO_SPAN:
+        return
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        span.set_attribute("gen_ai.usage.input_tokens", usage.prompt_tokens)
+        span.set_attribute("gen_ai.usage.output_tokens", usage.completion_tokens)
+        if usage.prompt_cached_tokens is not None:
+            span.set_attribute(
+                "gen_ai.usage.cache_read.input_tokens", usage.prompt_cached_tokens
+            )
+    stop_reason = getattr(response, "stop_reason", None)
+    if stop_reason is not None:
+        span.set_attribute("gen_ai.response.finish_reasons", [stop_reason])
@@ -0,0 +1,281 @@
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+
+from llmify.views import ChatInvokeUsage
+
+_TOKENS_PER_PRICE_UNIT = 1_000_000
+# Pending records past which a recorder folds them into the totals itself.
+_FOLD_THRESHOLD = 1024
+
+_active_tags: ContextVar[tuple[str, ...]] = ContextVar("llmify_usage_tags", default=())
+
+
+@dataclass(frozen=True, slots=True)
+class ModelPrice:
+    """Prices in currency units per million tokens.
+
+    Cached reads, cache writes and image input fall back to ``input`` when
+    unset. Reasoning tokens are billed as output, as providers report them
+    inside the completion tokens.
+    """
+
+    input: float
+    output: float
+    cached_input: float | None = None
+    cache_write: float | None = None
+    image_input: float | None = None
+
+
+type PriceTable = Mapping[str, ModelPrice]
+"""Prices keyed by model name; ``OpenAIModel``, ``AnthropicModel``,
+``GoogleModel`` and ``CerebrasModel`` members work as keys."""
+
+
+@dataclass(frozen=True, slots=True)
+class UsageTotals:
+    """Aggregated usage of the requests a ``UsageMeter`` recorded.
+
+    ``prompt_tokens`` is the full prompt size for every provider, including
+    cached reads and cache writes, even where the provider reports those
+    separately (Anthropic). ``cost`` covers the requests whose model has a
+    price; ``unpriced_requests`` counts the rest.
+    """
+
+    requests: int = 0
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    cache_write_tokens: int = 0
+    image_prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    cost: float = 0.0
+    unpriced_requests: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Share of prompt tokens read from the provider's prompt cache."""
+        if not self.prompt_tokens:
+            return None
+        return self.cached_prompt_tokens / self.prompt_tokens
+
+    def __add__(self, other: "UsageTotals") -> "UsageTotals":
+        return UsageTotals(
+            **{
+                field.name: getattr(self, field.name) + getattr(other, field.name)
+                for field in fields(self)
+            }
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UsageWindow:
+    start: float
+    """Unix time at which the window opened."""
+    totals: UsageTotals
+
+
+@dataclass(frozen=True, slots=True)
+class _Record:
+    at: float
+    model: str
+    tags: tuple[str, ...]
+    totals: UsageTotals
+
+
+class UsageMeter:
+    """Aggregates the usage and cost of every request made by the models it is given.
+
+    Pass one meter as ``usage_meter`` to any number of models. Each provider
+    request is recorded per model, per tag and per ``window`` seconds of wall
+    clock; the latest ``retain_windows`` windows are kept. Requests made
+    inside ``tagged()`` blocks are also counted under those tags. Responses
+    served from the response cache are not billed and are not recorded.
+
+    Recording only appends to a deque, which is atomic, so models on other
+    threads or event loops never wait for a lock. Reads fold the pending
+    records into the totals. A meter that is never read folds them once they
+    pile up, on whichever recorder finds the fold lock free, so memory stays
+    bounded by the retained windows rather than the request count.
+    """
+
+    def __init__(
+        self,
+        prices: PriceTable | None = None,
+        *,
+        window: float = 60.0,
+        retain_windows: int = 60,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("'window' must be greater than 0.")
+        if retain_windows < 1:
+            raise ValueError("'retain_windows' must be greater than or equal to 1.")
+
+        self._prices: dict[str, ModelPrice] = dict(prices or {})
+        self._window = window
+        self._retain_windows = retain_windows
+        self._pending: deque[_Record] = deque()
+        self._fold_lock = threading.Lock()
+        # Keyed by (model, tag); tag None holds every request of the model.
+        self._totals: dict[tuple[str, str | None], UsageTotals] = {}
+        self._windows: dict[float, dict[tuple[str, str | None], UsageTotals]] = {}
+
+    def set_price(self, model: str, price: ModelPrice) -> None:
+        """Add or replace a price; it applies to requests recorded from now on."""
+        self._prices[model] = price
+
+    @contextmanager
+    def tagged(self, *tags: str) -> Iterator[None]:
+        """Tag every request made inside this block, including nested tasks."""
+        token = _active_tags.set((*_active_tags.get(), *tags))
+        try:
+            yield
+        finally:
+            _active_tags.reset(token)
+
+    def record(
+        self, model: str, usage: ChatInvokeUsage, *, tags: Iterable[str] = ()
+    ) -> None:
+        """Record one request; ``tags`` are added to the active ``tagged()`` tags."""
+        if usage.from_cache:
+            return
+        self._pending.append(
+            _Record(
+                at=time.time(),
+                model=model,
+                tags=tuple(dict.fromkeys((*_active_tags.get(), *tags))),
+                totals=self._price(model, usage),
+            )
+        )
+        if len(self._pending) >= _FOLD_THRESHOLD and self._fold_lock.acquire(
+            blocking=False
+        ):
+            try:
+                self._drain()
+            finally:
+                self._fold_lock.release()
+
+    def totals(
+        self, *, model: str | None = None, tag: str | None = None
+    ) -> UsageTotals:
+        """Usage since creation or ``reset()``, optionally for one model or tag."""
+        with self._fold_lock:
+            self._drain()
+            return _sum(self._totals, model=model, tag=tag)
+
+    def by_model(self) -> dict[str, UsageTotals]:
+        with self._fold_lock:
+            self._drain()
+            return {
+                model: totals
+                for (model, tag), totals in self._totals.items()
+                if tag is None
+            }
+
+    def by_tag(self) -> dict[str, UsageTotals]:
+        result: dict[str, UsageTotals] = {}
+        with self._fold_lock:
+            self._drain()
+            for (_, tag), totals in self._totals.items():
+                if tag is not None:
+                    result[tag] = result.get(tag, UsageTotals()) + totals
+        return result
+
+    def windows(
+        self, *, model: str | None = None, tag: str | None = None
+    ) -> list[UsageWindow]:
+        """Retained windows with recorded requests, oldest first."""
+        with self._fold_lock:
+            self._drain()
+            return [
+                UsageWindow(start=start, totals=_sum(entries, model=model, tag=tag))
+                for start, entries in sorted(self._windows.items())
+            ]
+
+    def reset(self) -> None:
+        with self._fold_lock:
+            self._drain()
+            self._totals.clear()
+            self._windows.clear()
+
+    def _price(self, model: str, usage: ChatInvokeUsage) -> UsageTotals:
+        cached = usage.prompt_cached_tokens or 0
+        written = _cache_write_tokens(usage)
+        images = getattr(usage, "prompt_image_tokens", None) or 0
+        prompt = usage.prompt_tokens
+        if not usage.prompt_includes_cache:
+            prompt += cached + written
+
+        price = self._prices.get(model)
+        cost = 0.0
+        if price is not None:
+            uncached = max(prompt - cached - written - images, 0)
+            cost = (
+                uncached * price.input
+                + cached * _or(price.cached_input, price.input)
+                + written * _or(price.cache_write, price.input)
+                + images * _or(price.image_input, price.input)
+                + usage.completion_tokens * price.output
+            ) / _TOKENS_PER_PRICE_UNIT
+
+        return UsageTotals(
+            requests=1,
+            prompt_tokens=prompt,
+            cached_prompt_tokens=cached,
+            cache_write_tokens=written,
+            image_prompt_tokens=images,
+            completion_tokens=usage.completion_tokens,
+            reasoning_tokens=getattr(usage, "reasoning_tokens", None) or 0,
+            cost=cost,
+            unpriced_requests=int(price is None),
+        )
+
+    def _drain(self) -> None:
+        while self._pending:
+            record = self._pending.popleft()
+            start = math.floor(record.at / self._window) * self._window
+            window = self._windows.setdefault(start, {})
+            for key in (
+                (record.model, None),
+                *((record.model, tag) for tag in record.tags),
+            ):
+                self._totals[key] = self._totals.get(key, UsageTotals()) + record.totals
+                window[key] = window.get(key, UsageTotals()) + record.totals
+
+        for start in sorted(self._windows)[: -self._retain_windows]:
+            del self._windows[start]
+
+
+def _sum(
+    entries: Mapping[tuple[str, str | None], UsageTotals],
+    *,
+    model: str | None,
+    tag: str | None,
+) -> UsageTotals:
+    total = UsageTotals()
+    for (entry_model, entry_tag), totals in entries.items():
+        if entry_tag == tag and (model is None or entry_model == model):
+            total += totals
+    return total
+
+
+def _cache_write_tokens(usage: ChatInvokeUsage) -> int:
+    # Anthropic and the Responses API name the counter differently.
+    for name in ("prompt_cache_creation_tokens", "prompt_cache_write_tokens"):
+        value = getattr(usage, name, None)
+        if value is not None:
+            return value
+    return 0
+
+
+def _or(value: float | None, default: float) -> float:
+    return default if value is None else value
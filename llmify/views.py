@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import Literal
+from typing import ClassVar, Literal
 
 from pydantic import BaseModel, Field
 
@@ -18,6 +18,31 @@ class ChatInvokeUsage(BaseModel):
     prompt_cached_tokens: int | None = None
     completion_tokens: int
     total_tokens: int
+    from_cache: bool = False
+    """Whether this usage was replayed from a response cache instead of billed again."""
+
+    prompt_includes_cache: ClassVar[bool] = True
+    """Whether ``prompt_tokens`` already counts cached and cache-written tokens."""
+
+
+def add_usage[U: ChatInvokeUsage](left: U | None, right: U | None) -> U | None:
+    """Sum two usage reports field by field, e.g. across tool-loop rounds.
+
+    Optional counters stay ``None`` only when neither side reported them.
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    totals: dict[str, object] = {}
+    for name, field in type(left).model_fields.items():
+        if field.annotation is bool:
+            totals[name] = getattr(left, name) and getattr(right, name, False)
+            continue
+        a, b = getattr(left, name), getattr(right, name, None)
+        totals[name] = None if a is None and b is None else (a or 0) + (b or 0)
+    return type(left)(**totals)
 
 
 class ChatInvokeCompletion[T](BaseModel):
@@ -32,6 +57,7 @@ class ChatInvokeCompletion[T](BaseModel):
 class StreamEventType(StrEnum):
     TEXT = "text"
     TOOL_CALL = "tool_call"
+    TOOL_RESULT = "tool_result"
     END = "end"
 
 
@@ -53,6 +79,14 @@ class StreamToolCall(BaseModel):
     tool_call: ToolCall
 
 
+class StreamToolResult(BaseModel):
+    """Emitted by ``stream_with_tools`` once a tool call's output is ready."""
+
+    type: Literal[StreamEventType.TOOL_RESULT] = StreamEventType.TOOL_RESULT
+    tool_call_id: str
+    content: str
+
+
 class StreamEnd(BaseModel):
     """Final event. Always emitted exactly once at the end of the stream."""
 
@@ -63,4 +97,10 @@ class StreamEnd(BaseModel):
     completion: str = ""
 
 
-type StreamEvent = StreamTextDelta | StreamProviderEvent | StreamToolCall | StreamEnd
+type StreamEvent = (
+    StreamTextDelta
+    | StreamProviderEvent
+    | StreamToolCall
+    | StreamToolResult
+    | StreamEnd
+)
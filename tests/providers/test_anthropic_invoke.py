@@ -10,6 +10,7 @@ pytest.importorskip("anthropic")
 
 from llmify.messages import (
     AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
     Function,
@@ -19,13 +20,15 @@ from llmify.messages import (
     ToolResultMessage,
     UserMessage,
 )
+from llmify.prompt_cache import BreakpointKind
 from llmify.providers.anthropic import (
     ChatAnthropic,
     _build_params,
     _convert_messages,
     _convert_tool,
 )
-from llmify.tools import tool
+from llmify.providers.anthropic_types import AnthropicUsage
+from llmify.tools import RawSchemaTool, tool
 
 
 @tool
@@ -356,6 +359,33 @@ class TestConvertMessages:
             },
         ]
 
+    def test_parses_tool_call_arguments_once_per_message(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        parsed: list[str] = []
+        loads = json.loads
+        monkeypatch.setattr(
+            "llmify.providers.anthropic.json.loads",
+            lambda text: parsed.append(text) or loads(text),
+        )
+        history = [
+            AssistantMessage(
+                tool_calls=[
+                    ToolCall(
+                        id="call_1",
+                        function=Function(name="get_weather", arguments="{}"),
+                    )
+                ]
+            ),
+            ToolResultMessage(tool_call_id="call_1", content="18 degrees"),
+        ]
+
+        _convert_messages(history)
+        _, converted = _convert_messages([*history, UserMessage(content="Thanks")])
+
+        assert parsed == ["{}"]
+        assert len(converted) == 3
+
     def test_omits_empty_assistant_text_before_a_tool_call(self) -> None:
         _, converted = _convert_messages(
             [
@@ -398,6 +428,22 @@ class TestConvertMessages:
             },
         ]
 
+    def test_inlines_image_bytes(self) -> None:
+        image = ContentPartImageBytes(data=b"\x89PNG", media_type="image/png")
+
+        _, converted = _convert_messages([UserMessage(content=[image])])
+
+        assert converted[0]["content"] == [
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": "image/png",
+                    "data": "iVBORw==",
+                },
+            }
+        ]
+
     def test_references_remote_images_by_url(self) -> None:
         _, converted = _convert_messages(
             [
@@ -438,6 +484,184 @@ class TestConvertTool:
         assert converted["input_schema"]["required"] == ["city"]
 
 
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def _breakpoints(params: dict[str, Any]) -> list[str]:
+    found = [
+        f"tool:{tool['name']}"
+        for tool in params.get("tools", [])
+        if "cache_control" in tool
+    ]
+    if isinstance(params.get("system"), list):
+        found += ["system" for block in params["system"] if "cache_control" in block]
+    for index, message in enumerate(params["messages"]):
+        if isinstance(message["content"], list):
+            found += [
+                f"message:{index}"
+                for block in message["content"]
+                if "cache_control" in block
+            ]
+    return found
+
+
+class TestPromptCaching:
+    def test_marks_the_end_of_each_cached_message(self) -> None:
+        system, converted = _convert_messages(
+            [
+                SystemMessage(content="Long instructions.", cache=True),
+                UserMessage(
+                    content=[
+                        ContentPartTextParam(text="Look"),
+                        ContentPartImageParam(
+                            image_url=ImageURL(url="https://example.com/a.png")
+                        ),
+                    ],
+                    cache=True,
+                ),
+                ToolResultMessage(tool_call_id="call_1", content="ok", cache=True),
+                UserMessage(content="Plain", cache=True),
+                UserMessage(content="Uncached"),
+            ]
+        )
+
+        assert system == [
+            {"type": "text", "text": "Long instructions.", "cache_control": EPHEMERAL}
+        ]
+        assert "cache_control" not in converted[0]["content"][0]
+        assert converted[0]["content"][1]["cache_control"] == EPHEMERAL
+        assert converted[1]["content"][0]["cache_control"] == EPHEMERAL
+        assert converted[2]["content"] == [
+            {"type": "text", "text": "Plain", "cache_control": EPHEMERAL}
+        ]
+        assert converted[3]["content"] == "Uncached"
+
+    def test_marks_cached_tool_definitions(self) -> None:
+        @tool(cache=True)
+        def search(query: str) -> str:
+            return query
+
+        raw = RawSchemaTool(name="lookup", schema={"type": "object"}, cache=True)
+
+        assert _convert_tool(search)["cache_control"] == EPHEMERAL
+        assert _convert_tool(raw)["cache_control"] == EPHEMERAL
+        assert "cache_control" not in _convert_tool(get_weather)
+
+    def test_keeps_stable_then_latest_breakpoints_within_the_limit(self) -> None:
+        @tool(cache=True)
+        def search(query: str) -> str:
+            return query
+
+        messages = [
+            SystemMessage(content="Instructions.", cache=True),
+            *(UserMessage(content=f"turn {index}", cache=True) for index in range(4)),
+        ]
+
+        params = _build_params("claude-test", messages, {}, tools=[search])
+
+        assert _breakpoints(params) == [
+            "tool:search",
+            "system",
+            "message:2",
+            "message:3",
+        ]
+        assert params["messages"][0]["content"] == [{"type": "text", "text": "turn 0"}]
+
+    def test_applies_the_ttl_without_touching_caller_tools(self) -> None:
+        raw = {"name": "lookup", "input_schema": {}, "cache_control": EPHEMERAL}
+
+        params = _build_params(
+            "claude-test",
+            [UserMessage(content="Hi", cache=True)],
+            {},
+            tools=[raw],
+            cache_ttl="1h",
+        )
+
+        assert params["tools"][0]["cache_control"] == {"type": "ephemeral", "ttl": "1h"}
+        assert params["messages"][0]["content"][0]["cache_control"] == {
+            "type": "ephemeral",
+            "ttl": "1h",
+        }
+        assert raw["cache_control"] == EPHEMERAL
+
+    def test_applies_the_ttl_to_a_copy_of_resent_messages(self) -> None:
+        message = UserMessage(content="Hi", cache=True)
+
+        _build_params("claude-test", [message], {}, cache_ttl="1h")
+        params = _build_params("claude-test", [message], {})
+
+        assert params["messages"][0]["content"][0]["cache_control"] == EPHEMERAL
+
+    @pytest.mark.asyncio
+    async def test_sends_breakpoints_and_the_model_ttl(self) -> None:
+        model = _model(cache_ttl="5m")
+        model._client.messages.create = AsyncMock(return_value=_response())
+
+        await model.invoke(
+            [SystemMessage(content="Stable.", cache=True), UserMessage(content="Hi")],
+            tools=[get_weather],
+        )
+
+        request = model._client.messages.create.call_args.kwargs
+        assert request["system"][0]["cache_control"] == {
+            "type": "ephemeral",
+            "ttl": "5m",
+        }
+        assert "cache_control" not in request["tools"][0]
+
+    @pytest.mark.asyncio
+    async def test_auto_strategy_places_and_scores_breakpoints(self) -> None:
+        model = _model(cache_strategy="auto")
+        model._client.messages.create = AsyncMock(
+            return_value=_response(cache_read=4000)
+        )
+        messages = [
+            SystemMessage(content="Stable."),
+            UserMessage(content="Weather in Paris?"),
+            AssistantMessage(
+                content="",
+                tool_calls=[
+                    ToolCall(
+                        id="toolu_1",
+                        function=Function(name="get_weather", arguments="{}"),
+                    )
+                ],
+            ),
+            ToolResultMessage(tool_call_id="toolu_1", content="sunny"),
+        ]
+
+        await model.invoke(messages, tools=[get_weather])
+
+        request = model._client.messages.create.call_args.kwargs
+        assert _breakpoints(request) == [
+            "tool:get_weather",
+            "system",
+            "message:0",
+            "message:2",
+        ]
+        assert not any(message.cache for message in messages)
+        assert model.cache_planner is not None
+        assert model.cache_planner.hit_rate(BreakpointKind.SYSTEM) == 1.0
+
+    def test_reports_the_cache_hit_rate(self) -> None:
+        usage = AnthropicUsage(
+            prompt_tokens=10,
+            completion_tokens=1,
+            total_tokens=11,
+            prompt_cached_tokens=80,
+            prompt_cache_creation_tokens=10,
+        )
+
+        assert usage.prompt_cache_hit_rate == 0.8
+        assert (
+            AnthropicUsage(
+                prompt_tokens=1, completion_tokens=1, total_tokens=2
+            ).prompt_cache_hit_rate
+            is None
+        )
+
+
 class TestClientInjection:
     def test_uses_the_injected_client(self) -> None:
         client = SimpleNamespace(messages=SimpleNamespace())
@@ -0,0 +1,156 @@
+import asyncio
+import random
+
+import pytest
+from pydantic import BaseModel
+
+from llmify.exceptions import RateLimitError, RetryableError
+from llmify.messages import Function, ToolCall, UserMessage
+from llmify.providers.fake import ChatFake, FakeBehavior, FakeFault
+from llmify.retries import RetryEvent
+from llmify.tools import tool
+from llmify.views import StreamEnd, StreamTextDelta, StreamToolCall
+
+CALL = ToolCall(
+    id="call_1", function=Function(name="add", arguments='{"a": 1, "b": 2}')
+)
+
+
+@tool
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def _prompt() -> list[UserMessage]:
+    return [UserMessage(content="hi")]
+
+
+class TestFakeBehavior:
+    def test_splits_text_into_whitespace_tokens(self) -> None:
+        assert FakeBehavior(text="one two  three").tokens() == [
+            "one",
+            " two",
+            "  three",
+        ]
+
+    def test_paces_tokens_after_the_initial_latency(self) -> None:
+        behavior = FakeBehavior(latency=0.5, tokens_per_second=4)
+
+        assert behavior.token_delay(0) == 0.5
+        assert behavior.token_delay(1) == 0.25
+
+    def test_faults_follow_the_configured_rates(self) -> None:
+        behavior = FakeBehavior(rate_limit_rate=0.25, server_error_rate=0.25)
+        rng = random.Random(7)
+
+        faults = [behavior.roll_fault(rng) for _ in range(2000)]
+
+        assert FakeFault.DISCONNECT not in faults
+        assert 400 < faults.count(FakeFault.RATE_LIMIT) < 600
+        assert 400 < faults.count(FakeFault.SERVER_ERROR) < 600
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"latency": -1},
+            {"tokens_per_second": 0},
+            {"rate_limit_rate": 0.6, "server_error_rate": 0.6},
+            {"disconnect_rate": -0.1},
+        ],
+    )
+    def test_rejects_invalid_settings(self, kwargs: dict) -> None:
+        with pytest.raises(ValueError):
+            FakeBehavior(**kwargs)
+
+
+class TestChatFake:
+    @pytest.mark.asyncio
+    async def test_invoke_returns_the_scripted_text_and_usage(self) -> None:
+        model = ChatFake(behavior=FakeBehavior(text="Hello there"))
+
+        result = await model.invoke(_prompt())
+
+        assert result.completion == "Hello there"
+        assert result.stop_reason == "stop"
+        assert result.usage.completion_tokens == 2
+
+    @pytest.mark.asyncio
+    async def test_structured_output_parses_the_text(self) -> None:
+        class Answer(BaseModel):
+            value: int
+
+        model = ChatFake(behavior=FakeBehavior(text='{"value": 4}'))
+
+        result = await model.invoke(_prompt(), Answer)
+
+        assert result.completion == Answer(value=4)
+
+    @pytest.mark.asyncio
+    async def test_streams_tokens_then_tool_calls(self) -> None:
+        model = ChatFake(behavior=FakeBehavior(text="a b", tool_calls=(CALL,)))
+
+        events = [event async for event in model.stream(_prompt(), tools=[add])]
+
+        assert [type(event) for event in events] == [
+            StreamTextDelta,
+            StreamTextDelta,
+            StreamToolCall,
+            StreamEnd,
+        ]
+        assert events[-1].tool_calls == [CALL]
+
+    @pytest.mark.asyncio
+    async def test_tool_loop_ends_after_one_round(self) -> None:
+        model = ChatFake(behavior=FakeBehavior(text="3", tool_calls=(CALL,)))
+
+        result = await model.invoke_with_tools(_prompt(), tools=[add])
+
+        assert result.completion == "3"
+        assert [call.id for call in result.tool_calls] == ["call_1"]
+
+    @pytest.mark.asyncio
+    async def test_only_offers_tool_calls_when_tools_are_given(self) -> None:
+        model = ChatFake(behavior=FakeBehavior(tool_calls=(CALL,)))
+
+        assert (await model.invoke(_prompt())).tool_calls == []
+        assert (
+            await model.invoke(_prompt(), tools=[add], tool_choice="none")
+        ).tool_calls == []
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_are_retried_with_retry_after(self) -> None:
+        events: list[RetryEvent] = []
+        model = ChatFake(
+            behavior=FakeBehavior(rate_limit_rate=1, retry_after=0),
+            max_retries=1,
+            on_retry=events.append,
+        )
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await model.invoke(_prompt())
+
+        assert exc_info.value.retry_after == 0
+        assert len(events) == 1
+
+    @pytest.mark.asyncio
+    async def test_dropped_stream_fails_after_partial_output(self) -> None:
+        model = ChatFake(
+            behavior=FakeBehavior(text="a b c d", disconnect_rate=1), max_retries=0
+        )
+        deltas: list[str] = []
+
+        with pytest.raises(RetryableError):
+            async for event in model.stream(_prompt()):
+                deltas.append(event.delta)
+
+        assert deltas == ["a", " b"]
+
+    @pytest.mark.asyncio
+    async def test_applies_latency_before_the_first_token(self) -> None:
+        model = ChatFake(behavior=FakeBehavior(latency=0.05))
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await anext(model.stream(_prompt()))
+
+        assert loop.time() - start >= 0.05
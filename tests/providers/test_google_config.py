@@ -5,6 +5,7 @@ pytest.importorskip("google.genai")
 
 from llmify.messages import (
     AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
     ImageURL,
@@ -181,6 +182,15 @@ class TestConvertUserParts:
             {"inline_data": {"mime_type": "image/png", "data": "abc123"}},
         ]
 
+    def test_inlines_image_bytes(self) -> None:
+        message = UserMessage(
+            content=[ContentPartImageBytes(data=b"\xff\xd8", media_type="image/jpeg")]
+        )
+
+        assert _convert_user_parts(message) == [
+            {"inline_data": {"mime_type": "image/jpeg", "data": "/9g="}}
+        ]
+
     def test_references_remote_images_by_uri(self) -> None:
         message = UserMessage(
             content=[
@@ -0,0 +1,195 @@
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from google.genai import errors, types
+
+from llmify.messages import AssistantMessage, SystemMessage, UserMessage
+from llmify.providers.google import ChatGoogle
+from llmify.providers.google_context_cache import GoogleContextCache
+
+DOCUMENT = "Clause. " * 20_000
+
+
+def _response() -> types.GenerateContentResponse:
+    return types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(parts=[types.Part(text="done")]),
+                finish_reason="STOP",
+            )
+        ],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=40_000,
+            candidates_token_count=3,
+        ),
+    )
+
+
+def _client() -> SimpleNamespace:
+    return SimpleNamespace(
+        models=SimpleNamespace(generate_content=AsyncMock(return_value=_response())),
+        caches=SimpleNamespace(
+            create=AsyncMock(
+                return_value=types.CachedContent(name="cachedContents/doc")
+            ),
+            update=AsyncMock(),
+            delete=AsyncMock(),
+        ),
+    )
+
+
+def _model(context_cache: GoogleContextCache, **kwargs: Any) -> ChatGoogle:
+    model = ChatGoogle(
+        model="gemini-test",
+        client=SimpleNamespace(aio=None),
+        context_cache=context_cache,
+        **kwargs,
+    )
+    model._client = _client()
+    return model
+
+
+def _messages(question: str) -> list:
+    return [
+        SystemMessage(content="Answer from the contract."),
+        UserMessage(content=DOCUMENT, cache=True),
+        UserMessage(content=question),
+    ]
+
+
+class TestContextCache:
+    @pytest.mark.asyncio
+    async def test_creates_once_and_sends_only_the_suffix(self) -> None:
+        model = _model(GoogleContextCache())
+
+        await model.invoke(_messages("Who signs?"))
+        await model.invoke(_messages("When does it end?"))
+
+        model._client.caches.create.assert_awaited_once()
+        created = model._client.caches.create.call_args.kwargs["config"]
+        assert created.system_instruction == "Answer from the contract."
+        assert created.ttl == "3600s"
+        assert len(created.contents) == 1
+
+        request = model._client.models.generate_content.call_args.kwargs
+        assert request["config"].cached_content == "cachedContents/doc"
+        assert request["config"].system_instruction is None
+        assert request["contents"] == [
+            {"role": "user", "parts": [{"text": "When does it end?"}]}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_auto_strategy_chooses_the_prefix_boundary(self) -> None:
+        model = _model(GoogleContextCache(), cache_strategy="auto")
+
+        await model.invoke(
+            [
+                SystemMessage(content="Answer from the contract."),
+                UserMessage(content=DOCUMENT),
+                AssistantMessage(content="Read it."),
+                UserMessage(content="Who signs?"),
+            ]
+        )
+
+        # The planner marks the message before the last assistant reply, so
+        # the document is cached and the reply and question are sent.
+        created = model._client.caches.create.call_args.kwargs["config"]
+        assert [content.parts[0].text for content in created.contents] == [DOCUMENT]
+        request = model._client.models.generate_content.call_args.kwargs
+        assert [content["role"] for content in request["contents"]] == [
+            "model",
+            "user",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sends_small_or_unmarked_prefixes_in_full(self) -> None:
+        model = _model(GoogleContextCache())
+
+        await model.invoke(
+            [UserMessage(content="Short.", cache=True), UserMessage(content="Hi")]
+        )
+        await model.invoke([UserMessage(content=DOCUMENT), UserMessage(content="Hi")])
+
+        model._client.caches.create.assert_not_awaited()
+        request = model._client.models.generate_content.call_args.kwargs
+        assert request["config"] is None
+        assert len(request["contents"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_renews_entries_close_to_expiry(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        now = [1000.0]
+        monkeypatch.setattr(
+            "llmify.providers.google_context_cache.time.monotonic", lambda: now[0]
+        )
+        model = _model(GoogleContextCache(ttl=600, renew_within=120))
+
+        await model.invoke(_messages("Who signs?"))
+        now[0] += 300
+        await model.invoke(_messages("Who pays?"))
+        model._client.caches.update.assert_not_awaited()
+
+        now[0] += 200
+        await model.invoke(_messages("When does it end?"))
+
+        model._client.caches.update.assert_awaited_once()
+        renewed = model._client.caches.update.call_args.kwargs
+        assert renewed["name"] == "cachedContents/doc"
+        assert renewed["config"].ttl == "600s"
+
+        now[0] += 601
+        await model.invoke(_messages("Any penalties?"))
+        assert model._client.caches.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_the_server_lost_the_cache(self) -> None:
+        context_cache = GoogleContextCache()
+        model = _model(context_cache)
+        model._client.models.generate_content.side_effect = [
+            errors.APIError(
+                403, {"message": "CachedContent not found (or permission denied)"}
+            ),
+            _response(),
+        ]
+
+        result = await model.invoke(_messages("Who signs?"))
+
+        assert result.completion == "done"
+        fallback = model._client.models.generate_content.call_args.kwargs
+        assert fallback["config"].cached_content is None
+        assert len(fallback["contents"]) == 2
+        assert len(context_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_remembers_prefixes_that_cannot_be_cached(self) -> None:
+        model = _model(GoogleContextCache())
+        model._client.caches.create.side_effect = errors.APIError(
+            400, {"message": "Cached content is too small."}
+        )
+
+        await model.invoke(_messages("Who signs?"))
+        await model.invoke(_messages("Who pays?"))
+
+        model._client.caches.create.assert_awaited_once()
+        assert model._client.models.generate_content.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_deletes_created_caches(self) -> None:
+        context_cache = GoogleContextCache()
+        model = _model(context_cache)
+        await model.invoke(_messages("Who signs?"))
+
+        await context_cache.clear(model._client)
+
+        model._client.caches.delete.assert_awaited_once_with(name="cachedContents/doc")
+        assert context_cache.names == []
+
+    def test_validates_options(self) -> None:
+        with pytest.raises(ValueError, match="renew_within"):
+            GoogleContextCache(ttl=60, renew_within=60)
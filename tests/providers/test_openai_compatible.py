@@ -17,6 +17,7 @@ from llmify import retries as retries_provider
 from llmify.exceptions import RetryableError
 from llmify.messages import (
     AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
     Function,
@@ -101,6 +102,20 @@ class TestMessageConversion:
         assert converted["content"][1]["type"] == "image_url"
         assert "data:image/png;base64," in converted["content"][1]["image_url"]["url"]
 
+    def test_sends_image_bytes_as_a_data_url(self, mock_model: MockChatModel) -> None:
+        message = UserMessage(
+            content=[ContentPartImageBytes(data=memoryview(b"\x89PNG"), detail="low")]
+        )
+
+        converted = _convert_message(message)
+
+        assert converted["content"] == [
+            {
+                "type": "image_url",
+                "image_url": {"url": "data:image/png;base64,iVBORw==", "detail": "low"},
+            }
+        ]
+
     def test_converts_tool_result_message(self, mock_model: MockChatModel) -> None:
         message = ToolResultMessage(tool_call_id="call_123", content="Search completed")
         converted = _convert_message(message)
@@ -599,6 +614,42 @@ class TestStreaming:
         assert [tc.id for tc in end_event.tool_calls] == ["call_a", "call_b"]
         assert end_event.completion == "Working..."
 
+    @pytest.mark.asyncio
+    async def test_emits_a_tool_call_once_the_next_one_starts(
+        self, mock_model: MockChatModel
+    ) -> None:
+        async def mock_stream():
+            yield self._make_chunk(
+                tool_calls=[
+                    SimpleNamespace(
+                        index=0,
+                        id="call_a",
+                        function=SimpleNamespace(name="tool_a", arguments='{"a":1}'),
+                    )
+                ]
+            )
+            yield self._make_chunk(
+                tool_calls=[
+                    SimpleNamespace(
+                        index=1,
+                        id="call_b",
+                        function=SimpleNamespace(name="tool_b", arguments='{"b":2}'),
+                    )
+                ]
+            )
+            yield self._make_chunk(finish_reason="tool_calls")
+
+        mock_model._client.chat.completions.create = AsyncMock(
+            return_value=mock_stream()
+        )
+
+        stream = mock_model.stream([UserMessage(content="Hi")])
+        first = await anext(stream)
+        await stream.aclose()
+
+        assert isinstance(first, StreamToolCall)
+        assert first.tool_call.id == "call_a"
+
     @pytest.mark.asyncio
     async def test_ignores_tool_choice_when_tools_are_missing(
         self, mock_model: MockChatModel
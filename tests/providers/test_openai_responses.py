@@ -219,6 +219,30 @@ class TestInvoke:
         assert "max_tokens" not in request
         assert "frequency_penalty" not in request
 
+    @pytest.mark.asyncio
+    async def test_auto_cache_strategy_keys_the_conversation(self) -> None:
+        model = ChatOpenAIResponses(model="gpt-test", cache_strategy="auto")
+        model._client.responses.create = AsyncMock(
+            side_effect=[
+                _stream(_completed(_response(), 0)),
+                _stream(_completed(_response(), 0)),
+            ]
+        )
+
+        first = await model.invoke(
+            [SystemMessage(content="Rules."), UserMessage(content="Hi")]
+        )
+        await model.invoke(
+            [UserMessage(content="More")], provider_state=first.provider_state
+        )
+
+        calls = model._client.responses.create.call_args_list
+        key = calls[0].kwargs["prompt_cache_key"]
+        assert key.startswith("llmify-")
+        assert calls[0].kwargs["input"][0]["content"][0]["prompt_cache_breakpoint"]
+        assert first.provider_state.prompt_cache_key == key
+        assert calls[1].kwargs["prompt_cache_key"] == key
+
     @pytest.mark.asyncio
     async def test_retries_and_discards_an_incomplete_attempt(
         self, monkeypatch: pytest.MonkeyPatch
@@ -1,3 +1,6 @@
+import asyncio
+import json
+from contextlib import contextmanager
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
@@ -19,8 +22,12 @@ from openai.types.responses import (
 
 from llmify import (
     ChatOpenAIResponses,
+    CompactionPolicy,
+    ContextLengthExceededError,
     ContinuationMode,
+    DropOldestTurns,
     OpenAIResponsesState,
+    PooledWebSocketResponsesTransport,
     PromptCacheOptions,
     ResponsesOptions,
     StreamOutputItemAdded,
@@ -29,9 +36,13 @@ from llmify import (
     SystemMessage,
     UserMessage,
     WebSocketResponsesTransport,
+    disable_tracing,
+    enable_tracing,
     tool,
 )
+from llmify.messages import Message
 from llmify.providers.openai_responses import _build_request
+from llmify.providers.openai_responses_compaction import compact_input_items
 
 
 @pytest.fixture(autouse=True)
@@ -184,6 +195,228 @@ class TestNativeState:
         with pytest.raises(ValueError, match="continuation_mode"):
             await model.invoke([UserMessage(content="Hi")], provider_state=state)
 
+    @pytest.mark.asyncio
+    async def test_preflight_counts_the_replayed_input_items(self) -> None:
+        model = ChatOpenAIResponses(model="gpt-test", context_window=200)
+        model._client.responses.create = AsyncMock()
+        state = OpenAIResponsesState(input_items=_history(20))
+
+        with pytest.raises(ContextLengthExceededError):
+            await model.invoke([UserMessage(content="Hi")], provider_state=state)
+
+        model._client.responses.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_overflow_policy_leaves_stateful_calls_alone(self) -> None:
+        class CountingPolicy(DropOldestTurns):
+            calls = 0
+
+            async def trim(self, messages: list[Message], **kwargs) -> list[Message]:
+                CountingPolicy.calls += 1
+                return await super().trim(messages, **kwargs)
+
+        model = ChatOpenAIResponses(
+            model="gpt-test", context_window=200, context_overflow=CountingPolicy()
+        )
+        model._client.responses.create = AsyncMock()
+        state = OpenAIResponsesState(input_items=_history(20))
+        messages = [
+            UserMessage(content="Earlier " + "x" * 400),
+            UserMessage(content="Hi"),
+        ]
+
+        with pytest.raises(ContextLengthExceededError):
+            await model.invoke(messages, provider_state=state)
+        with pytest.raises(ContextLengthExceededError):
+            async for _ in model.stream(messages, provider_state=state):
+                pass
+
+        assert CountingPolicy.calls == 0
+        model._client.responses.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_previous_response_mode_still_counts_the_replay_window(
+        self,
+    ) -> None:
+        options = ResponsesOptions(
+            continuation_mode=ContinuationMode.PREVIOUS_RESPONSE_ID
+        )
+        model = ChatOpenAIResponses(
+            model="gpt-test",
+            store=True,
+            context_window=200,
+            responses_options=options,
+        )
+        model._client.responses.create = AsyncMock()
+        state = OpenAIResponsesState(
+            continuation_mode=ContinuationMode.PREVIOUS_RESPONSE_ID,
+            input_items=_history(20),
+            response_id="resp_1",
+        )
+
+        with pytest.raises(ContextLengthExceededError):
+            async for _ in model.stream(
+                [UserMessage(content="Hi")], provider_state=state
+            ):
+                pass
+
+        model._client.responses.create.assert_not_awaited()
+
+
+def _turn(index: int, *, reasoning: bool = True) -> list[dict]:
+    items: list[dict] = [{"role": "user", "content": f"question {index}"}]
+    if reasoning:
+        items.append(
+            {"type": "reasoning", "id": f"rs_{index}", "encrypted_content": "x" * 500}
+        )
+    items += [
+        {
+            "type": "function_call",
+            "id": f"fc_{index}",
+            "call_id": f"call_{index}",
+            "name": "lookup",
+            "arguments": "{}",
+        },
+        {"type": "function_call_output", "call_id": f"call_{index}", "output": "ok"},
+        {"type": "message", "id": f"msg_{index}", "role": "assistant", "content": []},
+    ]
+    return items
+
+
+def _history(turns: int) -> list[dict]:
+    pinned = {"role": "developer", "content": "Stable rules."}
+    return [pinned, *(item for index in range(turns) for item in _turn(index))]
+
+
+def _questions(items: list[dict]) -> list[str]:
+    return [item["content"] for item in items if item.get("role") == "user"]
+
+
+class TestCompaction:
+    def test_keeps_pinned_items_and_the_last_turns(self) -> None:
+        compacted = compact_input_items(_history(5), CompactionPolicy(max_turns=2))
+
+        assert compacted[0] == {"role": "developer", "content": "Stable rules."}
+        assert _questions(compacted) == ["question 3", "question 4"]
+
+    def test_drops_old_reasoning_and_the_ids_that_point_at_it(self) -> None:
+        compacted = compact_input_items(
+            _history(3), CompactionPolicy(keep_reasoning_turns=1)
+        )
+
+        assert [
+            item["id"] for item in compacted if item.get("type") == "reasoning"
+        ] == ["rs_2"]
+        linked = [item for item in compacted if item.get("type") == "function_call"]
+        assert ["id" in item for item in linked] == [False, False, True]
+
+    def test_byte_cap_sheds_reasoning_before_whole_turns(self) -> None:
+        history = _history(4)
+        slim = compact_input_items(history, CompactionPolicy(keep_reasoning_turns=1))
+        size = len(json.dumps(slim, separators=(",", ":")))
+
+        fits = compact_input_items(history, CompactionPolicy(max_bytes=size))
+        tight = compact_input_items(history, CompactionPolicy(max_bytes=size // 2))
+
+        assert _questions(fits) == _questions(history)
+        assert _questions(tight)[-1] == "question 3"
+        assert len(_questions(tight)) < 4
+        assert compact_input_items(history, CompactionPolicy(max_bytes=1))[1:] == (
+            _turn(3)
+        )
+
+    def test_never_separates_a_call_from_its_output(self) -> None:
+        items = [
+            {"role": "user", "content": "question 0"},
+            {"type": "function_call", "call_id": "call_0", "name": "a"},
+            {"role": "user", "content": "interjection"},
+            {"type": "function_call_output", "call_id": "call_0", "output": "ok"},
+            {"role": "user", "content": "question 1"},
+        ]
+
+        compacted = compact_input_items(items, CompactionPolicy(max_turns=1))
+
+        assert compacted == items[4:]
+        assert compact_input_items(items, CompactionPolicy(max_turns=2)) == items
+
+    @pytest.mark.asyncio
+    async def test_state_is_compacted_after_each_response(self) -> None:
+        options = ResponsesOptions(compaction=CompactionPolicy(max_turns=1))
+        model = ChatOpenAIResponses(model="gpt-test", responses_options=options)
+        model._client.responses.create = AsyncMock(
+            side_effect=[
+                _stream(_completed(_response("resp_1"), 0)),
+                _stream(_completed(_response("resp_2"), 0)),
+            ]
+        )
+
+        first = await model.invoke([UserMessage(content="One")])
+        second = await model.invoke(
+            [UserMessage(content="Two")], provider_state=first.provider_state
+        )
+
+        request = model._client.responses.create.call_args_list[1].kwargs
+        assert _questions(request["input"]) == ["One", "Two"]
+        assert _questions(second.provider_state.input_items) == ["Two"]
+
+
+class TestBinarySerialization:
+    def test_round_trips_and_stores_repeated_items_once(self) -> None:
+        history = _history(20)
+        state = OpenAIResponsesState(
+            input_items=history,
+            output_items=history[-4:],
+            response_id="resp_1",
+            instructions="Stay concise",
+            prompt_cache_key="tenant:acme",
+        )
+
+        data = state.to_bytes()
+
+        assert data.startswith(b"LRS\x01")
+        assert OpenAIResponsesState.from_bytes(data) == state
+        assert len(data) < len(state.model_dump_json()) // 4
+        without_outputs = state.model_copy(update={"output_items": []}).to_bytes()
+        assert len(data) - len(without_outputs) < 32
+
+    def test_delta_appends_to_the_base_state(self) -> None:
+        base = OpenAIResponsesState(input_items=_history(2), response_id="resp_1")
+        current = OpenAIResponsesState(
+            input_items=[*base.input_items, *_turn(2)],
+            output_items=_turn(2)[1:],
+            response_id="resp_2",
+        )
+
+        delta = current.to_bytes(since=len(base.input_items))
+
+        assert len(delta) < len(current.to_bytes())
+        assert OpenAIResponsesState.from_bytes(delta, base=base) == current
+        with pytest.raises(ValueError, match="base state"):
+            OpenAIResponsesState.from_bytes(delta)
+        with pytest.raises(ValueError, match="since"):
+            current.to_bytes(since=len(current.input_items) + 1)
+
+    def test_delta_rejects_a_base_rewritten_by_compaction(self) -> None:
+        base = OpenAIResponsesState(input_items=_history(2))
+        current = OpenAIResponsesState(
+            input_items=compact_input_items(
+                [*base.input_items, *_turn(2)], CompactionPolicy(max_turns=1)
+            )
+        )
+
+        delta = current.to_bytes(since=2)
+
+        with pytest.raises(ValueError, match="compaction"):
+            OpenAIResponsesState.from_bytes(delta, base=base)
+
+    def test_rejects_foreign_or_corrupt_payloads(self) -> None:
+        data = OpenAIResponsesState().to_bytes()
+
+        with pytest.raises(ValueError, match="unsupported version"):
+            OpenAIResponsesState.from_bytes(b"LRS\x02" + data[4:])
+        with pytest.raises(ValueError, match="Corrupt"):
+            OpenAIResponsesState.from_bytes(data[:-3])
+
 
 class TestRequestBuilder:
     def test_builds_full_stateless_replay_without_side_effects(self) -> None:
@@ -411,6 +644,123 @@ class TestToolLoop:
         assert '"type": "RuntimeError"' in outputs[1]["output"]
         assert '"message": "broken"' in outputs[1]["output"]
 
+    @pytest.mark.asyncio
+    async def test_opens_a_tool_round_span_per_round(self) -> None:
+        @tool
+        def ping() -> str:
+            return "pong"
+
+        spans: list[SimpleNamespace] = []
+
+        @contextmanager
+        def start_as_current_span(name: str, *, attributes=None):
+            span = SimpleNamespace(name=name, attributes=dict(attributes or {}))
+            span.set_attribute = span.attributes.__setitem__
+            spans.append(span)
+            yield span
+
+        model = ChatOpenAIResponses(model="gpt-test")
+        model._client.responses.create = AsyncMock(
+            side_effect=[
+                _stream(
+                    _done(_function_call("call_1", "ping", "{}"), 0, 0),
+                    _completed(_response("resp_1"), 1),
+                ),
+                _stream(_completed(_response("resp_2"), 0)),
+            ]
+        )
+
+        enable_tracing(SimpleNamespace(start_as_current_span=start_as_current_span))
+        try:
+            await model.invoke_with_tools([UserMessage(content="Ping")], tools=[ping])
+        finally:
+            disable_tracing()
+
+        rounds = [span for span in spans if span.name == "llmify.tool_round"]
+        assert [span.attributes for span in rounds] == [
+            {"llmify.tool_round": 0, "llmify.tool_round.tool_calls": 1},
+            {"llmify.tool_round": 1, "llmify.tool_round.tool_calls": 0},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_runs_calls_of_one_round_concurrently_in_order(self) -> None:
+        started: list[str] = []
+        all_started = asyncio.Event()
+
+        @tool
+        async def slow(name: str) -> str:
+            started.append(name)
+            if len(started) == 3:
+                all_started.set()
+            await asyncio.wait_for(all_started.wait(), timeout=1)
+            return name.upper()
+
+        model = ChatOpenAIResponses(model="gpt-test")
+        model._client.responses.create = AsyncMock(
+            side_effect=[
+                _stream(
+                    _done(_function_call("call_a", "slow", '{"name":"a"}'), 0, 0),
+                    _done(_function_call("call_b", "slow", '{"name":"b"}'), 1, 1),
+                    _done(_function_call("call_c", "slow", '{"name":"c"}'), 2, 2),
+                    _completed(_response("resp_1"), 3),
+                ),
+                _stream(_completed(_response("resp_2"), 0)),
+            ]
+        )
+
+        await model.invoke_with_tools([UserMessage(content="Go")], tools=[slow])
+
+        second_input = model._client.responses.create.call_args_list[1].kwargs["input"]
+        outputs = [
+            item["output"]
+            for item in second_input
+            if item.get("type") == "function_call_output"
+        ]
+        assert outputs == ["A", "B", "C"]
+
+    @pytest.mark.asyncio
+    async def test_bounds_parallel_tool_calls(self) -> None:
+        in_flight = 0
+        peak = 0
+
+        @tool
+        async def slow() -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "done"
+
+        model = ChatOpenAIResponses(model="gpt-test")
+        model._client.responses.create = AsyncMock(
+            side_effect=[
+                _stream(
+                    *(
+                        _done(_function_call(f"call_{i}", "slow", "{}"), i, i)
+                        for i in range(4)
+                    ),
+                    _completed(_response("resp_1"), 4),
+                ),
+                _stream(_completed(_response("resp_2"), 0)),
+            ]
+        )
+
+        await model.invoke_with_tools(
+            [UserMessage(content="Go")], tools=[slow], max_parallel_tools=2
+        )
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_positive_parallelism(self) -> None:
+        model = ChatOpenAIResponses(model="gpt-test")
+
+        with pytest.raises(ValueError, match="max_parallel_tools"):
+            await model.invoke_with_tools(
+                [UserMessage(content="Go")], tools=[], max_parallel_tools=0
+            )
+
     @pytest.mark.asyncio
     async def test_enforces_maximum_tool_rounds(self) -> None:
         @tool
@@ -433,15 +783,56 @@ class TestToolLoop:
             )
 
 
+class TestStreamingToolLoop:
+    @pytest.mark.asyncio
+    async def test_continues_from_native_state_with_tool_outputs(self) -> None:
+        @tool
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        model = ChatOpenAIResponses(model="gpt-test")
+        model._client.responses.create = AsyncMock(
+            side_effect=[
+                _stream(
+                    _done(_function_call("call_add", "add", '{"a":2,"b":3}'), 0, 0),
+                    _completed(_response("resp_1"), 1),
+                ),
+                _stream(_completed(_response("resp_2"), 0)),
+            ]
+        )
+
+        events = [
+            event
+            async for event in model.stream_with_tools(
+                [UserMessage(content="Add")], tools=[add]
+            )
+        ]
+
+        assert [event.type for event in events if event.type != "output_item_done"] == [
+            "tool_call",
+            "tool_result",
+            "end",
+        ]
+        assert events[-1].provider_state.response_id == "resp_2"
+        assert [call.id for call in events[-1].tool_calls] == ["call_add"]
+        second = model._client.responses.create.call_args_list[1].kwargs
+        assert second["input"][-1] == {
+            "type": "function_call_output",
+            "call_id": "call_add",
+            "output": "5",
+        }
+
+
 class _ConnectionManager:
     def __init__(self, connection) -> None:
         self.connection = connection
+        self.closed = False
 
     async def __aenter__(self):
         return self.connection
 
     async def __aexit__(self, *_args):
-        return None
+        self.closed = True
 
 
 class TestWebSocketTransport:
@@ -513,3 +904,200 @@ class TestWebSocketTransport:
                 "output": "pong",
             }
         ]
+
+
+def _connection(*events, state: str = "OPEN") -> SimpleNamespace:
+    return SimpleNamespace(
+        send=AsyncMock(),
+        recv=AsyncMock(side_effect=list(events)),
+        _connection=SimpleNamespace(
+            state=SimpleNamespace(name=state),
+            ping=AsyncMock(),
+        ),
+    )
+
+
+def _pooled_model(
+    transport: PooledWebSocketResponsesTransport, *connections
+) -> tuple[ChatOpenAIResponses, list[_ConnectionManager]]:
+    model = ChatOpenAIResponses(
+        model="gpt-test",
+        store=False,
+        transport=transport,
+        responses_options=ResponsesOptions(
+            continuation_mode=ContinuationMode.PREVIOUS_RESPONSE_ID,
+        ),
+    )
+    managers = [_ConnectionManager(connection) for connection in connections]
+    model._client.responses.connect = Mock(side_effect=managers)
+    return model, managers
+
+
+class TestPooledWebSocketTransport:
+    @pytest.mark.asyncio
+    async def test_standalone_calls_continue_on_the_pooled_connection(self) -> None:
+        connection = _connection(
+            _completed(_response("resp_1"), 0),
+            _completed(_response("resp_2"), 0),
+        )
+        transport = PooledWebSocketResponsesTransport()
+        model, managers = _pooled_model(transport, connection)
+
+        first = await model.invoke([UserMessage(content="One")])
+        await model.invoke(
+            [UserMessage(content="Two")], provider_state=first.provider_state
+        )
+
+        model._client.responses.connect.assert_called_once()
+        second = connection.send.await_args_list[1].args[0]
+        assert second["previous_response_id"] == "resp_1"
+        assert second["input"] == [{"role": "user", "content": "Two"}]
+        assert transport.idle_connections == 1
+        assert not managers[0].closed
+
+    @pytest.mark.asyncio
+    async def test_new_conversations_get_their_own_connection(self) -> None:
+        transport = PooledWebSocketResponsesTransport()
+        model, _ = _pooled_model(
+            transport,
+            _connection(_completed(_response("resp_1"), 0)),
+            _connection(_completed(_response("resp_2"), 0)),
+        )
+
+        await model.invoke([UserMessage(content="One")])
+        await model.invoke([UserMessage(content="Other")])
+
+        assert model._client.responses.connect.call_count == 2
+        assert transport.idle_connections == 2
+
+    @pytest.mark.asyncio
+    async def test_recycles_the_oldest_connection_at_max_idle(self) -> None:
+        connection = _connection(
+            _completed(_response("resp_1"), 0),
+            _completed(_response("resp_2"), 0),
+            _completed(_response("resp_3"), 0),
+        )
+        transport = PooledWebSocketResponsesTransport(max_idle=1)
+        model, _ = _pooled_model(transport, connection)
+
+        first = await model.invoke([UserMessage(content="One")])
+        await model.invoke([UserMessage(content="Other")])
+        await model.invoke(
+            [UserMessage(content="Two")], provider_state=first.provider_state
+        )
+
+        model._client.responses.connect.assert_called_once()
+        # The other conversation replaced the first one's connection-local
+        # state, so the first conversation replays its window.
+        third = connection.send.await_args.args[0]
+        assert "previous_response_id" not in third
+        assert len(third["input"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_skips_closed_and_expired_connections(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        now = [1000.0]
+        monkeypatch.setattr(
+            "llmify.providers.openai_responses_transport.time.monotonic",
+            lambda: now[0],
+        )
+        dropped = _connection(_completed(_response("resp_1"), 0))
+        expired = _connection(_completed(_response("resp_2"), 0))
+        transport = PooledWebSocketResponsesTransport(idle_timeout=60)
+        model, managers = _pooled_model(
+            transport,
+            dropped,
+            _connection(_completed(_response("resp_3"), 0)),
+            expired,
+            _connection(_completed(_response("resp_4"), 0)),
+        )
+
+        first = await model.invoke([UserMessage(content="One")])
+        dropped._connection.state.name = "CLOSED"
+        await model.invoke(
+            [UserMessage(content="Two")], provider_state=first.provider_state
+        )
+        other = await model.invoke([UserMessage(content="Other")])
+        now[0] += 61
+        await model.invoke(
+            [UserMessage(content="Again")], provider_state=other.provider_state
+        )
+
+        assert model._client.responses.connect.call_count == 4
+        assert managers[0].closed
+        assert managers[2].closed
+        replayed = managers[1].connection.send.await_args.args[0]
+        assert "previous_response_id" not in replayed
+
+    @pytest.mark.asyncio
+    async def test_pings_long_idle_connections_before_reuse(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        now = [1000.0]
+        monkeypatch.setattr(
+            "llmify.providers.openai_responses_transport.time.monotonic",
+            lambda: now[0],
+        )
+        connection = _connection(
+            _completed(_response("resp_1"), 0),
+            _completed(_response("resp_2"), 0),
+        )
+        pong = asyncio.get_running_loop().create_future()
+        pong.set_result(None)
+        connection._connection.ping = AsyncMock(return_value=pong)
+        transport = PooledWebSocketResponsesTransport(ping_after=30)
+        model, _ = _pooled_model(transport, connection)
+
+        first = await model.invoke([UserMessage(content="One")])
+        now[0] += 31
+        await model.invoke(
+            [UserMessage(content="Two")], provider_state=first.provider_state
+        )
+
+        connection._connection.ping.assert_awaited_once()
+        model._client.responses.connect.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_discards_connections_that_failed_mid_response(self) -> None:
+        broken = _connection(ConnectionError("reset"))
+        transport = PooledWebSocketResponsesTransport()
+        model, managers = _pooled_model(transport, broken)
+
+        with pytest.raises(ConnectionError):
+            await model.invoke([UserMessage(content="One")])
+
+        assert managers[0].closed
+        assert transport.idle_connections == 0
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_idle_connections(self) -> None:
+        transport = PooledWebSocketResponsesTransport()
+        model, managers = _pooled_model(
+            transport, _connection(_completed(_response("resp_1"), 0))
+        )
+        await model.invoke([UserMessage(content="One")])
+
+        await transport.aclose()
+
+        assert managers[0].closed
+        assert transport.idle_connections == 0
+
+    @pytest.mark.asyncio
+    async def test_closes_expired_connections_without_further_traffic(self) -> None:
+        connection = _connection(_completed(_response("resp_1"), 0))
+        transport = PooledWebSocketResponsesTransport(idle_timeout=0.05)
+        model, managers = _pooled_model(transport, connection)
+
+        await model.invoke([UserMessage(content="One")])
+        assert transport.idle_connections == 1
+        await asyncio.sleep(0.1)
+
+        assert transport.idle_connections == 0
+        assert managers[0].closed
+
+    def test_validates_options(self) -> None:
+        with pytest.raises(ValueError, match="max_idle"):
+            PooledWebSocketResponsesTransport(max_idle=0)
+        with pytest.raises(ValueError, match="idle_timeout"):
+            PooledWebSocketResponsesTransport(idle_timeout=0)
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from llmify.base import ChatModel
+from llmify.exceptions import LLMifyError, RateLimitError
+from llmify.messages import Message, UserMessage
+from llmify.retries import AdaptiveConcurrencyLimiter, RetryEvent
+from llmify.views import ChatInvokeCompletion
+
+
+class ScriptedModel(ChatModel):
+    """Answers with the prompt text, or raises the error scripted for it."""
+
+    def __init__(self, errors: dict[str, Exception] | None = None, **kwargs: Any):
+        super().__init__(model="scripted", **kwargs)
+        self.errors = errors or {}
+        self.started: list[tuple[str, float]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def invoke(self, messages, output_format=None, **kwargs):
+        prompt = messages[-1].text
+        self.started.append((prompt, asyncio.get_running_loop().time()))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if prompt in self.errors:
+                raise self.errors[prompt]
+            return ChatInvokeCompletion(completion=prompt)
+        finally:
+            self.in_flight -= 1
+
+    async def stream(self, messages, tools=None, tool_choice="auto", **kwargs):
+        raise NotImplementedError
+        yield
+
+
+def _batch(*prompts: str) -> list[list[Message]]:
+    return [[UserMessage(content=prompt)] for prompt in prompts]
+
+
+class TestBatchInvoke:
+    @pytest.mark.asyncio
+    async def test_returns_results_in_input_order(self) -> None:
+        model = ScriptedModel()
+
+        results = await model.batch_invoke(_batch("a", "b", "c", "d"))
+
+        assert [result.completion for result in results] == ["a", "b", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_bounds_the_number_of_requests_in_flight(self) -> None:
+        model = ScriptedModel()
+
+        await model.batch_invoke(_batch(*"abcdefgh"), max_concurrency=3)
+
+        assert model.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_reports_failures_per_item(self) -> None:
+        model = ScriptedModel(errors={"b": LLMifyError("bad request")})
+
+        results = await model.batch_invoke(_batch("a", "b", "c"))
+
+        assert results[0].completion == "a"
+        assert isinstance(results[1], LLMifyError)
+        assert results[2].completion == "c"
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pauses_the_whole_batch(self) -> None:
+        model = ScriptedModel(errors={"a": RateLimitError(retry_after=0.1)})
+
+        results = await model.batch_invoke(_batch("a", "b", "c"), max_concurrency=1)
+
+        assert isinstance(results[0], RateLimitError)
+        failed_at = model.started[0][1]
+        assert all(started - failed_at >= 0.1 for _, started in model.started[1:])
+
+    @pytest.mark.asyncio
+    async def test_forwards_retries_to_the_callback(self) -> None:
+        events: list[RetryEvent] = []
+        event = RetryEvent(
+            retry_number=1,
+            max_retries=2,
+            delay=0.0,
+            error=RateLimitError(retry_after=0.0),
+        )
+
+        class RetryingModel(ScriptedModel):
+            async def invoke(self, messages, output_format=None, **kwargs):
+                await kwargs["on_retry"](event)
+                return await super().invoke(messages, output_format)
+
+        model = RetryingModel(on_retry=events.append)
+
+        await model.batch_invoke(_batch("a", "b"))
+
+        assert events == [event, event]
+
+    @pytest.mark.asyncio
+    async def test_adaptive_limiter_bounds_and_learns_from_retries(self) -> None:
+        event = RetryEvent(
+            retry_number=0,
+            max_retries=2,
+            delay=0.0,
+            error=RateLimitError(retry_after=0.0),
+        )
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, cooldown=60.0)
+        limits_after_retry: list[int] = []
+
+        class RetryingModel(ScriptedModel):
+            async def invoke(self, messages, output_format=None, **kwargs):
+                if messages[-1].text == "a":
+                    await kwargs["on_retry"](event)
+                    limits_after_retry.append(limiter.limit)
+                return await super().invoke(messages, output_format)
+
+        model = RetryingModel()
+
+        results = await model.batch_invoke(_batch(*"abcdef"), max_concurrency=limiter)
+
+        assert [result.completion for result in results] == list("abcdef")
+        assert model.max_in_flight <= 2
+        assert limits_after_retry == [1]
+        assert limiter.in_flight == 0
+
+    @pytest.mark.parametrize("max_concurrency", [0, -1])
+    @pytest.mark.asyncio
+    async def test_rejects_non_positive_concurrency(self, max_concurrency: int) -> None:
+        with pytest.raises(ValueError, match="greater than or equal to 1"):
+            await ScriptedModel().batch_invoke(
+                _batch("a"), max_concurrency=max_concurrency
+            )
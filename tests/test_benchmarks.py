@@ -0,0 +1,64 @@
+import inspect
+import json
+
+import pytest
+
+from benchmarks import fixtures
+from benchmarks.__main__ import main
+from benchmarks.suite import Case, cases, measure
+from llmify.views import StreamEnd
+
+
+class TestCases:
+    @pytest.mark.asyncio
+    async def test_every_case_runs_against_its_stub(self) -> None:
+        names = set()
+        for case in cases():
+            result = case.run()
+            if inspect.isawaitable(result):
+                await result
+            names.add(case.name)
+
+        assert {"merge_params", "tool_schemas", "completion.plain"} <= names
+
+    @pytest.mark.asyncio
+    async def test_stub_streams_produce_a_complete_response(self) -> None:
+        pytest.importorskip("anthropic")
+        from llmify.providers.anthropic import ChatAnthropic
+
+        model = ChatAnthropic(
+            model="bench",
+            client=fixtures.anthropic_client(fixtures.anthropic_events(3), None),
+        )
+
+        events = [event async for event in model._stream_once({})]
+
+        end = events[-1]
+        assert isinstance(end, StreamEnd)
+        assert end.completion == "".join(fixtures.text_deltas(3))
+        assert end.tool_calls[0].function.arguments == '{"shipment_id": 42}'
+
+    @pytest.mark.asyncio
+    async def test_measure_reports_time_per_unit(self) -> None:
+        case = Case(name="noop", run=lambda: None, per=4, unit="chunk")
+
+        result = await measure(case, repeat=2, min_time=0.001)
+
+        assert result.to_dict()["repeat"] == 2
+        assert result.loops >= 1
+        assert all(sample >= 0 for sample in result.cpu_us)
+
+
+class TestCli:
+    def test_writes_json_and_flags_regressions(self, tmp_path) -> None:
+        output = tmp_path / "results.json"
+        args = ["-k", "merge_params", "--repeat", "1", "--min-time", "0.001"]
+
+        assert main([*args, "-o", str(output)]) == 0
+        report = json.loads(output.read_text())
+        assert [result["name"] for result in report["results"]] == ["merge_params"]
+        assert report["meta"]["python"]
+
+        report["results"][0]["cpu_us"]["median"] = 1e-6
+        output.write_text(json.dumps(report))
+        assert main([*args, "--compare", str(output), "-o", str(tmp_path / "new")]) == 1
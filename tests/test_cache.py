@@ -0,0 +1,229 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from llmify import cache as cache_module
+from llmify.cache import (
+    InMemoryResponseCache,
+    ResponseCache,
+    SQLiteResponseCache,
+    request_fingerprint,
+)
+from llmify.messages import FrozenUserMessage, UserMessage
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    fake = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    monkeypatch.setattr(cache_module.time, "time", fake)
+    return fake
+
+
+class TestRequestFingerprint:
+    def test_ignores_key_order(self) -> None:
+        assert request_fingerprint({"a": 1, "b": [1, 2]}) == request_fingerprint(
+            {"b": [1, 2], "a": 1}
+        )
+
+    def test_distinguishes_values(self) -> None:
+        assert request_fingerprint({"a": 1}) != request_fingerprint({"a": 2})
+
+    def test_normalizes_models_schemas_and_bytes(self) -> None:
+        class Answer(BaseModel):
+            value: int
+
+        request = {"schema": Answer, "data": b"\x00\x01", "part": Answer(value=1)}
+
+        assert request_fingerprint(request) == request_fingerprint(dict(request))
+
+
+class TestInMemoryResponseCache:
+    @pytest.mark.asyncio
+    async def test_returns_stored_values(self) -> None:
+        cache = InMemoryResponseCache()
+
+        await cache.set("key", {"completion": "hi"})
+
+        assert await cache.get("key") == {"completion": "hi"}
+        assert await cache.get("missing") is None
+        assert isinstance(cache, ResponseCache)
+
+    @pytest.mark.asyncio
+    async def test_evicts_the_least_recently_used_entry(self) -> None:
+        cache = InMemoryResponseCache(max_entries=2)
+        await cache.set("a", {})
+        await cache.set("b", {})
+        await cache.get("a")
+
+        await cache.set("c", {})
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {}
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_expires_entries_after_ttl(self, clock: Clock) -> None:
+        cache = InMemoryResponseCache(ttl=10)
+        await cache.set("key", {})
+
+        clock.now += 9
+        assert await cache.get("key") == {}
+        clock.now += 1
+        assert await cache.get("key") is None
+
+    @pytest.mark.parametrize("kwargs", [{"max_entries": 0}, {"ttl": 0}])
+    def test_rejects_invalid_settings(self, kwargs: dict) -> None:
+        with pytest.raises(ValueError):
+            InMemoryResponseCache(**kwargs)
+
+
+class TestSQLiteResponseCache:
+    @pytest.mark.asyncio
+    async def test_survives_reopening(self, tmp_path) -> None:
+        path = tmp_path / "responses.sqlite"
+        first = SQLiteResponseCache(path)
+        await first.set("key", {"completion": "hi"})
+        first.close()
+
+        second = SQLiteResponseCache(path)
+
+        assert await second.get("key") == {"completion": "hi"}
+        assert await second.get("missing") is None
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_expires_entries_after_ttl(self, tmp_path, clock: Clock) -> None:
+        cache = SQLiteResponseCache(tmp_path / "responses.sqlite", ttl=10)
+        await cache.set("key", {})
+
+        clock.now += 10
+
+        assert await cache.get("key") is None
+        cache.close()
+
+
+def _anthropic_response(text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        stop_reason="end_turn",
+        usage=SimpleNamespace(
+            input_tokens=11,
+            output_tokens=7,
+            cache_read_input_tokens=None,
+            cache_creation_input_tokens=3,
+        ),
+    )
+
+
+class TestProviderIntegration:
+    @pytest.fixture
+    def anthropic_model(self):
+        pytest.importorskip("anthropic")
+        from llmify.providers.anthropic import ChatAnthropic
+
+        client = SimpleNamespace(messages=SimpleNamespace())
+        client.messages.create = AsyncMock(return_value=_anthropic_response("hi"))
+        return ChatAnthropic(
+            model="claude-test", client=client, cache=InMemoryResponseCache()
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_invoke_is_served_from_cache(self, anthropic_model) -> None:
+        from llmify.providers.anthropic_types import AnthropicCompletion
+
+        first = await anthropic_model.invoke([UserMessage(content="hello")])
+        second = await anthropic_model.invoke([UserMessage(content="hello")])
+
+        assert anthropic_model._client.messages.create.await_count == 1
+        assert isinstance(second, AnthropicCompletion)
+        assert second.completion == "hi"
+        assert second.usage.prompt_cache_creation_tokens == 3
+        assert second.usage.from_cache is True
+        assert first.usage.from_cache is False
+
+    @pytest.mark.asyncio
+    async def test_frozen_messages_are_fingerprinted_by_digest(
+        self, anthropic_model, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        encoded: list[str] = []
+
+        def dumps(value, **kwargs):
+            encoded.append(json.dumps(value, **kwargs))
+            return encoded[-1]
+
+        monkeypatch.setattr(
+            cache_module, "json", SimpleNamespace(dumps=dumps, loads=json.loads)
+        )
+        long_text = "x" * 10_000
+
+        await anthropic_model.invoke([FrozenUserMessage(content=long_text)])
+        await anthropic_model.invoke([FrozenUserMessage(content=long_text)])
+
+        assert anthropic_model._client.messages.create.await_count == 1
+        assert len(encoded) == 2
+        assert all(long_text not in request for request in encoded)
+
+    @pytest.mark.asyncio
+    async def test_different_requests_miss(self, anthropic_model) -> None:
+        await anthropic_model.invoke([UserMessage(content="hello")])
+        await anthropic_model.invoke([UserMessage(content="hello")], temperature=0.5)
+        await anthropic_model.invoke([UserMessage(content="bye")])
+
+        assert anthropic_model._client.messages.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_structured_output_round_trips(self, anthropic_model) -> None:
+        class Answer(BaseModel):
+            value: int
+
+        anthropic_model._client.messages.create.return_value = SimpleNamespace(
+            content=[
+                SimpleNamespace(
+                    type="tool_use", name="structured_output", input={"value": 4}
+                )
+            ],
+            stop_reason="tool_use",
+            usage=_anthropic_response("").usage,
+        )
+
+        await anthropic_model.invoke([UserMessage(content="2+2")], Answer)
+        cached = await anthropic_model.invoke([UserMessage(content="2+2")], Answer)
+
+        assert cached.completion == Answer(value=4)
+        assert anthropic_model._client.messages.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_that_no_longer_validate_are_misses(
+        self, anthropic_model
+    ) -> None:
+        class Answer(BaseModel):
+            value: int
+
+        anthropic_model._client.messages.create.return_value = SimpleNamespace(
+            content=[
+                SimpleNamespace(
+                    type="tool_use", name="structured_output", input={"value": 4}
+                )
+            ],
+            stop_reason="tool_use",
+            usage=_anthropic_response("").usage,
+        )
+        await anthropic_model.invoke([UserMessage(content="2+2")], Answer)
+        for value in anthropic_model._cache._entries.values():
+            value[1]["completion"] = {"value": "four"}
+
+        await anthropic_model.invoke([UserMessage(content="2+2")], Answer)
+
+        assert anthropic_model._client.messages.create.await_count == 2
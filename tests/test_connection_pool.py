@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from llmify import connection_pool
+from llmify.connection_pool import (
+    ConnectionPoolOptions,
+    close_connection_pools,
+    shared_http_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_pools(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(connection_pool, "_shared_clients", {})
+
+
+class TestSharedHttpClient:
+    def test_equal_options_share_one_client(self) -> None:
+        first = shared_http_client(ConnectionPoolOptions(max_connections=10))
+        second = shared_http_client(ConnectionPoolOptions(max_connections=10))
+
+        assert first is second
+
+    def test_different_options_get_separate_clients(self) -> None:
+        first = shared_http_client(ConnectionPoolOptions(max_connections=10))
+        second = shared_http_client(ConnectionPoolOptions(max_connections=20))
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_close_connection_pools_closes_and_forgets_clients(self) -> None:
+        options = ConnectionPoolOptions()
+        client = shared_http_client(options)
+
+        await close_connection_pools()
+
+        assert client.is_closed
+        assert shared_http_client(options) is not client
+
+
+class TestOpenAIModels:
+    @pytest.mark.asyncio
+    async def test_models_with_a_pool_share_the_http_client(self) -> None:
+        pytest.importorskip("openai")
+        from llmify import ChatCerebras, ChatOpenAI
+
+        pool = ConnectionPoolOptions()
+        first = ChatOpenAI(api_key="tenant-a", connection_pool=pool)
+        second = ChatOpenAI(api_key="tenant-b", connection_pool=pool)
+        third = ChatCerebras(api_key="tenant-c", connection_pool=pool)
+
+        assert first._client._client is second._client._client
+        assert first._client._client is third._client._client
+        assert first._client.api_key == "tenant-a"
+        assert second._client.api_key == "tenant-b"
+
+        await first.aclose()
+        assert not second._client._client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_responses_models_share_the_pool(self) -> None:
+        pytest.importorskip("openai")
+        from llmify import ChatOpenAI, ChatOpenAIResponses
+
+        pool = ConnectionPoolOptions()
+        responses = ChatOpenAIResponses(
+            model="gpt-test", api_key="key", connection_pool=pool
+        )
+        chat = ChatOpenAI(api_key="key", connection_pool=pool)
+
+        assert responses._client._client is chat._client._client
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_a_private_client(self) -> None:
+        pytest.importorskip("openai")
+        from llmify import ChatOpenAI
+
+        async with ChatOpenAI(api_key="key") as model:
+            http_client = model._client._client
+
+        assert http_client.is_closed
+
+
+class TestOwnedClients:
+    @pytest.mark.asyncio
+    async def test_anthropic_leaves_caller_clients_open(self) -> None:
+        pytest.importorskip("anthropic")
+        from llmify import ChatAnthropic
+
+        client = SimpleNamespace(close=AsyncMock())
+        model = ChatAnthropic(model="claude-test", client=client)
+
+        await model.aclose()
+
+        client.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_anthropic_closes_its_own_client(self) -> None:
+        pytest.importorskip("anthropic")
+        from llmify import ChatAnthropic
+
+        model = ChatAnthropic(model="claude-test", api_key="key")
+        model._client.close = AsyncMock()
+
+        await model.aclose()
+
+        model._client.close.assert_awaited_once()
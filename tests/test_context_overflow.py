@@ -0,0 +1,243 @@
+import pytest
+
+from llmify import (
+    AssistantMessage,
+    ChatFake,
+    DropOldestTurns,
+    FakeBehavior,
+    Function,
+    KeepLastTurns,
+    SummarizeMiddle,
+    SystemMessage,
+    ToolCall,
+    ToolResultMessage,
+    UserMessage,
+)
+from llmify.exceptions import ContextLengthExceededError
+from llmify.messages import Message
+from llmify.rate_limit import estimate_prompt_tokens
+from llmify.tools import Tool, ToolChoice, tool
+
+
+@tool
+def ping() -> str:
+    """Ping"""
+    return "pong"
+
+
+def _call(call_id: str) -> ToolCall:
+    return ToolCall(id=call_id, function=Function(name="ping", arguments="{}"))
+
+
+def _chat(turns: int) -> list[Message]:
+    messages: list[Message] = [SystemMessage(content="Be brief.")]
+    for index in range(turns):
+        messages.append(UserMessage(content=f"question {index} " + "x" * 200))
+        messages.append(AssistantMessage(content=f"answer {index}"))
+    return messages
+
+
+def _agent_loop(rounds: int) -> list[Message]:
+    messages: list[Message] = [UserMessage(content="Do the task.")]
+    for index in range(rounds):
+        messages.append(AssistantMessage(tool_calls=[_call(f"call_{index}")]))
+        messages.append(
+            ToolResultMessage(tool_call_id=f"call_{index}", content="y" * 200)
+        )
+    return messages
+
+
+def _paired(messages: list[Message]) -> bool:
+    offered = {
+        call.id
+        for message in messages
+        if isinstance(message, AssistantMessage)
+        for call in message.tool_calls
+    }
+    answered = {
+        message.tool_call_id
+        for message in messages
+        if isinstance(message, ToolResultMessage)
+    }
+    return offered == answered
+
+
+class LimitedFake(ChatFake):
+    """Rejects requests with more than ``limit`` messages, as a provider would."""
+
+    def __init__(self, limit: int = 1_000, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.limit = limit
+        self.sent: list[int] = []
+
+    def _tool_calls(
+        self,
+        messages: list[Message],
+        tools: list[Tool | dict] | None,
+        tool_choice: ToolChoice,
+    ) -> list[ToolCall]:
+        self.sent.append(len(messages))
+        if len(messages) > self.limit:
+            raise ContextLengthExceededError("Too long")
+        return super()._tool_calls(messages, tools, tool_choice)
+
+
+class TestPolicies:
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_system_and_newest_turns(self) -> None:
+        messages = _chat(5)
+
+        trimmed = await DropOldestTurns().trim(
+            messages, budget=150, count_tokens=estimate_prompt_tokens
+        )
+
+        assert trimmed[0] == messages[0]
+        assert trimmed[1:] == messages[-4:]
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_drops_tool_rounds_with_their_results(self) -> None:
+        messages = _agent_loop(4)
+
+        trimmed = await DropOldestTurns().trim(
+            messages, budget=120, count_tokens=estimate_prompt_tokens
+        )
+
+        assert _paired(trimmed)
+        # The task stays in front of the kept tool rounds.
+        assert trimmed[0] == messages[0]
+        assert trimmed[1:] == messages[-4:]
+
+    @pytest.mark.asyncio
+    async def test_returns_the_same_list_when_nothing_can_go(self) -> None:
+        messages = [UserMessage(content="x" * 1_000)]
+
+        assert (
+            await DropOldestTurns().trim(
+                messages, budget=1, count_tokens=estimate_prompt_tokens
+            )
+            is messages
+        )
+        assert (
+            await KeepLastTurns(1).trim(
+                messages, budget=1, count_tokens=estimate_prompt_tokens
+            )
+            is messages
+        )
+
+    @pytest.mark.asyncio
+    async def test_keep_last_turns_never_splits_a_pending_call(self) -> None:
+        messages = [
+            UserMessage(content="one"),
+            AssistantMessage(tool_calls=[_call("a")]),
+            UserMessage(content="interrupting"),
+            ToolResultMessage(tool_call_id="a", content="done"),
+            UserMessage(content="two"),
+        ]
+
+        trimmed = await KeepLastTurns(1).trim(
+            messages, budget=0, count_tokens=estimate_prompt_tokens
+        )
+
+        assert trimmed == [messages[-1]]
+        assert _paired(
+            await KeepLastTurns(2).trim(
+                messages, budget=0, count_tokens=estimate_prompt_tokens
+            )
+        )
+
+    @pytest.mark.asyncio
+    async def test_summarize_middle_replaces_older_turns(self) -> None:
+        summarizer = ChatFake(behavior=FakeBehavior(text="They talked."))
+        messages = _chat(4)
+
+        trimmed = await SummarizeMiddle(summarizer, keep_last_turns=1).trim(
+            messages, budget=0, count_tokens=estimate_prompt_tokens
+        )
+
+        assert trimmed[0] == messages[0]
+        assert isinstance(trimmed[1], SystemMessage)
+        assert trimmed[1].text.endswith("They talked.")
+        assert trimmed[2:] == messages[-2:]
+
+    @pytest.mark.asyncio
+    async def test_summary_keeps_the_system_prompt_on_every_provider(self) -> None:
+        pytest.importorskip("anthropic")
+        pytest.importorskip("google.genai")
+        from llmify.providers import anthropic, google
+
+        summarizer = ChatFake(behavior=FakeBehavior(text="They talked."))
+        trimmed = await SummarizeMiddle(summarizer, keep_last_turns=1).trim(
+            _chat(4), budget=0, count_tokens=estimate_prompt_tokens
+        )
+
+        system, _ = anthropic._convert_messages(trimmed)
+        _, system_instruction = google._convert_messages(trimmed)
+        for prompt in (system, system_instruction):
+            assert prompt.startswith("Be brief.")
+            assert prompt.endswith("They talked.")
+
+    def test_rejects_invalid_turn_counts(self) -> None:
+        with pytest.raises(ValueError, match="turns"):
+            KeepLastTurns(0)
+        with pytest.raises(ValueError, match="keep_last_turns"):
+            SummarizeMiddle(ChatFake(), keep_last_turns=0)
+
+
+class TestModelIntegration:
+    @pytest.mark.asyncio
+    async def test_trims_up_front_when_over_the_context_window(self) -> None:
+        llm = ChatFake(context_window=150, context_overflow=DropOldestTurns())
+        messages = _chat(5)
+
+        completion = await llm.invoke(messages)
+
+        assert completion.usage.prompt_tokens <= 150
+        assert len(messages) == 11
+
+    @pytest.mark.asyncio
+    async def test_retries_once_after_a_provider_rejection(self) -> None:
+        llm = LimitedFake(limit=3, context_overflow=KeepLastTurns(1))
+
+        await llm.invoke(_chat(3))
+
+        assert llm.sent == [7, 3]
+
+    @pytest.mark.asyncio
+    async def test_raises_when_trimming_cannot_help(self) -> None:
+        llm = LimitedFake(limit=0, context_overflow=KeepLastTurns(1))
+
+        with pytest.raises(ContextLengthExceededError):
+            await llm.invoke(_chat(3))
+
+        assert llm.sent == [7, 3]
+
+    @pytest.mark.asyncio
+    async def test_streams_retry_before_the_first_event(self) -> None:
+        llm = LimitedFake(limit=3, context_overflow=KeepLastTurns(1))
+
+        events = [event async for event in llm.stream(_chat(3))]
+
+        assert events
+        assert llm.sent == [7, 3]
+
+    @pytest.mark.asyncio
+    async def test_without_a_policy_overflow_propagates(self) -> None:
+        llm = LimitedFake(limit=3)
+
+        with pytest.raises(ContextLengthExceededError):
+            await llm.invoke(_chat(3))
+
+    @pytest.mark.asyncio
+    async def test_tool_loops_keep_the_trimmed_history(self) -> None:
+        llm = LimitedFake(
+            behavior=FakeBehavior(tool_calls=(_call("call_new"),)),
+            context_window=150,
+            context_overflow=DropOldestTurns(),
+        )
+
+        await llm.invoke_with_tools(
+            [*_agent_loop(4), UserMessage(content="Continue.")], tools=[ping]
+        )
+
+        # Round two extends the trimmed history instead of the original one.
+        assert llm.sent == [6, 8]
@@ -0,0 +1,84 @@
+import gc
+
+from llmify import (
+    AssistantMessage,
+    ContentPartTextParam,
+    Function,
+    ToolCall,
+    UserMessage,
+)
+from llmify.conversion import ConversionMemo
+
+
+class CountingConverter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, message: UserMessage) -> dict:
+        self.calls += 1
+        return {"role": "user", "content": message.content, "cache": message.cache}
+
+
+class TestConversionMemo:
+    def test_converts_each_message_once(self) -> None:
+        convert = CountingConverter()
+        memo = ConversionMemo(convert)
+        message = UserMessage(content="Hi")
+
+        first = memo(message)
+
+        assert memo(message) is first
+        assert convert.calls == 1
+
+    def test_equal_messages_are_converted_separately(self) -> None:
+        convert = CountingConverter()
+        memo = ConversionMemo(convert)
+
+        memo(UserMessage(content="Hi"))
+        memo(UserMessage(content="Hi"))
+
+        assert convert.calls == 2
+
+    def test_assigning_a_field_invalidates_the_entry(self) -> None:
+        convert = CountingConverter()
+        memo = ConversionMemo(convert)
+        message = UserMessage(content="Hi")
+        memo(message)
+
+        message.cache = True
+
+        assert memo(message)["cache"] is True
+        assert convert.calls == 2
+
+    def test_in_place_edits_invalidate_the_entry(self) -> None:
+        convert = CountingConverter()
+        memo = ConversionMemo(convert)
+        message = UserMessage(content=[ContentPartTextParam(text="Hi")])
+        memo(message)
+
+        message.content.append(ContentPartTextParam(text="there"))
+
+        assert len(memo(message)["content"]) == 2
+        assert convert.calls == 2
+
+    def test_editing_a_tool_call_invalidates_the_entry(self) -> None:
+        memo = ConversionMemo(lambda message: message.model_dump())
+        call = ToolCall(id="call_1", function=Function(name="f", arguments="{}"))
+        message = AssistantMessage(tool_calls=[call])
+        memo(message)
+
+        call.function.arguments = '{"x": 1}'
+
+        converted = memo(message)
+        assert converted["tool_calls"][0]["function"]["arguments"] == '{"x": 1}'
+
+    def test_entries_die_with_their_message(self) -> None:
+        memo = ConversionMemo(CountingConverter())
+        message = UserMessage(content="Hi")
+        memo(message)
+        assert len(memo) == 1
+
+        del message
+        gc.collect()
+
+        assert len(memo) == 0
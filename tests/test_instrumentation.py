@@ -0,0 +1,177 @@
+import pytest
+
+from llmify import (
+    ChatFake,
+    FakeBehavior,
+    Function,
+    InMemoryResponseCache,
+    RequestCallback,
+    RequestEndEvent,
+    RequestEvent,
+    RequestStartEvent,
+    ToolCall,
+    UserMessage,
+    tool,
+)
+from llmify.exceptions import RateLimitError
+from llmify.views import ChatInvokeUsage
+
+MESSAGES = [UserMessage(content="Hi")]
+
+
+@tool
+def ping() -> str:
+    """Ping"""
+    return "pong"
+
+
+def _recorder() -> tuple[list[RequestEvent], RequestCallback]:
+    events: list[RequestEvent] = []
+
+    async def record(event: RequestEvent) -> None:
+        events.append(event)
+
+    return events, record
+
+
+class TestRequestEvents:
+    @pytest.mark.asyncio
+    async def test_reports_stream_timings(self) -> None:
+        events, record = _recorder()
+        llm = ChatFake(
+            behavior=FakeBehavior(
+                text="one two three", latency=0.02, tokens_per_second=100
+            ),
+            on_request=record,
+        )
+
+        async for _ in llm.stream(MESSAGES):
+            pass
+
+        start, end = events
+        assert start == RequestStartEvent(
+            model="fake", provider="ChatFake", streamed=True
+        )
+        assert isinstance(end, RequestEndEvent)
+        assert end.time_to_first_byte == end.time_to_first_token
+        assert end.time_to_first_token >= 0.02
+        assert len(end.inter_token_gaps) == 2
+        assert all(gap >= 0.01 for gap in end.inter_token_gaps)
+        assert end.duration >= end.time_to_first_token + sum(end.inter_token_gaps)
+        assert end.stop_reason == "stop"
+        assert end.usage.completion_tokens == 3
+        assert 0 < end.tokens_per_second <= 3 / sum(end.inter_token_gaps)
+        assert (end.retries, end.backoff_time, end.error) == (0, 0.0, None)
+
+    @pytest.mark.asyncio
+    async def test_reports_invoke_timings(self) -> None:
+        events, record = _recorder()
+        llm = ChatFake(behavior=FakeBehavior(latency=0.01), on_request=record)
+
+        await llm.invoke(MESSAGES)
+
+        end = events[-1]
+        assert not end.streamed
+        assert end.time_to_first_token is None
+        assert end.inter_token_gaps == ()
+        assert end.time_to_first_byte <= end.duration
+        assert end.generation_time >= 0.01
+        assert end.usage is not None
+
+    @pytest.mark.asyncio
+    async def test_separates_backoff_from_provider_time(self) -> None:
+        events, record = _recorder()
+        retries = []
+        llm = ChatFake(
+            behavior=FakeBehavior(rate_limit_rate=0.5, retry_after=0.03, seed=1),
+            on_request=record,
+            on_retry=retries.append,
+        )
+
+        await llm.invoke(MESSAGES)
+
+        end = events[-1]
+        assert end.retries == len(retries) == 1
+        assert end.backoff_time == pytest.approx(0.03)
+        assert end.provider_time == pytest.approx(end.duration - 0.03)
+
+    @pytest.mark.asyncio
+    async def test_reports_streams_closed_early(self) -> None:
+        events, record = _recorder()
+        llm = ChatFake(behavior=FakeBehavior(text="one two three"), on_request=record)
+        stream = llm.stream(MESSAGES)
+
+        await anext(stream)
+        await stream.aclose()
+
+        _, end = events
+        assert isinstance(end, RequestEndEvent)
+        assert end.error is None
+        assert end.usage is None
+
+    @pytest.mark.asyncio
+    async def test_reports_failed_requests(self) -> None:
+        events, record = _recorder()
+        llm = ChatFake(
+            behavior=FakeBehavior(rate_limit_rate=1.0, retry_after=0.0),
+            max_retries=1,
+            on_request=record,
+        )
+
+        with pytest.raises(RateLimitError):
+            await llm.invoke(MESSAGES)
+
+        end = events[-1]
+        assert isinstance(end.error, RateLimitError)
+        assert end.retries == 1
+        assert end.usage is None
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_send_no_request(self) -> None:
+        events, record = _recorder()
+        llm = ChatFake(cache=InMemoryResponseCache(), on_request=record)
+
+        await llm.invoke(MESSAGES)
+        await llm.invoke(MESSAGES)
+
+        assert [type(event) for event in events] == [
+            RequestStartEvent,
+            RequestEndEvent,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tool_loops_report_every_round(self) -> None:
+        events, record = _recorder()
+        llm = ChatFake(
+            behavior=FakeBehavior(
+                tool_calls=(
+                    ToolCall(
+                        id="call_1", function=Function(name="ping", arguments="{}")
+                    ),
+                )
+            ),
+            on_request=record,
+        )
+
+        await llm.invoke_with_tools(MESSAGES, tools=[ping])
+
+        assert sum(isinstance(event, RequestEndEvent) for event in events) == 2
+
+
+def test_tokens_per_second_needs_usage_and_time() -> None:
+    end = RequestEndEvent(
+        model="fake",
+        provider="ChatFake",
+        streamed=True,
+        duration=1.0,
+        time_to_first_byte=None,
+        time_to_first_token=None,
+        inter_token_gaps=(),
+        generation_time=None,
+        retries=0,
+        backoff_time=0.0,
+        usage=ChatInvokeUsage(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+        stop_reason=None,
+    )
+
+    assert end.tokens_per_second is None
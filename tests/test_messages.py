@@ -1,16 +1,26 @@
+from pathlib import Path
+
 import pytest
+from pydantic import ValidationError
 
 from llmify import (
     AssistantMessage,
+    ContentPartImageBytes,
     ContentPartImageParam,
     ContentPartTextParam,
+    FrozenAssistantMessage,
+    FrozenUserMessage,
     Function,
     ImageURL,
     SystemMessage,
     ToolCall,
     ToolResultMessage,
     UserMessage,
+    freeze,
 )
+from llmify import messages as messages_module
+from llmify.cache import request_fingerprint
+from llmify.conversion import ConversionMemo
 from llmify.messages import ContentPartRefusalParam, _truncate
 
 BASE64_PNG = "data:image/png;base64," + "A" * 4096
@@ -188,3 +198,161 @@ class TestReprsAreReadable:
     def test_tool_result_truncates_long_content(self) -> None:
         message = ToolResultMessage(tool_call_id="call_1", content="x" * 200)
         assert len(str(message)) < 150
+
+
+def _image() -> ContentPartImageParam:
+    return ContentPartImageParam(image_url=ImageURL(url=BASE64_PNG))
+
+
+class TestFrozenMessages:
+    def test_equal_messages_share_digest_and_hash(self) -> None:
+        built = FrozenUserMessage(content=[ContentPartTextParam(text="Hi"), _image()])
+        frozen = freeze(
+            UserMessage(content=[ContentPartTextParam(text="Hi"), _image()])
+        )
+
+        assert built.digest == frozen.digest
+        assert built == frozen
+        assert len({built, frozen}) == 1
+        assert built != freeze(UserMessage(content="Hi"))
+
+    def test_shares_identical_image_parts(self) -> None:
+        first = FrozenUserMessage(content=[_image()])
+        second = freeze(UserMessage(content=[ContentPartTextParam(text="x"), _image()]))
+
+        assert first.content[0] is second.content[1]
+
+    def test_rejects_changes(self) -> None:
+        message = FrozenUserMessage(content=[ContentPartTextParam(text="Hi")])
+
+        with pytest.raises(ValidationError):
+            message.cache = True
+        with pytest.raises(TypeError):
+            message.content.append(ContentPartTextParam(text="more"))
+        with pytest.raises(ValidationError):
+            message.content[0].text = "Bye"
+
+    def test_copies_with_updates_get_a_new_digest(self) -> None:
+        message = FrozenUserMessage(content="Hi")
+
+        cached = message.model_copy(update={"cache": True})
+
+        assert cached.cache
+        assert cached.digest != message.digest
+        assert message.model_copy(deep=True) == message
+
+    def test_freezes_tool_calls(self) -> None:
+        message = freeze(
+            AssistantMessage(
+                tool_calls=[
+                    ToolCall(id="call_1", function=Function(name="f", arguments="{}"))
+                ]
+            )
+        )
+
+        assert isinstance(message, FrozenAssistantMessage)
+        assert isinstance(message, AssistantMessage)
+        assert freeze(message) is message
+        with pytest.raises(ValidationError):
+            message.tool_calls[0].function.arguments = "[]"
+
+    def test_fingerprints_use_the_digest(self) -> None:
+        message = FrozenUserMessage(content="Hi")
+
+        assert request_fingerprint({"messages": [message]}) == request_fingerprint(
+            {"messages": [FrozenUserMessage(content="Hi")]}
+        )
+
+    def test_equal_messages_share_one_conversion(self) -> None:
+        converted: list[str] = []
+        memo = ConversionMemo(lambda message: converted.append(message.text))
+        first = FrozenUserMessage(content="Hi")
+
+        memo(first)
+        memo(FrozenUserMessage(content="Hi"))
+
+        assert converted == ["Hi"]
+
+
+class TestContentPartImageBytes:
+    def test_encodes_once_and_caches(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        encoded: list[bytes] = []
+        b64encode = messages_module.b64encode
+        monkeypatch.setattr(
+            messages_module,
+            "b64encode",
+            lambda data: encoded.append(bytes(data)) or b64encode(data),
+        )
+        part = ContentPartImageBytes(data=b"\x89PNG")
+
+        assert part.base64 == "iVBORw=="
+        assert part.data_url == "data:image/png;base64,iVBORw=="
+        assert part.base64 is part.base64
+        assert encoded == [b"\x89PNG"]
+
+    def test_keeps_bytes_and_read_only_views_without_copying(self) -> None:
+        data = b"\x89PNG"
+        view = memoryview(data)
+
+        assert ContentPartImageBytes(data=data).data is data
+        assert ContentPartImageBytes(data=view).data is view
+
+    def test_copies_writable_views_so_the_part_stays_hashable(self) -> None:
+        buffer = bytearray(b"\x89PNG")
+        part = ContentPartImageBytes(data=memoryview(buffer))
+        buffer[0] = 0
+
+        assert part.data == b"\x89PNG"
+        assert hash(part) == hash(ContentPartImageBytes(data=b"\x89PNG"))
+
+    def test_reads_files_lazily(self, tmp_path: Path) -> None:
+        path = tmp_path / "shot.jpeg"
+        part = ContentPartImageBytes(data=str(path), media_type="image/jpeg")
+        path.write_bytes(b"\xff\xd8")
+
+        assert part.data == path
+        assert part.base64 == "/9g="
+
+    def test_reads_empty_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "empty.png"
+        path.write_bytes(b"")
+
+        assert ContentPartImageBytes(data=path).base64 == ""
+
+    def test_repr_does_not_leak_the_payload(self) -> None:
+        part = ContentPartImageBytes(data=b"x" * 4096)
+
+        assert repr(part) == (
+            "ContentPartImageBytes(data=<4096 bytes>, media_type='image/png', "
+            "detail='auto')"
+        )
+
+    def test_round_trips_through_json(self, tmp_path: Path) -> None:
+        path = tmp_path / "shot.png"
+        path.write_bytes(b"\x89PNG")
+        message = UserMessage(content=[ContentPartImageBytes(data=path)])
+
+        dumped = message.model_dump_json()
+        restored = UserMessage.model_validate_json(dumped)
+
+        assert message.model_dump(mode="json")["content"][0]["data"] == {
+            "base64": "iVBORw=="
+        }
+        assert restored.content[0].data == b"\x89PNG"
+        assert restored.content[0].base64 == "iVBORw=="
+
+    def test_caches_the_data_url(self) -> None:
+        part = ContentPartImageBytes(data=b"\x89PNG")
+
+        assert part.data_url is part.data_url
+        assert part.model_copy(update={"media_type": "image/gif"}).data_url == (
+            "data:image/gif;base64,iVBORw=="
+        )
+
+    def test_frozen_messages_digest_the_raw_bytes(self) -> None:
+        first = freeze(UserMessage(content=[ContentPartImageBytes(data=b"\x89PNG")]))
+        second = freeze(
+            UserMessage(content=[ContentPartImageBytes(data=memoryview(b"\x89PNG"))])
+        )
+
+        assert first == second
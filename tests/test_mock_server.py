@@ -0,0 +1,189 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from llmify.exceptions import RateLimitError, RetryableError
+from llmify.messages import Function, ToolCall, UserMessage
+from llmify.mock_server import MockLLMServer
+from llmify.providers.fake import FakeBehavior
+from llmify.tools import tool
+from llmify.views import StreamEnd, StreamTextDelta
+
+CALL = ToolCall(
+    id="call_1", function=Function(name="add", arguments='{"a": 1, "b": 2}')
+)
+
+
+@tool
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+@pytest_asyncio.fixture
+async def server():
+    async with MockLLMServer(FakeBehavior(text="Hello there world")) as server:
+        yield server
+
+
+def _chat(server: MockLLMServer, **kwargs):
+    pytest.importorskip("openai")
+    from llmify.providers.openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model="gpt-test", api_key="sk-test", base_url=server.openai_base_url, **kwargs
+    )
+
+
+def _responses(server: MockLLMServer, **kwargs):
+    pytest.importorskip("openai")
+    from llmify.providers.openai_responses import ChatOpenAIResponses
+
+    return ChatOpenAIResponses(
+        model="gpt-test", api_key="sk-test", base_url=server.openai_base_url, **kwargs
+    )
+
+
+def _websocket_responses(server: MockLLMServer, **kwargs):
+    pytest.importorskip("websockets")
+    from llmify.providers.openai_responses_transport import (
+        WebSocketResponsesTransport,
+    )
+
+    return _responses(server, transport=WebSocketResponsesTransport(), **kwargs)
+
+
+def _anthropic(server: MockLLMServer, **kwargs):
+    anthropic = pytest.importorskip("anthropic")
+    from llmify.providers.anthropic import ChatAnthropic
+
+    client = anthropic.AsyncAnthropic(
+        api_key="sk-test", base_url=server.base_url, max_retries=0
+    )
+    return ChatAnthropic(model="claude-test", client=client, **kwargs)
+
+
+def _google(server: MockLLMServer, **kwargs):
+    pytest.importorskip("google.genai")
+    from google import genai
+    from google.genai import types
+
+    from llmify.providers.google import ChatGoogle
+
+    client = genai.Client(
+        api_key="test",
+        http_options=types.HttpOptions(
+            base_url=server.base_url,
+            retry_options=types.HttpRetryOptions(attempts=1),
+        ),
+    )
+    return ChatGoogle(model="gemini-test", client=client, **kwargs)
+
+
+PROVIDERS = [_chat, _responses, _websocket_responses, _anthropic, _google]
+
+
+@pytest.mark.parametrize("make_model", PROVIDERS)
+class TestWireFormats:
+    @pytest.mark.asyncio
+    async def test_invoke(self, server: MockLLMServer, make_model) -> None:
+        result = await make_model(server).invoke([UserMessage(content="hi")])
+
+        assert result.completion == "Hello there world"
+        assert result.usage.completion_tokens == 3
+        assert result.usage.prompt_tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_stream(self, server: MockLLMServer, make_model) -> None:
+        events = [
+            event
+            async for event in make_model(server).stream([UserMessage(content="hi")])
+        ]
+
+        deltas = [event.delta for event in events if isinstance(event, StreamTextDelta)]
+        assert deltas == ["Hello", " there", " world"]
+        assert isinstance(events[-1], StreamEnd)
+
+    @pytest.mark.asyncio
+    async def test_tool_loop(self, server: MockLLMServer, make_model) -> None:
+        server.behavior = FakeBehavior(text="3", tool_calls=(CALL,))
+
+        result = await make_model(server).invoke_with_tools(
+            [UserMessage(content="1+2?")], tools=[add]
+        )
+
+        assert result.completion == "3"
+        assert [call.id for call in result.tool_calls] == ["call_1"]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit(self, server: MockLLMServer, make_model) -> None:
+        server.behavior = FakeBehavior(rate_limit_rate=1, retry_after=2.5)
+
+        with pytest.raises(RateLimitError):
+            await make_model(server, max_retries=0).invoke([UserMessage(content="hi")])
+
+    @pytest.mark.asyncio
+    async def test_server_error(self, server: MockLLMServer, make_model) -> None:
+        server.behavior = FakeBehavior(server_error_rate=1)
+
+        with pytest.raises(RetryableError):
+            await make_model(server, max_retries=0).invoke([UserMessage(content="hi")])
+
+
+class TestFaults:
+    @pytest.mark.asyncio
+    async def test_rate_limits_carry_retry_after(self, server: MockLLMServer) -> None:
+        server.behavior = FakeBehavior(rate_limit_rate=1, retry_after=2.5)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await _chat(server, max_retries=0).invoke([UserMessage(content="hi")])
+
+        assert exc_info.value.retry_after == 2.5
+
+    @pytest.mark.asyncio
+    async def test_dropped_stream_stops_halfway(self, server: MockLLMServer) -> None:
+        server.behavior = FakeBehavior(text="a b c d", disconnect_rate=1)
+        events: list[str] = []
+
+        async with (
+            httpx.AsyncClient() as client,
+            client.stream(
+                "POST",
+                f"{server.openai_base_url}/chat/completions",
+                json={"model": "gpt-test", "messages": [], "stream": True},
+            ) as response,
+        ):
+            with pytest.raises(httpx.RemoteProtocolError):
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        events.append(line)
+
+        # The role chunk and the first two of four tokens.
+        assert len(events) == 3
+
+    @pytest.mark.asyncio
+    async def test_paces_tokens(self, server: MockLLMServer) -> None:
+        server.behavior = FakeBehavior(text="a b c", latency=0.05, tokens_per_second=50)
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await _chat(server).invoke([UserMessage(content="hi")])
+
+        assert loop.time() - start >= 0.09
+
+
+class TestRouting:
+    @pytest.mark.asyncio
+    async def test_records_requests(self, server: MockLLMServer) -> None:
+        await _anthropic(server).invoke([UserMessage(content="hi")])
+
+        assert server.requests[-1]["path"] == "/v1/messages"
+        assert server.requests[-1]["body"]["model"] == "claude-test"
+
+    @pytest.mark.asyncio
+    async def test_unknown_paths_are_not_found(self, server: MockLLMServer) -> None:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(f"{server.base_url}/v1/unknown", json={})
+
+        assert response.status_code == 404
@@ -0,0 +1,189 @@
+import pytest
+
+from llmify.messages import (
+    AssistantMessage,
+    Function,
+    SystemMessage,
+    ToolCall,
+    ToolResultMessage,
+    UserMessage,
+)
+from llmify.prompt_cache import (
+    BreakpointKind,
+    PromptCachePlanner,
+    resolve_cache_planner,
+)
+from llmify.tools import tool
+from llmify.views import ChatInvokeUsage
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look something up"""
+    return query
+
+
+def _conversation() -> list:
+    return [
+        SystemMessage(content="You are terse. " * 50),
+        UserMessage(content="Find the order."),
+        AssistantMessage(
+            content="",
+            tool_calls=[
+                ToolCall(id="call_1", function=Function(name="lookup", arguments="{}"))
+            ],
+        ),
+        ToolResultMessage(tool_call_id="call_1", content="order 42. " * 100),
+    ]
+
+
+def _usage(cached: int) -> ChatInvokeUsage:
+    return ChatInvokeUsage(
+        prompt_tokens=1000,
+        prompt_cached_tokens=cached,
+        completion_tokens=5,
+        total_tokens=1005,
+    )
+
+
+def _kinds(plan) -> list[BreakpointKind]:
+    return [bp.kind for bp in plan.breakpoints]
+
+
+class TestPlan:
+    def test_places_breakpoints_on_the_stable_prefixes(self) -> None:
+        planner = PromptCachePlanner()
+
+        plan = planner.plan(_conversation(), [lookup])
+
+        assert _kinds(plan) == [
+            BreakpointKind.TOOLS,
+            BreakpointKind.SYSTEM,
+            BreakpointKind.HISTORY,
+            BreakpointKind.LATEST,
+        ]
+        assert [message.cache for message in plan.messages] == [
+            True,
+            True,
+            False,
+            True,
+        ]
+        assert plan.cache_tools
+        tokens = [bp.tokens for bp in plan.breakpoints]
+        assert tokens == sorted(tokens)
+
+    def test_one_shot_requests_do_not_write_their_tail(self) -> None:
+        planner = PromptCachePlanner()
+
+        plan = planner.plan(
+            [SystemMessage(content="Rules."), UserMessage(content="Hi")]
+        )
+
+        assert _kinds(plan) == [BreakpointKind.SYSTEM]
+        assert not plan.messages[1].cache
+
+    def test_leaves_the_caller_messages_untouched(self) -> None:
+        messages = _conversation()
+
+        PromptCachePlanner().plan(messages, [lookup])
+
+        assert not any(message.cache for message in messages)
+
+    def test_reuses_marked_copies_across_requests(self) -> None:
+        planner = PromptCachePlanner()
+        messages = _conversation()
+
+        first = planner.plan(messages, [lookup])
+        second = planner.plan([*messages, UserMessage(content="More?")], [lookup])
+        messages[0].content = "New rules."
+        third = planner.plan(messages, [lookup])
+
+        # Stable copies keep the providers' conversion memos warm.
+        assert second.messages[0] is first.messages[0]
+        assert third.messages[0] is not first.messages[0]
+        assert third.messages[0].content == "New rules."
+
+    def test_stable_digest_ignores_the_conversation_tail(self) -> None:
+        planner = PromptCachePlanner()
+        first = planner.plan(_conversation(), [lookup])
+        second = planner.plan(
+            [*_conversation(), UserMessage(content="And the invoice?")], [lookup]
+        )
+
+        assert first.stable_digest == second.stable_digest
+        assert first.breakpoints[-1].digest != second.breakpoints[-1].digest
+
+
+class TestRecord:
+    def test_attributes_cached_tokens_to_covered_prefixes(self) -> None:
+        planner = PromptCachePlanner()
+        plan = planner.plan(_conversation(), [lookup])
+        system = plan.breakpoints[1]
+
+        planner.record(plan, _usage(cached=system.tokens))
+
+        assert planner.hit_rate(BreakpointKind.SYSTEM) == 1.0
+        assert planner.hit_rate(BreakpointKind.LATEST) == 0.0
+        stats = planner.prefix_stats()[system.digest]
+        assert (stats.requests, stats.hits) == (1, 1)
+
+    def test_ignores_cached_responses_and_missing_usage(self) -> None:
+        planner = PromptCachePlanner()
+        plan = planner.plan(_conversation(), [lookup])
+        replayed = _usage(cached=0)
+        replayed.from_cache = True
+
+        planner.record(plan, None)
+        planner.record(plan, replayed)
+
+        assert planner.hit_rate(BreakpointKind.SYSTEM) is None
+        assert planner.prefix_stats() == {}
+
+    def test_drops_a_missing_system_breakpoint_and_reprobes_it(self) -> None:
+        planner = PromptCachePlanner(window=2)
+        messages = [SystemMessage(content="Rules."), UserMessage(content="Hi")]
+        for _ in range(2):
+            planner.record(planner.plan(messages), _usage(cached=0))
+
+        skipped = planner.plan(messages)
+        probe = planner.plan(messages)
+
+        assert _kinds(skipped) == []
+        assert _kinds(probe) == [BreakpointKind.SYSTEM]
+
+    def test_stops_writing_the_latest_message_while_history_misses(self) -> None:
+        planner = PromptCachePlanner(window=2)
+        for _ in range(2):
+            planner.record(planner.plan(_conversation()), _usage(cached=0))
+
+        plan = planner.plan(_conversation())
+
+        assert BreakpointKind.LATEST not in _kinds(plan)
+        assert BreakpointKind.HISTORY in _kinds(plan)
+
+    def test_evicts_the_least_recent_prefixes(self) -> None:
+        planner = PromptCachePlanner(max_prefixes=2)
+        for index in range(3):
+            messages = [SystemMessage(content=f"Rules {index}.")]
+            planner.record(planner.plan(messages), _usage(cached=0))
+
+        assert len(planner.prefix_stats()) == 2
+
+
+class TestResolve:
+    def test_maps_strategies_to_planners(self) -> None:
+        planner = PromptCachePlanner()
+
+        assert resolve_cache_planner("manual") is None
+        assert isinstance(resolve_cache_planner("auto"), PromptCachePlanner)
+        assert resolve_cache_planner(planner) is planner
+
+    def test_rejects_unknown_strategies(self) -> None:
+        with pytest.raises(ValueError, match="cache_strategy"):
+            resolve_cache_planner("always")  # type: ignore[arg-type]
+
+    def test_validates_planner_options(self) -> None:
+        with pytest.raises(ValueError, match="window"):
+            PromptCachePlanner(window=0)
+        with pytest.raises(ValueError, match="min_hit_rate"):
+            PromptCachePlanner(min_hit_rate=1.5)
@@ -0,0 +1,185 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from llmify import ChatFake, FakeBehavior, rate_limit
+from llmify.exceptions import RateLimitError
+from llmify.messages import (
+    AssistantMessage,
+    Function,
+    ToolCall,
+    ToolResultMessage,
+    UserMessage,
+)
+from llmify.rate_limit import RateLimiter, RateLimitReservation, estimate_prompt_tokens
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_allows_a_full_minute_of_requests_without_waiting(
+        self, clock: FakeClock
+    ) -> None:
+        limiter = RateLimiter(requests_per_minute=3)
+
+        for _ in range(3):
+            await limiter.acquire(0)
+
+        assert clock.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_waits_for_a_request_slot_to_refill(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(requests_per_minute=60)
+        for _ in range(60):
+            await limiter.acquire(0)
+
+        await limiter.acquire(0)
+
+        assert clock.sleeps == [pytest.approx(1.0)]
+
+    @pytest.mark.asyncio
+    async def test_waits_for_enough_tokens(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(tokens_per_minute=600)
+        await limiter.acquire(600)
+
+        await limiter.acquire(100)
+
+        assert clock.sleeps == [pytest.approx(10.0)]
+
+    @pytest.mark.asyncio
+    async def test_caps_oversized_requests_at_the_budget(
+        self, clock: FakeClock
+    ) -> None:
+        limiter = RateLimiter(tokens_per_minute=600)
+
+        reservation = await limiter.acquire(10_000)
+
+        assert reservation == RateLimitReservation(tokens=600)
+        assert clock.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_reconcile_charges_tokens_beyond_the_estimate(
+        self, clock: FakeClock
+    ) -> None:
+        limiter = RateLimiter(tokens_per_minute=600)
+        reservation = await limiter.acquire(100)
+
+        limiter.reconcile(reservation, 700)
+        await limiter.acquire(100)
+
+        assert clock.sleeps == [pytest.approx(20.0)]
+
+    @pytest.mark.asyncio
+    async def test_reconcile_refunds_an_overestimate(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(tokens_per_minute=600)
+        reservation = await limiter.acquire(600)
+
+        limiter.reconcile(reservation, 100)
+        await limiter.acquire(500)
+
+        assert clock.sleeps == []
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"requests_per_minute": 0}, {"tokens_per_minute": -1}]
+    )
+    def test_rejects_non_positive_budgets(self, kwargs: dict) -> None:
+        with pytest.raises(ValueError, match="must be greater than 0"):
+            RateLimiter(**kwargs)
+
+
+class TestEstimatePromptTokens:
+    def test_counts_characters_and_per_message_overhead(self) -> None:
+        messages = [
+            UserMessage(content="x" * 40),
+            AssistantMessage(
+                content="y" * 8,
+                tool_calls=[
+                    ToolCall(id="1", function=Function(name="f", arguments="z" * 12))
+                ],
+            ),
+            ToolResultMessage(tool_call_id="1", content="w" * 20),
+        ]
+
+        assert estimate_prompt_tokens(messages) == 80 // 4 + 3 * 4
+
+
+class SpyLimiter(RateLimiter):
+    def __init__(self) -> None:
+        super().__init__(requests_per_minute=100)
+        self.acquired: list[int] = []
+        self.reconciled: list[int] = []
+
+    async def acquire(self, tokens: int) -> RateLimitReservation:
+        self.acquired.append(tokens)
+        return await super().acquire(tokens)
+
+    def reconcile(self, reservation: RateLimitReservation, total_tokens: int) -> None:
+        self.reconciled.append(total_tokens)
+
+
+class TestProviderIntegration:
+    @pytest.mark.asyncio
+    async def test_invoke_debits_the_estimate_and_reconciles_usage(self) -> None:
+        pytest.importorskip("anthropic")
+        from llmify.providers.anthropic import ChatAnthropic
+
+        limiter = SpyLimiter()
+        client = SimpleNamespace(messages=SimpleNamespace())
+        model = ChatAnthropic(model="claude-test", client=client, rate_limiter=limiter)
+        model._client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(type="text", text="hi")],
+                stop_reason="end_turn",
+                usage=SimpleNamespace(
+                    input_tokens=11,
+                    output_tokens=7,
+                    cache_read_input_tokens=None,
+                    cache_creation_input_tokens=None,
+                ),
+            )
+        )
+
+        await model.invoke([UserMessage(content="x" * 40)])
+
+        # Anthropic's heuristic assumes 3.5 characters per token.
+        assert limiter.acquired == [int(40 / 3.5) + 4]
+        assert limiter.reconciled == [18]
+
+    @pytest.mark.asyncio
+    async def test_failed_attempts_give_their_tokens_back(self) -> None:
+        limiter = SpyLimiter()
+        model = ChatFake(
+            behavior=FakeBehavior(rate_limit_rate=1.0, retry_after=0.0),
+            max_retries=1,
+            rate_limiter=limiter,
+        )
+
+        with pytest.raises(RateLimitError):
+            await model.invoke([UserMessage(content="x" * 40)])
+        with pytest.raises(RateLimitError):
+            async for _ in model.stream([UserMessage(content="x" * 40)]):
+                pass
+
+        assert len(limiter.acquired) == 4
+        assert limiter.reconciled == [0, 0, 0, 0]
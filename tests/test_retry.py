@@ -1,7 +1,10 @@
+import asyncio
+
 import pytest
 
-from llmify.exceptions import RateLimitError, RetryableError
-from llmify.retries import RetryEvent, retry_delay
+from llmify import retries
+from llmify.exceptions import LLMifyError, RateLimitError, RetryableError
+from llmify.retries import AdaptiveConcurrencyLimiter, RetryEvent, retry_delay
 
 
 def test_uses_retry_after_from_rate_limit() -> None:
@@ -37,3 +40,133 @@ def test_retry_event_exposes_attempt_numbers() -> None:
     assert event.failed_attempt == 2
     assert event.next_attempt == 3
     assert event.max_attempts == 5
+
+
+def _retry_event(error: Exception) -> RetryEvent:
+    return RetryEvent(retry_number=0, max_retries=2, delay=0.0, error=error)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    @pytest.fixture(autouse=True)
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        now = [100.0]
+        monkeypatch.setattr(retries.time, "monotonic", lambda: now[0])
+        return now
+
+    @pytest.mark.asyncio
+    async def test_grows_by_one_per_window_of_successes(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+        for _ in range(4):
+            async with limiter:
+                pass
+
+        assert limiter.limit == 4
+        async with limiter:
+            pass
+        assert limiter.limit == 5
+
+    @pytest.mark.asyncio
+    async def test_never_exceeds_max_limit(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+
+        for _ in range(10):
+            async with limiter:
+                pass
+
+        assert limiter.limit == 2
+
+    @pytest.mark.parametrize(
+        "error",
+        [RateLimitError(), RetryableError("overloaded", status_code=503)],
+    )
+    def test_halves_on_congestion_retries(self, error: Exception) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+        limiter(_retry_event(error))
+
+        assert limiter.limit == 4
+
+    @pytest.mark.parametrize(
+        "error",
+        [RetryableError("connection reset"), RetryableError("bad", status_code=408)],
+    )
+    def test_ignores_non_congestion_retries(self, error: Exception) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+        limiter(_retry_event(error))
+
+        assert limiter.limit == 8
+
+    def test_decreases_once_per_cooldown(self, clock: list[float]) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, cooldown=1.0)
+
+        limiter(_retry_event(RateLimitError()))
+        limiter(_retry_event(RateLimitError()))
+        assert limiter.limit == 8
+
+        clock[0] += 1.0
+        limiter(_retry_event(RateLimitError()))
+        assert limiter.limit == 4
+
+    def test_never_drops_below_min_limit(self, clock: list[float]) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+
+        for _ in range(5):
+            limiter(_retry_event(RateLimitError()))
+            clock[0] += 10
+
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_decreases_when_a_request_fails_with_congestion(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+        with pytest.raises(RateLimitError):
+            async with limiter:
+                raise RateLimitError()
+
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_other_failures_leave_the_limit_alone(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+        with pytest.raises(LLMifyError):
+            async with limiter:
+                raise LLMifyError("bad request")
+
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_exposes_in_flight_and_queue_depth(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with limiter:
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        assert limiter.in_flight == 1
+        assert limiter.queue_depth == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"initial_limit": 0},
+            {"initial_limit": 4, "max_limit": 2},
+            {"decrease_factor": 1.0},
+        ],
+    )
+    def test_rejects_invalid_settings(self, kwargs: dict) -> None:
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(**kwargs)
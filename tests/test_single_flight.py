@@ -0,0 +1,220 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from llmify.base import ChatModel
+from llmify.exceptions import LLMifyError
+from llmify.messages import Message, UserMessage
+from llmify.views import ChatInvokeCompletion, StreamEnd, StreamTextDelta
+
+
+class GatedModel(ChatModel):
+    """Holds every provider call open until ``release`` is set."""
+
+    def __init__(self, **kwargs):
+        super().__init__(model="gated", single_flight=True, **kwargs)
+        self.release = asyncio.Event()
+        self.calls = 0
+        self.streams = 0
+        self.error: Exception | None = None
+
+    async def invoke(self, messages, output_format=None, **kwargs):
+        async def call() -> ChatInvokeCompletion[str]:
+            self.calls += 1
+            await self.release.wait()
+            if self.error is not None:
+                raise self.error
+            return ChatInvokeCompletion(completion=messages[-1].text)
+
+        return await self._invoke_shared(
+            lambda: {"prompt": messages[-1].text, **kwargs},
+            ChatInvokeCompletion[str],
+            call,
+        )
+
+    async def stream(self, messages, tools=None, tool_choice="auto", **kwargs):
+        async def produce():
+            self.streams += 1
+            for word in messages[-1].text.split():
+                yield StreamTextDelta(delta=word)
+                await self.release.wait()
+            yield StreamEnd(completion=messages[-1].text)
+
+        async for event in self._stream_shared(
+            lambda: {"prompt": messages[-1].text}, produce
+        ):
+            yield event
+
+
+def _prompt(text: str) -> list[Message]:
+    return [UserMessage(content=text)]
+
+
+async def _collect(model: ChatModel, text: str) -> list[object]:
+    return [event async for event in model.stream(_prompt(text))]
+
+
+class TestInvoke:
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_calls_share_one_request(self) -> None:
+        model = GatedModel()
+        tasks = [asyncio.create_task(model.invoke(_prompt("hi"))) for _ in range(5)]
+        await asyncio.sleep(0)
+
+        model.release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert model.calls == 1
+        assert [result.completion for result in results] == ["hi"] * 5
+        assert len({id(result) for result in results}) == 5
+
+    @pytest.mark.asyncio
+    async def test_different_requests_are_not_shared(self) -> None:
+        model = GatedModel()
+        tasks = [
+            asyncio.create_task(model.invoke(_prompt("hi"))),
+            asyncio.create_task(model.invoke(_prompt("hi"), temperature=0.5)),
+        ]
+        await asyncio.sleep(0)
+
+        model.release.set()
+        await asyncio.gather(*tasks)
+
+        assert model.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_later_calls_start_a_new_request(self) -> None:
+        model = GatedModel()
+        model.release.set()
+
+        await model.invoke(_prompt("hi"))
+        await model.invoke(_prompt("hi"))
+
+        assert model.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self) -> None:
+        model = GatedModel()
+        model.error = LLMifyError("boom")
+        tasks = [asyncio.create_task(model.invoke(_prompt("hi"))) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        model.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert model.calls == 1
+        assert all(isinstance(result, LLMifyError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_the_request_alive(self) -> None:
+        model = GatedModel()
+        first = asyncio.create_task(model.invoke(_prompt("hi")))
+        second = asyncio.create_task(model.invoke(_prompt("hi")))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        model.release.set()
+
+        assert (await second).completion == "hi"
+        assert model.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_failures_are_not_reported_as_unretrieved(
+        self,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        reported: list[dict] = []
+        loop.set_exception_handler(lambda _, context: reported.append(context))
+        model = GatedModel()
+        model.error = LLMifyError("boom")
+        waiter = asyncio.create_task(model.invoke(_prompt("hi")))
+        await asyncio.sleep(0)
+        (flight,) = model._invoke_flights.values()
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        model.release.set()
+        await asyncio.wait([flight])
+        del flight, waiter
+        gc.collect()
+
+        assert reported == []
+
+
+class TestStream:
+    @pytest.mark.asyncio
+    async def test_late_subscribers_get_a_replay_then_live_events(self) -> None:
+        model = GatedModel()
+        first = asyncio.create_task(_collect(model, "one two three"))
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        second = asyncio.create_task(_collect(model, "one two three"))
+        await asyncio.sleep(0)
+        model.release.set()
+        first_events, second_events = await asyncio.gather(first, second)
+
+        assert model.streams == 1
+        assert first_events == second_events
+        assert [event.delta for event in first_events[:-1]] == ["one", "two", "three"]
+        assert isinstance(first_events[-1], StreamEnd)
+
+    @pytest.mark.asyncio
+    async def test_provider_stream_stops_when_every_subscriber_leaves(self) -> None:
+        model = GatedModel()
+        stream = model.stream(_prompt("one two"))
+
+        assert (await anext(stream)).delta == "one"
+        await stream.aclose()
+        # The shared subscription is finalized by the loop's async-gen hooks.
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        assert model._stream_flights == {}
+
+    @pytest.mark.asyncio
+    async def test_without_single_flight_streams_are_independent(self) -> None:
+        model = GatedModel()
+        model._single_flight = False
+        model.release.set()
+
+        await asyncio.gather(_collect(model, "a b"), _collect(model, "a b"))
+
+        assert model.streams == 2
+
+
+class TestProviderIntegration:
+    @pytest.mark.asyncio
+    async def test_anthropic_shares_identical_invokes(self) -> None:
+        pytest.importorskip("anthropic")
+        from llmify.providers.anthropic import ChatAnthropic
+
+        release = asyncio.Event()
+
+        async def create(**_params):
+            await release.wait()
+            return SimpleNamespace(
+                content=[SimpleNamespace(type="text", text="hi")],
+                stop_reason="end_turn",
+                usage=SimpleNamespace(
+                    input_tokens=1,
+                    output_tokens=1,
+                    cache_read_input_tokens=None,
+                    cache_creation_input_tokens=None,
+                ),
+            )
+
+        client = SimpleNamespace(messages=SimpleNamespace())
+        client.messages.create = AsyncMock(side_effect=create)
+        model = ChatAnthropic(model="claude-test", client=client, single_flight=True)
+        tasks = [asyncio.create_task(model.invoke(_prompt("hello"))) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert client.messages.create.await_count == 1
@@ -0,0 +1,114 @@
+import sys
+
+import pytest
+
+from llmify import (
+    ChatFake,
+    HeuristicTokenEstimator,
+    RateLimiter,
+    RateLimitReservation,
+    TokenEstimator,
+    UserMessage,
+    default_token_estimator,
+)
+from llmify.exceptions import ContextLengthExceededError
+from llmify.rate_limit import estimate_prompt_tokens
+
+
+class WordEstimator:
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+class SpyLimiter(RateLimiter):
+    def __init__(self) -> None:
+        super().__init__(tokens_per_minute=100_000)
+        self.acquired: list[int] = []
+
+    async def acquire(self, tokens: int) -> RateLimitReservation:
+        self.acquired.append(tokens)
+        return await super().acquire(tokens)
+
+
+@pytest.fixture
+def no_tiktoken(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "tiktoken", None)
+    default_token_estimator.cache_clear()
+    yield
+    default_token_estimator.cache_clear()
+
+
+class TestEstimators:
+    def test_heuristic_divides_characters(self) -> None:
+        assert HeuristicTokenEstimator().count("x" * 41) == 10
+        assert HeuristicTokenEstimator(chars_per_token=3.5).count("x" * 35) == 10
+
+    def test_heuristic_rejects_non_positive_ratios(self) -> None:
+        with pytest.raises(ValueError, match="chars_per_token"):
+            HeuristicTokenEstimator(chars_per_token=0)
+
+    def test_estimate_prompt_tokens_uses_the_estimator(self) -> None:
+        messages = [UserMessage(content="one two three"), UserMessage(content="four")]
+
+        assert estimate_prompt_tokens(messages, WordEstimator()) == 3 + 2 * 4
+
+    @pytest.mark.usefixtures("no_tiktoken")
+    def test_openai_falls_back_to_the_heuristic_without_tiktoken(self) -> None:
+        estimator = default_token_estimator("openai", "gpt-4o")
+
+        assert isinstance(estimator, HeuristicTokenEstimator)
+        assert isinstance(estimator, TokenEstimator)
+
+    def test_families_tune_the_heuristic(self) -> None:
+        text = "x" * 70
+
+        assert default_token_estimator("anthropic", "claude").count(text) == 20
+        assert default_token_estimator("google", "gemini").count(text) == 17
+
+
+class TestPreflight:
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_prompts_before_sending(self) -> None:
+        events = []
+        llm = ChatFake(context_window=10, on_request=events.append)
+
+        with pytest.raises(ContextLengthExceededError) as raised:
+            await llm.invoke([UserMessage(content="x" * 100)])
+
+        assert raised.value.prompt_tokens == 100 // 4 + 4
+        assert raised.value.context_window == 10
+        assert events == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_streams(self) -> None:
+        llm = ChatFake(context_window=10)
+
+        with pytest.raises(ContextLengthExceededError):
+            async for _ in llm.stream([UserMessage(content="x" * 100)]):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_sends_prompts_that_fit(self) -> None:
+        llm = ChatFake(context_window=10, token_estimator=WordEstimator())
+
+        completion = await llm.invoke([UserMessage(content="x" * 100)])
+
+        assert completion.completion
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_debits_the_model_estimate(self) -> None:
+        limiter = SpyLimiter()
+        llm = ChatFake(rate_limiter=limiter, token_estimator=WordEstimator())
+
+        await llm.invoke([UserMessage(content="a b c")])
+
+        assert limiter.acquired == [3 + 4]
+
+    def test_count_tokens_needs_no_request(self) -> None:
+        llm = ChatFake(token_estimator=WordEstimator())
+
+        assert llm.count_tokens([UserMessage(content="a b")]) == 2 + 4
+
+    def test_rejects_non_positive_context_windows(self) -> None:
+        with pytest.raises(ValueError, match="context_window"):
+            ChatFake(context_window=0)
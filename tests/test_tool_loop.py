@@ -0,0 +1,356 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from llmify.base import ChatModel
+from llmify.exceptions import LLMifyError
+from llmify.messages import (
+    AssistantMessage,
+    Function,
+    ToolCall,
+    ToolResultMessage,
+    UserMessage,
+)
+from llmify.tools import RawSchemaTool, tool
+from llmify.views import (
+    ChatInvokeCompletion,
+    ChatInvokeUsage,
+    StreamEnd,
+    StreamTextDelta,
+    StreamToolCall,
+    StreamToolResult,
+)
+
+
+def _call(call_id: str, name: str, arguments: str = "{}") -> ToolCall:
+    return ToolCall(id=call_id, function=Function(name=name, arguments=arguments))
+
+
+def _usage(prompt: int, completion: int) -> ChatInvokeUsage:
+    return ChatInvokeUsage(
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        total_tokens=prompt + completion,
+    )
+
+
+class ScriptedModel(ChatModel):
+    """Replays one scripted completion per invoke and records every request."""
+
+    def __init__(self, *completions: ChatInvokeCompletion) -> None:
+        super().__init__(model="scripted")
+        self.completions = list(completions)
+        self.requests: list[tuple[list, dict]] = []
+
+    async def invoke(self, messages, output_format=None, **kwargs):
+        self.requests.append(
+            (list(messages), {"output_format": output_format, **kwargs})
+        )
+        return self.completions.pop(0)
+
+    async def stream(self, messages, tools=None, tool_choice="auto", **kwargs):
+        self.requests.append((list(messages), {"tools": tools, **kwargs}))
+        async for event in self.completions.pop(0):
+            yield event
+
+
+@tool
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+class TestInvokeWithTools:
+    @pytest.mark.asyncio
+    async def test_feeds_tool_results_back_until_a_final_answer(self) -> None:
+        model = ScriptedModel(
+            ChatInvokeCompletion(
+                completion="",
+                tool_calls=[_call("1", "add", '{"a": 2, "b": 3}')],
+                usage=_usage(10, 2),
+            ),
+            ChatInvokeCompletion(completion="5", usage=_usage(20, 1)),
+        )
+
+        result = await model.invoke_with_tools(
+            [UserMessage(content="2+3?")], tools=[add]
+        )
+
+        assert result.completion == "5"
+        assert [call.id for call in result.tool_calls] == ["1"]
+        assert result.usage == _usage(30, 3)
+        history, kwargs = model.requests[1]
+        assert isinstance(history[1], AssistantMessage)
+        assert history[1].tool_calls[0].id == "1"
+        assert history[2] == ToolResultMessage(tool_call_id="1", content="5")
+        assert kwargs["tools"] == [add]
+
+    @pytest.mark.asyncio
+    async def test_keeps_output_order_and_reports_failures(self) -> None:
+        @tool
+        def fail() -> str:
+            raise RuntimeError("broken")
+
+        model = ScriptedModel(
+            ChatInvokeCompletion(
+                completion="",
+                tool_calls=[_call("1", "fail"), _call("2", "add", '{"a":1,"b":1}')],
+            ),
+            ChatInvokeCompletion(completion="done"),
+        )
+
+        await model.invoke_with_tools([UserMessage(content="go")], tools=[fail, add])
+
+        history, _ = model.requests[1]
+        assert [message.tool_call_id for message in history[2:]] == ["1", "2"]
+        assert '"type": "RuntimeError"' in history[2].content
+        assert history[3].content == "2"
+
+    @pytest.mark.asyncio
+    async def test_uses_the_executor_for_schema_only_tools(self) -> None:
+        schema_tool = RawSchemaTool(name="lookup", schema={"type": "object"})
+        model = ScriptedModel(
+            ChatInvokeCompletion(completion="", tool_calls=[_call("1", "lookup")]),
+            ChatInvokeCompletion(completion="done"),
+        )
+
+        await model.invoke_with_tools(
+            [UserMessage(content="go")],
+            tools=[schema_tool],
+            tool_executor=lambda call: {"name": call.function.name},
+        )
+
+        assert model.requests[1][0][2].content == '{"name": "lookup"}'
+
+    @pytest.mark.asyncio
+    async def test_enforces_maximum_tool_rounds(self) -> None:
+        model = ScriptedModel(
+            ChatInvokeCompletion(completion="", tool_calls=[_call("1", "add")])
+        )
+
+        with pytest.raises(LLMifyError, match="max_tool_rounds=0"):
+            await model.invoke_with_tools(
+                [UserMessage(content="go")], tools=[add], max_tool_rounds=0
+            )
+
+    @pytest.mark.asyncio
+    async def test_requests_structured_output_after_the_last_round(self) -> None:
+        class Answer(BaseModel):
+            value: int
+
+        model = ScriptedModel(
+            ChatInvokeCompletion(
+                completion="",
+                tool_calls=[_call("1", "add", '{"a":2,"b":2}')],
+                usage=_usage(5, 1),
+            ),
+            ChatInvokeCompletion(completion="It is 4.", usage=_usage(7, 2)),
+            ChatInvokeCompletion(completion=Answer(value=4), usage=_usage(9, 3)),
+        )
+
+        result = await model.invoke_with_tools(
+            [UserMessage(content="2+2?")], tools=[add], output_format=Answer
+        )
+
+        assert result.completion == Answer(value=4)
+        assert result.usage.total_tokens == 27
+        history, kwargs = model.requests[2]
+        assert kwargs["output_format"] is Answer
+        assert isinstance(history[-1], ToolResultMessage)
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"max_tool_rounds": -1}, "max_tool_rounds"),
+            ({"max_parallel_tools": 0}, "max_parallel_tools"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_bounds(self, kwargs: dict, match: str) -> None:
+        with pytest.raises(ValueError, match=match):
+            await ScriptedModel().invoke_with_tools(
+                [UserMessage(content="go")], tools=[add], **kwargs
+            )
+
+
+async def _events(*events: object):
+    for event in events:
+        if callable(event):
+            await event()
+        else:
+            yield event
+
+
+class TestStreamWithTools:
+    @pytest.mark.asyncio
+    async def test_starts_tools_while_the_response_is_still_streaming(self) -> None:
+        tool_started = asyncio.Event()
+
+        @tool
+        async def lookup(query: str) -> str:
+            tool_started.set()
+            return query.upper()
+
+        async def wait_for_tool() -> None:
+            await asyncio.wait_for(tool_started.wait(), timeout=1)
+
+        call = _call("1", "lookup", '{"query": "alpha"}')
+        model = ScriptedModel(
+            _events(
+                StreamToolCall(tool_call=call),
+                wait_for_tool,
+                StreamTextDelta(delta="trailing"),
+                StreamEnd(tool_calls=[call], usage=_usage(10, 2)),
+            ),
+            _events(
+                StreamTextDelta(delta="ALPHA"),
+                StreamEnd(completion="ALPHA", usage=_usage(20, 1)),
+            ),
+        )
+
+        events = [
+            event
+            async for event in model.stream_with_tools(
+                [UserMessage(content="look up alpha")], tools=[lookup]
+            )
+        ]
+
+        assert [event.type for event in events] == [
+            "tool_call",
+            "text",
+            "tool_result",
+            "text",
+            "end",
+        ]
+        assert events[2] == StreamToolResult(tool_call_id="1", content="ALPHA")
+        end = events[-1]
+        assert end.completion == "ALPHA"
+        assert end.usage == _usage(30, 3)
+        assert [tool_call.id for tool_call in end.tool_calls] == ["1"]
+        history, _ = model.requests[1]
+        assert history[1].tool_calls == [call]
+        assert history[2] == ToolResultMessage(tool_call_id="1", content="ALPHA")
+
+    @pytest.mark.asyncio
+    async def test_runs_calls_missing_from_the_stream_after_it_ends(self) -> None:
+        call = _call("1", "add", '{"a": 1, "b": 2}')
+        model = ScriptedModel(
+            _events(StreamEnd(tool_calls=[call])),
+            _events(StreamEnd(completion="3")),
+        )
+
+        events = [
+            event
+            async for event in model.stream_with_tools(
+                [UserMessage(content="1+2?")], tools=[add]
+            )
+        ]
+
+        assert events[0] == StreamToolResult(tool_call_id="1", content="3")
+
+    @pytest.mark.asyncio
+    async def test_enforces_maximum_tool_rounds_without_running_tools(self) -> None:
+        calls = 0
+
+        @tool
+        def count() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        call = _call("1", "count")
+        model = ScriptedModel(
+            _events(StreamToolCall(tool_call=call), StreamEnd(tool_calls=[call]))
+        )
+
+        with pytest.raises(LLMifyError, match="max_tool_rounds=0"):
+            async for _ in model.stream_with_tools(
+                [UserMessage(content="go")], tools=[count], max_tool_rounds=0
+            ):
+                pass
+
+        assert calls == 0
+
+    @pytest.mark.asyncio
+    async def test_closing_the_stream_cancels_running_tools(self) -> None:
+        cancelled = asyncio.Event()
+
+        @tool
+        async def hang() -> str:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "never"
+
+        call = _call("1", "hang")
+        model = ScriptedModel(
+            _events(StreamToolCall(tool_call=call), StreamEnd(tool_calls=[call]))
+        )
+        stream = model.stream_with_tools([UserMessage(content="go")], tools=[hang])
+
+        assert isinstance(await anext(stream), StreamToolCall)
+        await asyncio.sleep(0)
+        await stream.aclose()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    def test_rejects_invalid_bounds(self) -> None:
+        with pytest.raises(ValueError, match="max_parallel_tools"):
+            ScriptedModel().stream_with_tools(
+                [UserMessage(content="go")], tools=[add], max_parallel_tools=0
+            )
+
+
+class TestProviderIntegration:
+    @pytest.mark.asyncio
+    async def test_anthropic_round_trips_tool_results(self) -> None:
+        pytest.importorskip("anthropic")
+        from llmify.providers.anthropic import ChatAnthropic
+        from llmify.providers.anthropic_types import AnthropicCompletion
+
+        def response(content, stop_reason):
+            return SimpleNamespace(
+                content=content,
+                stop_reason=stop_reason,
+                usage=SimpleNamespace(
+                    input_tokens=10,
+                    output_tokens=5,
+                    cache_read_input_tokens=None,
+                    cache_creation_input_tokens=2,
+                ),
+            )
+
+        client = SimpleNamespace(messages=SimpleNamespace())
+        client.messages.create = AsyncMock(
+            side_effect=[
+                response(
+                    [
+                        SimpleNamespace(
+                            type="tool_use",
+                            id="toolu_1",
+                            name="add",
+                            input={"a": 2, "b": 3},
+                        )
+                    ],
+                    "tool_use",
+                ),
+                response([SimpleNamespace(type="text", text="5")], "end_turn"),
+            ]
+        )
+        model = ChatAnthropic(model="claude-test", client=client)
+
+        result = await model.invoke_with_tools(
+            [UserMessage(content="2+3?")], tools=[add]
+        )
+
+        assert isinstance(result, AnthropicCompletion)
+        assert result.completion == "5"
+        assert result.usage.prompt_tokens == 20
+        assert result.usage.prompt_cache_creation_tokens == 4
+        second = client.messages.create.call_args_list[1].kwargs["messages"]
+        assert second[-1]["content"][0]["type"] == "tool_result"
+        assert second[-1]["content"][0]["tool_use_id"] == "toolu_1"
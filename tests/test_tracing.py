@@ -0,0 +1,215 @@
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+
+from llmify import (
+    ChatFake,
+    FakeBehavior,
+    Function,
+    InMemoryResponseCache,
+    ToolCall,
+    UserMessage,
+    disable_tracing,
+    enable_tracing,
+    tool,
+)
+from llmify.exceptions import RateLimitError
+from llmify.tracing import NO_SPAN, start_span
+
+MESSAGES = [UserMessage(content="Hi")]
+
+
+@tool
+def ping() -> str:
+    """Ping"""
+    return "pong"
+
+
+@tool
+def broken() -> str:
+    """Fail"""
+    raise RuntimeError("boom")
+
+
+class RecordedSpan:
+    def __init__(self, name: str, attributes: dict, parent: "RecordedSpan | None"):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.parent = parent
+        self.exception: BaseException | None = None
+
+    def set_attribute(self, key: str, value: object) -> None:
+        self.attributes[key] = value
+
+
+class RecordingTracer:
+    def __init__(self) -> None:
+        self.spans: list[RecordedSpan] = []
+        self._stack: list[RecordedSpan] = []
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, *, attributes: dict | None = None
+    ) -> Iterator[RecordedSpan]:
+        span = RecordedSpan(
+            name, attributes or {}, self._stack[-1] if self._stack else None
+        )
+        self.spans.append(span)
+        self._stack.append(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.exception = exc
+            raise
+        finally:
+            self._stack.remove(span)
+
+    def named(self, prefix: str) -> list[RecordedSpan]:
+        return [span for span in self.spans if span.name.startswith(prefix)]
+
+
+@pytest.fixture
+def tracer() -> Iterator[RecordingTracer]:
+    recording = RecordingTracer()
+    enable_tracing(recording)
+    yield recording
+    disable_tracing()
+
+
+def _call(name: str) -> ToolCall:
+    return ToolCall(id=f"call_{name}", function=Function(name=name, arguments="{}"))
+
+
+class TestModelSpans:
+    @pytest.mark.asyncio
+    async def test_invoke_reports_genai_attributes(
+        self, tracer: RecordingTracer
+    ) -> None:
+        await ChatFake(model="fake-1").invoke(MESSAGES)
+
+        call, attempt = tracer.spans
+        assert call.name == "chat fake-1"
+        assert call.attributes["gen_ai.operation.name"] == "chat"
+        assert call.attributes["gen_ai.request.model"] == "fake-1"
+        assert call.attributes["gen_ai.usage.output_tokens"] == 5
+        assert call.attributes["gen_ai.response.finish_reasons"] == ["stop"]
+        assert attempt.name == "llmify.attempt"
+        assert attempt.parent is call
+
+    @pytest.mark.asyncio
+    async def test_stream_span_closes_with_the_stream(
+        self, tracer: RecordingTracer
+    ) -> None:
+        async for _ in ChatFake().stream(MESSAGES):
+            pass
+
+        (call,) = tracer.named("chat")
+        assert call.attributes["llmify.stream"] is True
+        assert call.attributes["gen_ai.usage.input_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_stream_spans_close_when_the_caller_stops_early(
+        self, tracer: RecordingTracer
+    ) -> None:
+        stream = ChatFake(behavior=FakeBehavior(text="one two three")).stream(MESSAGES)
+
+        await anext(stream)
+        await stream.aclose()
+
+        assert [span.name for span in tracer.spans] == ["chat fake", "llmify.attempt"]
+        assert tracer._stack == []
+
+    @pytest.mark.asyncio
+    async def test_each_retry_gets_an_attempt_and_backoff_span(
+        self, tracer: RecordingTracer
+    ) -> None:
+        llm = ChatFake(
+            behavior=FakeBehavior(rate_limit_rate=0.5, retry_after=0.0, seed=1)
+        )
+
+        await llm.invoke(MESSAGES)
+
+        first, second = tracer.named("llmify.attempt")
+        assert first.attributes["error.type"] == "RateLimitError"
+        assert second.attributes == {"llmify.attempt": 2}
+        (backoff,) = tracer.named("llmify.backoff")
+        assert backoff.attributes["llmify.retry.delay"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_failed_calls_carry_the_error_type(
+        self, tracer: RecordingTracer
+    ) -> None:
+        llm = ChatFake(behavior=FakeBehavior(rate_limit_rate=1.0), max_retries=0)
+
+        with pytest.raises(RateLimitError):
+            await llm.invoke(MESSAGES)
+
+        (call,) = tracer.named("chat")
+        assert call.attributes["error.type"] == "RateLimitError"
+        assert isinstance(call.exception, RateLimitError)
+
+    @pytest.mark.asyncio
+    async def test_marks_response_cache_hits(self, tracer: RecordingTracer) -> None:
+        llm = ChatFake(cache=InMemoryResponseCache())
+
+        await llm.invoke(MESSAGES)
+        await llm.invoke(MESSAGES)
+
+        calls = tracer.named("chat")
+        assert [call.attributes.get("llmify.response_cache.hit") for call in calls] == [
+            None,
+            True,
+        ]
+
+
+class TestToolSpans:
+    @pytest.mark.asyncio
+    async def test_tool_loop_nests_calls_and_tools_in_rounds(
+        self, tracer: RecordingTracer
+    ) -> None:
+        llm = ChatFake(behavior=FakeBehavior(tool_calls=(_call("ping"),)))
+
+        await llm.invoke_with_tools(MESSAGES, tools=[ping])
+
+        first, second = tracer.named("llmify.tool_round")
+        assert first.attributes == {
+            "llmify.tool_round": 0,
+            "llmify.tool_round.tool_calls": 1,
+        }
+        assert second.attributes["llmify.tool_round.tool_calls"] == 0
+        (execution,) = tracer.named("execute_tool")
+        assert execution.name == "execute_tool ping"
+        assert execution.attributes["gen_ai.tool.call.id"] == "call_ping"
+        assert execution.parent is first
+        assert all(
+            call.parent.name == "llmify.tool_round" for call in tracer.named("chat")
+        )
+
+    @pytest.mark.asyncio
+    async def test_streamed_tool_loop_traces_rounds_and_failures(
+        self, tracer: RecordingTracer
+    ) -> None:
+        llm = ChatFake(behavior=FakeBehavior(tool_calls=(_call("broken"),)))
+
+        async for _ in llm.stream_with_tools(MESSAGES, tools=[broken]):
+            pass
+
+        assert len(tracer.named("llmify.tool_round")) == 2
+        (execution,) = tracer.named("execute_tool")
+        assert execution.attributes["error.type"] == "RuntimeError"
+
+
+def test_disabled_tracing_shares_a_no_op_span() -> None:
+    with start_span("anything", {}) as span:
+        span.set_attribute("key", "value")
+
+    assert span is NO_SPAN
+
+
+def test_default_tracer_needs_opentelemetry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "opentelemetry", None)
+
+    with pytest.raises(ImportError, match="py-llmify\\[tracing\\]"):
+        enable_tracing()
@@ -0,0 +1,212 @@
+import asyncio
+
+import pytest
+
+from llmify import (
+    ChatFake,
+    InMemoryResponseCache,
+    ModelPrice,
+    UsageMeter,
+    UsageTotals,
+    UserMessage,
+)
+from llmify.providers.anthropic_types import AnthropicUsage
+from llmify.providers.google_types import GoogleUsage
+from llmify.providers.openai_responses_types import OpenAIResponsesUsage
+from llmify.views import ChatInvokeUsage
+
+MESSAGES = [UserMessage(content="Hi")]
+
+
+def _usage(prompt: int, completion: int, cached: int | None = None) -> ChatInvokeUsage:
+    return ChatInvokeUsage(
+        prompt_tokens=prompt,
+        prompt_cached_tokens=cached,
+        completion_tokens=completion,
+        total_tokens=prompt + completion,
+    )
+
+
+class TestPricing:
+    def test_prices_cached_and_uncached_prompt_tokens(self) -> None:
+        meter = UsageMeter({"gpt": ModelPrice(input=2.0, output=8.0, cached_input=0.5)})
+
+        meter.record("gpt", _usage(1_000_000, 500_000, cached=400_000))
+
+        totals = meter.totals()
+        assert totals.cost == pytest.approx(600_000 * 2e-6 + 400_000 * 5e-7 + 4.0)
+        assert totals.cache_hit_rate == pytest.approx(0.4)
+        assert totals.unpriced_requests == 0
+
+    def test_adds_anthropic_cache_tokens_back_into_the_prompt(self) -> None:
+        meter = UsageMeter(
+            {"claude": ModelPrice(input=3.0, output=15.0, cache_write=3.75)}
+        )
+        usage = AnthropicUsage(
+            prompt_tokens=100,
+            prompt_cached_tokens=800,
+            prompt_cache_creation_tokens=100,
+            completion_tokens=10,
+            total_tokens=110,
+        )
+
+        meter.record("claude", usage)
+
+        totals = meter.totals()
+        assert totals.prompt_tokens == 1_000
+        assert totals.cache_write_tokens == 100
+        assert totals.cache_hit_rate == pytest.approx(0.8)
+        # Cached reads fall back to the input price when unset.
+        assert totals.cost == pytest.approx(
+            (100 * 3.0 + 800 * 3.0 + 100 * 3.75 + 10 * 15.0) / 1_000_000
+        )
+
+    def test_tracks_reasoning_and_image_tokens(self) -> None:
+        meter = UsageMeter(
+            {"gemini": ModelPrice(input=1.0, output=2.0, image_input=4.0)}
+        )
+
+        meter.record(
+            "o-model",
+            OpenAIResponsesUsage(
+                prompt_tokens=10,
+                completion_tokens=30,
+                total_tokens=40,
+                reasoning_tokens=20,
+                prompt_cache_write_tokens=5,
+            ),
+        )
+        meter.record(
+            "gemini",
+            GoogleUsage(
+                prompt_tokens=300,
+                completion_tokens=0,
+                total_tokens=300,
+                prompt_image_tokens=258,
+            ),
+        )
+
+        responses = meter.totals(model="o-model")
+        assert responses.reasoning_tokens == 20
+        assert responses.cache_write_tokens == 5
+        assert responses.unpriced_requests == 1
+        gemini = meter.totals(model="gemini")
+        assert gemini.image_prompt_tokens == 258
+        assert gemini.cost == pytest.approx((42 * 1.0 + 258 * 4.0) / 1_000_000)
+
+    def test_set_price_applies_to_later_requests(self) -> None:
+        meter = UsageMeter()
+        meter.record("gpt", _usage(1_000_000, 0))
+
+        meter.set_price("gpt", ModelPrice(input=1.0, output=1.0))
+        meter.record("gpt", _usage(1_000_000, 0))
+
+        totals = meter.totals()
+        assert totals.cost == pytest.approx(1.0)
+        assert totals.unpriced_requests == 1
+
+
+class TestAggregation:
+    def test_groups_by_model_and_tag(self) -> None:
+        meter = UsageMeter()
+
+        with meter.tagged("checkout"):
+            meter.record("a", _usage(10, 1))
+            with meter.tagged("retry"):
+                meter.record("b", _usage(20, 2))
+        meter.record("a", _usage(30, 3), tags=["batch"])
+
+        assert meter.totals().requests == 3
+        assert meter.by_model() == {
+            "a": UsageTotals(
+                requests=2, prompt_tokens=40, completion_tokens=4, unpriced_requests=2
+            ),
+            "b": UsageTotals(
+                requests=1, prompt_tokens=20, completion_tokens=2, unpriced_requests=1
+            ),
+        }
+        assert meter.by_tag()["checkout"].requests == 2
+        assert meter.totals(model="a", tag="checkout").prompt_tokens == 10
+        assert set(meter.by_tag()) == {"checkout", "retry", "batch"}
+
+    def test_buckets_requests_into_retained_windows(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        now = [1_000.0]
+        monkeypatch.setattr("llmify.usage_meter.time.time", lambda: now[0])
+        meter = UsageMeter(window=10.0, retain_windows=2)
+
+        for at in (1_000.0, 1_005.0, 1_012.0, 1_025.0):
+            now[0] = at
+            meter.record("a", _usage(1, 1))
+
+        windows = meter.windows()
+        assert [window.start for window in windows] == [1_010.0, 1_020.0]
+        assert [window.totals.requests for window in windows] == [1, 1]
+        assert meter.totals().requests == 4
+
+    def test_reset_clears_everything(self) -> None:
+        meter = UsageMeter()
+        meter.record("a", _usage(1, 1))
+
+        meter.reset()
+
+        assert meter.totals() == UsageTotals()
+        assert meter.windows() == []
+
+    def test_folds_pending_records_without_a_read(self) -> None:
+        meter = UsageMeter()
+
+        for _ in range(5_000):
+            meter.record("gpt", _usage(10, 1))
+
+        assert len(meter._pending) < 1_024
+        assert meter.totals().requests == 5_000
+
+    def test_rejects_invalid_windows(self) -> None:
+        with pytest.raises(ValueError, match="window"):
+            UsageMeter(window=0)
+        with pytest.raises(ValueError, match="retain_windows"):
+            UsageMeter(retain_windows=0)
+
+
+class TestModelIntegration:
+    @pytest.mark.asyncio
+    async def test_records_invoke_and_stream_usage(self) -> None:
+        meter = UsageMeter({"fake": ModelPrice(input=1.0, output=1.0)})
+        llm = ChatFake(usage_meter=meter)
+
+        await llm.invoke(MESSAGES)
+        async for _ in llm.stream(MESSAGES):
+            pass
+
+        totals = meter.totals(model="fake")
+        assert totals.requests == 2
+        assert totals.completion_tokens == 10
+        assert totals.cost > 0
+
+    @pytest.mark.asyncio
+    async def test_shared_meter_tags_concurrent_tasks(self) -> None:
+        meter = UsageMeter()
+        first = ChatFake(model="one", usage_meter=meter)
+        second = ChatFake(model="two", usage_meter=meter)
+
+        async def run(llm: ChatFake, tag: str) -> None:
+            with meter.tagged(tag):
+                await llm.invoke(MESSAGES)
+
+        await asyncio.gather(run(first, "a"), run(second, "b"))
+
+        assert set(meter.by_model()) == {"one", "two"}
+        assert meter.totals(model="one", tag="a").requests == 1
+        assert meter.totals(model="two", tag="a").requests == 0
+
+    @pytest.mark.asyncio
+    async def test_skips_response_cache_hits(self) -> None:
+        meter = UsageMeter()
+        llm = ChatFake(cache=InMemoryResponseCache(), usage_meter=meter)
+
+        await llm.invoke(MESSAGES)
+        await llm.invoke(MESSAGES)
+
+        assert meter.totals().requests == 1
@@ -9,13 +9,14 @@ from llmify.providers.google_types import (
     GoogleUsage,
 )
 from llmify.providers.openai_responses_types import OpenAIResponsesUsage
-from llmify.views import ChatInvokeUsage
+from llmify.views import ChatInvokeUsage, add_usage
 
 COMMON_FIELDS = {
     "prompt_tokens",
     "prompt_cached_tokens",
     "completion_tokens",
     "total_tokens",
+    "from_cache",
 }
 
 
@@ -33,6 +34,24 @@ class TestChatInvokeUsage:
             "reasoning_tokens",
         }
 
+    def test_add_usage_sums_fields_and_keeps_the_provider_type(self) -> None:
+        left = AnthropicUsage(
+            prompt_tokens=10,
+            completion_tokens=2,
+            total_tokens=12,
+            prompt_cache_creation_tokens=4,
+        )
+        right = AnthropicUsage(prompt_tokens=5, completion_tokens=1, total_tokens=6)
+
+        total = add_usage(left, right)
+
+        assert isinstance(total, AnthropicUsage)
+        assert total.prompt_tokens == 15
+        assert total.total_tokens == 18
+        assert total.prompt_cache_creation_tokens == 4
+        assert total.prompt_cached_tokens is None
+        assert add_usage(None, right) is right
+
 
 class TestAnthropicViews:
     def test_completion_keeps_provider_usage(self) -> None:
@@ -1,4 +1,5 @@
 # tests/tools/test_function_tool.py
+import threading
 from typing import Annotated
 
 import pytest
@@ -181,6 +182,21 @@ class TestAnnotatedDescriptions:
         assert "description" not in props["country"]
 
 
+class TestAsyncCall:
+    @pytest.mark.asyncio
+    async def test_runs_sync_functions_in_a_worker_thread(self) -> None:
+        tool_instance = FunctionTool(lambda: threading.get_ident(), name="ident")
+
+        assert await tool_instance.acall() != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_awaits_coroutine_functions(self) -> None:
+        async def double(value: int) -> int:
+            return value * 2
+
+        assert await FunctionTool(double).acall(value=4) == 8
+
+
 class TestToolDecorator:
     def test_converts_function_to_tool(self) -> None:
         @tool